@@ -0,0 +1,490 @@
+"""
+Content-addressed download cache for the setup artifacts (godot-cpp, Zig).
+
+    cache layout    <cache>/sha256/ab/abcdef...    verified archives
+                    <cache>/index.json              url -> sha256, size
+                    <cache>/partial/<id>.part(.json) interrupted downloads
+    download        probes the size with a one-byte Range request, then
+                    fetches N segments in parallel threads into a
+                    preallocated .part file; the offset each segment has
+                    flushed to disk is saved so an interrupted download
+                    resumes where it stopped. Servers without Range support
+                    get one streamed request.
+    verify          SHA-256 of the finished file against the pinned hash
+                    (ARTIFACTS in setup_project.py). An unpinned URL is an
+                    error unless trust_unpinned is set; then the first
+                    download is recorded in index.json and printed so it can
+                    be pinned.
+    extract         zip members are streamed to a temp folder (zipfile checks
+                    each member's CRC as it reads), paths matching exclude
+                    globs are skipped, and the folder is renamed into place
+                    with a .artifact stamp. A matching stamp skips extraction.
+
+A machine with the archives in its cache (or already-extracted folders) sets
+up with no network access; --offline turns any needed download into an error.
+
+The cache lives in $GODOT_ARTIFACT_CACHE or ~/.cache/godot-artifacts.
+
+Usage:
+    python artifact_cache.py --self-test
+"""
+import argparse
+import fnmatch
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+import tracing
+
+CACHE_ENV = "GODOT_ARTIFACT_CACHE"
+DEFAULT_CACHE = Path.home() / ".cache" / "godot-artifacts"
+INDEX_VERSION = 1
+SEGMENTS = 4
+MIN_SEGMENT = 1 << 20
+CHUNK = 1 << 16
+RETRIES = 3
+STAMP_NAME = ".artifact"
+
+
+class ArtifactError(Exception):
+    pass
+
+
+@tracing.traced("hash")
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    tmp = Path(str(path) + ".tmp")
+    tmp.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# === Download ===
+
+def probe(url, timeout):
+    """(size or None, supports ranges) without downloading the body."""
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if response.status == 206:
+            total = response.headers.get("Content-Range", "").rsplit("/", 1)[-1]
+            return (int(total) if total.isdigit() else None), True
+        length = response.headers.get("Content-Length")
+        return (int(length) if length else None), False
+
+
+class SegmentedDownload:
+    """Parallel ranged download into a .part file with a resumable progress file."""
+
+    def __init__(self, url, part, size, segments, timeout):
+        self.url = url
+        self.part = Path(part)
+        self.state_path = Path(str(part) + ".json")
+        self.size = size
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.fetched = 0
+        state = self._load_state()
+        if state is None:
+            count = max(1, min(segments, size // MIN_SEGMENT or 1))
+            step = -(-size // count)
+            self.segments = [[start, min(size, start + step), 0] for start in range(0, size, step)]
+            with open(self.part, "wb") as f:
+                f.truncate(size)
+        else:
+            self.segments = state["segments"]
+        # Bytes of each segment known to be on disk; only these go into the progress file
+        self.flushed = [done for _, _, done in self.segments]
+        self.resumed = sum(self.flushed)
+
+    def _load_state(self):
+        if not (self.state_path.exists() and self.part.exists()):
+            return None
+        state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        if state.get("url") != self.url or state.get("size") != self.size:
+            return None
+        return state
+
+    def _save_state(self):
+        with self.lock:
+            segments = [[start, end, done] for (start, end, _), done in zip(self.segments, self.flushed)]
+            _write_json(self.state_path, {"url": self.url, "size": self.size, "segments": segments})
+
+    def _mark_flushed(self, index):
+        with self.lock:
+            self.flushed[index] = self.segments[index][2]
+
+    def _fetch_segment(self, index):
+        segment = self.segments[index]
+        start, end, _ = segment
+        last_save = 0
+        for attempt in range(RETRIES):
+            offset = start + segment[2]
+            if offset >= end:
+                return
+            request = urllib.request.Request(self.url, headers={"Range": f"bytes={offset}-{end - 1}"})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response, \
+                        open(self.part, "r+b") as out:
+                    if response.status != 206:
+                        raise ArtifactError(f"server ignored Range for {self.url}")
+                    out.seek(offset)
+                    while segment[2] < end - start:
+                        block = response.read(min(CHUNK, end - start - segment[2]))
+                        if not block:
+                            break
+                        out.write(block)
+                        with self.lock:
+                            segment[2] += len(block)
+                            self.fetched += len(block)
+                        if segment[2] - last_save >= 4 * MIN_SEGMENT:
+                            last_save = segment[2]
+                            out.flush()
+                            os.fsync(out.fileno())
+                            self._mark_flushed(index)
+                            self._save_state()
+            except (urllib.error.URLError, http.client.HTTPException, OSError):
+                # The with block closed (flushed) the file before we got here
+                self._mark_flushed(index)
+                if attempt == RETRIES - 1:
+                    self._save_state()
+                    raise
+            self._mark_flushed(index)
+            if segment[2] >= end - start:
+                return
+        self._save_state()
+        raise ArtifactError(f"segment {start}-{end} of {self.url} incomplete after {RETRIES} attempts")
+
+    def run(self):
+        errors = []
+
+        def worker(index):
+            try:
+                self._fetch_segment(index)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,))
+                   for i, (start, end, done) in enumerate(self.segments) if done < end - start]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._save_state()
+        if errors:
+            raise ArtifactError(f"download of {self.url} interrupted ({errors[0]}); rerun to resume")
+        self.state_path.unlink()
+
+
+def stream_download(url, part, timeout):
+    """Single request without Range support; returns bytes fetched."""
+    fetched = 0
+    with urllib.request.urlopen(url, timeout=timeout) as response, open(part, "wb") as out:
+        for block in iter(lambda: response.read(CHUNK), b""):
+            out.write(block)
+            fetched += len(block)
+    return fetched
+
+
+# === Cache ===
+
+class ArtifactCache:
+    def __init__(self, root=None, offline=False, segments=SEGMENTS, timeout=30, trust_unpinned=False):
+        self.root = Path(root or os.environ.get(CACHE_ENV) or DEFAULT_CACHE)
+        self.offline = offline
+        self.trust_unpinned = trust_unpinned
+        self.segments = segments
+        self.timeout = timeout
+        self.index_path = self.root / "index.json"
+        self.last_fetch = {}
+
+    def _index(self):
+        if not self.index_path.exists():
+            return {}
+        data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        return data.get("urls", {}) if data.get("version") == INDEX_VERSION else {}
+
+    def _record(self, url, sha256, size):
+        urls = self._index()
+        urls[url] = {"sha256": sha256, "size": size}
+        self.root.mkdir(parents=True, exist_ok=True)
+        _write_json(self.index_path, {"version": INDEX_VERSION, "urls": urls})
+
+    def blob(self, sha256):
+        return self.root / "sha256" / sha256[:2] / sha256
+
+    def lookup(self, url, sha256=None):
+        """Cached archive for url (pinned hash or the recorded one), or None."""
+        entry = self._index().get(url, {})
+        sha256 = sha256 or entry.get("sha256")
+        if not sha256:
+            return None
+        path = self.blob(sha256)
+        if not path.exists():
+            return None
+        if entry.get("sha256") == sha256 and entry.get("size") not in (None, path.stat().st_size):
+            return None
+        return path
+
+    @tracing.traced("download")
+    def fetch(self, url, sha256=None):
+        """Path of the verified archive; downloads only on a cache miss."""
+        if not sha256 and not self.trust_unpinned:
+            raise ArtifactError(f"no pinned SHA-256 for {url}; pin it in ARTIFACTS "
+                                f"(setup_project.py) or pass --trust-first-download")
+        cached = self.lookup(url, sha256)
+        if cached is not None:
+            self.last_fetch = {"url": url, "network": False, "bytes": 0, "resumed": 0}
+            return cached
+        if self.offline:
+            raise ArtifactError(f"{url} is not in the artifact cache ({self.root}) and --offline is set")
+        partial = self.root / "partial"
+        partial.mkdir(parents=True, exist_ok=True)
+        part = partial / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:24] + ".part")
+        start = time.perf_counter()
+        size, ranges = probe(url, self.timeout)
+        if ranges and size:
+            download = SegmentedDownload(url, part, size, self.segments, self.timeout)
+            download.run()
+            fetched, resumed = download.fetched, download.resumed
+        else:
+            fetched, resumed = stream_download(url, part, self.timeout), 0
+        if size is not None and part.stat().st_size != size:
+            raise ArtifactError(f"{url}: expected {size} bytes, got {part.stat().st_size}")
+        actual = sha256_file(part)
+        if sha256 and actual != sha256:
+            part.unlink()
+            raise ArtifactError(f"{url}: SHA-256 mismatch (expected {sha256}, got {actual})")
+        if not sha256:
+            print(f"No pinned SHA-256 for {url}; recorded {actual} (pin it in ARTIFACTS)")
+        target = self.blob(actual)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part, target)
+        self._record(url, actual, target.stat().st_size)
+        elapsed = time.perf_counter() - start
+        self.last_fetch = {"url": url, "network": True, "bytes": fetched, "resumed": resumed,
+                           "seconds": elapsed}
+        return target
+
+
+# === Extraction ===
+
+def read_stamp(folder):
+    stamp = Path(folder) / STAMP_NAME
+    return json.loads(stamp.read_text(encoding="utf-8")) if stamp.exists() else None
+
+
+@tracing.traced("extract")
+def extract_zip(archive, sha256, parent, target_name, exclude=()):
+    """Stream-extract target_name/ from archive into parent, skipping exclude globs."""
+    parent = Path(parent)
+    final = parent / target_name
+    stamp = {"sha256": sha256, "exclude": sorted(exclude)}
+    if read_stamp(final) == stamp:
+        return 0
+    temp = Path(tempfile.mkdtemp(prefix=f".{target_name}.", dir=parent))
+    written = 0
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                name = info.filename
+                if name.startswith("/") or ".." in Path(name).parts:
+                    raise ArtifactError(f"unsafe path in archive: {name}")
+                if not name.startswith(target_name + "/"):
+                    continue
+                if any(fnmatch.fnmatch(name, pattern) for pattern in exclude):
+                    continue
+                out = temp / name
+                if info.is_dir():
+                    out.mkdir(parents=True, exist_ok=True)
+                    continue
+                out.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info) as src, open(out, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK)
+                mode = info.external_attr >> 16
+                if mode & 0o111:
+                    out.chmod(mode & 0o777)
+                written += 1
+        _write_json(temp / target_name / STAMP_NAME, stamp)
+        if final.exists():
+            shutil.rmtree(final)
+        os.replace(temp / target_name, final)
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        raise ArtifactError(f"{archive}: {e}") from e
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+    return written
+
+
+# === Self-test ===
+
+def _serve(files, drop_after=None):
+    """Local HTTP server with Range support; drop_after cuts the first N responses short."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    stats = {"requests": 0, "bytes": 0, "drops": drop_after or 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            data = files.get(self.path)
+            if data is None:
+                self.send_error(404)
+                return
+            start, end = 0, len(data) - 1
+            header = self.headers.get("Range")
+            if header and header.startswith("bytes="):
+                first, last = header[6:].split("-")
+                start, end = int(first), int(last or len(data) - 1)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                self.send_response(200)
+            body = data[start:end + 1]
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            with lock:
+                stats["requests"] += 1
+                drop = stats["drops"] > 0 and len(body) > 1
+                if drop:
+                    stats["drops"] -= 1
+            if drop:
+                body = body[:len(body) // 3]
+            self.wfile.write(body)
+            with lock:
+                stats["bytes"] += len(body)
+            if drop:
+                self.close_connection = True
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def self_test():
+    checks = []
+
+    def check(name, ok, detail=""):
+        checks.append(ok)
+        print(f"[ARTIFACTS] self-test {'PASS' if ok else 'FAIL'}: {name}{(' (' + detail + ')') if detail else ''}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        archive = tmp / "tool.zip"
+        payload = os.urandom(3 * MIN_SEGMENT)
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr("tool-1.0/bin/tool", payload)
+            zf.writestr("tool-1.0/include/a.h", b"int a();\n")
+            zf.writestr("tool-1.0/test/big.bin", os.urandom(MIN_SEGMENT))
+        data = archive.read_bytes()
+        pinned = hashlib.sha256(data).hexdigest()
+        server, stats = _serve({"/tool.zip": data}, drop_after=2)
+        url = f"http://127.0.0.1:{server.server_port}/tool.zip"
+        try:
+            cache = ArtifactCache(tmp / "cache", segments=4)
+            try:
+                cache.fetch(url, pinned)
+                check("dropped connections are retried", True)
+            except ArtifactError as e:
+                check("dropped connections are retried", False, str(e))
+            fetched = cache.last_fetch.get("bytes", 0)
+            check("segmented download is verified and cached", cache.lookup(url, pinned) is not None,
+                  f"{fetched} bytes in {stats['requests']} requests")
+
+            served = stats["bytes"]
+            offline = ArtifactCache(tmp / "cache", offline=True)
+            path = offline.fetch(url, pinned)
+            check("cached artifact needs no network", stats["bytes"] == served and path.exists())
+
+            written = extract_zip(path, pinned, tmp, "tool-1.0", exclude=["*/test/*"])
+            out = tmp / "tool-1.0"
+            check("extraction skips excluded members", written == 2 and not (out / "test").exists()
+                  and (out / "bin" / "tool").read_bytes() == payload)
+            check("matching stamp skips extraction", extract_zip(path, pinned, tmp, "tool-1.0",
+                                                                 exclude=["*/test/*"]) == 0)
+
+            # Interrupted download resumes from the saved segment progress.
+            resume = ArtifactCache(tmp / "resume", segments=4)
+            stats["drops"] = 100
+            try:
+                resume.fetch(url, pinned)
+                check("interrupted download reports failure", False)
+            except ArtifactError:
+                check("interrupted download reports failure", True)
+            part = next((tmp / "resume" / "partial").glob("*.part"))
+            state = json.loads(Path(str(part) + ".json").read_text(encoding="utf-8"))
+            on_disk = part.read_bytes()
+            check("saved progress covers only bytes on disk",
+                  all(on_disk[start:start + done] == data[start:start + done] for start, _, done in state["segments"]))
+            stats["drops"] = 0
+            resume.fetch(url, pinned)
+            check("rerun resumes instead of restarting", resume.last_fetch["resumed"] > 0
+                  and resume.last_fetch["bytes"] < len(data),
+                  f"resumed {resume.last_fetch['resumed']}, fetched {resume.last_fetch['bytes']} of {len(data)}")
+
+            bad = ArtifactCache(tmp / "bad")
+            try:
+                bad.fetch(url, "0" * 64)
+                check("checksum mismatch is rejected", False)
+            except ArtifactError:
+                check("checksum mismatch is rejected", bad.lookup(url, "0" * 64) is None)
+
+            try:
+                ArtifactCache(tmp / "unpinned").fetch(url)
+                check("unpinned download is an error", False)
+            except ArtifactError:
+                check("unpinned download is an error", not (tmp / "unpinned").exists())
+            trusted = ArtifactCache(tmp / "trusted", trust_unpinned=True)
+            check("trust_unpinned records the first download", trusted.fetch(url) == trusted.blob(pinned))
+
+            try:
+                ArtifactCache(tmp / "empty", offline=True).fetch(url, pinned)
+                check("offline miss is an error", False)
+            except ArtifactError:
+                check("offline miss is an error", True)
+
+            corrupt = bytearray(data)
+            corrupt[data.index(b"int a();") + 2] ^= 0xFF
+            corrupt_path = tmp / "corrupt.zip"
+            corrupt_path.write_bytes(bytes(corrupt))
+            try:
+                extract_zip(corrupt_path, "x", tmp, "tool-1.0")
+                check("corrupt member fails CRC during extraction", False)
+            except ArtifactError:
+                check("corrupt member fails CRC during extraction", read_stamp(tmp / "tool-1.0")["sha256"] == pinned)
+        finally:
+            server.shutdown()
+    return all(checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artifact cache for the GDExtension setup.")
+    parser.add_argument("--self-test", action="store_true", help="run against a local HTTP server")
+    args = parser.parse_args()
+    if args.self_test:
+        return 0 if self_test() else 1
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,13 @@
+import argparse
 import os
-import urllib.request
-import zipfile
 import subprocess
 import sys
 import shutil
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+import tracing
+from artifact_cache import ArtifactCache, ArtifactError, extract_zip, read_stamp
+
 # Configuration
 GODOT_CPP_URL = "https://github.com/godotengine/godot-cpp/archive/refs/tags/godot-4.5-stable.zip"
 ZIG_URL = "https://ziglang.org/builds/zig-x86_64-windows-0.16.0-dev.1484+d0ba6642b.zip"
@@ -12,36 +15,54 @@ ZIG_URL = "https://ziglang.org/builds/zig-x86_64-windows-0.16.0-dev.1484+d0ba664
 GODOT_CPP_DIR_NAME = "godot-cpp-godot-4.5-stable"
 ZIG_DIR_NAME = "zig-x86_64-windows-0.16.0-dev.1484+d0ba6642b"
 
-def download_and_extract(url, target_name):
-    filename = url.split('/')[-1]
-    
+# sha256: the archive's SHA-256, checked on every download. None is an error unless
+# --trust-first-download is passed, which records and prints the hash so it can be pinned.
+# exclude: archive members the build never reads.
+ARTIFACTS = {
+    GODOT_CPP_URL: {"sha256": None, "exclude": ["*/test/*", "*/doc/*", "*/.github/*", "*/misc/*"]},
+    ZIG_URL: {"sha256": None, "exclude": ["*/doc/*"]},
+}
+
+def download_and_extract(url, target_name, cache):
     # Check if directory already exists
-    if os.path.exists(target_name):
+    if os.path.exists(target_name) and read_stamp(target_name) is None:
         print(f"Directory '{target_name}' already exists. Skipping download.")
         return
 
-    print(f"Downloading {filename}...")
-    try:
-        urllib.request.urlretrieve(url, filename)
-    except Exception as e:
-        print(f"Error downloading {url}: {e}")
-        sys.exit(1)
-
-    print(f"Extracting {filename}...")
+    artifact = ARTIFACTS.get(url, {})
+    stamp = read_stamp(target_name)
+    if (stamp and stamp["exclude"] == sorted(artifact.get("exclude", ()))
+            and (artifact.get("sha256") or (cache.trust_unpinned and stamp["sha256"])) == stamp["sha256"]):
+        print(f"'{target_name}' is already extracted and verified. Skipping.")
+        return
     try:
-        with zipfile.ZipFile(filename, 'r') as zip_ref:
-            zip_ref.extractall(".")
-    except Exception as e:
-        print(f"Error extracting {filename}: {e}")
+        archive = cache.fetch(url, artifact.get("sha256"))
+        fetch = cache.last_fetch
+        if fetch["network"]:
+            print(f"Downloaded {url.split('/')[-1]} ({fetch['bytes']} bytes"
+                  + (f", resumed after {fetch['resumed']}" if fetch["resumed"] else "")
+                  + f") in {fetch['seconds']:.1f}s")
+        else:
+            print(f"Using cached {url.split('/')[-1]} ({archive})")
+        sha256 = archive.name  # cache blobs are named by their SHA-256
+        written = extract_zip(archive, sha256, ".", target_name, artifact.get("exclude", ()))
+    except (ArtifactError, OSError) as e:
+        print(f"Error setting up {target_name}: {e}")
         sys.exit(1)
-        
-    # Cleanup zip file
-    if os.path.exists(filename):
-        os.remove(filename)
-    print(f"Successfully setup {target_name}")
+    if written:
+        print(f"Successfully setup {target_name} ({written} files)")
+    else:
+        print(f"'{target_name}' is already extracted from the same archive. Skipping.")
 
+@tracing.traced("install scons")
 def install_scons():
-    print("Installing/Upgrading SCons via pip...")
+    try:
+        import SCons  # noqa: F401
+        print("SCons is already installed.")
+        return
+    except ImportError:
+        pass
+    print("Installing SCons via pip...")
     try:
         subprocess.check_call([sys.executable, "-m", "pip", "install", "scons"])
     except subprocess.CalledProcessError as e:
@@ -277,6 +298,7 @@ windows.release.x86_64 = "res://bin/gdexample.windows.template_release.x86_64.dl
     with open(os.path.join(bin_dir, "example.gdextension"), "w") as f:
         f.write(content)
 
+@tracing.traced("wait")
 def run_build():
     print("Running SCons build...")
     try:
@@ -287,10 +309,20 @@ def run_build():
         sys.exit(1)
 
 def main():
+    parser = argparse.ArgumentParser(description="Download godot-cpp + Zig and build the test extension.")
+    parser.add_argument("--offline", action="store_true", help="fail instead of downloading")
+    parser.add_argument("--cache", help="artifact cache folder (default: $GODOT_ARTIFACT_CACHE or ~/.cache/godot-artifacts)")
+    parser.add_argument("--segments", type=int, default=4, help="parallel download segments")
+    parser.add_argument("--trust-first-download", action="store_true",
+                        help="accept artifacts with no pinned SHA-256 in ARTIFACTS and record their hash")
+    args = parser.parse_args()
+    cache = ArtifactCache(args.cache, offline=args.offline, segments=args.segments,
+                          trust_unpinned=args.trust_first_download)
+
     print("Starting Setup...")
     install_scons()
-    download_and_extract(GODOT_CPP_URL, GODOT_CPP_DIR_NAME)
-    download_and_extract(ZIG_URL, ZIG_DIR_NAME)
+    download_and_extract(GODOT_CPP_URL, GODOT_CPP_DIR_NAME, cache)
+    download_and_extract(ZIG_URL, ZIG_DIR_NAME, cache)
     create_source_files()
     create_sconstruct()
     create_project_file()
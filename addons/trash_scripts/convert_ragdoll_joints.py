@@ -1,26 +1,15 @@
+"""
+Change Pin joints (joint_type = 1) to Cone joints (2) in sketchfab_scene2.tscn.
+Wraps `python tools/cli.py patch-scene`; pass --apply to write.
+"""
+import os
+import sys
 
-input_file = r'c:\Users\Windows10_new\Documents\gpu-marching-cubes\modules\tools\sketchfab_scene2.tscn'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+import cli
 
-with open(input_file, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
+SCENE = "res://modules/tools/sketchfab_scene2.tscn"
+OPERATIONS = ["--replace", "joint_type", "1", "2"]
 
-output_lines = []
-
-for line in lines:
-    stripped = line.strip()
-    
-    # Change joint_type = 1 (Pin) to 2 (Cone) for better default stability
-    # Or 5 (6DOF)
-    if stripped == 'joint_type = 1':
-        # Don't change Bip01 Pelvis_04 if it was set to 0 (root)
-        # But wait, my previous script changed valid lines in place.
-        # This simple check replaces ALL type 1.
-        # Assuming Pelvis is type 0 now from previous step, it won't be matched.
-        output_lines.append('joint_type = 2\n')
-    else:
-        output_lines.append(line)
-
-with open(input_file, 'w', encoding='utf-8') as f:
-    f.writelines(output_lines)
-
-print("Converted Pin Constraints to ConeConstraints.")
+if __name__ == "__main__":
+    sys.exit(cli.main(["patch-scene", SCENE, *OPERATIONS, *sys.argv[1:]]))
@@ -1,4 +1,9 @@
+import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+import tracing
 
 content = 'const ItemDefs = preload("res://modules/world_player_v2/features/inventory/item_definitions.gd")'
 old_name = "inventory"
@@ -6,7 +11,8 @@ pattern_str = rf"(modules/world_player_v2/features/){re.escape(old_name)}([\\/\"
 regex = re.compile(pattern_str)
 
 print(f"Pattern: {pattern_str}")
-match = regex.search(content)
+with tracing.span("match"):
+    match = regex.search(content)
 if match:
     print(f"Match found: {match.group(0)}")
     print(f"Groups: {match.groups()}")
@@ -15,13 +21,14 @@ else:
 
 # Test file reading
 try:
-    with open(r"modules/world_player_v2/features/player_modes/mode_manager.gd", "r", encoding="utf-8") as f:
-        file_content = f.read()
-        print(f"File read success. Length: {len(file_content)}")
-        match_file = regex.search(file_content)
-        if match_file:
-            print("Match found in file content!")
-        else:
-            print("No match in file content.")
+    with tracing.span("read"):
+        with open(r"modules/world_player_v2/features/player_modes/mode_manager.gd", "r", encoding="utf-8") as f:
+            file_content = f.read()
+            print(f"File read success. Length: {len(file_content)}")
+            match_file = regex.search(file_content)
+            if match_file:
+                print("Match found in file content!")
+            else:
+                print("No match in file content.")
 except Exception as e:
     print(f"File read error: {e}")
@@ -1,31 +1,15 @@
+"""
+Give the pelvis physical bone no joint (joint_type = 0) in sketchfab_scene2.tscn.
+Wraps `python tools/cli.py patch-scene`; pass --apply to write.
+"""
+import os
+import sys
 
-input_file = r'c:\Users\Windows10_new\Documents\gpu-marching-cubes\modules\tools\sketchfab_scene2.tscn'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+import cli
 
-target_node = 'Physical Bone Bip01 Pelvis_04'
+SCENE = "res://modules/tools/sketchfab_scene2.tscn"
+OPERATIONS = ["--set", "Physical Bone Bip01 Pelvis_04", "joint_type", "0"]
 
-with open(input_file, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-
-output_lines = []
-in_target_node = False
-
-for line in lines:
-    stripped = line.strip()
-    
-    if stripped.startswith('[node '):
-        if f'name="{target_node}"' in stripped:
-            in_target_node = True
-        else:
-            in_target_node = False
-    
-    if in_target_node and stripped.startswith('joint_type = '):
-        # Change joint_type to 0 (None)
-        print(f"fixing joint_type for {target_node}")
-        output_lines.append('joint_type = 0\n')
-    else:
-        output_lines.append(line)
-
-with open(input_file, 'w', encoding='utf-8') as f:
-    f.writelines(output_lines)
-
-print("Finished fixing root joint.")
+if __name__ == "__main__":
+    sys.exit(cli.main(["patch-scene", SCENE, *OPERATIONS, *sys.argv[1:]]))
@@ -1,59 +1,11 @@
-import subprocess
+"""
+Stream 15 s of Godot --debug output. Wraps `python tools/cli.py run`.
+"""
+import os
 import sys
-import time
 
-# Configuration
-GODOT_BIN = r"C:\Program Files (x86)\Steam\steamapps\common\Godot Engine\godot.windows.opt.tools.64.exe"
-PROJECT_PATH = r"C:\Users\Windows10_new\Documents\gpu-marching-cubes"
-TIMEOUT = 15  # Seconds to run
-
-def main():
-    print(f"🚀 Running Godot for {TIMEOUT}s...")
-    print("-" * 50)
-    
-    cmd = [
-        GODOT_BIN,
-        "--path", PROJECT_PATH,
-        "--debug"
-    ]
-    
-    try:
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT, # Merge stderr into stdout
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            bufsize=1
-        )
-        
-        start_time = time.time()
-        
-        while True:
-            # Check for timeout
-            if time.time() - start_time > TIMEOUT:
-                print(f"\n🛑 Time limit reached ({TIMEOUT}s). Terminating...")
-                process.terminate()
-                break
-            
-            # Non-blocking read
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            
-            if output:
-                # Print to console
-                sys.stdout.write(output)
-                sys.stdout.flush()
-                
-        try:
-            process.wait(timeout=3)
-        except subprocess.TimeoutExpired:
-            process.kill()
-            
-    except Exception as e:
-        print(f"❌ Execution error: {e}")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+import cli
 
 if __name__ == "__main__":
-    main()
+    sys.exit(cli.main(["run", "--debug", "--timeout", "15", *sys.argv[1:]]))
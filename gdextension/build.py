@@ -1,41 +1,481 @@
+"""
+Incremental, cached build driver for the high_performance GDExtension.
 
+Compiles src/*.cpp and links them against the godot-cpp static library
+without going through SCons:
+
+    1. scan      src/*.cpp and every "quoted" header they include
+                 (transitively; <angle> godot-cpp headers are covered by the
+                 godot-cpp library stamp below)
+    2. hash      per object: compiler command + `--version`, flags, source
+                 and header contents, godot-cpp library stamp
+    3. no-op     if the link key (all object keys + link flags) matches the
+                 last build and the output is unchanged on disk, stop here
+    4. compile   objects missing from the content-addressed cache
+                 (addons/gdextension_setup/build_cache/objects/<key>.o),
+                 in parallel at the core count
+    5. link      into bin/high_performance.<platform>.<target>.<arch><ext>
+
+Every step prints its wall time. The compiler defaults to the Zig toolchain
+in addons/gdextension_setup (as in SConstruct), else $CXX, else c++;
+--cxx takes any command, which is how --self-test checks the incremental
+logic on Linux with a stand-in compiler.
+
+godot-cpp itself is still built by SCons once (--scons runs the old SCons
+build of the whole extension). The compiler flags here are written out by
+hand, so every build compares the ones that change the ABI (-D defines,
+-std, exceptions, RTTI) with those godot-cpp was compiled with, read from
+its compile_commands.json (scons compiledb=yes), and stops on a mismatch.
+
+Usage:
+    python build.py
+    python build.py --target template_release --jobs 8
+    python build.py --cxx "clang++" --platform linux
+    python build.py --self-test
+"""
+import argparse
+import hashlib
+import json
 import os
+import re
+import shlex
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-def build():
-    print("Building GDExtension...")
-    
-    # Check if scons is installed
-    try:
-        # Try running scons as a command
-        subprocess.run(["scons", "--version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, shell=True)
-        cmd = ["scons"]
-    except:
-        # Fallback to python module
-        print("'scons' command not found, trying 'python -m SCons'...")
-        cmd = [sys.executable, "-m", "SCons"]
-
-    # Run build
-    try:
-        subprocess.check_call(cmd, shell=True)
-        print("\nBuild SUCCESS!")
-        
-        # Only stage bin folder changes on successful build
-        print("\nStaging bin folder for git commit...")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tools"))
+import tracing
+
+EXTENSION_DIR = Path(__file__).resolve().parent
+SETUP_DIR = EXTENSION_DIR.parent / "addons" / "gdextension_setup"
+GODOT_CPP_DIR = SETUP_DIR / "godot-cpp-godot-4.5-stable"
+ZIG_EXE = SETUP_DIR / "zig-x86_64-windows-0.16.0-dev.1484+d0ba6642b" / "zig.exe"
+CACHE_DIR = SETUP_DIR / "build_cache"
+LIBRARY_NAME = "high_performance"
+DRIVER_VERSION = 1
+
+SHARED_SUFFIX = {"windows": ".dll", "linux": ".so", "macos": ".dylib"}
+TARGET_FLAGS = {
+    "template_debug": ["-O2", "-g", "-DDEBUG_ENABLED", "-DDEBUG_METHODS_ENABLED"],
+    "template_release": ["-O3", "-DNDEBUG"],
+}
+
+_INCLUDE_RE = re.compile(rb'^\s*#\s*include\s*"([^"]+)"', re.M)
+# Flags that must agree with the godot-cpp build: they change class layouts or the ABI
+_ABI_FLAG_RE = re.compile(r"^(-D\S+|-std=\S+|-f(no-)?exceptions|-f(no-)?rtti)$")
+COMPILE_DB = "compile_commands.json"
+
+
+def default_platform():
+    if sys.platform == "win32":
+        return "windows"
+    return "macos" if sys.platform == "darwin" else "linux"
+
+
+def default_cxx():
+    if ZIG_EXE.exists():
+        return [str(ZIG_EXE), "c++"]
+    return shlex.split(os.environ.get("CXX", "c++"))
+
+
+def hash_bytes(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_stamp(path):
+    """Cheap identity of a large prebuilt file (size + mtime)."""
+    path = Path(path)
+    if not path.exists():
+        return "missing"
+    st = path.stat()
+    return f"{path.name}:{st.st_size}:{st.st_mtime_ns}"
+
+
+class Step:
+    """Context manager printing the wall time of one build step."""
+
+    def __init__(self, name, timings):
+        self.name = name
+        self.timings = timings
+
+    def __enter__(self):
+        self.span = tracing.span(self.name)
+        self.span.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.span.__exit__(*exc)
+        self.timings[self.name] = elapsed
+        print(f"[BUILD] {self.name:<9} {elapsed * 1000:8.1f} ms")
+
+
+# === Configuration ===
+
+class BuildConfig:
+    """Compiler command, flags and paths of one build."""
+
+    def __init__(self, cxx, platform, target, arch, src_dir=EXTENSION_DIR / "src",
+                 out_dir=EXTENSION_DIR / "bin", cache_dir=CACHE_DIR, godot_cpp=GODOT_CPP_DIR,
+                 extra_flags=()):
+        self.cxx = list(cxx)
+        self.platform = platform
+        self.target = target
+        self.arch = arch
+        self.src_dir = Path(src_dir)
+        self.out_dir = Path(out_dir)
+        self.cache_dir = Path(cache_dir)
+        self.godot_cpp = Path(godot_cpp)
+        self.include_dirs = [self.src_dir, self.godot_cpp / "include",
+                             self.godot_cpp / "gen" / "include", self.godot_cpp / "gdextension"]
+        base_flags = ["-std=c++17", "-fno-exceptions", "-DTHREADS_ENABLED"] + TARGET_FLAGS[target]
+        self.abi_flags = abi_flags(base_flags)
+        self.cflags = (base_flags + ([] if platform == "windows" else ["-fPIC"])
+                       + [f"-I{d}" for d in self.include_dirs] + list(extra_flags))
+        self.ldflags = ["-shared"] + (["-static-libstdc++"] if platform == "linux" else [])
+
+    @property
+    def suffix(self):
+        return f".{self.platform}.{self.target}.{self.arch}"
+
+    @property
+    def godot_cpp_lib(self):
+        return self.godot_cpp / "bin" / f"libgodot-cpp{self.suffix}.a"
+
+    @property
+    def output(self):
+        suffix = SHARED_SUFFIX[self.platform]
+        prefix = "lib" if self.platform != "windows" else ""
+        return self.out_dir / f"{prefix}{LIBRARY_NAME}{self.suffix}{suffix}"
+
+    def toolchain_stamp(self):
+        """Compiler identity: the command plus its --version output."""
+        try:
+            proc = subprocess.run(self.cxx + ["--version"], capture_output=True, timeout=30)
+            version = proc.stdout + proc.stderr
+        except OSError as e:
+            version = str(e).encode("utf-8")
+        return hash_bytes(DRIVER_VERSION, " ".join(self.cxx), version,
+                          " ".join(self.cflags), file_stamp(self.godot_cpp_lib))
+
+
+def abi_flags(flags):
+    return {flag for flag in flags if _ABI_FLAG_RE.match(flag)}
+
+
+def godot_cpp_flags(config):
+    """ABI flags godot-cpp was compiled with for this platform/target/arch, or None if unknown.
+
+    Read from the first godot-cpp object with the matching suffix in its
+    compile_commands.json.
+    """
+    path = config.godot_cpp / COMPILE_DB
+    if not path.exists():
+        return None
+    for entry in json.loads(path.read_text(encoding="utf-8")):
+        args = entry.get("arguments") or shlex.split(entry.get("command", ""), posix=os.name != "nt")
+        output = entry.get("output") or (args[args.index("-o") + 1] if "-o" in args[:-1] else "")
+        if config.suffix + "." in Path(output).name:
+            return abi_flags(args)
+    return None
+
+
+def check_flags(config):
+    """Raise RuntimeError if our ABI flags differ from godot-cpp's; warn if they cannot be compared."""
+    expected = godot_cpp_flags(config)
+    if expected is None:
+        print(f"[BUILD] flags not checked: no {config.suffix[1:]} objects in {config.godot_cpp / COMPILE_DB} "
+              f"(build godot-cpp with compiledb=yes)")
+        return
+    if expected != config.abi_flags:
+        missing = " ".join(sorted(expected - config.abi_flags)) or "-"
+        extra = " ".join(sorted(config.abi_flags - expected)) or "-"
+        raise RuntimeError(f"compiler flags differ from the godot-cpp build ({COMPILE_DB}): "
+                           f"missing {missing}; not in godot-cpp {extra}. "
+                           f"Update TARGET_FLAGS / BuildConfig in {Path(__file__).name}")
+
+
+# === Scan / hash ===
+
+def local_headers(source, include_dirs, memo):
+    """Transitive "quoted" includes of source that exist on disk (sorted paths)."""
+    seen = set()
+    stack = [Path(source)]
+    while stack:
+        path = stack.pop()
+        if path not in memo:
+            found = []
+            for name in _INCLUDE_RE.findall(path.read_bytes()):
+                name = name.decode("utf-8")
+                for base in [path.parent] + list(include_dirs):
+                    candidate = (base / name).resolve()
+                    if candidate.is_file():
+                        found.append(candidate)
+                        break
+            memo[path] = found
+        for header in memo[path]:
+            if header not in seen:
+                seen.add(header)
+                stack.append(header)
+    return sorted(seen)
+
+
+def object_keys(config, toolchain):
+    """{source: object key} for every src/*.cpp."""
+    memo = {}
+    contents = {}
+
+    def content(path):
+        if path not in contents:
+            contents[path] = Path(path).read_bytes()
+        return contents[path]
+
+    keys = {}
+    local = [config.src_dir]
+    for source in sorted(config.src_dir.glob("*.cpp")):
+        headers = local_headers(source, local, memo)
+        keys[source] = hash_bytes(toolchain, source.name, content(source),
+                                  *[content(h) for h in headers])
+    return keys
+
+
+def load_manifest(config):
+    path = config.cache_dir / "manifest.json"
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data if data.get("version") == DRIVER_VERSION else {}
+
+
+def save_manifest(config, manifest):
+    manifest["version"] = DRIVER_VERSION
+    path = config.cache_dir / "manifest.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def file_hash(path):
+    return hash_bytes(Path(path).read_bytes()) if Path(path).exists() else None
+
+
+# === Build ===
+
+@tracing.traced("compile object")
+def compile_object(config, source, key):
+    """Compile one source into the object cache; returns (source, seconds, error text)."""
+    objects = config.cache_dir / "objects"
+    target = objects / f"{key}.o"
+    tmp = objects / f"{key}.{os.getpid()}.tmp.o"
+    start = time.perf_counter()
+    proc = subprocess.run(config.cxx + config.cflags + ["-c", str(source), "-o", str(tmp)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0 or not tmp.exists():
+        if tmp.exists():
+            tmp.unlink()
+        return source, time.perf_counter() - start, (proc.stderr or proc.stdout).strip()
+    os.replace(tmp, target)
+    return source, time.perf_counter() - start, None
+
+
+def build(config, jobs, force=False):
+    """Run the pipeline. Returns a dict of counts / timings; raises RuntimeError on failure."""
+    timings = {}
+    (config.cache_dir / "objects").mkdir(parents=True, exist_ok=True)
+    check_flags(config)
+    with Step("toolchain", timings):
+        toolchain = config.toolchain_stamp()
+    with Step("scan", timings):
+        keys = object_keys(config, toolchain)
+    if not keys:
+        raise RuntimeError(f"no sources in {config.src_dir}")
+    link_key = hash_bytes(toolchain, " ".join(config.ldflags), *[keys[s] for s in sorted(keys)])
+    manifest = load_manifest(config)
+    output = config.output
+    previous = manifest.get("outputs", {}).get(output.name, {})
+    if (not force and previous.get("key") == link_key and output.exists()
+            and previous.get("hash") == file_hash(output)):
+        print(f"[BUILD] {output.name} is up to date ({len(keys)} sources unchanged)")
+        return {"compiled": 0, "cached": len(keys), "linked": False, "timings": timings}
+
+    missing = {s: k for s, k in keys.items()
+               if force or not (config.cache_dir / "objects" / f"{k}.o").exists()}
+    errors = []
+    with Step("compile", timings):
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                results = list(pool.map(lambda item: compile_object(config, *item), missing.items()))
+            for source, seconds, error in sorted(results, key=lambda r: -r[1]):
+                status = "FAILED" if error else "ok"
+                print(f"[BUILD]   {seconds * 1000:8.1f} ms {status:<6} {source.name}")
+                if error:
+                    errors.append(f"{source.name}:\n{error}")
+    if errors:
+        raise RuntimeError("compile failed\n" + "\n".join(errors))
+    print(f"[BUILD] {len(missing)} compiled, {len(keys) - len(missing)} from object cache")
+
+    if not config.godot_cpp_lib.exists():
+        raise RuntimeError(f"{config.godot_cpp_lib} not found; build godot-cpp first "
+                           f"(scons -C \"{config.godot_cpp}\" platform={config.platform} target={config.target} compiledb=yes)")
+    with Step("link", timings):
+        config.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(output.name + ".tmp")
+        objects = [str(config.cache_dir / "objects" / f"{keys[s]}.o") for s in sorted(keys)]
+        proc = subprocess.run(config.cxx + config.ldflags + objects + [str(config.godot_cpp_lib), "-o", str(tmp)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0 or not tmp.exists():
+            raise RuntimeError("link failed\n" + (proc.stderr or proc.stdout).strip())
+        os.replace(tmp, output)
+    manifest.setdefault("outputs", {})[output.name] = {"key": link_key, "hash": file_hash(output)}
+    save_manifest(config, manifest)
+    return {"compiled": len(missing), "cached": len(keys) - len(missing), "linked": True, "timings": timings}
+
+
+def run_scons(jobs):
+    """The previous SCons build (also builds godot-cpp)."""
+    cmd = [sys.executable, "-m", "SCons", f"--jobs={jobs}"]
+    if shutil.which("scons"):
+        cmd = ["scons", f"--jobs={jobs}"]
+    return subprocess.call(cmd, cwd=EXTENSION_DIR)
+
+
+# === Self-test ===
+
+STANDIN_CXX = r"""
+import sys, hashlib
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("standin-cxx 1.0"); sys.exit(0)
+out = args[args.index("-o") + 1]
+inputs = [a for a in args if not a.startswith("-") and a != out]
+if "-c" in args:
+    src = open(args[args.index("-c") + 1], "rb").read()
+    if b"#error" in src:
+        sys.stderr.write("error: #error directive\n"); sys.exit(1)
+    flags = " ".join(a for a in args if a.startswith("-D")).encode()
+    open(out, "wb").write(b"OBJ " + hashlib.sha1(src + flags).hexdigest().encode() + b"\n")
+else:
+    open(out, "wb").write(b"".join(open(i, "rb").read() for i in inputs))
+"""
+
+
+def self_test():
+    """Incremental behaviour with a stand-in compiler in a temp tree."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = tmp / "src"
+        src.mkdir()
+        (src / "a.h").write_text("#pragma once\nint a();\n")
+        (src / "b.h").write_text('#pragma once\n#include "a.h"\n')
+        (src / "a.cpp").write_text('#include "a.h"\nint a() { return 1; }\n')
+        (src / "b.cpp").write_text('#include "b.h"\nint b() { return a(); }\n')
+        (src / "c.cpp").write_text("int c() { return 3; }\n")
+        lib = tmp / "godot-cpp" / "bin" / "libgodot-cpp.linux.template_debug.x86_64.a"
+        lib.parent.mkdir(parents=True)
+        lib.write_bytes(b"LIB\n")
+        standin = tmp / "cxx.py"
+        standin.write_text(STANDIN_CXX)
+
+        def write_compile_db(extra=()):
+            entries = [{"directory": str(lib.parents[1]), "file": "src/godot.cpp",
+                        "output": f"src/godot.linux.{target}.x86_64.o",
+                        "arguments": ["c++", "-std=c++17", "-fno-exceptions", "-DTHREADS_ENABLED", "-fPIC",
+                                      *TARGET_FLAGS[target], *extra, "-c", "src/godot.cpp"]}
+                       for target in sorted(TARGET_FLAGS)]
+            (lib.parents[1] / COMPILE_DB).write_text(json.dumps(entries), encoding="utf-8")
+
+        write_compile_db()
+
+        def run(target="template_debug"):
+            config = BuildConfig([sys.executable, str(standin)], "linux", target, "x86_64",
+                                 src_dir=src, out_dir=tmp / "bin", cache_dir=tmp / "cache",
+                                 godot_cpp=tmp / "godot-cpp")
+            if target != "template_debug":
+                release = config.godot_cpp_lib
+                release.write_bytes(b"LIB\n")
+            return build(config, jobs=2)
+
+        checks = []
+
+        def check(name, result, compiled, linked):
+            ok = result["compiled"] == compiled and result["linked"] == linked
+            checks.append(ok)
+            print(f"[BUILD] self-test {'PASS' if ok else 'FAIL'}: {name} "
+                  f"(compiled {result['compiled']}, linked {result['linked']})")
+
+        check("clean build", run(), 3, True)
+        check("no-op rebuild", run(), 0, False)
+        (src / "a.h").write_text("#pragma once\nint a(); // changed\n")
+        check("header change rebuilds its includers", run(), 2, True)
+        (src / "a.h").write_text("#pragma once\nint a();\n")
+        check("reverted header comes from the object cache", run(), 0, True)
+        check("flag change (release) recompiles", run("template_release"), 3, True)
+        check("debug output still up to date after a release build", run(), 0, False)
+        (tmp / "bin" / "libhigh_performance.linux.template_debug.x86_64.so").write_bytes(b"tampered")
+        check("modified output is relinked", run(), 0, True)
+        write_compile_db(["-DREAL_T_IS_DOUBLE"])
+        try:
+            run()
+            checks.append(False)
+            print("[BUILD] self-test FAIL: flag mismatch with godot-cpp not reported")
+        except RuntimeError as e:
+            checks.append("REAL_T_IS_DOUBLE" in str(e))
+            print(f"[BUILD] self-test {'PASS' if checks[-1] else 'FAIL'}: flag mismatch with godot-cpp raises")
+        write_compile_db()
+        (src / "c.cpp").write_text("#error broken\n")
         try:
-            subprocess.run(["git", "add", "-f", "bin/"], check=True, shell=True)
-            print("Successfully added bin/ folder to git staging area")
-        except subprocess.CalledProcessError:
-            print("Warning: Could not add bin/ to git (git may not be available or not a git repo)")
-        except FileNotFoundError:
-            print("Warning: git command not found")
-            
-    except subprocess.CalledProcessError as e:
-        print(f"\nBuild FAILED with error code {e.returncode}")
-        print("Ensure you have SCons installed (pip install scons) and the Zig compiler is setup correctly.")
-        print("\nBin folder NOT staged to git (build failed)")
+            run()
+            checks.append(False)
+            print("[BUILD] self-test FAIL: compile error not reported")
+        except RuntimeError:
+            checks.append(True)
+            print("[BUILD] self-test PASS: compile error raises and skips the link")
+    return all(checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental cached build of the GDExtension.")
+    parser.add_argument("--cxx", help="compiler command (default: bundled zig c++, $CXX, c++)")
+    parser.add_argument("--platform", default=default_platform(), choices=sorted(SHARED_SUFFIX))
+    parser.add_argument("--target", default="template_debug", choices=sorted(TARGET_FLAGS))
+    parser.add_argument("--arch", default="x86_64")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel compiles (default: all cores)")
+    parser.add_argument("--flag", action="append", default=[], help="extra compiler flag (repeatable)")
+    parser.add_argument("--force", action="store_true", help="ignore the object cache and no-op check")
+    parser.add_argument("--stage", action="store_true", help="git add the built library afterwards")
+    parser.add_argument("--scons", action="store_true", help="run the SCons build instead")
+    parser.add_argument("--self-test", action="store_true", help="check incremental logic with a stand-in compiler")
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.self_test:
+        return 0 if self_test() else 1
+    if args.scons:
+        return run_scons(jobs)
+
+    cxx = shlex.split(args.cxx) if args.cxx else default_cxx()
+    config = BuildConfig(cxx, args.platform, args.target, args.arch, extra_flags=args.flag)
+    start = time.perf_counter()
+    try:
+        result = build(config, jobs, args.force)
+    except RuntimeError as e:
+        print(f"[BUILD] FAILED: {e}")
+        return 1
+    print(f"[BUILD] {config.output.name} done in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"({jobs} jobs)")
+    if args.stage and result["linked"]:
+        subprocess.run(["git", "add", str(config.output)], cwd=EXTENSION_DIR, check=False)
+    return 0
+
 
 if __name__ == "__main__":
-    build()
-    input("Completed")
\ No newline at end of file
+    sys.exit(main())
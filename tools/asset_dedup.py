@@ -0,0 +1,441 @@
+"""
+Content-hash asset deduplication with reference rewriting.
+
+The models / game asset trees contain byte-identical copies (the
+T_Hair_*_BaseColor.png textures in five "Universal Base Characters"
+folders, the same sword sound under player_pickaxe and player_shovel, ...).
+Every copy is imported separately and ships separately. This tool:
+
+    1. lists binary assets (textures, audio, fonts, .glb / .bin / .fbx),
+       skipping folders with .gdignore and files Godot re-extracts on import
+       (.import with generator_parameters, e.g. textures pulled out of a .glb)
+    2. hashes every file whose size collides with another one, in parallel,
+       with a persistent (size, mtime) keyed cache in tools/.cache/
+    3. groups exact duplicates and picks a canonical copy per group (most
+       referenced, has a .import / uid, shortest path)
+    4. rewrites every reference to the other copies:
+           .tscn / .tres / .import / .gd / .gdshader / project.godot
+               res:// paths and the duplicate's uid:// (from its .import)
+           .gltf / .glb
+               relative image / buffer "uri" entries (GLB JSON chunk is
+               re-padded and the chunk / file lengths updated)
+    5. removes the duplicates and their .import files
+
+Step 4-5 are transactional: originals are backed up under
+tools/.cache/asset_dedup/<timestamp>/ with a manifest, edits are written to
+temp files and swapped in with os.replace, and any failure restores every
+file. --restore <dir> undoes a previous run.
+
+Disk savings are the bytes of the removed copies; import savings are the
+import jobs removed (one per .import) and, when .godot/imported exists, the
+imported artifacts those jobs produced.
+
+Usage:
+    python tools/asset_dedup.py                 # dry run: groups, rewrites, savings
+    python tools/asset_dedup.py --apply         # rewrite references, remove duplicates
+    python tools/asset_dedup.py --restore tools/.cache/asset_dedup/20260101-120000
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import tracing
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_PATH = PROJECT_ROOT / "tools" / ".cache" / "asset_hashes.json"
+BACKUP_DIR = Path("tools") / ".cache" / "asset_dedup"
+CACHE_VERSION = 1
+
+ASSET_EXTS = frozenset(("png", "jpg", "jpeg", "webp", "tga", "bmp", "exr", "hdr", "ktx", "dds",
+                        "wav", "ogg", "mp3", "ttf", "otf", "woff", "woff2",
+                        "glb", "bin", "fbx"))
+TEXT_REF_EXTS = frozenset(("tscn", "tres", "import", "gd", "gdshader", "gdshaderinc",
+                           "godot", "cfg"))
+GLTF_EXTS = frozenset(("gltf", "glb"))
+SKIP_DIRS = {".git", ".godot", ".import", "__pycache__", ".cache"}
+HASH_CHUNK = 1 << 20
+GLB_MAGIC = 0x46546C67
+GLB_JSON = 0x4E4F534A
+
+_UID_RE = re.compile(rb'^uid="(uid://[a-z0-9]+)"', re.M)
+_DEST_RE = re.compile(rb'^dest_files=\[(.*)\]', re.M)
+_URI_RE = re.compile(rb'"uri"\s*:\s*"([^"]*)"')
+
+
+# === Scan ===
+
+@tracing.traced("walk")
+def project_files(root):
+    """Sorted res-relative POSIX paths, skipping .gdignore folders and tool caches."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if ".gdignore" in filenames and Path(dirpath) != Path(root):
+            dirnames[:] = []
+            continue
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        rel_dir = Path(dirpath).relative_to(root)
+        found.extend((rel_dir / f).as_posix() for f in filenames)
+    return sorted(found)
+
+
+def extension(rel):
+    return rel.rsplit(".", 1)[-1].lower() if "." in rel else ""
+
+
+def is_generated(root, rel):
+    """Godot re-extracts this file on import (e.g. a texture embedded in a .glb)."""
+    import_file = Path(root) / (rel + ".import")
+    return import_file.is_file() and b"generator_parameters=" in import_file.read_bytes()
+
+
+def glb_json(raw):
+    """(json bytes, chunk offset) of a binary glTF, or (None, 0)."""
+    if len(raw) < 20:
+        return None, 0
+    magic, _, _ = struct.unpack_from("<III", raw, 0)
+    length, kind = struct.unpack_from("<II", raw, 12)
+    if magic != GLB_MAGIC or kind != GLB_JSON:
+        return None, 0
+    return raw[20:20 + length], 20
+
+
+def gltf_uris(raw, ext):
+    """Relative uri strings (still percent-encoded) in a .gltf / .glb."""
+    text = raw if ext == "gltf" else glb_json(raw)[0]
+    if text is None:
+        return []
+    return [m.group(1).decode("utf-8") for m in _URI_RE.finditer(text)
+            if not m.group(1).startswith(b"data:")]
+
+
+def hash_file(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+
+
+def save_cache(path, files):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": CACHE_VERSION, "files": files}, separators=(",", ":")),
+                    encoding="utf-8")
+
+
+@tracing.traced("hash")
+def hash_assets(root, rels, jobs, cache_path=CACHE_PATH):
+    """{rel: hash} for rels, re-hashing only files whose size / mtime changed."""
+    cache = load_cache(cache_path)
+    result = {}
+    todo = []
+    for rel in rels:
+        st = (Path(root) / rel).stat()
+        entry = cache.get(rel)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            result[rel] = entry[2]
+        else:
+            todo.append((rel, st.st_size, st.st_mtime_ns))
+    paths = [str(Path(root) / rel) for rel, _, _ in todo]
+    if jobs == 1 or len(paths) < 8:
+        hashes = [hash_file(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            hashes = list(pool.map(hash_file, paths, chunksize=4))
+    for (rel, size, mtime), digest in zip(todo, hashes):
+        cache[rel] = [size, mtime, digest]
+        result[rel] = digest
+    if todo:
+        save_cache(cache_path, {rel: cache[rel] for rel in cache if (Path(root) / rel).exists()})
+    return result, len(todo)
+
+
+# === Plan ===
+
+@tracing.traced("group")
+def find_groups(root, files, jobs, cache_path=CACHE_PATH):
+    """Exact duplicate groups among non-generated assets. Returns (groups, stats)."""
+    root = Path(root)
+    assets = [rel for rel in files if extension(rel) in ASSET_EXTS]
+    generated = {rel for rel in assets if is_generated(root, rel)}
+    by_size = {}
+    for rel in assets:
+        if rel in generated:
+            continue
+        # A .glb with external uris depends on its folder; copies are not interchangeable.
+        if extension(rel) == "glb" and gltf_uris((root / rel).read_bytes(), "glb"):
+            continue
+        by_size.setdefault((root / rel).stat().st_size, []).append(rel)
+    candidates = [rel for size, rels in by_size.items() if len(rels) > 1 and size > 0 for rel in rels]
+    hashes, rehashed = hash_assets(root, sorted(candidates), jobs, cache_path)
+    by_hash = {}
+    for rel in candidates:
+        by_hash.setdefault(hashes[rel], []).append(rel)
+    groups = [sorted(rels) for rels in by_hash.values() if len(rels) > 1]
+    stats = {"assets": len(assets), "generated": len(generated), "candidates": len(candidates),
+             "rehashed": rehashed}
+    return sorted(groups), stats
+
+
+def read_uid(root, rel):
+    import_file = Path(root) / (rel + ".import")
+    if not import_file.is_file():
+        return None
+    m = _UID_RE.search(import_file.read_bytes())
+    return m.group(1) if m else None
+
+
+class ReferenceScan:
+    """All text and glTF files that may reference assets, read once."""
+
+    @tracing.traced("scan references")
+    def __init__(self, root, files):
+        self.root = Path(root)
+        self.text = {rel: (self.root / rel).read_bytes() for rel in files
+                     if extension(rel) in TEXT_REF_EXTS}
+        self.gltf = {}
+        for rel in files:
+            ext = extension(rel)
+            if ext in GLTF_EXTS:
+                raw = (self.root / rel).read_bytes()
+                uris = gltf_uris(raw, ext)
+                if uris:
+                    self.gltf[rel] = (raw, uris)
+
+    def gltf_target(self, owner, uri):
+        folder = os.path.dirname(owner)
+        return os.path.normpath(os.path.join(folder, unquote(uri))).replace(os.sep, "/")
+
+    def count(self, rel, uid):
+        res = ("res://" + rel).encode("utf-8")
+        n = sum(raw.count(res) for owner, raw in self.text.items() if owner != rel + ".import")
+        if uid:
+            n += sum(raw.count(uid) for owner, raw in self.text.items() if owner != rel + ".import")
+        n += sum(1 for owner, (_, uris) in self.gltf.items()
+                 for uri in uris if self.gltf_target(owner, uri) == rel)
+        return n
+
+
+def _rewrite_glb(raw, new_json):
+    new_json += b" " * (-len(new_json) % 4)
+    _, old_len, _ = struct.unpack_from("<III", raw, 0)
+    json_len = struct.unpack_from("<I", raw, 12)[0]
+    rest = raw[20 + json_len:]
+    total = 12 + 8 + len(new_json) + len(rest)
+    return (struct.pack("<III", GLB_MAGIC, 2, total) + struct.pack("<II", len(new_json), GLB_JSON)
+            + new_json + rest)
+
+
+@tracing.traced("plan")
+def plan(root, groups, scan):
+    """
+    Canonical choice, per-file rewrites and deletions.
+    Returns {"groups": [...], "edits": {rel: new bytes}, "deletes": [rel, ...]}.
+    """
+    root = Path(root)
+    uids = {rel: read_uid(root, rel) for group in groups for rel in group}
+    edits = {}
+    deletes = []
+    report = []
+    replace = {}          # duplicate rel -> canonical rel
+    for group in groups:
+        ranked = sorted(group, key=lambda r: (-scan.count(r, uids[r]), uids[r] is None,
+                                              len(r), r))
+        canonical = ranked[0]
+        size = (root / canonical).stat().st_size
+        report.append({"canonical": canonical, "duplicates": ranked[1:], "bytes": size,
+                       "references": {r: scan.count(r, uids[r]) for r in ranked}})
+        for dup in ranked[1:]:
+            replace[dup] = canonical
+            deletes.append(dup)
+            if (root / (dup + ".import")).is_file():
+                deletes.append(dup + ".import")
+
+    removed = set(deletes)
+    pairs = []
+    for dup, canonical in replace.items():
+        pairs.append((("res://" + dup).encode("utf-8"), ("res://" + canonical).encode("utf-8")))
+        if uids[dup] and uids[canonical]:
+            pairs.append((uids[dup], uids[canonical]))
+    for rel, raw in scan.text.items():
+        if rel in removed:
+            continue
+        new = raw
+        for old, repl in pairs:
+            if old in new:
+                new = _replace_token(new, old, repl)
+        if new != raw:
+            edits[rel] = new
+
+    for rel, (raw, uris) in scan.gltf.items():
+        if rel in removed:
+            continue
+        folder = os.path.dirname(rel)
+        text = raw if extension(rel) == "gltf" else glb_json(raw)[0]
+        new_text = text
+        for uri in uris:
+            target = scan.gltf_target(rel, uri)
+            if target not in replace:
+                continue
+            new_uri = os.path.relpath(replace[target], folder or ".").replace(os.sep, "/")
+            if "%" in uri:
+                new_uri = quote(new_uri, safe="/")
+            new_text = new_text.replace(b'"' + uri.encode("utf-8") + b'"',
+                                        b'"' + new_uri.encode("utf-8") + b'"')
+        if new_text != text:
+            edits[rel] = new_text if extension(rel) == "gltf" else _rewrite_glb(raw, new_text)
+    return {"groups": report, "edits": edits, "deletes": deletes}
+
+
+def _replace_token(raw, old, new):
+    """Replace old where it is a whole path / uid (not a prefix of a longer name)."""
+    pattern = re.compile(re.escape(old) + rb'(?=["\'\s,\]\)]|$)', re.M)
+    return pattern.sub(lambda _: new, raw)
+
+
+def savings(root, result):
+    root = Path(root)
+    disk = 0
+    imports = 0
+    imported_bytes = 0
+    for rel in result["deletes"]:
+        path = root / rel
+        disk += path.stat().st_size
+        if rel.endswith(".import"):
+            imports += 1
+            m = _DEST_RE.search(path.read_bytes())
+            if m:
+                for dest in re.findall(rb'"res://([^"]+)"', m.group(1)):
+                    artifact = root / dest.decode("utf-8")
+                    if artifact.is_file():
+                        imported_bytes += artifact.stat().st_size
+    return {"disk_bytes": disk, "import_jobs": imports, "imported_bytes": imported_bytes}
+
+
+# === Apply / restore ===
+
+@tracing.traced("write")
+def apply(root, result, backup_root=BACKUP_DIR):
+    """Back up, rewrite and delete as one unit; restores everything on failure."""
+    root = Path(root)
+    backup = root / backup_root / time.strftime("%Y%m%d-%H%M%S")
+    backup.mkdir(parents=True, exist_ok=False)
+    manifest = {"edits": sorted(result["edits"]), "deletes": result["deletes"]}
+    (backup / "manifest.json").write_text(json.dumps(manifest, indent=1) + "\n", encoding="utf-8")
+    for rel in manifest["edits"]:
+        target = backup / "files" / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(root / rel, target)
+    done = []
+    try:
+        for rel in manifest["edits"]:
+            tmp = root / (rel + ".dedup.tmp")
+            tmp.write_bytes(result["edits"][rel])
+            os.replace(tmp, root / rel)
+            done.append(rel)
+        for rel in manifest["deletes"]:
+            target = backup / "files" / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(root / rel), str(target))
+            done.append(rel)
+    except BaseException:
+        restore(root, backup)
+        for rel in manifest["edits"]:
+            tmp = root / (rel + ".dedup.tmp")
+            if tmp.exists():
+                tmp.unlink()
+        raise
+    return backup
+
+
+@tracing.traced("write")
+def restore(root, backup):
+    """Put back every file saved in a backup directory."""
+    root = Path(root)
+    manifest = json.loads((Path(backup) / "manifest.json").read_text(encoding="utf-8"))
+    restored = 0
+    for rel in manifest["edits"] + manifest["deletes"]:
+        source = Path(backup) / "files" / rel
+        if source.exists():
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, root / rel)
+            restored += 1
+    return restored
+
+
+def _mb(n):
+    return f"{n / (1 << 20):.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate identical assets and rewrite references.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--apply", action="store_true", help="rewrite references and remove duplicates")
+    parser.add_argument("--restore", type=Path, help="undo a previous --apply from its backup folder")
+    parser.add_argument("--json", type=Path, help="write the plan / report as JSON")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH)
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    if args.restore:
+        count = restore(root, args.restore)
+        print(f"[ASSET_DEDUP] Restored {count} files from {args.restore}")
+        return 0
+
+    start = time.perf_counter()
+    jobs = args.jobs or os.cpu_count() or 1
+    files = project_files(root)
+    groups, stats = find_groups(root, files, jobs, args.cache)
+    scan = ReferenceScan(root, files)
+    result = plan(root, groups, scan)
+    saved = savings(root, result)
+    elapsed = time.perf_counter() - start
+
+    for group in result["groups"]:
+        refs = group["references"]
+        print(f"[ASSET_DEDUP] {len(group['duplicates']) + 1}x {_mb(group['bytes'])}  keep "
+              f"{group['canonical']} ({refs[group['canonical']]} refs)")
+        for dup in group["duplicates"]:
+            print(f"[ASSET_DEDUP]     remove {dup} ({refs[dup]} refs)")
+    for rel in sorted(result["edits"]):
+        print(f"[ASSET_DEDUP] rewrite {rel}")
+    print(f"[ASSET_DEDUP] {stats['assets']} assets ({stats['generated']} re-extracted on import, "
+          f"skipped), {stats['candidates']} size collisions ({stats['rehashed']} hashed, rest cached), "
+          f"{len(result['groups'])} duplicate groups in {elapsed * 1000:.0f} ms")
+    imported = f", {_mb(saved['imported_bytes'])} of imported artifacts" if saved["imported_bytes"] else ""
+    print(f"[ASSET_DEDUP] Savings: {_mb(saved['disk_bytes'])} on disk, {saved['import_jobs']} fewer "
+          f"import jobs{imported}; {len(result['edits'])} files to rewrite, "
+          f"{len(result['deletes'])} files to remove")
+    if args.json:
+        payload = {"groups": result["groups"], "rewrites": sorted(result["edits"]),
+                   "deletes": result["deletes"], "savings": saved, "stats": stats}
+        args.json.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+
+    if args.apply and result["deletes"]:
+        backup = apply(root, result)
+        print(f"[ASSET_DEDUP] Applied; backup and manifest in {backup} (undo with --restore)")
+    elif not args.apply:
+        print("[ASSET_DEDUP] Dry run; pass --apply to rewrite and remove")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,527 @@
+"""
+CPU reference of the building greedy mesher (greedy_meshing.glsl).
+
+BuildingMesher uploads a BuildingChunk's voxel_bytes / voxel_meta (16^3,
+index = x + y * 16 + z * 256) as 3D textures and runs one invocation per
+voxel. This is a vectorized port of the same rules, batched over any number
+of chunks:
+
+    type 1   cube faces where the neighbour is not type 1 (chunk edges count as
+             air), merged into 1-voxel-wide runs: +-X faces along z, +-Y / +-Z
+             faces along x, exactly like the shader's per-voxel run scan
+    type 2   ramp, rotated by meta (3 quads + 2 triangles, no culling)
+    type 3   UV sphere (16 slices x 12 stacks)
+    type 4   stairs, rotated by meta (10 quads, no culling)
+    other    nothing
+
+Output is the add_quad / add_triangle arguments (QUAD_DTYPE / TRI_DTYPE) with
+the chunk they belong to; mesh_arrays() expands one chunk into the vertex /
+normal / uv / index arrays in the shader's write order (GPU order between
+voxels depends on atomics, so comparisons are order-independent).
+
+The tool checks the batch mesher against a literal per-voxel port of the
+shader's main() and against a naive one-quad-per-face mesher (same covered
+faces), then times both on chunks stamped from the project prefabs.
+
+Usage:
+    python tools/building_mesher.py
+    python tools/building_mesher.py --chunks 512 --prefab-dir world_prefabs
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import prefab_compiler as pc
+import tracing
+
+SIZE = 16  # BuildingChunk.SIZE
+BLOCK_CUBE, BLOCK_RAMP, BLOCK_SPHERE, BLOCK_STAIRS = 1, 2, 3, 4
+SPHERE_SLICES, SPHERE_STACKS = 16, 12
+SPHERE_PI = np.float32(3.14159)
+
+QUAD_DTYPE = np.dtype([
+    ("origin", "<f4", 3), ("u_axis", "<f4", 3), ("v_axis", "<f4", 3), ("size", "<f4", 2), ("normal", "<f4", 3),
+])
+TRI_DTYPE = np.dtype([("points", "<f4", (3, 3)), ("normals", "<f4", (3, 3)), ("uvs", "<f4", (3, 2))])
+
+# Cube faces: direction (x, y, z), merge axis, add_quad(origin offset, u axis, v axis, normal)
+CUBE_FACES = (
+    ((1, 0, 0), "z", (1, 1, 0), (0, 0, 1), (0, -1, 0)),
+    ((-1, 0, 0), "z", (0, 0, 0), (0, 0, 1), (0, 1, 0)),
+    ((0, 1, 0), "x", (0, 1, 1), (1, 0, 0), (0, 0, -1)),
+    ((0, -1, 0), "x", (0, 0, 0), (1, 0, 0), (0, 0, 1)),
+    ((0, 0, 1), "x", (0, 0, 1), (1, 0, 0), (0, 1, 0)),
+    ((0, 0, -1), "x", (0, 1, 0), (1, 0, 0), (0, -1, 0)),
+)
+# Array axis of x / y / z in [chunk, z, y, x] grids
+GRID_AXIS = {"x": 3, "y": 2, "z": 1}
+
+
+# === Shape templates (add_ramp / add_stairs / add_sphere at the origin) ===
+
+def rotate_vector(v, r):
+    x, y, z = v
+    if r == 1:
+        return (-z, y, x)
+    if r == 2:
+        return (-x, y, -z)
+    if r == 3:
+        return (z, y, -x)
+    return (x, y, z)
+
+
+def rotate_local(p, r):
+    c = rotate_vector((p[0] - 0.5, p[1], p[2] - 0.5), r)
+    return (c[0] + 0.5, c[1], c[2] + 0.5)
+
+
+def _sub(a, b):
+    return tuple(x - y for x, y in zip(a, b))
+
+
+def _quad(origin, u_axis, v_axis, u_len, v_len, normal):
+    return (origin, u_axis, v_axis, (u_len, v_len), normal)
+
+
+def ramp_shape(r):
+    """(quads, triangles) of add_ramp(vec3(0), r)."""
+    p000, p100 = rotate_local((0, 0, 0), r), rotate_local((1, 0, 0), r)
+    p011, p111 = rotate_local((0, 1, 1), r), rotate_local((1, 1, 1), r)
+    p001, p101 = rotate_local((0, 0, 1), r), rotate_local((1, 0, 1), r)
+    slope = np.array([0, 1, -1], dtype=np.float32)
+    slope_n = rotate_vector(tuple(slope / np.sqrt(np.float32(2.0))), r)
+    left_n, right_n = rotate_vector((-1, 0, 0), r), rotate_vector((1, 0, 0), r)
+    quads = [
+        _quad(p000, _sub(p011, p000), _sub(p100, p000), 1.0, 1.0, slope_n),
+        _quad(p001, _sub(p101, p001), _sub(p011, p001), 1.0, 1.0, rotate_vector((0, 0, 1), r)),
+        _quad(p000, _sub(p100, p000), _sub(p001, p000), 1.0, 1.0, rotate_vector((0, -1, 0), r)),
+    ]
+    tris = [
+        ((p000, p001, p011), (left_n,) * 3, ((0, 0), (1, 0), (1, 1))),
+        ((p100, p111, p101), (right_n,) * 3, ((0, 0), (1, 1), (1, 0))),
+    ]
+    return quads, tris
+
+
+def stairs_shape(r):
+    """(quads, triangles) of add_stairs(vec3(0), r)."""
+    def q(origin, u, v, u_len, v_len, normal):
+        return _quad(rotate_local(origin, r), rotate_vector(u, r), rotate_vector(v, r), u_len, v_len,
+                     rotate_vector(normal, r))
+
+    up, down, front, back, left, right = (0, 1, 0), (0, -1, 0), (0, 0, -1), (0, 0, 1), (-1, 0, 0), (1, 0, 0)
+    quads = [
+        q((1, 0.5, 0), (-1, 0, 0), (0, 0, 1), 1.0, 0.5, up),
+        q((1, 0, 0), (-1, 0, 0), (0, 1, 0), 1.0, 0.5, front),
+        q((1, 1.0, 0.5), (-1, 0, 0), (0, 0, 1), 1.0, 0.5, up),
+        q((1, 0.5, 0.5), (-1, 0, 0), (0, 1, 0), 1.0, 0.5, front),
+        q((0, 0, 0), (1, 0, 0), (0, 0, 1), 1.0, 1.0, down),
+        q((0, 0, 1), (1, 0, 0), (0, 1, 0), 1.0, 1.0, back),
+        q((0, 0, 0), (0, 0, 1), (0, 1, 0), 0.5, 0.5, left),
+        q((0, 0, 0.5), (0, 0, 1), (0, 1, 0), 0.5, 1.0, left),
+        q((1, 0, 0.5), (0, 0, -1), (0, 1, 0), 0.5, 0.5, right),
+        q((1, 0, 1.0), (0, 0, -1), (0, 1, 0), 0.5, 1.0, right),
+    ]
+    return quads, []
+
+
+def sphere_shape():
+    """Triangles of add_sphere(vec3(0)) in float32."""
+    f = np.float32
+    center = np.full(3, 0.5, dtype=np.float32)
+    radius = f(0.5)
+    tris = []
+    for i in range(SPHERE_STACKS):
+        v0, v1 = f(i) / f(SPHERE_STACKS), f(i + 1) / f(SPHERE_STACKS)
+        lat0, lat1 = SPHERE_PI * (f(-0.5) + v0), SPHERE_PI * (f(-0.5) + v1)
+        z0, zr0 = radius * np.sin(lat0), radius * np.cos(lat0)
+        z1, zr1 = radius * np.sin(lat1), radius * np.cos(lat1)
+        for j in range(SPHERE_SLICES):
+            u0, u1 = f(j) / f(SPHERE_SLICES), f(j + 1) / f(SPHERE_SLICES)
+            lng0, lng1 = f(2.0) * SPHERE_PI * u0, f(2.0) * SPHERE_PI * u1
+            x0, y0, x1, y1 = np.cos(lng0), np.sin(lng0), np.cos(lng1), np.sin(lng1)
+            p00 = center + np.array([x0 * zr0, z0, y0 * zr0], dtype=np.float32)
+            p10 = center + np.array([x1 * zr0, z0, y1 * zr0], dtype=np.float32)
+            p01 = center + np.array([x0 * zr1, z1, y0 * zr1], dtype=np.float32)
+            p11 = center + np.array([x1 * zr1, z1, y1 * zr1], dtype=np.float32)
+            n00, n10, n01, n11 = (p / np.linalg.norm(p) for p in (p00 - center, p10 - center, p01 - center, p11 - center))
+            uv00, uv10, uv01, uv11 = (u0, v0), (u1, v0), (u0, v1), (u1, v1)
+            tris.append(((p00, p01, p11), (n00, n01, n11), (uv00, uv01, uv11)))
+            tris.append(((p00, p11, p10), (n00, n11, n10), (uv00, uv11, uv10)))
+    return [], tris
+
+
+def _to_arrays(shape):
+    quads, tris = shape
+    quad_array = np.zeros(len(quads), dtype=QUAD_DTYPE)
+    for i, (origin, u_axis, v_axis, size, normal) in enumerate(quads):
+        quad_array[i] = (origin, u_axis, v_axis, size, normal)
+    tri_array = np.zeros(len(tris), dtype=TRI_DTYPE)
+    for i, (points, normals, uvs) in enumerate(tris):
+        tri_array[i] = (np.array(points, dtype=np.float32), np.array(normals, dtype=np.float32),
+                        np.array(uvs, dtype=np.float32))
+    return quad_array, tri_array
+
+
+# Index 0-3 = rotation; any other meta leaves rotate_vector untouched (same as 0)
+SHAPES = {
+    BLOCK_RAMP: [_to_arrays(ramp_shape(r)) for r in range(4)],
+    BLOCK_STAIRS: [_to_arrays(stairs_shape(r)) for r in range(4)],
+    BLOCK_SPHERE: [_to_arrays(sphere_shape())] * 4,
+}
+
+
+def effective_rotation(metas):
+    metas = np.asarray(metas)
+    return np.where((metas >= 1) & (metas <= 3), metas, 0)
+
+
+# === Batch greedy mesher ===
+
+def _shift(grid, axis, step):
+    """grid[..., i + step, ...] along axis, False outside the chunk."""
+    out = np.zeros_like(grid)
+    src = [slice(None)] * grid.ndim
+    dst = [slice(None)] * grid.ndim
+    if step > 0:
+        src[axis], dst[axis] = slice(step, None), slice(None, -step)
+    else:
+        src[axis], dst[axis] = slice(None, step), slice(-step, None)
+    out[tuple(dst)] = grid[tuple(src)]
+    return out
+
+
+def cube_runs(solid):
+    """
+    Greedy runs of exposed cube faces for a [chunk, z, y, x] bool grid.
+
+    Yields (face index, chunk, x, y, z, run length) arrays per face direction.
+    """
+    for face, (direction, merge, *_rest) in enumerate(CUBE_FACES):
+        neighbour = solid
+        for name, step in zip("xyz", direction):
+            if step:
+                neighbour = _shift(solid, GRID_AXIS[name], step)
+        exposed = solid & ~neighbour
+        axis = GRID_AXIS[merge]
+        starts = exposed & ~_shift(exposed, axis, -1)
+        ends = exposed & ~_shift(exposed, axis, 1)
+        # With the merge axis last, nonzero() lists each run's start and end in the same order
+        start_idx = np.nonzero(np.ascontiguousarray(np.moveaxis(starts, axis, -1)))
+        end_idx = np.nonzero(np.ascontiguousarray(np.moveaxis(ends, axis, -1)))
+        length = end_idx[-1] - start_idx[-1] + 1
+        remaining = [a for a in range(4) if a != axis] + [axis]
+        coords = dict(zip(remaining, start_idx))
+        yield face, coords[0], coords[3], coords[2], coords[1], length
+
+
+@tracing.traced("mesh")
+def mesh_chunks(voxels, metas):
+    """
+    Mesh a batch of chunks ([chunk, z, y, x] uint8, or flat 4096-byte rows).
+
+    Returns (quads, quad_chunk, tris, tri_chunk).
+    """
+    voxels = np.asarray(voxels, dtype=np.uint8).reshape(-1, SIZE, SIZE, SIZE)
+    metas = np.asarray(metas, dtype=np.uint8).reshape(-1, SIZE, SIZE, SIZE)
+    quad_parts, quad_chunks, tri_parts, tri_chunks = [], [], [], []
+
+    for face, chunk, x, y, z, length in cube_runs(voxels == BLOCK_CUBE):
+        _direction, _merge, offset, u_axis, v_axis = CUBE_FACES[face]
+        quads = np.zeros(chunk.size, dtype=QUAD_DTYPE)
+        quads["origin"] = np.stack([x, y, z], axis=1) + np.array(offset)
+        quads["u_axis"] = u_axis
+        quads["v_axis"] = v_axis
+        quads["size"][:, 0] = length
+        quads["size"][:, 1] = 1.0
+        quads["normal"] = CUBE_FACES[face][0]
+        quad_parts.append(quads)
+        quad_chunks.append(chunk)
+
+    for block, templates in SHAPES.items():
+        chunk, z, y, x = np.nonzero(voxels == block)
+        if not chunk.size:
+            continue
+        rotation = effective_rotation(metas[chunk, z, y, x])
+        pos = np.stack([x, y, z], axis=1).astype(np.float32)
+        for r in np.unique(rotation):
+            pick = rotation == r
+            template_quads, template_tris = templates[r]
+            if template_quads.size:
+                quads = np.tile(template_quads, pick.sum())
+                quads["origin"] += np.repeat(pos[pick], template_quads.size, axis=0)
+                quad_parts.append(quads)
+                quad_chunks.append(np.repeat(chunk[pick], template_quads.size))
+            if template_tris.size:
+                tris = np.tile(template_tris, pick.sum())
+                tris["points"] += np.repeat(pos[pick], template_tris.size, axis=0)[:, None, :]
+                tri_parts.append(tris)
+                tri_chunks.append(np.repeat(chunk[pick], template_tris.size))
+
+    def join(parts, chunks, dtype):
+        if not parts:
+            return np.zeros(0, dtype=dtype), np.zeros(0, dtype=np.int64)
+        return np.concatenate(parts), np.concatenate(chunks).astype(np.int64)
+
+    quads, quad_chunk = join(quad_parts, quad_chunks, QUAD_DTYPE)
+    tris, tri_chunk = join(tri_parts, tri_chunks, TRI_DTYPE)
+    return quads, quad_chunk, tris, tri_chunk
+
+
+def mesh_arrays(quads, tris):
+    """ArrayMesh arrays (vertices, normals, uvs, indices) in add_quad / add_triangle write order."""
+    f = np.float32
+    origin, u, v = quads["origin"], quads["u_axis"], quads["v_axis"]
+    u_len, v_len = quads["size"][:, :1], quads["size"][:, 1:]
+    p0, p1 = origin, origin + u * u_len
+    p2, p3 = origin + u * u_len + v * v_len, origin + v * v_len
+    quad_vertices = np.stack([p0, p3, p2, p1], axis=1).reshape(-1, 3)
+    quad_normals = np.repeat(quads["normal"], 4, axis=0)
+    zero = np.zeros_like(u_len)
+    quad_uvs = np.stack([np.hstack([zero, zero]), np.hstack([zero, v_len]),
+                         np.hstack([u_len, v_len]), np.hstack([u_len, zero])], axis=1).reshape(-1, 2)
+    base = np.arange(len(quads))[:, None] * 4
+    quad_indices = (base + np.array([0, 1, 2, 0, 2, 3])).reshape(-1)
+
+    # add_triangle writes p0, p2, p1
+    order = [0, 2, 1]
+    tri_vertices = tris["points"][:, order].reshape(-1, 3)
+    tri_normals = tris["normals"][:, order].reshape(-1, 3)
+    tri_uvs = tris["uvs"][:, order].reshape(-1, 2)
+    tri_indices = np.arange(len(tris) * 3) + len(quad_vertices)
+
+    return (np.concatenate([quad_vertices, tri_vertices]).astype(f), np.concatenate([quad_normals, tri_normals]).astype(f),
+            np.concatenate([quad_uvs, tri_uvs]).astype(f), np.concatenate([quad_indices, tri_indices]).astype(np.int32))
+
+
+# === Per-voxel reference (literal port of main()) ===
+
+def mesh_chunk_reference(voxels, metas):
+    """One chunk, one voxel at a time, exactly as the compute shader invocations do it."""
+    voxels = np.asarray(voxels, dtype=np.uint8).reshape(SIZE, SIZE, SIZE)
+    metas = np.asarray(metas, dtype=np.uint8).reshape(SIZE, SIZE, SIZE)
+
+    def get_voxel(x, y, z):
+        if x < 0 or y < 0 or z < 0 or x >= SIZE or y >= SIZE or z >= SIZE:
+            return 0
+        return int(voxels[z, y, x])
+
+    def has_face_type(x, y, z, normal, block):
+        return get_voxel(x, y, z) == block and get_voxel(x + normal[0], y + normal[1], z + normal[2]) != block
+
+    quads, tris = [], []
+    for z in range(SIZE):
+        for y in range(SIZE):
+            for x in range(SIZE):
+                block = get_voxel(x, y, z)
+                if block in SHAPES:
+                    template_quads, template_tris = SHAPES[block][int(effective_rotation(metas[z, y, x]))]
+                    for quad in template_quads:
+                        quad = quad.copy()
+                        quad["origin"] += (x, y, z)
+                        quads.append(quad)
+                    for tri in template_tris:
+                        tri = tri.copy()
+                        tri["points"] += np.array([x, y, z], dtype=np.float32)
+                        tris.append(tri)
+                    continue
+                if block != BLOCK_CUBE:
+                    continue
+                for normal, merge, offset, u_axis, v_axis in CUBE_FACES:
+                    if not has_face_type(x, y, z, normal, 1):
+                        continue
+                    step = (0, 0, 1) if merge == "z" else (1, 0, 0)
+                    if has_face_type(x - step[0], y, z - step[2], normal, 1):
+                        continue
+                    length = 1
+                    limit = SIZE - (z if merge == "z" else x)
+                    for k in range(1, limit):
+                        if has_face_type(x + step[0] * k, y, z + step[2] * k, normal, 1):
+                            length += 1
+                        else:
+                            break
+                    quads.append(np.array(((x + offset[0], y + offset[1], z + offset[2]), u_axis, v_axis,
+                                           (length, 1.0), normal), dtype=QUAD_DTYPE))
+    quad_array = np.array(quads, dtype=QUAD_DTYPE) if quads else np.zeros(0, dtype=QUAD_DTYPE)
+    tri_array = np.array(tris, dtype=TRI_DTYPE) if tris else np.zeros(0, dtype=TRI_DTYPE)
+    return quad_array, tri_array
+
+
+def naive_cube_faces(voxels):
+    """(chunk, x, y, z, face) of every exposed unit cube face: the unmerged mesh."""
+    solid = np.asarray(voxels, dtype=np.uint8).reshape(-1, SIZE, SIZE, SIZE) == BLOCK_CUBE
+    parts = []
+    for face, (direction, *_rest) in enumerate(CUBE_FACES):
+        neighbour = solid
+        for name, step in zip("xyz", direction):
+            if step:
+                neighbour = _shift(solid, GRID_AXIS[name], step)
+        chunk, z, y, x = np.nonzero(solid & ~neighbour)
+        parts.append(np.stack([chunk, x, y, z, np.full(chunk.size, face)], axis=1))
+    return np.concatenate(parts)
+
+
+def covered_cube_faces(voxels):
+    """Unit faces covered by the greedy runs, in naive_cube_faces() form."""
+    solid = np.asarray(voxels, dtype=np.uint8).reshape(-1, SIZE, SIZE, SIZE) == BLOCK_CUBE
+    parts = []
+    for face, chunk, x, y, z, length in cube_runs(solid):
+        k = np.arange(length.sum()) - np.repeat(np.cumsum(length) - length, length)
+        x, y, z, chunk = (np.repeat(a, length) for a in (x, y, z, chunk))
+        if CUBE_FACES[face][1] == "z":
+            z = z + k
+        else:
+            x = x + k
+        parts.append(np.stack([chunk, x, y, z, np.full(chunk.size, face)], axis=1))
+    return np.concatenate(parts)
+
+
+def _row_set(array):
+    """Order-independent fingerprint of a structured or 2D array."""
+    array = np.ascontiguousarray(array)
+    rows = array.view(np.uint8).reshape(len(array), array.itemsize * int(np.prod(array.shape[1:])))
+    return sorted(bytes(row) for row in rows)
+
+
+@tracing.traced("verify")
+def verify(voxels, metas, reference_chunks):
+    """Problems found comparing the batch mesher with the shader port and the naive mesher."""
+    problems = []
+    quads, quad_chunk, tris, tri_chunk = mesh_chunks(voxels, metas)
+    for i in reference_chunks:
+        ref_quads, ref_tris = mesh_chunk_reference(voxels[i], metas[i])
+        if _row_set(quads[quad_chunk == i]) != _row_set(ref_quads) or _row_set(tris[tri_chunk == i]) != _row_set(ref_tris):
+            problems.append(f"chunk {i}: quads differ from the per-voxel shader port")
+    naive, covered = naive_cube_faces(voxels), covered_cube_faces(voxels)
+    if _row_set(naive.astype(np.int64)) != _row_set(covered.astype(np.int64)):
+        problems.append("greedy runs do not cover exactly the exposed cube faces")
+    return problems
+
+
+# === Prefab-generated chunks ===
+
+@tracing.traced("read")
+def load_prefab_variants(prefab_dir):
+    """Every rotation of every valid v2 prefab, as ([y, z, x] types, metas) arrays."""
+    object_sizes = pc.load_object_sizes()
+    variants = []
+    for path in sorted(Path(prefab_dir).glob("*.json")):
+        try:
+            prefab, errors = pc.validate(json.loads(path.read_text(encoding="utf-8")), object_sizes)
+        except (json.JSONDecodeError, pc.PrefabError):
+            continue
+        if prefab is None or errors:
+            continue
+        for variant in pc.build_variants(prefab, object_sizes):
+            variants.append((path.stem, variant["types"], variant["metas"]))
+    return variants
+
+
+def stamp_chunks(variants, count, seed=0):
+    """
+    Scatter prefab variants over a world of building voxels and cut it into
+    16^3 chunks (the way spawn_user_prefab + BuildingManager.set_voxel fill
+    them). Returns the `count` non-empty chunks as [chunk, z, y, x] arrays.
+    """
+    rng = np.random.default_rng(seed)
+    side = max(int(np.ceil(np.sqrt(count))), 1)
+    world_types = np.zeros((SIZE * 2, SIZE * side, SIZE * side), dtype=np.uint8)  # [y, z, x]
+    world_metas = np.zeros_like(world_types)
+    for _ in range(count * 2):
+        _name, types, metas = variants[rng.integers(len(variants))]
+        dy, dz, dx = types.shape
+        if dz > world_types.shape[1] or dx > world_types.shape[2] or dy > world_types.shape[0]:
+            continue
+        y0 = int(rng.integers(0, world_types.shape[0] - dy + 1))
+        z0 = int(rng.integers(0, world_types.shape[1] - dz + 1))
+        x0 = int(rng.integers(0, world_types.shape[2] - dx + 1))
+        filled = types > 0
+        region = (slice(y0, y0 + dy), slice(z0, z0 + dz), slice(x0, x0 + dx))
+        world_types[region] = np.where(filled, types, world_types[region])
+        world_metas[region] = np.where(filled, metas, world_metas[region])
+
+    ny, nz, nx = (s // SIZE for s in world_types.shape)
+    def split(world):
+        blocks = world.reshape(ny, SIZE, nz, SIZE, nx, SIZE).transpose(0, 2, 4, 3, 1, 5)  # cy, cz, cx, z, y, x
+        return blocks.reshape(-1, SIZE, SIZE, SIZE)
+    types, metas = split(world_types), split(world_metas)
+    keep = types.reshape(len(types), -1).any(axis=1)
+    return types[keep][:count], metas[keep][:count]
+
+
+def random_chunks(count, seed=0):
+    """Noise chunks with every block type and meta 0-5, for the rule checks."""
+    rng = np.random.default_rng(seed)
+    voxels = rng.choice(np.array([0, 0, 0, 1, 1, 1, 2, 3, 4, 5], dtype=np.uint8), (count, SIZE, SIZE, SIZE))
+    metas = rng.integers(0, 6, (count, SIZE, SIZE, SIZE), dtype=np.uint8)
+    return voxels, metas
+
+
+@tracing.traced("benchmark")
+def benchmark(voxels, metas, reference_count, repeats=3):
+    results = {"chunks": len(voxels)}
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        quads, _, tris, _ = mesh_chunks(voxels, metas)
+        best = min(best, time.perf_counter() - start)
+    results["batch_s"] = best
+    results["quads"] = len(quads)
+    results["tris"] = len(tris)
+    results["cube_faces"] = len(naive_cube_faces(voxels))
+    results["cube_quads"] = _greedy_cube_quads(voxels)
+
+    start = time.perf_counter()
+    for i in range(reference_count):
+        mesh_chunk_reference(voxels[i], metas[i])
+    results["reference_s_per_chunk"] = (time.perf_counter() - start) / max(reference_count, 1)
+    return results
+
+
+def _greedy_cube_quads(voxels):
+    solid = np.asarray(voxels).reshape(-1, SIZE, SIZE, SIZE) == BLOCK_CUBE
+    return sum(len(run[1]) for run in cube_runs(solid))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy-mesh building chunks on the CPU and check the rules.")
+    parser.add_argument("--prefab-dir", type=Path, default=pc.PREFAB_DIR)
+    parser.add_argument("--chunks", type=int, default=256, help="prefab-generated chunks to mesh")
+    parser.add_argument("--reference", type=int, default=8, help="chunks to check against the per-voxel port")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    variants = load_prefab_variants(args.prefab_dir)
+    if not variants:
+        print(f"[BUILDING_MESHER] No valid prefabs in {args.prefab_dir}")
+        return 1
+    voxels, metas = stamp_chunks(variants, args.chunks, args.seed)
+    blocks = {name: int(np.count_nonzero(voxels == block)) for name, block in
+              (("cube", BLOCK_CUBE), ("ramp", BLOCK_RAMP), ("sphere", BLOCK_SPHERE), ("stairs", BLOCK_STAIRS))}
+    print(f"[BUILDING_MESHER] {len(voxels)} chunks from {len(variants) // 4} prefabs: "
+          + ", ".join(f"{count} {name}" for name, count in blocks.items()))
+
+    reference = min(args.reference, len(voxels))
+    problems = verify(voxels, metas, range(reference))
+    noise_voxels, noise_metas = random_chunks(2, args.seed)
+    problems += [f"noise {p}" for p in verify(noise_voxels, noise_metas, range(2))]
+    print(f"[BUILDING_MESHER] Check vs per-voxel shader port ({reference} prefab + 2 noise chunks) and naive faces: "
+          f"{'OK' if not problems else '; '.join(problems[:4])}")
+
+    bench = benchmark(voxels, metas, reference)
+    rate = bench["quads"] / max(bench["batch_s"], 1e-9)
+    print(f"[BUILDING_MESHER] Cube faces: {bench['cube_faces']} naive -> {bench['cube_quads']} greedy quads "
+          f"({bench['cube_faces'] / max(bench['cube_quads'], 1):.2f}x fewer)")
+    print(f"[BUILDING_MESHER] Batch: {bench['quads']} quads + {bench['tris']} triangles in "
+          f"{bench['batch_s'] * 1000:.1f} ms ({bench['batch_s'] / max(len(voxels), 1) * 1e6:.0f} us/chunk, "
+          f"{rate:,.0f} quads/s); per-voxel port {bench['reference_s_per_chunk'] * 1000:.1f} ms/chunk "
+          f"({bench['reference_s_per_chunk'] * len(voxels) / max(bench['batch_s'], 1e-9):.0f}x slower)")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+One entry point for the project's Python tooling.
+
+    python tools/cli.py [--root DIR] [--config FILE] <command> [options]
+
+Each command lives in tools/commands/ and is imported only when it runs, so
+`--help` and `config` start without loading the GDScript parser, numpy or
+the build driver. The project root is found from project.godot and settings
+come from tools/tools.json with TOOLS_<KEY> environment overrides (see
+project_config.py); nothing here hard-codes a machine path.
+
+Usage:
+    python tools/cli.py --help
+    python tools/cli.py config
+    python tools/cli.py scan res://entities "entities/" --ext .gd .tscn
+    python tools/cli.py rewrite modules/old_name/ modules/new_name/ --apply
+    python tools/cli.py patch-scene modules/tools/sketchfab_scene2.tscn --remove-node "Physical Bone _rootJoint"
+    python tools/cli.py run --debug --timeout 3
+    python tools/cli.py run --test
+    python tools/cli.py check
+    python tools/cli.py check --static
+    python tools/cli.py build --target template_release
+"""
+import sys
+
+# name -> (module in tools/commands/, one-line summary). A module provides
+# add_arguments(parser) and run(args, config) -> exit code; FORWARD_ARGS = True
+# hands unparsed arguments through as args.forward.
+COMMANDS = {
+    "config": ("commands.config", "print the project root and resolved settings"),
+    "scan": ("commands.scan", "find text / regex references across project files"),
+    "rewrite": ("commands.rewrite", "replace paths or identifiers across project files (dry run by default)"),
+    "patch-scene": ("commands.patch_scene", "remove nodes and edit node properties in a .tscn"),
+    "run": ("commands.run", "run Godot on the project for a while and stream or filter its output"),
+    "check": ("commands.check", "report engine errors from a short Godot run, or check scripts statically"),
+    "build": ("commands.build", "incremental GDExtension build (gdextension/build.py)"),
+}
+
+
+def _usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: cli.py [--root DIR] [--config FILE] <command> [options]", "",
+             "Project tooling. `cli.py <command> --help` shows a command's options.", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "options:",
+              "  --root DIR     Godot project root (default: nearest project.godot, $TOOLS_PROJECT_ROOT)",
+              "  --config FILE  settings file (default: tools/tools.json, $TOOLS_CONFIG)"]
+    return "\n".join(lines)
+
+
+def _split_globals(argv):
+    """(root, config, command, rest) without importing argparse for the global options."""
+    root = config = None
+    i = 0
+    while i < len(argv) and argv[i].startswith("-"):
+        flag, _, value = argv[i].partition("=")
+        if flag not in ("--root", "--config"):
+            break
+        if not value:
+            i += 1
+            if i >= len(argv):
+                raise SystemExit(f"cli.py: {flag} needs a value")
+            value = argv[i]
+        if flag == "--root":
+            root = value
+        else:
+            config = value
+        i += 1
+    command = argv[i] if i < len(argv) else None
+    return root, config, command, argv[i + 1:]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    root, config_path, command, rest = _split_globals(argv)
+    if command in (None, "-h", "--help"):
+        print(_usage())
+        return 0
+    if command not in COMMANDS:
+        print(f"cli.py: unknown command {command!r}\n\n{_usage()}", file=sys.stderr)
+        return 2
+
+    import argparse
+    import importlib
+
+    import project_config
+    import tracing
+
+    module_name, summary = COMMANDS[command]
+    with tracing.span("import command"):
+        module = importlib.import_module(module_name)
+    parser = argparse.ArgumentParser(prog=f"cli.py {command}", description=summary[0].upper() + summary[1:] + ".")
+    module.add_arguments(parser)
+    if getattr(module, "FORWARD_ARGS", False):
+        args, forward = parser.parse_known_args(rest)
+        args.forward = forward
+    else:
+        args = parser.parse_args(rest)
+
+    try:
+        config = project_config.load(root, config_path)
+    except project_config.ConfigError as e:
+        print(f"[CLI] {e}", file=sys.stderr)
+        return 2
+    with tracing.span(command):
+        try:
+            return module.run(args, config)
+        except project_config.ConfigError as e:
+            print(f"[CLI] {e}", file=sys.stderr)
+            return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Collision proxy builder for terrain chunks.
+
+MeshBuilder.build_collision_shape feeds the full render mesh into a
+ConcavePolygonShape3D, so physics cost follows visual detail. This tool
+decimates chunks by coarser density resampling: the 33^3 grid is resampled
+onto a lattice with fewer cells (still spanning exactly one CHUNK_STRIDE, so
+neighbouring proxies of the same resolution meet without cracks) and
+re-polygonized.
+
+One resolution is picked for the whole chunk set: the finest candidate that
+fits the triangle budget, refined until the walkable-surface error (vertical
+distance between the proxy and the full mesh on floor-angled triangles) is
+within tolerance. The error is gated on a high percentile rather than the
+maximum because the 1-unit road steps are always rounded off by resampling.
+
+Proxies are written in the same 9-float vertex stream the GPU produces, so
+they go straight into build_collision_shape(data, 9).
+
+Usage:
+    python tools/collision_proxy.py --budget 600 --tolerance 0.4
+    python tools/collision_proxy.py --radius 3 --out collision_proxies
+"""
+import argparse
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+import marching_cubes as mc
+import terrain_lod
+import terrain_reference as tr
+import tracing
+
+# Cells per axis, finest first (31 = full resolution)
+CANDIDATE_CELLS = (31, 24, 20, 16, 12, 10, 8, 6, 4)
+
+# CharacterBody3D.floor_max_angle default
+FLOOR_MAX_ANGLE_DEG = 45.0
+QUERY_BLOCK = 1024
+ERROR_PERCENTILE = 99.0
+
+
+def build_proxy(density, cells):
+    """Collision proxy for one chunk at `cells` cells per axis (9-float stream)."""
+    if cells >= tr.CHUNK_STRIDE:
+        return mc.polygonize_chunk(density)
+    coarse = terrain_lod.resample_grid(density, cells)
+    return mc.polygonize(coarse, None, tr.CHUNK_STRIDE / cells)
+
+
+def faces(vertices):
+    """Flat (n * 3, 3) triangle positions, i.e. ConcavePolygonShape3D faces."""
+    return np.ascontiguousarray(vertices[:, 0:3])
+
+
+def walkable_samples(vertices, max_angle_deg=FLOOR_MAX_ANGLE_DEG):
+    """Centroids of triangles a character could stand on."""
+    tris = faces(vertices).reshape(-1, 3, 3)
+    if tris.shape[0] == 0:
+        return np.zeros((0, 3), dtype=np.float32)
+    normal = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    length = np.linalg.norm(normal, axis=1)
+    # Winding is 1,3,2 so the geometric normal points down on floors; use |n.y|
+    up = np.abs(normal[:, 1]) / np.maximum(length, 1e-12)
+    keep = (length > 1e-9) & (up >= math.cos(math.radians(max_angle_deg)))
+    return tris[keep].mean(axis=1)
+
+
+def height_error(samples, proxy_vertices):
+    """
+    Vertical distance from each sample to the nearest proxy surface directly above/below it.
+
+    Returns (errors, uncovered) where uncovered counts samples with no proxy
+    triangle over their XZ position.
+    """
+    if samples.shape[0] == 0:
+        return np.zeros(0), 0
+    tris = faces(proxy_vertices).reshape(-1, 3, 3).astype(np.float64)
+    if tris.shape[0] == 0:
+        return np.zeros(0), samples.shape[0]
+
+    a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+    # 2D barycentric setup in XZ per triangle
+    v0x, v0z = b[:, 0] - a[:, 0], b[:, 2] - a[:, 2]
+    v1x, v1z = c[:, 0] - a[:, 0], c[:, 2] - a[:, 2]
+    det = v0x * v1z - v1x * v0z
+    usable = np.abs(det) > 1e-12
+    inv_det = np.where(usable, 1.0 / np.where(usable, det, 1.0), 0.0)
+
+    errors = []
+    uncovered = 0
+    for start in range(0, samples.shape[0], QUERY_BLOCK):
+        q = samples[start:start + QUERY_BLOCK].astype(np.float64)
+        px = q[:, None, 0] - a[None, :, 0]
+        pz = q[:, None, 2] - a[None, :, 2]
+        u = (px * v1z - v1x * pz) * inv_det
+        v = (v0x * pz - px * v0z) * inv_det
+        inside = usable & (u >= -1e-6) & (v >= -1e-6) & (u + v <= 1.0 + 1e-6)
+        y = a[None, :, 1] + u * (b[None, :, 1] - a[None, :, 1]) + v * (c[None, :, 1] - a[None, :, 1])
+        dist = np.where(inside, np.abs(y - q[:, None, 1]), np.inf)
+        best = dist.min(axis=1)
+        covered = np.isfinite(best)
+        uncovered += int(np.count_nonzero(~covered))
+        errors.append(best[covered])
+    return np.concatenate(errors), uncovered
+
+
+@tracing.traced("evaluate")
+def evaluate(chunks, cells, percentile=ERROR_PERCENTILE):
+    """Build proxies at one resolution for every chunk and measure them."""
+    results = []
+    for coord, density, full, samples in chunks:
+        start = time.perf_counter()
+        proxy = build_proxy(density, cells)
+        seconds = time.perf_counter() - start
+        errors, uncovered = height_error(samples, proxy)
+        results.append({
+            "coord": coord,
+            "proxy": proxy,
+            "full_tris": full.shape[0] // 3,
+            "proxy_tris": proxy.shape[0] // 3,
+            "seconds": seconds,
+            "max_error": float(errors.max()) if errors.size else 0.0,
+            "p_error": float(np.percentile(errors, percentile)) if errors.size else 0.0,
+            "mean_error": float(errors.mean()) if errors.size else 0.0,
+            "uncovered": uncovered,
+        })
+    return results
+
+
+@tracing.traced("search")
+def choose_resolution(chunks, budget, tolerance, percentile=ERROR_PERCENTILE, candidates=CANDIDATE_CELLS):
+    """
+    Finest candidate whose worst chunk fits the budget, refined toward full
+    resolution until the walkable error is within tolerance.
+    """
+    evaluated = {}
+
+    def get(cells):
+        if cells not in evaluated:
+            evaluated[cells] = evaluate(chunks, cells, percentile)
+        return evaluated[cells]
+
+    start_index = len(candidates) - 1
+    for i, cells in enumerate(candidates):
+        if max((r["proxy_tris"] for r in get(cells)), default=0) <= budget:
+            start_index = i
+            break
+
+    for i in range(start_index, -1, -1):
+        cells = candidates[i]
+        if max((r["p_error"] for r in get(cells)), default=0.0) <= tolerance:
+            return cells, get(cells)
+    return candidates[0], get(candidates[0])
+
+
+@tracing.traced("density")
+def prepare_chunks(coords, params=tr.DEFAULT_PARAMS):
+    chunks = []
+    for coord in coords:
+        density = tr.chunk_density(coord, params)
+        full = mc.polygonize_chunk(density)
+        chunks.append((coord, density, full, walkable_samples(full)))
+    return chunks
+
+
+def print_report(cells, results, budget, tolerance, percentile=ERROR_PERCENTILE):
+    print(f"{'chunk':>14} {'full':>6} {'proxy':>6} {'saved':>7} {'ms':>7} {'mean err':>9} "
+          f"{'p' + format(percentile, 'g') + ' err':>8} {'max err':>8}")
+    for r in results:
+        saved = 1.0 - r["proxy_tris"] / r["full_tris"] if r["full_tris"] else 0.0
+        print(f"{str(r['coord']):>14} {r['full_tris']:>6} {r['proxy_tris']:>6} {saved:>7.1%} "
+              f"{r['seconds'] * 1000:>7.2f} {r['mean_error']:>9.3f} {r['p_error']:>8.3f} {r['max_error']:>8.3f}")
+
+    full = sum(r["full_tris"] for r in results)
+    proxy = sum(r["proxy_tris"] for r in results)
+    worst = max((r["p_error"] for r in results), default=0.0)
+    worst_tris = max((r["proxy_tris"] for r in results), default=0)
+    print(f"[COLLISION_PROXY] Resolution: {cells} cells/axis (spacing {tr.CHUNK_STRIDE / cells:.3f})")
+    print(f"[COLLISION_PROXY] Triangles: {full} -> {proxy} ({1.0 - proxy / max(full, 1):.1%} saved)")
+    print(f"[COLLISION_PROXY] Avg build time: {sum(r['seconds'] for r in results) * 1000 / max(len(results), 1):.2f} ms/chunk")
+    print(f"[COLLISION_PROXY] Worst chunk: {worst_tris} tris (budget {budget}), "
+          f"p{percentile:g} walkable error {worst:.3f} (tolerance {tolerance})")
+    uncovered = sum(r["uncovered"] for r in results)
+    if uncovered:
+        print(f"[COLLISION_PROXY] Note: {uncovered} walkable samples had no proxy triangle above/below them")
+    return worst_tris <= budget and worst <= tolerance
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build decimated collision proxies for terrain chunks.")
+    parser.add_argument("--radius", type=int, default=2, help="chunk radius around the center")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("X", "Z"))
+    parser.add_argument("--y", type=int, default=0, help="chunk Y layer")
+    parser.add_argument("--budget", type=int, default=1000, help="max triangles per chunk proxy")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="max walkable-surface height error")
+    parser.add_argument("--percentile", type=float, default=ERROR_PERCENTILE,
+                        help="error percentile gated by --tolerance (100 = strict max)")
+    parser.add_argument("--out", type=Path, help="write proxies as raw little-endian float32 streams")
+    args = parser.parse_args()
+
+    coords = [(args.center[0] + x, args.y, args.center[1] + z)
+              for x in range(-args.radius, args.radius + 1)
+              for z in range(-args.radius, args.radius + 1)]
+
+    print(f"[COLLISION_PROXY] Meshing {len(coords)} chunks at full resolution...")
+    chunks = prepare_chunks(coords)
+    cells, results = choose_resolution(chunks, args.budget, args.tolerance, args.percentile)
+    ok = print_report(cells, results, args.budget, args.tolerance, args.percentile)
+
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+        for r in results:
+            x, y, z = r["coord"]
+            (args.out / f"collision_{x}_{y}_{z}.f32").write_bytes(r["proxy"].astype("<f4").tobytes())
+        print(f"[COLLISION_PROXY] Proxies written to {args.out}")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Subcommands of tools/cli.py, one module each, imported on demand."""
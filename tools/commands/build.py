@@ -0,0 +1,22 @@
+"""cli.py build: the incremental GDExtension build driver (gdextension/build.py); options pass through."""
+import importlib.util
+import sys
+
+FORWARD_ARGS = True
+
+
+def add_arguments(parser):
+    parser.epilog = "All options are those of gdextension/build.py (see `python gdextension/build.py --help`)."
+
+
+def run(args, config):
+    path = config.root / "gdextension" / "build.py"
+    spec = importlib.util.spec_from_file_location("gdextension_build", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    saved = sys.argv
+    sys.argv = [str(path), *args.forward]
+    try:
+        return module.main()
+    finally:
+        sys.argv = saved
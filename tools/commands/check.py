@@ -0,0 +1,75 @@
+"""
+cli.py check: engine errors from a short --debug run of the project.
+
+Captures check_timeout seconds of output and prints every error block (an
+ERROR / EXCEPTION / "E 0:00" / <C++ Error> line plus its indented
+continuation). Exit 1 when any are found. --static runs
+tools/gdscript_check.py instead, which needs no Godot binary.
+"""
+import re
+import sys
+
+import tracing
+from commands.godot import capture, godot_command
+
+_ANSI_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+
+def add_arguments(parser):
+    parser.add_argument("--timeout", type=float, help="seconds to run Godot (default: check_timeout)")
+    parser.add_argument("--static", action="store_true", help="check scripts with gdscript_check.py instead")
+
+
+def is_error_start(line):
+    upper = line.upper()
+    return ("ERROR" in upper or "EXCEPTION" in upper or " <C++ Error>" in line
+            or (line.startswith("E ") and len(line) > 5 and line[2].isdigit()))
+
+
+def error_blocks(output):
+    """[[line, continuation...]] of every error in Godot's output."""
+    blocks = []
+    capturing = False
+    for raw_line in output.splitlines():
+        if is_error_start(_ANSI_RE.sub("", raw_line).strip()):
+            blocks.append([raw_line])
+            capturing = True
+        elif capturing and raw_line[:1].isspace():
+            blocks[-1].append(raw_line)
+        else:
+            capturing = False
+    return blocks
+
+
+def run_static(config):
+    import gdscript_check
+
+    saved = sys.argv
+    sys.argv = ["gdscript_check.py", "--root", str(config.root)]
+    try:
+        return gdscript_check.main()
+    finally:
+        sys.argv = saved
+
+
+def run(args, config):
+    if args.static:
+        return run_static(config)
+    timeout = args.timeout or config["check_timeout"]
+    cmd = godot_command(config, "--debug")
+    print(f"[CHECK] Running Godot for {timeout:g}s...")
+    output, timed_out = capture(cmd, timeout)
+    print(f"[CHECK] {'Time limit reached' if timed_out else 'Godot exited'}")
+
+    with tracing.span("match"):
+        blocks = error_blocks(output)
+    for block in blocks:
+        print("\n".join(block))
+    if not blocks:
+        lines = output.splitlines()
+        print("[CHECK] No ERROR / EXCEPTION / E 0:00 lines. First lines of output:")
+        for i, line in enumerate(lines[:10]):
+            print(f"[CHECK]   {i}: {line!r}")
+        return 0
+    print(f"[CHECK] {len(blocks)} error blocks")
+    return 1
@@ -0,0 +1,20 @@
+"""cli.py config: show the discovered project root and every setting with its source."""
+import json
+
+
+def add_arguments(parser):
+    parser.add_argument("--json", action="store_true", help="print the settings as JSON")
+
+
+def run(args, config):
+    if args.json:
+        print(json.dumps({"root": str(config.root), "config": str(config.path), "settings": config.settings},
+                         indent=1))
+        return 0
+    print(f"[CONFIG] root    {config.root}")
+    print(f"[CONFIG] config  {config.path}")
+    width = max(len(key) for key in config.settings)
+    for key, value in config.settings.items():
+        source = "" if config.sources[key] == str(config.path) else f"  (from {config.sources[key]})"
+        print(f"[CONFIG] {key:<{width}}  {json.dumps(value)}{source}")
+    return 0
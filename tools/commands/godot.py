@@ -0,0 +1,70 @@
+"""Launching Godot on the project for run / check: binary lookup, time-limited streamed and captured runs."""
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+
+import tracing
+from project_config import ConfigError
+
+
+def godot_command(config, *extra):
+    """[godot, --path, root, *extra]; the binary comes from godot_bin (a path or a name on PATH)."""
+    binary = config["godot_bin"]
+    found = binary if os.path.isfile(binary) else shutil.which(binary)
+    if not found:
+        raise ConfigError(f"Godot binary not found: {binary!r} "
+                          f"(set godot_bin in {config.path.name} or TOOLS_GODOT_BIN)")
+    return [found, "--path", str(config.root), *extra]
+
+
+def stream(cmd, timeout, on_line):
+    """Run cmd, passing each output line to on_line, terminating it after timeout seconds.
+
+    Returns (exit code, timed out). A timer ends the process (its whole
+    process group on POSIX, so helpers holding the pipe go too); a child that
+    goes quiet cannot outlive the timeout.
+    """
+    posix = os.name == "posix"
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                               encoding="utf-8", errors="replace", bufsize=1, start_new_session=posix)
+    timed_out = threading.Event()
+
+    def stop():
+        timed_out.set()
+        try:
+            if posix:
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            pass
+
+    timer = threading.Timer(timeout, stop)
+    timer.start()
+    try:
+        with tracing.span("subprocess wait"):
+            for line in process.stdout:
+                on_line(line)
+    finally:
+        timer.cancel()
+        try:
+            process.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return process.returncode, timed_out.is_set()
+
+
+def capture(cmd, timeout):
+    """(combined output, timed out) of a run limited to timeout seconds."""
+    lines = []
+    _, timed_out = stream(cmd, timeout, lines.append)
+    return "".join(lines), timed_out
+
+
+def echo(line):
+    sys.stdout.write(line)
+    sys.stdout.flush()
@@ -0,0 +1,163 @@
+"""
+cli.py patch-scene: structural edits of a text scene (.tscn).
+
+    --remove-node NAME          drop every node called NAME, its descendants
+                                and the [connection]s that touch them
+    --set NODE KEY VALUE        set KEY = VALUE on nodes called NODE (added
+                                after the header when the node lacks it)
+    --replace KEY OLD NEW       KEY = OLD -> KEY = NEW on every node
+
+Node paths are rebuilt from name= / parent= so descendants are found at any
+depth. Nothing is written unless every operation matched and --apply is
+given. Replaces the ragdoll one-offs (remove_ragdoll_roots.py,
+convert_ragdoll_joints.py, fix_ragdoll_root_joint.py), e.g.
+
+    cli.py patch-scene modules/tools/sketchfab_scene2.tscn --replace joint_type 1 2 \\
+        --set "Physical Bone Bip01 Pelvis_04" joint_type 0 --apply
+"""
+import os
+import re
+
+import tracing
+
+# Section headers of the text scene / resource format
+_HEADER_RE = re.compile(r"^\[(gd_scene|gd_resource|ext_resource|sub_resource|node|connection|editable|resource)\b")
+_ATTR_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def add_arguments(parser):
+    parser.add_argument("scene", help="res:// or filesystem path of the .tscn")
+    parser.add_argument("--remove-node", action="append", default=[], metavar="NAME")
+    parser.add_argument("--set", action="append", default=[], nargs=3, metavar=("NODE", "KEY", "VALUE"))
+    parser.add_argument("--replace", action="append", default=[], nargs=3, metavar=("KEY", "OLD", "NEW"))
+    parser.add_argument("--apply", action="store_true", help="write the scene (default: report only)")
+
+
+class Section:
+    """One [header] line and the property lines after it."""
+
+    def __init__(self, header, lines):
+        self.header = header
+        self.lines = lines
+        match = _HEADER_RE.match(header)
+        self.kind = match.group(1) if match else None
+        self.attrs = dict(_ATTR_RE.findall(header))
+
+    def property_index(self, key):
+        prefix = key + " = "
+        for i, line in enumerate(self.lines):
+            if line.startswith(prefix):
+                return i
+        return None
+
+    def text(self):
+        return self.header + "".join(self.lines)
+
+
+def parse_sections(text):
+    """(preamble lines, [Section]) keeping every line ending as-is."""
+    preamble, sections = [], []
+    for line in text.splitlines(keepends=True):
+        if _HEADER_RE.match(line):
+            sections.append(Section(line, []))
+        elif sections:
+            sections[-1].lines.append(line)
+        else:
+            preamble.append(line)
+    return preamble, sections
+
+
+def node_path(section):
+    """Scene-relative path of a [node] section ("." for the root)."""
+    parent = section.attrs.get("parent")
+    name = section.attrs.get("name", "")
+    if parent is None:
+        return "."
+    return name if parent == "." else f"{parent}/{name}"
+
+
+def _inside(path, removed):
+    return any(path == r or path.startswith(r + "/") for r in removed)
+
+
+def patch(text, remove=(), sets=(), replaces=()):
+    """(new text, [report line], [unmatched operation])."""
+    preamble, sections = parse_sections(text)
+    report = []
+    hits = {("remove", name): 0 for name in remove}
+    hits.update({("set", tuple(op)): 0 for op in sets})
+    hits.update({("replace", tuple(op)): 0 for op in replaces})
+    newline = "\r\n" if "\r\n" in text else "\n"
+
+    removed = []
+    kept = []
+    for section in sections:
+        if section.kind == "node":
+            path = node_path(section)
+            name = section.attrs.get("name")
+            if name in remove or _inside(path, removed):
+                if name in remove:
+                    hits[("remove", name)] += 1
+                removed.append(path)
+                report.append(f"remove node {path}")
+                continue
+        elif section.kind == "connection" and removed:
+            ends = (section.attrs.get("from", ""), section.attrs.get("to", ""))
+            if any(_inside(end, removed) for end in ends):
+                report.append(f"remove connection {section.attrs.get('signal')} {ends[0]} -> {ends[1]}")
+                continue
+        kept.append(section)
+
+    for section in kept:
+        if section.kind != "node":
+            continue
+        for node, key, value in sets:
+            if section.attrs.get("name") != node:
+                continue
+            hits[("set", (node, key, value))] += 1
+            index = section.property_index(key)
+            line = f"{key} = {value}{newline}"
+            if index is None:
+                section.lines.insert(0, line)
+            else:
+                section.lines[index] = line
+            report.append(f"set {node_path(section)}: {key} = {value}")
+        for key, old, new in replaces:
+            index = section.property_index(key)
+            if index is not None and section.lines[index].rstrip("\r\n") == f"{key} = {old}":
+                hits[("replace", (key, old, new))] += 1
+                section.lines[index] = f"{key} = {new}{newline}"
+                report.append(f"replace {node_path(section)}: {key} = {old} -> {new}")
+
+    unmatched = [f"{kind} {' '.join(op) if isinstance(op, tuple) else op}"
+                 for (kind, op), n in hits.items() if n == 0]
+    return "".join(preamble) + "".join(s.text() for s in kept), report, unmatched
+
+
+def run(args, config):
+    path = config.resolve(args.scene)
+    if not args.remove_node and not args.set and not args.replace:
+        print("[PATCH_SCENE] nothing to do; give --remove-node, --set or --replace")
+        return 2
+    with tracing.span("read"):
+        with open(path, encoding="utf-8", newline="") as f:
+            text = f.read()
+    with tracing.span("match"):
+        new_text, report, unmatched = patch(text, args.remove_node, args.set, args.replace)
+    for line in report:
+        print(f"[PATCH_SCENE] {line}")
+    for op in unmatched:
+        print(f"[PATCH_SCENE] no match: {op}")
+    if unmatched:
+        print("[PATCH_SCENE] Not written: every operation must match")
+        return 1
+    if not args.apply:
+        print(f"[PATCH_SCENE] Dry run; {len(report)} changes, pass --apply to write {path.name}")
+        return 0
+    with tracing.span("write"):
+        tmp = path.with_name(path.name + ".patch.tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.write(new_text)
+        os.replace(tmp, path)
+    print(f"[PATCH_SCENE] Wrote {len(report)} changes to {path}")
+    return 0
@@ -0,0 +1,88 @@
+"""
+cli.py rewrite: replace paths or identifiers across project text files.
+
+Pairs of OLD NEW are applied in order to every file (regexes with --regex,
+NEW may then use \\1 groups). Files are read and written with their line
+endings untouched and replaced atomically; non-UTF-8 files are skipped.
+Dry run unless --apply. Replaces the update_*_references.py and
+migrate_debug_settings.py one-offs.
+"""
+import os
+import re
+import time
+
+import tracing
+from commands.scan import compile_patterns
+
+
+def add_arguments(parser):
+    parser.add_argument("pairs", nargs="+", metavar="OLD NEW", help="replacement pairs, applied in order")
+    parser.add_argument("--regex", action="store_true", help="OLD is a regular expression, NEW a template")
+    parser.add_argument("--ext", nargs="+", help="file extensions (default: text_extensions setting)")
+    parser.add_argument("--apply", action="store_true", help="write the changes (default: report only)")
+
+
+def rewrite_text(text, replacements):
+    """(new text, [count per pair])."""
+    counts = []
+    for old, new in replacements:
+        if isinstance(old, re.Pattern):
+            text, n = old.subn(new, text)
+        else:
+            n = text.count(old)
+            text = text.replace(old, new)
+        counts.append(n)
+    return text, counts
+
+
+def write_atomic(path, text):
+    tmp = path.with_name(path.name + ".rewrite.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def run(args, config):
+    if len(args.pairs) % 2:
+        print("[REWRITE] expected OLD NEW pairs, got an odd number of arguments")
+        return 2
+    olds, news = args.pairs[0::2], args.pairs[1::2]
+    replacements = [(re.compile(old) if args.regex else old, new) for old, new in zip(olds, news)]
+    _, prefilter = compile_patterns(olds, args.regex)
+
+    start = time.perf_counter()
+    with tracing.span("walk"):
+        files = config.text_files(args.ext)
+    changed = skipped = 0
+    totals = [0] * len(replacements)
+    for path in files:
+        with tracing.span("read"):
+            raw = path.read_bytes()
+        if prefilter and not prefilter(raw):
+            continue
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            skipped += 1
+            continue
+        with tracing.span("match"):
+            new_text, counts = rewrite_text(text, replacements)
+        if new_text == text:
+            continue
+        changed += 1
+        totals = [t + c for t, c in zip(totals, counts)]
+        detail = ", ".join(f"{old} -> {new} ({n}x)" for (old, new), n in zip(zip(olds, news), counts) if n)
+        print(f"[REWRITE] {config.to_res(path)}: {detail}")
+        if args.apply:
+            with tracing.span("write"):
+                write_atomic(path, new_text)
+    elapsed = time.perf_counter() - start
+
+    for old, new, total in zip(olds, news, totals):
+        print(f"[REWRITE] {old} -> {new}: {total} replacements")
+    skipped_note = f", {skipped} non-UTF-8 files skipped" if skipped else ""
+    verb = "Rewrote" if args.apply else "Would rewrite"
+    print(f"[REWRITE] {verb} {changed} of {len(files)} files{skipped_note} in {elapsed * 1000:.0f} ms")
+    if changed and not args.apply:
+        print("[REWRITE] Dry run; pass --apply to write")
+    return 0
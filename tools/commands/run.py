@@ -0,0 +1,45 @@
+"""
+cli.py run: run Godot on the project for a fixed time and stream its output.
+
+Without a scene Godot starts the project's main scene. --markers keeps only
+lines with one of the test_markers tags; --test runs test_scene for
+test_timeout seconds with --markers (the old addons/tests/run_movement_test.py).
+"""
+import time
+
+from commands.godot import echo, godot_command, stream
+
+
+def add_arguments(parser):
+    parser.add_argument("scene", nargs="?", help="res:// scene to run (default: the main scene)")
+    parser.add_argument("--timeout", type=float, help="seconds before Godot is stopped (default: run_timeout)")
+    parser.add_argument("--debug", action="store_true", help="pass --debug to Godot")
+    parser.add_argument("--markers", action="store_true", help="only print lines with a test marker")
+    parser.add_argument("--test", action="store_true", help="run test_scene for test_timeout with --markers")
+
+
+def run(args, config):
+    scene = args.scene or (config["test_scene"] if args.test else None)
+    timeout = args.timeout or config["test_timeout" if args.test else "run_timeout"]
+    markers = tuple(config["test_markers"]) if args.markers or args.test else ()
+    cmd = godot_command(config, *(["--debug"] if args.debug else []), *([scene] if scene else []))
+
+    print(f"[RUN] {scene or 'main scene'} for {timeout:g}s")
+    matched = 0
+
+    def on_line(line):
+        nonlocal matched
+        if not markers:
+            echo(line)
+        elif any(marker in line for marker in markers):
+            matched += 1
+            echo(line)
+
+    start = time.perf_counter()
+    code, timed_out = stream(cmd, timeout, on_line)
+    ending = "stopped at the time limit" if timed_out else f"exited with {code}"
+    found = f", {matched} marker lines" if markers else ""
+    print(f"[RUN] Godot {ending} after {time.perf_counter() - start:.1f}s{found}")
+    if markers and not matched:
+        print("[RUN] (no marker output)")
+    return 0 if timed_out or code == 0 else 1
@@ -0,0 +1,697 @@
+"""
+Headless simulator for the zombie population (entity_manager.gd + zombie_base.gd).
+
+In the game every zombie is a CharacterBody3D with its own _physics_process,
+and EntityManager walks active_entities (freeze / despawn by distance) and
+dormant_entities (respawn within spawn_radius) every physics frame. This
+tool keeps the same population as struct-of-arrays (Population) and steps
+it in batches (Simulator):
+
+    zones       tracked entities beyond despawn_radius go dormant, beyond
+                freeze_radius freeze, inside it unfreeze (within collision
+                range); dormant ones respawn frozen inside spawn_radius.
+                Dormant entities sit in a spatial hash, so the respawn check
+                only looks at cells near the viewer
+    AI          zombie_base's IDLE / WALK / CHASE / ATTACK state machine,
+                vectorized over the entities that tick this frame
+    tick LOD    active entities tick every 1 / 2 / 4 physics frames by
+                viewer distance (TICK_LOD), staggered by entity index, with
+                the elapsed time as their delta
+    collisions  capsules (radius 0.4) of ticking entities are pushed apart
+                using neighbour pairs from a uniform-grid spatial hash
+
+Movement is horizontal only (y stays where the save or respawn put it) and
+the terrain raycasts EntityManager waits on are assumed to hit. Player
+damage, HIT reactions and deaths are outside the simulation; attacks are
+counted.
+
+Population.from_save_data / to_save_data read and write the "entities"
+section of a save_manager_v2 file (EntityManager.get_save_data()), so a
+real save can be loaded, replayed and written back. Like the game, only
+tracked entities are saved; dormant ones are not.
+
+The tool checks the spatial hash against brute force and the batched step
+against a per-entity port (same random draws), then times 100 / 1,000 /
+10,000 zombies with and without tick LOD against the per-entity loop.
+
+Usage:
+    python tools/entity_sim.py
+    python tools/entity_sim.py --save ~/.local/share/godot/app_userdata/<project>/saves/quicksave.json --frames 600
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import terrain_reference as tr
+import tracing
+
+PHYSICS_DT = 1.0 / 60.0
+ZOMBIE_SCENE = "res://game/entities/zombie_base.tscn"
+
+# entity_manager.gd exports
+MAX_ENTITIES = 50
+SPAWN_RADIUS = 50.0
+FREEZE_RADIUS = 60.0
+DESPAWN_RADIUS = 100.0
+COLLISION_RANGE = 93.0  # collision_distance 3 * CHUNK_STRIDE
+
+# zombie_base.gd / entity_base.gd exports
+MAX_HEALTH = 20
+MOVE_SPEED = 3.0
+CHASE_SPEED_MULTIPLIER = 2.5
+CALM_CHASE_FACTOR = 0.4  # chase_anim_variant 1
+DETECTION_RADIUS = 20.0
+ATTACK_RANGE = 1.5
+LOSE_INTEREST_RANGE = 50.0
+ATTACK_COOLDOWN = 1.0
+IDLE_FRICTION = 10.0
+CAPSULE_RADIUS = 0.4  # zombie_base.tscn CapsuleShape3D
+
+STATE_NAMES = ("IDLE", "WALK", "CHASE", "ATTACK", "HIT", "DEAD")
+IDLE, WALK, CHASE, ATTACK, HIT, DEAD = range(len(STATE_NAMES))
+ZONE_ACTIVE, ZONE_FROZEN, ZONE_DORMANT = 0, 1, 2
+
+# (max viewer distance, tick interval in physics frames); beyond the last band entities are frozen anyway
+TICK_LOD = ((25.0, 1), (45.0, 2), (FREEZE_RADIUS, 4))
+HASH_CELL = 8.0  # Dormant entities (respawn queries of spawn_radius)
+COLLISION_CELL = 1.0  # Active entities (capsule contact pairs)
+HASH_BIAS = 1 << 20
+# Random draws per entity per frame: turn, state timer, chase variant, timer / variant on unfreeze
+RAND_COLUMNS = 5
+
+
+# === Population ===
+
+class Population:
+    """Struct-of-arrays state of every zombie the manager knows about (tracked or dormant)."""
+
+    def __init__(self, count=0):
+        self.position = np.zeros((count, 3))
+        self.velocity = np.zeros((count, 3))
+        self.yaw = np.zeros(count)
+        self.state = np.full(count, IDLE, dtype=np.uint8)
+        self.zone = np.full(count, ZONE_FROZEN, dtype=np.uint8)  # spawn_entity spawns frozen
+        self.health = np.full(count, MAX_HEALTH, dtype=np.int32)
+        self.wander_timer = np.zeros(count)
+        self.attack_timer = np.zeros(count)
+        self.chase_variant = np.zeros(count, dtype=np.uint8)
+        self.kind = np.zeros(count, dtype=np.int32)
+        self.kinds = [("scene_path", ZOMBIE_SCENE)]  # (save field, value) per kind
+        self.spawned_chunks = np.zeros((0, 2), dtype=np.int64)
+        self.attacks = 0
+
+    def __len__(self):
+        return len(self.state)
+
+    @classmethod
+    def from_save_data(cls, data):
+        """
+        Build from EntityManager.get_save_data() ({entities, spawned_chunks}).
+        Entities load like load_save_data() spawns them: frozen, IDLE, full
+        health. The game's max_entities cap on load is not applied.
+        """
+        items = data.get("entities", [])
+        population = cls(len(items))
+        population.kinds = []
+        kind_index = {}
+        for i, item in enumerate(items):
+            population.position[i] = item["position"][:3]
+            population.yaw[i] = item.get("rotation", 0.0)
+            if "type" in item:
+                kind = ("type", item["type"])
+            elif "scene_path" in item:
+                kind = ("scene_path", item["scene_path"])
+            else:
+                kind = ("", "")
+            population.kind[i] = kind_index.setdefault(kind, len(kind_index))
+        population.kinds = list(kind_index) or [("scene_path", ZOMBIE_SCENE)]
+        chunks = [chunk[:2] for chunk in data.get("spawned_chunks", []) if len(chunk) >= 2]
+        population.spawned_chunks = np.array(chunks, dtype=np.int64).reshape(-1, 2)
+        return population
+
+    def to_save_data(self):
+        """Dictionary in the get_save_data() format: tracked, non-dead entities."""
+        entities = []
+        keep = np.flatnonzero((self.zone != ZONE_DORMANT) & (self.state != DEAD))
+        for position, yaw, kind in zip(self.position[keep].tolist(), self.yaw[keep].tolist(), self.kind[keep].tolist()):
+            item = {"position": position, "rotation": yaw}
+            field, value = self.kinds[kind]
+            if field:
+                item[field] = value
+            entities.append(item)
+        return {"entities": entities, "spawned_chunks": self.spawned_chunks.tolist()}
+
+
+# === Spatial hash ===
+
+class SpatialHash:
+    """Uniform grid over xz: item indices sorted by cell key, with the range of each occupied cell."""
+
+    def __init__(self, cell_size=HASH_CELL):
+        self.cell_size = cell_size
+        self.build(np.zeros((0, 3)), np.zeros(0, dtype=np.int64))
+
+    def _cells(self, x, z):
+        cx = np.floor(np.asarray(x) / self.cell_size).astype(np.int64)
+        cz = np.floor(np.asarray(z) / self.cell_size).astype(np.int64)
+        return cx, cz
+
+    @staticmethod
+    def _key(cx, cz):
+        return ((cx + HASH_BIAS) << 21) | (cz + HASH_BIAS)
+
+    def build(self, positions, items):
+        """Index items (global entity indices) at positions (n, 3)."""
+        keys = self._key(*self._cells(positions[:, 0], positions[:, 2]))
+        order = np.argsort(keys, kind="stable")
+        self.items = np.asarray(items, dtype=np.int64)[order]
+        self.xz = positions[order][:, [0, 2]]
+        self.cells, starts = np.unique(keys[order], return_index=True)
+        self.starts = np.append(starts, len(keys)).astype(np.int64)
+
+    def _ranges(self, keys):
+        """Start / count in the sorted items for each cell key (count 0 when empty)."""
+        at = np.minimum(np.searchsorted(self.cells, keys), max(len(self.cells) - 1, 0))
+        found = (self.cells[at] == keys) if len(self.cells) else np.zeros(len(keys), dtype=bool)
+        starts = np.where(found, self.starts[at], 0)
+        counts = np.where(found, self.starts[np.minimum(at + 1, len(self.starts) - 1)] - self.starts[at], 0)
+        return starts, counts
+
+    def query_radius(self, x, z, radius):
+        """Items within radius of (x, z) on the xz plane."""
+        (x0, x1), (z0, z1) = (self._cells([x - radius, x + radius], [z - radius, z + radius]))
+        cx, cz = np.meshgrid(np.arange(x0, x1 + 1), np.arange(z0, z1 + 1), indexing="ij")
+        starts, counts = self._ranges(self._key(cx.ravel(), cz.ravel()))
+        rows = _expand(starts, counts)
+        d2 = (self.xz[rows, 0] - x) ** 2 + (self.xz[rows, 1] - z) ** 2
+        return self.items[rows[d2 <= radius * radius]]
+
+    def pairs(self, radius):
+        """Unordered item pairs closer than radius (<= cell size) on the xz plane."""
+        starts, counts = self.starts[:-1], np.diff(self.starts)
+        cx, cz = self.cells >> 21, self.cells & ((1 << 21) - 1)
+        first, second = [], []
+        for dx, dz in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):  # Half neighbourhood: each cell pair once
+            other_starts, other_counts = self._ranges(self._key(cx + dx - HASH_BIAS, cz + dz - HASH_BIAS))
+            a, b = _cross(starts, counts, other_starts, other_counts)
+            if dx == 0 and dz == 0:
+                a, b = a[a < b], b[a < b]
+            first.append(a)
+            second.append(b)
+        a, b = np.concatenate(first), np.concatenate(second)
+        d2 = ((self.xz[a] - self.xz[b]) ** 2).sum(axis=1)
+        close = d2 < radius * radius
+        return self.items[a[close]], self.items[b[close]]
+
+
+def _expand(starts, counts):
+    """Concatenated ranges starts[i] .. starts[i] + counts[i]."""
+    total = int(counts.sum())
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
+
+
+def _cross(starts_a, counts_a, starts_b, counts_b):
+    """Every (row in range a, row in range b) combination for each pair of ranges."""
+    sizes = counts_a * counts_b
+    block = np.repeat(np.arange(len(sizes)), sizes)
+    within = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return starts_a[block] + within // counts_b[block], starts_b[block] + within % counts_b[block]
+
+
+# === Batched simulation ===
+
+def _move_toward(value, amount):
+    return np.sign(value) * np.maximum(np.abs(value) - amount, 0.0)
+
+
+def _enter_chase(mask, variant, rand):
+    variant[mask] = (rand[mask] * 2).astype(np.uint8)  # randi() % 2
+
+
+def tick_ai(population, idx, dt, player, rand):
+    """One zombie_base._physics_process for entities idx (delta dt per entity) with pre-drawn randoms."""
+    p = population
+    pos, vel, yaw = p.position[idx], p.velocity[idx], p.yaw[idx]
+    state, wander, attack, variant = p.state[idx], p.wander_timer[idx], p.attack_timer[idx], p.chase_variant[idx]
+    new_state = state.copy()
+    to_player = player - pos
+    dist = np.sqrt((to_player ** 2).sum(axis=1))
+    sees = dist < DETECTION_RADIUS
+
+    idle = state == IDLE
+    vel[idle, 0] = _move_toward(vel[idle, 0], IDLE_FRICTION * dt[idle])
+    vel[idle, 2] = _move_toward(vel[idle, 2], IDLE_FRICTION * dt[idle])
+    wander[idle] -= dt[idle]
+    turn = idle & (wander <= 0)
+    yaw[turn] += np.radians(90.0 + 180.0 * rand[turn, 0])
+    new_state[turn] = WALK
+    wander[turn] = 3.0 + 3.0 * rand[turn, 1]
+
+    walk = state == WALK
+    vel[walk, 0] = -np.sin(yaw[walk]) * MOVE_SPEED
+    vel[walk, 2] = -np.cos(yaw[walk]) * MOVE_SPEED
+    wander[walk] -= dt[walk]
+    stop = walk & (wander <= 0)
+    new_state[stop] = IDLE
+    wander[stop] = 2.0 + 2.0 * rand[stop, 1]
+
+    spotted = (idle | walk) & sees
+    new_state[spotted] = CHASE
+    _enter_chase(spotted, variant, rand[:, 2])
+
+    chase = state == CHASE
+    lose = chase & (dist > LOSE_INTEREST_RANGE)
+    new_state[lose] = IDLE
+    wander[lose] = 2.0 + 2.0 * rand[lose, 1]
+    reach = chase & ~lose & (dist < ATTACK_RANGE)
+    new_state[reach] = ATTACK
+    run = chase & ~lose & ~reach
+
+    attacking = state == ATTACK
+    back = attacking & (dist > ATTACK_RANGE + 1.0)
+    new_state[back] = CHASE
+    _enter_chase(back, variant, rand[:, 2])
+    hold = attacking & ~back
+
+    face = (run | hold) & (np.hypot(to_player[:, 0], to_player[:, 2]) > 0.01)
+    yaw[face] = np.arctan2(-to_player[face, 0], -to_player[face, 2])  # look_at: -Z toward the player
+    speed = MOVE_SPEED * CHASE_SPEED_MULTIPLIER * np.where(variant[run] == 1, CALM_CHASE_FACTOR, 1.0)
+    direction = to_player[run] / np.maximum(dist[run], 1e-12)[:, None]
+    vel[run, 0] = direction[:, 0] * speed
+    vel[run, 2] = direction[:, 2] * speed
+    vel[hold, 0] = 0.0
+    vel[hold, 2] = 0.0
+    attack[hold] -= dt[hold]
+    strike = hold & (attack <= 0)
+    attack[strike] = ATTACK_COOLDOWN
+    p.attacks += int(strike.sum())
+
+    pos[:, 0] += vel[:, 0] * dt
+    pos[:, 2] += vel[:, 2] * dt
+    p.position[idx], p.velocity[idx], p.yaw[idx] = pos, vel, yaw
+    p.state[idx], p.wander_timer[idx], p.attack_timer[idx], p.chase_variant[idx] = new_state, wander, attack, variant
+
+
+def retrigger_state(population, idx, rand):
+    """_unfreeze_entity: change_state(current) after clearing it, which re-rolls timers / chase variant."""
+    state = population.state[idx]
+    idle, walk, chase = state == IDLE, state == WALK, state == CHASE
+    population.wander_timer[idx[idle]] = 2.0 + 2.0 * rand[idle, 3]
+    population.wander_timer[idx[walk]] = 3.0 + 3.0 * rand[walk, 3]
+    population.chase_variant[idx[chase]] = (rand[chase, 4] * 2).astype(np.uint8)
+
+
+def lod_interval(distance, lod=TICK_LOD):
+    interval = np.full(len(distance), lod[-1][1], dtype=np.int64)
+    for limit, frames in reversed(lod):
+        interval[distance <= limit] = frames
+    return interval
+
+
+class Simulator:
+    """Batched EntityManager + zombie AI over a Population."""
+
+    def __init__(self, population, lod=TICK_LOD, max_entities=None, cell_size=HASH_CELL, seed=0):
+        self.population = population
+        self.lod = lod  # None ticks every active entity every frame
+        self.max_entities = max_entities  # None = no cap (the game uses MAX_ENTITIES)
+        self.rng = np.random.default_rng(seed)
+        self.frame = 0
+        self.dormant_hash = SpatialHash(cell_size)
+        self.active_hash = SpatialHash(COLLISION_CELL)
+        self._dormant_dirty = True
+        self.stats = {"ticks": 0, "despawned": 0, "respawned": 0}
+
+    @tracing.traced("tick")
+    def step(self, player, dt=PHYSICS_DT, rand=None):
+        """One physics frame with the viewer at player (x, y, z). Returns the entities ticked."""
+        p = self.population
+        player = np.asarray(player, dtype=np.float64)
+        if rand is None:
+            rand = self.rng.random((len(p), RAND_COLUMNS))
+
+        # _update_entity_proximity
+        tracked = np.flatnonzero(p.zone != ZONE_DORMANT)
+        d2 = ((p.position[tracked] - player) ** 2).sum(axis=1)
+        despawn = tracked[d2 > DESPAWN_RADIUS ** 2]
+        freeze = tracked[(d2 > FREEZE_RADIUS ** 2) & (d2 <= DESPAWN_RADIUS ** 2)]
+        inside = tracked[(d2 <= FREEZE_RADIUS ** 2)]
+        p.zone[despawn] = ZONE_DORMANT
+        p.zone[freeze] = ZONE_FROZEN
+        p.velocity[freeze] = 0.0
+        frozen = inside[p.zone[inside] == ZONE_FROZEN]
+        flat2 = (p.position[frozen, 0] - player[0]) ** 2 + (p.position[frozen, 2] - player[2]) ** 2
+        thaw = frozen[flat2 <= COLLISION_RANGE ** 2]
+        p.zone[thaw] = ZONE_ACTIVE
+        retrigger_state(p, thaw, rand[thaw])
+        if len(despawn):
+            self._dormant_dirty = True
+            self.stats["despawned"] += len(despawn)
+
+        # _check_dormant_respawns
+        if self._dormant_dirty:
+            dormant = np.flatnonzero(p.zone == ZONE_DORMANT)
+            self.dormant_hash.build(p.position[dormant], dormant)
+            self._dormant_dirty = False
+        respawn = np.sort(self.dormant_hash.query_radius(player[0], player[2], min(SPAWN_RADIUS, COLLISION_RANGE)))
+        respawn = respawn[p.zone[respawn] == ZONE_DORMANT]
+        if self.max_entities is not None:
+            respawn = respawn[:max(self.max_entities - len(tracked) + len(despawn), 0)]
+        if len(respawn):
+            p.zone[respawn] = ZONE_FROZEN
+            p.state[respawn] = IDLE
+            p.velocity[respawn] = 0.0
+            p.wander_timer[respawn] = 0.0
+            p.attack_timer[respawn] = 0.0
+            p.health[respawn] = np.where(p.health[respawn] > 0, p.health[respawn], MAX_HEALTH)
+            self._dormant_dirty = True
+            self.stats["respawned"] += len(respawn)
+
+        # Zombie physics for active entities due this frame
+        active = np.flatnonzero(p.zone == ZONE_ACTIVE)
+        if self.lod is None:
+            due = active
+            dt_due = np.full(len(due), dt)
+        else:
+            distance = np.sqrt(((p.position[active] - player) ** 2).sum(axis=1))
+            interval = lod_interval(distance, self.lod)
+            on = (self.frame + active) % interval == 0
+            due, dt_due = active[on], interval[on] * dt
+        tick_ai(p, due, dt_due, player, rand[due])
+        self._separate(active, due)
+        self.frame += 1
+        self.stats["ticks"] += len(due)
+        return len(due)
+
+    def _separate(self, active, due):
+        """Push overlapping capsules apart; only entities that moved this frame are pushed."""
+        p = self.population
+        self.active_hash.build(p.position[active], active)
+        a, b = self.active_hash.pairs(2.0 * CAPSULE_RADIUS)
+        moved = np.zeros(len(p), dtype=bool)
+        moved[due] = True
+        keep = moved[a] | moved[b]
+        a, b = a[keep], b[keep]
+        delta = p.position[a][:, [0, 2]] - p.position[b][:, [0, 2]]
+        dist = np.sqrt((delta ** 2).sum(axis=1))
+        ok = dist > 0.0
+        a, b, delta, dist = a[ok], b[ok], delta[ok], dist[ok]
+        push = delta / dist[:, None] * ((2.0 * CAPSULE_RADIUS - dist) * 0.5)[:, None]
+        shift = np.zeros((len(p), 2))
+        np.add.at(shift, a[moved[a]], push[moved[a]])
+        np.add.at(shift, b[moved[b]], -push[moved[b]])
+        p.position[:, 0] += shift[:, 0]
+        p.position[:, 2] += shift[:, 1]
+
+
+# === Per-entity reference ===
+
+def tick_zombie(p, i, dt, player, r):
+    """zombie_base._physics_process for one entity, written like the GDScript."""
+    px, py, pz = p.position[i]
+    dx, dy, dz = player[0] - px, player[1] - py, player[2] - pz
+    dist = math.sqrt(dx * dx + dy * dy + dz * dz)
+    state = int(p.state[i])
+    vx, vz = float(p.velocity[i, 0]), float(p.velocity[i, 2])
+
+    def change(new):
+        nonlocal state
+        if new == state:
+            return
+        state = new
+        if new == IDLE:
+            p.wander_timer[i] = 2.0 + 2.0 * r[1]
+        elif new == WALK:
+            p.wander_timer[i] = 3.0 + 3.0 * r[1]
+        elif new == CHASE:
+            p.chase_variant[i] = int(r[2] * 2)
+
+    def face():
+        if math.hypot(dx, dz) > 0.01:
+            p.yaw[i] = math.atan2(-dx, -dz)
+
+    if state == IDLE:
+        vx = math.copysign(max(abs(vx) - IDLE_FRICTION * dt, 0.0), vx)
+        vz = math.copysign(max(abs(vz) - IDLE_FRICTION * dt, 0.0), vz)
+        p.wander_timer[i] -= dt
+        if p.wander_timer[i] <= 0:
+            p.yaw[i] += math.radians(90.0 + 180.0 * r[0])
+            change(WALK)
+        if dist < DETECTION_RADIUS:
+            change(CHASE)
+    elif state == WALK:
+        vx, vz = -math.sin(p.yaw[i]) * MOVE_SPEED, -math.cos(p.yaw[i]) * MOVE_SPEED
+        p.wander_timer[i] -= dt
+        if p.wander_timer[i] <= 0:
+            change(IDLE)
+        if dist < DETECTION_RADIUS:
+            change(CHASE)
+    elif state == CHASE:
+        if dist > LOSE_INTEREST_RANGE:
+            change(IDLE)
+        elif dist < ATTACK_RANGE:
+            change(ATTACK)
+        else:
+            face()
+            speed = MOVE_SPEED * CHASE_SPEED_MULTIPLIER * (CALM_CHASE_FACTOR if p.chase_variant[i] == 1 else 1.0)
+            vx, vz = dx / dist * speed, dz / dist * speed
+    elif state == ATTACK:
+        if dist > ATTACK_RANGE + 1.0:
+            change(CHASE)
+        else:
+            face()
+            vx = vz = 0.0
+            p.attack_timer[i] -= dt
+            if p.attack_timer[i] <= 0:
+                p.attacks += 1
+                p.attack_timer[i] = ATTACK_COOLDOWN
+    p.state[i] = state
+    p.velocity[i, 0], p.velocity[i, 2] = vx, vz
+    p.position[i, 0] += vx * dt
+    p.position[i, 2] += vz * dt
+
+
+def naive_step(p, player, rand, dt=PHYSICS_DT, max_entities=None):
+    """One frame the way the game runs it: per-entity loops, every active entity every frame."""
+    px, py, pz = player
+    tracked = [i for i in range(len(p)) if p.zone[i] != ZONE_DORMANT]
+    for i in tracked:
+        d2 = (p.position[i, 0] - px) ** 2 + (p.position[i, 1] - py) ** 2 + (p.position[i, 2] - pz) ** 2
+        if d2 > DESPAWN_RADIUS ** 2:
+            p.zone[i] = ZONE_DORMANT
+        elif d2 > FREEZE_RADIUS ** 2:
+            p.zone[i] = ZONE_FROZEN
+            p.velocity[i] = 0.0
+        elif p.zone[i] == ZONE_FROZEN and math.hypot(p.position[i, 0] - px, p.position[i, 2] - pz) <= COLLISION_RANGE:
+            p.zone[i] = ZONE_ACTIVE
+            if p.state[i] == IDLE:
+                p.wander_timer[i] = 2.0 + 2.0 * rand[i, 3]
+            elif p.state[i] == WALK:
+                p.wander_timer[i] = 3.0 + 3.0 * rand[i, 3]
+            elif p.state[i] == CHASE:
+                p.chase_variant[i] = int(rand[i, 4] * 2)
+    count = sum(1 for i in range(len(p)) if p.zone[i] != ZONE_DORMANT)
+    for i in range(len(p)):
+        if p.zone[i] != ZONE_DORMANT:
+            continue
+        if max_entities is not None and count >= max_entities:
+            break
+        if math.hypot(p.position[i, 0] - px, p.position[i, 2] - pz) <= min(SPAWN_RADIUS, COLLISION_RANGE):
+            p.zone[i] = ZONE_FROZEN
+            p.state[i] = IDLE
+            p.velocity[i] = 0.0
+            p.wander_timer[i] = p.attack_timer[i] = 0.0
+            p.health[i] = p.health[i] if p.health[i] > 0 else MAX_HEALTH
+            count += 1
+    active = [i for i in range(len(p)) if p.zone[i] == ZONE_ACTIVE]
+    for i in active:
+        tick_zombie(p, i, dt, player, rand[i])
+    shift = {}
+    for n, i in enumerate(active):
+        for j in active[n + 1:]:
+            ddx, ddz = p.position[i, 0] - p.position[j, 0], p.position[i, 2] - p.position[j, 2]
+            dist = math.sqrt(ddx * ddx + ddz * ddz)
+            if 0.0 < dist < 2.0 * CAPSULE_RADIUS:
+                push = (2.0 * CAPSULE_RADIUS - dist) * 0.5 / dist
+                sx, sz = shift.get(i, (0.0, 0.0))
+                shift[i] = (sx + ddx * push, sz + ddz * push)
+                sx, sz = shift.get(j, (0.0, 0.0))
+                shift[j] = (sx - ddx * push, sz - ddz * push)
+    for i, (sx, sz) in shift.items():
+        p.position[i, 0] += sx
+        p.position[i, 2] += sz
+    return len(active)
+
+
+# === Scenarios, checks and benchmarks ===
+
+@tracing.traced("read")
+def load_entities_save(path):
+    """(entities section, player position or None) of a save_manager_v2 JSON file or a bare get_save_data() dump."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    player = data.get("player", {}).get("position")
+    return data.get("entities", data), player
+
+
+def synthetic_save_data(count, radius=150.0, seed=0, params=tr.DEFAULT_PARAMS):
+    """An entities section with count zombies spread over a disc, standing on the reference terrain."""
+    rng = np.random.default_rng(seed)
+    r = radius * np.sqrt(rng.random(count))
+    angle = rng.uniform(0.0, 2.0 * math.pi, count)
+    x, z = r * np.cos(angle), r * np.sin(angle)
+    y = tr.get_terrain_height(x, z, params).astype(np.float64) + 1.5  # spawn height above the raycast hit
+    rotation = rng.uniform(-math.pi, math.pi, count)
+    span = int(math.ceil(radius / tr.CHUNK_STRIDE))
+    return {
+        "entities": [{"position": [a, b, c], "rotation": d, "scene_path": ZOMBIE_SCENE}
+                     for a, b, c, d in zip(x.tolist(), y.tolist(), z.tolist(), rotation.tolist())],
+        "spawned_chunks": [[cx, cz] for cx in range(-span, span) for cz in range(-span, span)],
+    }
+
+
+def player_path(frames, center=(0.0, 0.0, 0.0), radius=40.0, speed=5.0, params=tr.DEFAULT_PARAMS):
+    """Viewer positions per frame: a circle around center at walking speed, on the terrain."""
+    angle = np.arange(frames) * PHYSICS_DT * speed / radius
+    x = center[0] + radius * np.cos(angle)
+    z = center[2] + radius * np.sin(angle)
+    y = tr.get_terrain_height(x, z, params).astype(np.float64) + 1.0
+    return np.stack([x, y, z], axis=1)
+
+
+def verify_hash(seed=0, count=3000):
+    """SpatialHash radius queries and pairs against brute force."""
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-60.0, 60.0, (count, 3))
+    positions[: count // 10, [0, 2]] = rng.uniform(-2.0, 2.0, (count // 10, 2))  # a dense clump
+    items = np.arange(count) * 3 + 7
+    grid = SpatialHash()
+    grid.build(positions, items)
+    problems = []
+    for x, z, radius in ((0.0, 0.0, 5.0), (-59.0, 31.0, 20.0), (12.3, -7.7, 50.0), (500.0, 0.0, 10.0)):
+        d2 = (positions[:, 0] - x) ** 2 + (positions[:, 2] - z) ** 2
+        if set(grid.query_radius(x, z, radius).tolist()) != set(items[d2 <= radius * radius].tolist()):
+            problems.append(f"query_radius({x}, {z}, {radius})")
+    a, b = grid.pairs(2.0 * CAPSULE_RADIUS)
+    found = {(min(i, j), max(i, j)) for i, j in zip(a.tolist(), b.tolist())}
+    xz = positions[:, [0, 2]]
+    d2 = ((xz[:, None, :] - xz[None, :, :]) ** 2).sum(axis=2)
+    i, j = np.nonzero(np.triu(d2 < (2.0 * CAPSULE_RADIUS) ** 2, 1))
+    if found != set(zip(items[i].tolist(), items[j].tolist())) or len(found) != len(a):
+        problems.append("pairs")
+    return problems
+
+
+@tracing.traced("verify")
+def verify_step(data, frames=240, seed=0):
+    """Batched step (no tick LOD) against the per-entity loop with the same random draws."""
+    batched, reference = Population.from_save_data(data), Population.from_save_data(data)
+    path = player_path(frames)
+    sim = Simulator(batched, lod=None)
+    rng = np.random.default_rng(seed)
+    for frame in range(frames):
+        rand = rng.random((len(batched), RAND_COLUMNS))
+        sim.step(path[frame], rand=rand)
+        naive_step(reference, path[frame], rand)
+        if not (np.array_equal(batched.zone, reference.zone) and np.array_equal(batched.state, reference.state)):
+            return [f"zone / state differs at frame {frame}"]
+        error = np.abs(batched.position - reference.position).max(initial=0.0)
+        if error > 1e-6:
+            return [f"positions differ by {error:.2e} at frame {frame}"]
+    if batched.attacks != reference.attacks:
+        return [f"attack count {batched.attacks} != {reference.attacks}"]
+    return []
+
+
+def verify_roundtrip(data):
+    """Save section -> Population -> save section keeps every entity field."""
+    restored = Population.from_save_data(data).to_save_data()
+    expected = [{k: v for k, v in item.items()} for item in data.get("entities", [])]
+    problems = []
+    if restored["entities"] != expected:
+        problems.append("entities")
+    if restored["spawned_chunks"] != [list(c[:2]) for c in data.get("spawned_chunks", [])]:
+        problems.append("spawned_chunks")
+    return problems
+
+
+@tracing.traced("benchmark")
+def benchmark(data, frames, naive_frames, seed=0, center=(0.0, 0.0, 0.0)):
+    """ms per frame for the batched step with / without tick LOD and for the per-entity loop."""
+    path = player_path(max(frames, naive_frames), center)
+    results = {}
+    for label, lod in (("lod", TICK_LOD), ("full", None)):
+        population = Population.from_save_data(data)
+        sim = Simulator(population, lod=lod, seed=seed)
+        start = time.perf_counter()
+        for frame in range(frames):
+            sim.step(path[frame])
+        elapsed = time.perf_counter() - start
+        results[label] = {
+            "ms": elapsed / frames * 1000.0,
+            "ticks": sim.stats["ticks"] / frames,
+            "tracked": int((population.zone != ZONE_DORMANT).sum()),
+            "active": int((population.zone == ZONE_ACTIVE).sum()),
+        }
+    if naive_frames:
+        population = Population.from_save_data(data)
+        rng = np.random.default_rng(seed)
+        start = time.perf_counter()
+        for frame in range(naive_frames):
+            naive_step(population, path[frame], rng.random((len(population), RAND_COLUMNS)))
+        results["naive_ms"] = (time.perf_counter() - start) / naive_frames * 1000.0
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the zombie population in batches and benchmark it.")
+    parser.add_argument("--save", type=Path, help="save_manager_v2 JSON (or a get_save_data() dump) to replay")
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="synthetic population sizes (ignored with --save)")
+    parser.add_argument("--frames", type=int, default=300, help="physics frames per run")
+    parser.add_argument("--naive-frames", type=int, default=30, help="frames of the per-entity loop (0 = skip)")
+    parser.add_argument("--out", type=Path, help="write the entities section after the --save replay here")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    problems = verify_hash(args.seed)
+    check_data = synthetic_save_data(300, radius=70.0, seed=args.seed)
+    problems += verify_step(check_data, seed=args.seed)
+    print(f"[ENTITY_SIM] Check spatial hash vs brute force, batched step vs per-entity loop: "
+          f"{'OK' if not problems else '; '.join(problems)}")
+
+    if args.save:
+        data, player = load_entities_save(args.save)
+        runs = [(str(args.save), data, tuple(player) if player else (0.0, 0.0, 0.0))]
+    else:
+        runs = [(f"{count} zombies", synthetic_save_data(count, seed=args.seed), (0.0, 0.0, 0.0))
+                for count in args.counts]
+
+    for label, data, center in runs:
+        roundtrip = verify_roundtrip(data)
+        problems += roundtrip
+        bench = benchmark(data, args.frames, args.naive_frames, args.seed, center)
+        lod, full = bench["lod"], bench["full"]
+        naive = f", per-entity loop {bench['naive_ms']:.2f} ms" if "naive_ms" in bench else ""
+        print(f"[ENTITY_SIM] {label}: {lod['tracked']} tracked / {lod['active']} active after {args.frames} frames; "
+              f"batched {full['ms']:.2f} ms/frame ({full['ticks']:.0f} ticks), "
+              f"with tick LOD {lod['ms']:.2f} ms/frame ({lod['ticks']:.0f} ticks){naive}; "
+              f"save round trip {'OK' if not roundtrip else 'FAILED ' + ', '.join(roundtrip)}")
+
+    if args.save and args.out:
+        population = Population.from_save_data(runs[0][1])
+        sim = Simulator(population, seed=args.seed)
+        for position in player_path(args.frames, runs[0][2]):
+            sim.step(position)
+        args.out.write_text(json.dumps(population.to_save_data(), indent="\t"), encoding="utf-8")
+        print(f"[ENTITY_SIM] Entities after replay written to {args.out}")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
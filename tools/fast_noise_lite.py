@@ -0,0 +1,164 @@
+"""
+CPU reference of Godot's FastNoiseLite resource (2D, default settings).
+
+vegetation_manager.gd and prefab_spawner.gd create FastNoiseLite.new() and
+only change seed and frequency, so everything uses Godot's defaults:
+TYPE_SIMPLEX_SMOOTH (OpenSimplex2S), FRACTAL_FBM, 5 octaves, lacunarity 2,
+gain 0.5, weighted strength 0, no domain warp, zero offset.
+
+This is a vectorized float32 port of FastNoiseLite.h (GetNoise 2D,
+GenFractalFBm, SingleOpenSimplex2S). Godot builds with single-precision
+real_t, so FastNoiseLite's FNfloat is float and every step here is float32;
+results agree with the engine to within float rounding (compiler FMA
+contraction can move the last bit).
+"""
+import numpy as np
+
+PRIME_X = np.int32(501125321)
+PRIME_Y = np.int32(1136930381)
+HASH_MULTIPLIER = np.int32(0x27d4eb2d)
+
+# FastNoiseLite::Lookup::Gradients2D: 24 directions repeated 5 times, then 8 more
+_GRADIENTS_24 = [
+    0.130526192220052, 0.99144486137381, 0.38268343236509, 0.923879532511287, 0.608761429008721, 0.793353340291235, 0.793353340291235, 0.608761429008721,
+    0.923879532511287, 0.38268343236509, 0.99144486137381, 0.130526192220051, 0.99144486137381, -0.130526192220051, 0.923879532511287, -0.38268343236509,
+    0.793353340291235, -0.60876142900872, 0.608761429008721, -0.793353340291235, 0.38268343236509, -0.923879532511287, 0.130526192220052, -0.99144486137381,
+    -0.130526192220052, -0.99144486137381, -0.38268343236509, -0.923879532511287, -0.608761429008721, -0.793353340291235, -0.793353340291235, -0.608761429008721,
+    -0.923879532511287, -0.38268343236509, -0.99144486137381, -0.130526192220052, -0.99144486137381, 0.130526192220051, -0.923879532511287, 0.38268343236509,
+    -0.793353340291235, 0.608761429008721, -0.608761429008721, 0.793353340291235, -0.38268343236509, 0.923879532511287, -0.130526192220052, 0.99144486137381,
+]
+_GRADIENTS_TAIL = [
+    0.38268343236509, 0.923879532511287, 0.923879532511287, 0.38268343236509, 0.923879532511287, -0.38268343236509, 0.38268343236509, -0.923879532511287,
+    -0.38268343236509, -0.923879532511287, -0.923879532511287, -0.38268343236509, -0.923879532511287, 0.38268343236509, -0.38268343236509, 0.923879532511287,
+]
+GRADIENTS_2D = np.array(_GRADIENTS_24 * 5 + _GRADIENTS_TAIL, dtype=np.float32)
+
+_F = np.float32
+SQRT3 = _F(1.7320508075688772935274463415059)
+F2 = _F(0.5) * (SQRT3 - _F(1))
+G2 = (_F(3) - SQRT3) / _F(6)
+TWO_THIRDS = _F(2.0) / _F(3.0)
+A1_SCALE = _F(2) * (_F(1) - _F(2) * G2) * (_F(1) / G2 - _F(2))
+A1_BIAS = _F(-2) * (_F(1) - _F(2) * G2) * (_F(1) - _F(2) * G2)
+ONE_MINUS_2G2 = _F(1) - _F(2) * G2
+OS2S_SCALE = _F(18.24196194486065)
+
+
+def fast_floor(f):
+    """FastFloor: note it returns f - 1 for negative whole numbers, like the C++ code."""
+    truncated = f.astype(np.int32)
+    return np.where(f >= 0, truncated, truncated - np.int32(1))
+
+
+def grad_coord(seed, x_primed, y_primed, xd, yd):
+    h = (seed ^ x_primed ^ y_primed) * HASH_MULTIPLIER
+    h ^= h >> np.int32(15)
+    h &= np.int32(127 << 1)
+    return xd * GRADIENTS_2D[h] + yd * GRADIENTS_2D[h | 1]
+
+
+def _corner(x, y, seed, i, j):
+    """(2/3 - x^2 - y^2)^4 * grad, zero outside the kernel."""
+    a = TWO_THIRDS - x * x - y * y
+    return np.where(a > 0, (a * a) * (a * a) * grad_coord(seed, i, j, x, y), _F(0))
+
+
+def single_open_simplex2s(seed, x, y):
+    """SingleOpenSimplex2S for already skewed float32 coordinates."""
+    seed = np.int32(seed)
+    i = fast_floor(x)
+    j = fast_floor(y)
+    xi = (x - i.astype(np.float32)).astype(np.float32)
+    yi = (y - j.astype(np.float32)).astype(np.float32)
+
+    i = i * PRIME_X
+    j = j * PRIME_Y
+    i1 = i + PRIME_X
+    j1 = j + PRIME_Y
+
+    t = (xi + yi) * G2
+    x0 = xi - t
+    y0 = yi - t
+
+    a0 = TWO_THIRDS - x0 * x0 - y0 * y0
+    value = (a0 * a0) * (a0 * a0) * grad_coord(seed, i, j, x0, y0)
+
+    a1 = A1_SCALE * t + (A1_BIAS + a0)
+    x1 = x0 - ONE_MINUS_2G2
+    y1 = y0 - ONE_MINUS_2G2
+    value = value + (a1 * a1) * (a1 * a1) * grad_coord(seed, i1, j1, x1, y1)
+
+    xmyi = xi - yi
+    upper = t > G2
+
+    # t > G2 branch
+    far_x = xi + xmyi > 1
+    up_a = np.where(far_x,
+                    _corner(x0 + (_F(3) * G2 - _F(2)), y0 + (_F(3) * G2 - _F(1)), seed, i + (PRIME_X << 1), j + PRIME_Y),
+                    _corner(x0 + G2, y0 + (G2 - _F(1)), seed, i, j + PRIME_Y))
+    far_y = yi - xmyi > 1
+    up_b = np.where(far_y,
+                    _corner(x0 + (_F(3) * G2 - _F(1)), y0 + (_F(3) * G2 - _F(2)), seed, i + PRIME_X, j + (PRIME_Y << 1)),
+                    _corner(x0 + (G2 - _F(1)), y0 + G2, seed, i + PRIME_X, j))
+
+    # t <= G2 branch
+    back_x = xi + xmyi < 0
+    low_a = np.where(back_x,
+                     _corner(x0 + (_F(1) - G2), y0 - G2, seed, i - PRIME_X, j),
+                     _corner(x0 + (G2 - _F(1)), y0 + G2, seed, i + PRIME_X, j))
+    back_y = yi < xmyi
+    low_b = np.where(back_y,
+                     _corner(x0 - G2, y0 - (G2 - _F(1)), seed, i, j - PRIME_Y),
+                     _corner(x0 + G2, y0 + (G2 - _F(1)), seed, i, j + PRIME_Y))
+
+    value = value + np.where(upper, up_a, low_a)
+    value = value + np.where(upper, up_b, low_b)
+    return (value * OS2S_SCALE).astype(np.float32)
+
+
+class FastNoiseLite:
+    """Godot FastNoiseLite with default settings; only seed and frequency are configurable."""
+
+    def __init__(self, seed=0, frequency=0.01, octaves=5, lacunarity=2.0, gain=0.5):
+        self.seed = int(seed)
+        self.frequency = float(frequency)
+        self.octaves = int(octaves)
+        self.lacunarity = float(lacunarity)
+        self.gain = float(gain)
+
+    def fractal_bounding(self):
+        gain = _F(abs(self.gain))
+        amp = gain
+        amp_fractal = _F(1.0)
+        for _ in range(1, self.octaves):
+            amp_fractal = amp_fractal + amp
+            amp = amp * gain
+        return _F(1) / amp_fractal
+
+    def get_noise_2d(self, x, y):
+        """Noise in [-1, 1] for arrays of world positions (FastNoiseLite.get_noise_2d)."""
+        x = np.asarray(x, dtype=np.float32) * _F(self.frequency)
+        y = np.asarray(y, dtype=np.float32) * _F(self.frequency)
+        x, y = np.broadcast_arrays(x, y)
+        # TransformNoiseCoordinate: OpenSimplex2 skew
+        t = (x + y) * F2
+        x = x + t
+        y = y + t
+
+        # GenFractalFBm (weighted strength 0, so the amplitude only follows gain)
+        total = np.zeros(x.shape, dtype=np.float32)
+        amp = self.fractal_bounding()
+        seed = self.seed
+        for _ in range(self.octaves):
+            # Hashing relies on int32 wraparound; numpy only warns about it for scalar inputs
+            with np.errstate(over="ignore"):
+                total = total + single_open_simplex2s(_wrap_int32(seed), x, y) * amp
+            seed += 1
+            x = x * _F(self.lacunarity)
+            y = y * _F(self.lacunarity)
+            amp = amp * _F(self.gain)
+        return total
+
+
+def _wrap_int32(value):
+    return np.int32(((value + 2**31) % 2**32) - 2**31)
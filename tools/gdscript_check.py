@@ -0,0 +1,370 @@
+"""
+Static GDScript checker: syntax and reference errors without launching Godot.
+
+quick_check_project_syntax_errors.py runs the game for a few seconds to
+surface parse errors and needs a Windows Godot install. This tool parses
+every .gd file with gdscript_parser.py and reports:
+
+    syntax     tokenizer / parser errors, mixed tab / space indentation,
+               non-constant preload() arguments
+    paths      preload / load / ResourceLoader.load / change_scene_to_file /
+               extends "..." literals that do not exist (res:// and
+               script-relative paths)
+    types      type hints, `is` / `as`, extends targets and typed arrays naming
+               something that is neither an engine class, a class_name, an
+               autoload nor declared in the script or its base scripts
+    names      PascalCase identifiers (autoloads such as DebugManager,
+               SaveManager, PerformanceMonitor, class names) that resolve to
+               nothing in the same scopes
+    project    missing autoload scripts, duplicate class_name, class_name
+               shadowing an engine class or an autoload
+
+Per-file parse results are cached in tools/.cache/gdscript_check.json keyed
+by a content hash of the script (and of the parser source), so a warm run only
+hashes files and re-runs the cheap cross-file resolution. Cache misses are
+parsed in parallel.
+
+Usage:
+    python tools/gdscript_check.py               # check the whole project
+    python tools/gdscript_check.py --force       # ignore the cache
+    python tools/gdscript_check.py --jobs 1      # parse serially
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import gdscript_parser as gp
+import tracing
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_PATH = PROJECT_ROOT / "tools" / ".cache" / "gdscript_check.json"
+CACHE_VERSION = 1
+SKIP_DIRS = {".git", ".godot", ".import", "__pycache__"}
+PARALLEL_MIN_FILES = 16      # below this, process start-up costs more than parsing
+
+_AUTOLOAD_RE = re.compile(r'^(\w+)\s*=\s*"\*?([^"]*)"', re.M)
+_REGISTER_RE = re.compile(r"register(?:_abstract|_virtual|_runtime|_internal)?_class<(\w+)>"
+                          r"|GDREGISTER(?:_\w+)?_CLASS\((\w+)\)")
+
+
+# === Project scan ===
+
+@tracing.traced("walk")
+def script_files(root):
+    """Sorted .gd files under root, skipping folders Godot ignores (.gdignore)."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if ".gdignore" in filenames and Path(dirpath) != Path(root):
+            dirnames[:] = []
+            continue
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        found.extend(Path(dirpath) / f for f in filenames if f.endswith(".gd"))
+    return sorted(found)
+
+
+def to_res(path, root):
+    return "res://" + Path(path).relative_to(root).as_posix()
+
+
+def project_autoloads(root):
+    """{name: res path} from the [autoload] section of project.godot."""
+    text = (Path(root) / "project.godot").read_text(encoding="utf-8")
+    section = re.search(r"^\[autoload\]\s*$(.*?)(?=^\[|\Z)", text, re.M | re.S)
+    if not section:
+        return {}
+    return {m.group(1): m.group(2) for m in _AUTOLOAD_RE.finditer(section.group(1))}
+
+
+def extension_classes(root):
+    """Classes registered by the project's GDExtension sources."""
+    names = set()
+    for path in sorted((Path(root) / "gdextension").rglob("*.cpp")):
+        for m in _REGISTER_RE.finditer(path.read_text(encoding="utf-8", errors="replace")):
+            names.add(m.group(1) or m.group(2))
+    return names
+
+
+def resolve_res(path, script_res, root):
+    """Filesystem path for a script's load path; None for uid:// and user:// paths."""
+    if path.startswith("res://"):
+        return Path(root) / path[len("res://"):]
+    if "://" in path:
+        return None
+    base = Path(root) / script_res[len("res://"):]
+    return base.parent / path
+
+
+# === Parse cache ===
+
+def parser_stamp():
+    """Cache version: bumps whenever the parser or summary code changes."""
+    raw = Path(gp.__file__).read_bytes()
+    return f"{CACHE_VERSION}-" + hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def content_hash(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def load_cache(path, stamp):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return data.get("files", {}) if data.get("version") == stamp else {}
+
+
+def save_cache(path, stamp, entries):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": stamp, "files": entries}
+    path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+
+
+def summarize_bytes(raw):
+    """Worker entry point: raw file bytes -> gp.summarize() dict."""
+    try:
+        source = raw.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        info = gp.summarize("")
+        info["error"] = {"line": 1, "col": 1, "message": f"File is not valid UTF-8 ({e.reason})."}
+        return info
+    return gp.summarize(source)
+
+
+@tracing.traced("parse")
+def summarize_all(raws, jobs, worker=summarize_bytes):
+    """worker(raw) over every file, in a process pool when there are enough files."""
+    if jobs == 1 or len(raws) < PARALLEL_MIN_FILES:
+        return [worker(raw) for raw in raws]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(worker, raws, chunksize=max(1, len(raws) // (jobs * 4))))
+
+
+@tracing.traced("read")
+def load_summaries(paths, root, jobs, cache_path=CACHE_PATH, force=False):
+    """
+    {res path: summary} for every script, parsing only files whose content
+    hash is not cached. Returns (summaries, stats).
+    """
+    stamp = parser_stamp()
+    cache = {} if force else load_cache(cache_path, stamp)
+    hashes = {}
+    missing = {}
+    for path in paths:
+        raw = path.read_bytes()
+        digest = content_hash(raw)
+        hashes[to_res(path, root)] = digest
+        if digest not in cache and digest not in missing:
+            missing[digest] = raw
+    start = time.perf_counter()
+    parsed = summarize_all(list(missing.values()), jobs) if missing else []
+    parse_seconds = time.perf_counter() - start
+    entries = {digest: cache[digest] for digest in set(hashes.values()) if digest in cache}
+    entries.update(zip(missing, parsed))
+    if missing or len(entries) != len(cache):
+        save_cache(cache_path, stamp, entries)
+    summaries = {res: entries[digest] for res, digest in hashes.items()}
+    stats = {"files": len(paths), "parsed": len(missing), "parse_seconds": parse_seconds,
+             "workers": 1 if jobs == 1 or len(missing) < PARALLEL_MIN_FILES else jobs}
+    return summaries, stats
+
+
+# === Resolution ===
+
+class Resolver:
+    """Cross-file name resolution over all script summaries."""
+
+    def __init__(self, summaries, root, autoloads, extension_names):
+        self.summaries = summaries
+        self.root = Path(root)
+        self.autoloads = autoloads
+        self.class_names = {}
+        for res, info in sorted(summaries.items()):
+            if info["class_name"]:
+                self.class_names.setdefault(info["class_name"], []).append(res)
+        self.globals = (gp.BUILTIN_TYPES | gp.ENGINE_CLASSES | set(extension_names)
+                        | set(self.class_names) | set(autoloads))
+        self._inherited = {}
+
+    def base_script(self, res, extends):
+        """res path of the script an extends entry points at, or None (engine class)."""
+        if extends is None:
+            return None
+        if extends["path"]:
+            target = resolve_res(extends["path"], res, self.root)
+            if target is None or not target.exists():
+                return None
+            return to_res(target, self.root)
+        owners = self.class_names.get(extends["name"].split(".")[0])
+        return owners[0] if owners else None
+
+    def inherited(self, res, _seen=None):
+        """Members declared by every project script res (or its inner classes) extends."""
+        if res in self._inherited:
+            return self._inherited[res]
+        seen = _seen or set()
+        seen.add(res)
+        names = set()
+        info = self.summaries.get(res)
+        if info is not None:
+            for extends in [info["extends"]] + info["inner_extends"]:
+                base = self.base_script(res, extends)
+                if base is None or base in seen or base not in self.summaries:
+                    continue
+                names.update(self.summaries[base]["members"])
+                names.update(self.inherited(base, seen))
+        self._inherited[res] = names
+        return names
+
+    def known(self, res):
+        info = self.summaries[res]
+        return self.globals | set(info["declared"]) | self.inherited(res)
+
+
+@tracing.traced("check")
+def check_project(summaries, root, autoloads, extension_names):
+    """List of (res, line, col, category, message) sorted by file and line."""
+    root = Path(root)
+    resolver = Resolver(summaries, root, autoloads, extension_names)
+    problems = []
+
+    for name, path in sorted(autoloads.items()):
+        target = resolve_res(path, "res://project.godot", root)
+        if target is not None and not target.exists():
+            problems.append(("res://project.godot", 0, 0, "project",
+                             f"Autoload {name} points at missing file {path}"))
+    for name, owners in sorted(resolver.class_names.items()):
+        first = summaries[owners[0]].get("class_name_line", 1)
+        if len(owners) > 1:
+            for res in owners[1:]:
+                problems.append((res, summaries[res].get("class_name_line", 1), 1, "project",
+                                 f'class_name "{name}" is already used by {owners[0]}'))
+        if name in gp.ENGINE_CLASSES or name in gp.BUILTIN_TYPES:
+            problems.append((owners[0], first, 1, "project",
+                             f'class_name "{name}" shadows an engine class'))
+        if name in autoloads:
+            problems.append((owners[0], first, 1, "project",
+                             f'class_name "{name}" hides the autoload singleton "{name}"'))
+
+    for res, info in sorted(summaries.items()):
+        error = info["error"]
+        if error:
+            problems.append((res, error["line"], error["col"], "syntax", error["message"]))
+            continue
+        for line, col, message in info["problems"]:
+            problems.append((res, line, col, "syntax", message))
+        for path, line, col, _ in info["paths"]:
+            target = resolve_res(path, res, root)
+            if target is not None and not target.exists():
+                problems.append((res, line, col, "paths", f'Resource not found: "{path}"'))
+        known = resolver.known(res)
+        for name, line, col in info["types"]:
+            if name not in known:
+                problems.append((res, line, col, "types",
+                                 f'Unknown type "{name}" (not an engine class, class_name '
+                                 f"or autoload)"))
+        for name, line, col in info["names"]:
+            if name not in known:
+                problems.append((res, line, col, "names",
+                                 f'Identifier "{name}" not declared in the current scope '
+                                 f"(not a class_name, autoload or engine class)"))
+    problems.sort(key=lambda p: (p[0], p[1], p[2]))
+    return problems
+
+
+# === Self-check ===
+
+PARSER_CASES_OK = (
+    "extends Node\nvar a := 1\nfunc f(x: int = 2) -> void:\n\tif x > 1:\n\t\tpass\n"
+    "\telif x:\n\t\treturn\n\telse:\n\t\tprint(x)\n",
+    "var x: int = 5:\n\tset(v):\n\t\tx = v\n\tget:\n\t\treturn x\nvar y: int: set = _s, get = _g\n",
+    "func f():\n\tvar g = func(a):\n\t\treturn a\n\tfoo(func():\n\t\tbar()\n\t)\n\tmatch x:\n"
+    "\t\t1, 2:\n\t\t\tpass\n\t\t[var a, ..]:\n\t\t\tpass\n\t\t{\"k\": var v} when v > 1:\n"
+    "\t\t\tpass\n\t\t_:\n\t\t\tpass\n",
+    "func f():\n\tvar n = $A/B.text + %U.name + $\"../x\"\n\tvar d = {a = 1, \"b\": 2,}\n"
+    "\tvar t: Array[int] = []\n\tif x is not Node and y not in z: pass\n"
+    "\tvar q = 2 ** -1 if a else b as int\n\tfor i: int in range(3): print(i)\n",
+    "@tool\nclass_name Foo extends Node\n@export_range(0, 1) var z = 0.5\nenum {A, B = -1,}\n"
+    "signal s(a: int)\nstatic func g(): return 1\nclass In extends RefCounted:\n\tvar k\n"
+    "\tfunc m(): pass\n\nfunc after():\n\tawait get_tree().process_frame\n\ta = \\\n\t\t3\n",
+)
+PARSER_CASES_BAD = (
+    ("func f()\n\tpass\n", 1),
+    ("func f():\npass\n", 2),
+    ("func f():\n\tvar x = (1 + \n", 3),
+    ("func f():\n\tif x:\n\t\tpass\n\t  else:\n\t\tpass\n", 4),
+    ("var x = 'abc\n", 1),
+    ("func f():\n\tx = = 3\n", 2),
+    ("func f():\n    pass\nfunc g():\n\tpass\n", 4),
+    ("func f():\n\tvar 1x = 2\n", 2),
+    ("class A:\nvar x\n", 2),
+    ("func f():\n\tif x\n\t\tpass\n", 2),
+    ("func f():\n\t3 = x\n", 2),
+)
+
+
+@tracing.traced("self-check")
+def verify_parser():
+    """Known-good snippets must parse; known-bad ones must fail on the right line."""
+    failures = []
+    for source in PARSER_CASES_OK:
+        try:
+            gp.parse(source)
+        except gp.GDScriptSyntaxError as e:
+            failures.append(f"rejected valid code ({e}): {source[:40]!r}")
+    for source, line in PARSER_CASES_BAD:
+        try:
+            gp.parse(source)
+            failures.append(f"accepted invalid code: {source!r}")
+        except gp.GDScriptSyntaxError as e:
+            if e.line != line:
+                failures.append(f"error on line {e.line}, expected {line}: {source!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check GDScript syntax and references without Godot.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="ignore the parse cache")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    failures = verify_parser()
+    if failures:
+        for failure in failures:
+            print(f"[GD_CHECK] PARSER SELF-CHECK FAILED: {failure}")
+        return 1
+
+    root = args.root.resolve()
+    jobs = args.jobs or os.cpu_count() or 1
+    paths = script_files(root)
+    summaries, stats = load_summaries(paths, root, jobs, args.cache, args.force)
+    problems = check_project(summaries, root, project_autoloads(root), extension_classes(root))
+    elapsed = time.perf_counter() - start
+
+    for res, line, col, category, message in problems:
+        print(f"[GD_CHECK] {res}:{line}:{col}: {category}: {message}")
+    counts = {}
+    for problem in problems:
+        counts[problem[3]] = counts.get(problem[3], 0) + 1
+    detail = ", ".join(f"{n} {c}" for c, n in sorted(counts.items())) or "no problems"
+    print(f"[GD_CHECK] {stats['files']} scripts ({stats['files'] - stats['parsed']} cached, "
+          f"{stats['parsed']} parsed in {stats['parse_seconds'] * 1000:.0f} ms on "
+          f"{stats['workers']} workers), checked in {elapsed * 1000:.0f} ms: {detail}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+"""
+Project-wide GDScript symbol index: definitions and usages from parsed scripts.
+
+Replaces grepping the .gd files for "who calls terrain_manager.get_terrain_height"
+or "who connects to PlayerSignals". Every script is parsed with
+gdscript_parser.py and reduced to:
+
+    defs    class_name, extends, func (static), signal, const, enum, inner
+            class, member var and @export var, with line numbers
+    uses    call       receiver.method(...) and bare method(...) calls
+            connect    receiver.signal.connect(...) / connect("signal", ...)
+            emit       receiver.signal.emit(...) / emit_signal("signal")
+            dynamic    method or signal names passed as strings to call,
+                       call_deferred, has_method, has_signal, Callable(...)
+            attr       receiver.member reads / writes on a named receiver
+            ref        class_name, autoload and engine class identifiers
+            each with its enclosing function, so hot-path audits can follow
+            call sites back to _process / signal handlers
+    types   what each variable refers to: its declared class, or the
+            preload(...) / X.new() it is initialised or assigned from
+
+A "receiver.member" query matches the receiver text at the use site, i.e.
+the variable name (terrain_manager.get_terrain_height, player.terrain_manager
+...), not the script it holds. When receiver is a class_name or a res://
+script path, uses through variables resolved to that script by their type,
+preload const or .new() also match; variables typed Node or filled from
+get_node / groups stay unresolved (chunk_manager.gd has no class_name, so
+its callers are found by variable name or bare method name).
+
+The index lives in tools/.cache/gdscript_index.json. Each run re-hashes the
+scripts and re-parses only the files whose content changed (in parallel),
+drops deleted files and answers queries from the loaded index.
+
+Usage:
+    python tools/gdscript_index.py                                   # update, print stats
+    python tools/gdscript_index.py --def get_terrain_height
+    python tools/gdscript_index.py --uses terrain_manager.get_terrain_height
+    python tools/gdscript_index.py --uses BuildingAPIV2.place_block  # typed / .new() receivers
+    python tools/gdscript_index.py --uses PlayerSignals --kind connect
+    python tools/gdscript_index.py --uses DebugSettings --json       # exact columns for refactors
+    python tools/gdscript_index.py --file res://vegetation_manager.gd
+"""
+import argparse
+import json
+import os
+import posixpath
+import sys
+import time
+from pathlib import Path
+
+import gdscript_check as gc
+import gdscript_parser as gp
+import tracing
+
+PROJECT_ROOT = gc.PROJECT_ROOT
+INDEX_PATH = PROJECT_ROOT / "tools" / ".cache" / "gdscript_index.json"
+INDEX_VERSION = 2
+
+USE_KINDS = ("call", "connect", "emit", "dynamic", "attr", "ref")
+# Methods whose first string argument names a method or signal.
+DYNAMIC_METHODS = frozenset(("call", "call_deferred", "callv", "has_method", "has_signal",
+                             "is_connected", "disconnect", "rpc", "rpc_id", "set_deferred"))
+
+
+# === Extraction ===
+
+def render(node):
+    """Short source-like text of a receiver expression ("self.chunk_manager", "$Camera3D")."""
+    kind = node.kind
+    if kind == "ident":
+        return node.name
+    if kind in ("self", "super"):
+        return kind
+    if kind == "attr":
+        return f"{render(node.base)}.{node.name}"
+    if kind == "call":
+        return f"{render(node.callee)}()"
+    if kind == "subscript":
+        return f"{render(node.base)}[]"
+    if kind == "node_path":
+        return ("%" if node.unique else "$") + node.path
+    return "<expr>"
+
+
+def _string_arg(args, i):
+    if len(args) > i:
+        return gp._string_literal(args[i])
+    return None
+
+
+class SymbolCollector:
+    """Walks one parse tree, tracking the enclosing inner class and function."""
+
+    def __init__(self):
+        self.defs = []
+        self.uses = []
+        self.types = []
+        self.locals = set()
+
+    def typed(self, function, name, type_node, value):
+        """Record what name refers to: its declared class / preload const, or the value it is given."""
+        target = None
+        if value is not None and value.kind == "preload":
+            path = gp._string_literal(value.path)
+            target = ["preload", path] if path else None
+        elif value is not None and value.kind == "call" and value.callee.kind == "attr" \
+                and value.callee.name == "new":
+            base = value.callee.base
+            if base.kind == "ident":
+                target = ["type", base.name]
+            elif base.kind == "preload" and gp._string_literal(base.path):
+                target = ["preload", gp._string_literal(base.path)]
+        if target is None and type_node is not None:
+            target = ["type", type_node.name]
+        if target is not None:
+            self.types.append([function, name] + target)
+
+    def define(self, kind, name, node, container, extra=""):
+        self.defs.append([kind, name, node.line, container, extra])
+
+    def use(self, kind, name, receiver, line, col, function):
+        self.uses.append([kind, name, receiver, line, col, function])
+
+    def members(self, body, container):
+        for node in body:
+            kind = node.kind
+            if kind == "class_name":
+                self.define("class_name", node.name, node, container)
+                if node.extends is not None:
+                    self.define("extends", node.extends.name or node.extends.path,
+                                node.extends, container)
+            elif kind == "extends":
+                self.define("extends", node.name or node.path, node, container)
+            elif kind == "func":
+                self.define("func", node.name, node, container, "static" if node.static else "")
+                self.locals = set()
+                self.walk(node, node.name)
+            elif kind == "signal":
+                self.define("signal", node.name, node, container,
+                            ", ".join(p.name for p in node.params))
+            elif kind == "const":
+                self.define("const", node.name, node, container)
+                if not container:
+                    self.typed("", node.name, node.type, node.value)
+                self.walk(node, "")
+            elif kind == "enum":
+                self.define("enum", node.name or "", node, container,
+                            ", ".join(v.name for v in node.values))
+            elif kind == "var":
+                exported = [a.name for a in node.annotations if a.name.startswith("export")]
+                self.define("export" if exported else "var", node.name, node, container,
+                            node.type.name if node.type is not None else "")
+                if not container:
+                    self.typed("", node.name, node.type, node.value)
+                self.walk(node, "")
+                for accessor in (node.setter, node.getter):
+                    if accessor is not None and accessor.body is not None:
+                        self.walk(accessor, node.name)
+            elif kind == "class":
+                self.define("class", node.name, node, container,
+                            node.extends.name or node.extends.path if node.extends else "")
+                self.members(node.body, f"{container}.{node.name}" if container else node.name)
+
+    def walk(self, root, function):
+        for child in root.children():
+            self.expression(child, function)
+
+    def expression(self, node, function):
+        """Record uses in node and its subtree; lambdas keep the outer function."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            kind = node.kind
+            if kind == "call":
+                stack.extend(node.args)
+                stack.append(self.call(node, function))
+                continue
+            if kind == "attr":
+                if node.base.kind in ("ident", "self"):
+                    self.use("attr", node.name, render(node.base), node.line, node.col, function)
+            elif kind == "ident":
+                if gp._GLOBAL_NAME_RE.match(node.name):
+                    self.use("ref", node.name, "", node.line, node.col, function)
+            elif kind == "type":
+                name = node.name.split(".")[0]
+                if gp._GLOBAL_NAME_RE.match(name):
+                    self.use("ref", name, "", node.line, node.col, function)
+            elif kind in ("var", "const", "param") and function:
+                self.locals.add(node.name)
+                self.typed(function, node.name, node.type, getattr(node, "value", None))
+            elif kind == "assign" and node.op == "=":
+                target = node.target
+                if target.kind == "attr" and target.base.kind == "self":
+                    self.typed("", target.name, None, node.value)
+                elif target.kind == "ident":
+                    scope = function if target.name in self.locals else ""
+                    self.typed(scope, target.name, None, node.value)
+            stack.extend(node.children())
+
+    def call(self, node, function):
+        """Record one call site; returns the sub-expression still to walk."""
+        callee = node.callee
+        args = node.args
+        if callee.kind == "ident":
+            name, receiver, line, col = callee.name, "", callee.line, callee.col
+        elif callee.kind == "attr":
+            name, receiver, line, col = callee.name, render(callee.base), callee.line, callee.col
+        else:
+            return callee
+        signal = callee.base if callee.kind == "attr" else None
+        if name in ("connect", "emit") and signal is not None and signal.kind in ("ident", "attr") \
+                and _string_arg(args, 0) is None:
+            # sig.connect(handler) / obj.sig.emit(...): the base names the signal.
+            owner = render(signal.base) if signal.kind == "attr" else ""
+            self.use(name, signal.name, owner, signal.line, signal.col, function)
+            return signal.base if signal.kind == "attr" else signal
+        if name in ("connect", "emit_signal"):
+            target = _string_arg(args, 0)
+            if target is not None:
+                self.use("connect" if name == "connect" else "emit", target, receiver,
+                         args[0].line, args[0].col, function)
+        elif name in DYNAMIC_METHODS:
+            target = _string_arg(args, 0)
+            if target == "emit_signal" and _string_arg(args, 1) is not None:
+                self.use("emit", _string_arg(args, 1), receiver, args[1].line, args[1].col,
+                         function)
+            elif target is not None:
+                self.use("dynamic", target, receiver, args[0].line, args[0].col, function)
+        elif name == "Callable" and _string_arg(args, 1) is not None:
+            self.use("dynamic", _string_arg(args, 1), render(args[0]), args[1].line,
+                     args[1].col, function)
+        self.use("call", name, receiver, line, col, function)
+        return callee.base if callee.kind == "attr" else callee
+
+
+def index_bytes(raw):
+    """Worker entry point: raw script bytes -> {error, defs, uses}."""
+    try:
+        tree = gp.parse(raw.decode("utf-8-sig"))
+    except (gp.GDScriptSyntaxError, UnicodeDecodeError) as e:
+        return {"error": str(e), "defs": [], "uses": [], "types": []}
+    collector = SymbolCollector()
+    collector.members(tree.body, "")
+    return {"error": None, "defs": collector.defs, "uses": collector.uses, "types": collector.types}
+
+
+# === Index ===
+
+def load_index(path, stamp):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        return {}
+    return data.get("files", {}) if data.get("version") == stamp else {}
+
+
+@tracing.traced("write")
+def save_index(path, stamp, files):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": stamp, "files": files}
+    path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+
+
+@tracing.traced("index")
+def update_index(root, jobs, index_path=INDEX_PATH, force=False):
+    """
+    Bring the persistent index in line with the scripts on disk.
+    Returns (files, stats); files maps res path -> {hash, error, defs, uses}.
+    """
+    stamp = f"{INDEX_VERSION}-{gc.parser_stamp()}-{gc.content_hash(Path(__file__).read_bytes())}"
+    old = {} if force else load_index(index_path, stamp)
+    files = {}
+    changed = {}
+    for path in gc.script_files(root):
+        res = gc.to_res(path, root)
+        raw = path.read_bytes()
+        digest = gc.content_hash(raw)
+        entry = old.get(res)
+        if entry is not None and entry["hash"] == digest:
+            files[res] = entry
+        else:
+            changed[res] = (digest, raw)
+    start = time.perf_counter()
+    results = gc.summarize_all([raw for _, raw in changed.values()], jobs, worker=index_bytes)
+    parse_seconds = time.perf_counter() - start
+    for (res, (digest, _)), result in zip(changed.items(), results):
+        result["hash"] = digest
+        files[res] = result
+    removed = len(set(old) - set(files))
+    if changed or removed:
+        save_index(index_path, stamp, files)
+    stats = {"files": len(files), "parsed": len(changed), "removed": removed,
+             "parse_seconds": parse_seconds}
+    return files, stats
+
+
+# === Queries ===
+
+@tracing.traced("match")
+def find_defs(files, name):
+    """Definitions named name: dicts with file, line, kind, container, detail."""
+    found = []
+    for res, entry in sorted(files.items()):
+        for kind, def_name, line, container, extra in entry["defs"]:
+            if def_name == name:
+                found.append({"file": res, "line": line, "kind": kind, "name": def_name,
+                              "class": container, "detail": extra})
+    return found
+
+
+def _receiver_matches(receiver, wanted):
+    return receiver == wanted or receiver.endswith("." + wanted)
+
+
+def class_scripts(files):
+    """{global class_name: res path of its script}."""
+    return {name: res for res, entry in files.items()
+            for kind, name, _, container, _ in entry["defs"] if kind == "class_name" and not container}
+
+
+class ReceiverTypes:
+    """Script (res path) a receiver in one file refers to, from the recorded declarations."""
+
+    def __init__(self, res, entry, classes):
+        self.res = res
+        self.classes = classes
+        self.types = {(function, name): (kind, target) for function, name, kind, target in entry["types"]}
+
+    def _target(self, kind, target, depth):
+        if kind == "preload":
+            if target.startswith("res://"):
+                return target
+            if "://" in target:
+                return None
+            base = posixpath.dirname(self.res[len("res://"):])
+            return "res://" + posixpath.normpath(posixpath.join(base, target))
+        if target in self.classes:
+            return self.classes[target]
+        return self.script(target, "", depth + 1)
+
+    def script(self, receiver, function, depth=0):
+        """res path for "name" / "self.name" / a class_name, else None."""
+        if receiver.startswith("self."):
+            receiver, function = receiver[len("self."):], ""
+        name = receiver
+        if not name or "." in name or depth > 4:
+            return None
+        found = self.types.get((function, name)) or self.types.get(("", name))
+        if found is not None:
+            return self._target(*found, depth)
+        return self.classes.get(name)
+
+
+@tracing.traced("match")
+def find_uses(files, query, kinds=USE_KINDS):
+    """
+    Usage sites for query. "receiver.member" matches member uses whose receiver
+    text at the call site is receiver or ends with it (self.chunk_manager,
+    player.chunk_manager, ...): it is a variable name, not a type. When
+    receiver is a class_name or a res:// script path, uses whose receiver is
+    declared with that type, assigned from preload(...) / .new() of it, or a
+    preload const of it match as well, plus the script's own self / bare
+    uses. A bare name matches uses of that member / signal / identifier and,
+    for autoloads and classes, every use with it as the receiver.
+    """
+    receiver_part, _, member = query.rpartition(".")
+    classes = class_scripts(files)
+    wanted = receiver_part if receiver_part.startswith("res://") else classes.get(receiver_part)
+    found = []
+    for res, entry in sorted(files.items()):
+        resolver = ReceiverTypes(res, entry, classes) if wanted else None
+        for kind, name, receiver, line, col, function in entry["uses"]:
+            if kind not in kinds:
+                continue
+            if receiver_part:
+                hit = name == member and (
+                    _receiver_matches(receiver, receiver_part)
+                    or (wanted is not None and kind != "ref"
+                        and (res == wanted and receiver in ("", "self")
+                             or resolver.script(receiver, function) == wanted)))
+            else:
+                hit = name == query or receiver == query or receiver.startswith(query + ".")
+            if hit:
+                found.append({"file": res, "line": line, "col": col, "kind": kind, "name": name,
+                              "receiver": receiver, "function": function})
+    return found
+
+
+def _format_site(site):
+    where = f"{site['file']}:{site['line']}"
+    if "col" in site:
+        target = f"{site['receiver']}.{site['name']}" if site["receiver"] else site["name"]
+        inside = f" in {site['function']}()" if site["function"] else ""
+        return f"{where}:{site['col']}  {site['kind']:<7} {target}{inside}"
+    scope = f"{site['class']}." if site["class"] else ""
+    detail = f" ({site['detail']})" if site["detail"] else ""
+    return f"{where}  {site['kind']:<10} {scope}{site['name']}{detail}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / query the GDScript symbol index.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--def", dest="definition", help="find definitions of a name")
+    parser.add_argument("--uses", help="find usages of name or receiver.member")
+    parser.add_argument("--kind", action="append", choices=USE_KINDS,
+                        help="restrict --uses to these use kinds (repeatable)")
+    parser.add_argument("--file", help="list definitions in one script (res:// path)")
+    parser.add_argument("--json", action="store_true", help="print query results as JSON")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="rebuild the index from scratch")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    jobs = args.jobs or os.cpu_count() or 1
+    files, stats = update_index(root, jobs, args.index, args.force)
+    update_seconds = time.perf_counter() - start
+
+    results = []
+    if args.definition:
+        results += find_defs(files, args.definition)
+    if args.uses:
+        results += find_uses(files, args.uses, tuple(args.kind or USE_KINDS))
+    if args.file:
+        entry = files.get(args.file)
+        if entry is None:
+            print(f"[GD_INDEX] Not indexed: {args.file}")
+            return 1
+        results += [{"file": args.file, "line": line, "kind": kind, "name": name,
+                     "class": container, "detail": extra}
+                    for kind, name, line, container, extra in entry["defs"]]
+    query_seconds = time.perf_counter() - start - update_seconds
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+        return 0
+    for site in results:
+        print(f"[GD_INDEX] {_format_site(site)}")
+    errors = sorted(res for res, entry in files.items() if entry["error"])
+    for res in errors:
+        print(f"[GD_INDEX] Not indexed (syntax error): {res}: {files[res]['error']}")
+    n_defs = sum(len(e["defs"]) for e in files.values())
+    n_uses = sum(len(e["uses"]) for e in files.values())
+    print(f"[GD_INDEX] {stats['files']} scripts, {n_defs} definitions, {n_uses} uses "
+          f"({stats['parsed']} re-parsed, {stats['removed']} removed) updated in "
+          f"{update_seconds * 1000:.0f} ms")
+    if args.definition or args.uses or args.file:
+        print(f"[GD_INDEX] {len(results)} results in {query_seconds * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1383 @@
+"""
+GDScript 2 tokenizer and parser (pure Python, no Godot needed).
+
+Follows the grammar of Godot 4's GDScriptTokenizer / GDScriptParser closely
+enough to reject the same syntax errors in this project's scripts:
+
+    tokens     identifiers, keywords, numbers (0x / 0b / 1_000 / 1e-3), strings
+               ('..', "..", triple-quoted, r"raw", &"StringName", ^"NodePath"),
+               operators, annotations, $Node/Path and %UniqueNode shorthands
+    layout     one NEWLINE token per logical line carrying the indentation of
+               the next line; brackets suppress it (except inside multi-line
+               lambdas), "\\" joins lines, tabs and spaces may not be mixed
+    grammar    class members (extends, class_name, signal, enum, const, var
+               with set/get blocks, static func, inner classes, annotations),
+               statements (if/elif/else, while, for x: T in, match with
+               patterns and `when` guards, return/pass/break/continue),
+               expressions with Godot's operator precedence, lambdas, typed
+               arrays / dictionaries, `is not`, `not in`, await, preload
+
+parse() returns a tree of Node objects; summarize() reduces it to the plain
+JSON-friendly dict used by gdscript_check.py (declarations, type / identifier
+references, preload / load paths).
+
+Usage:
+    import gdscript_parser as gp
+    tree = gp.parse(source)            # raises gp.GDScriptSyntaxError
+    info = gp.summarize(source)        # {"error": ..., "class_name": ..., ...}
+"""
+import re
+
+# === Tokens ===
+
+KEYWORDS = frozenset("""
+    and as await break breakpoint class class_name const continue elif else
+    enum extends for func if in is match not or pass preload return self
+    signal static super var void while true false null PI TAU INF NAN
+""".split())
+
+CONSTANT_KEYWORDS = {"true": True, "false": False, "null": None,
+                     "PI": "PI", "TAU": "TAU", "INF": "INF", "NAN": "NAN"}
+
+OPERATORS = sorted("""
+    **= <<= >>= ... ** << >> == != <= >= && || += -= *= /= %= &= |= ^= -> :=
+    .. + - * / % < > = & | ^ ~ ! . , : ; ( ) [ ] { } $ @
+""".split(), key=len, reverse=True)
+
+ASSIGN_OPS = frozenset("= += -= *= /= %= **= &= |= ^= <<= >>=".split())
+COMPARE_OPS = frozenset("== != < > <= >=".split())
+OPEN_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+CLOSE_BRACKETS = frozenset(OPEN_BRACKETS.values())
+
+_IDENT_RE = re.compile(r"[^\W\d]\w*")
+_NUMBER_RE = re.compile(
+    r"0[xX][0-9a-fA-F_]+|0[bB][01_]+"
+    r"|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"',
+            "0": "\0", "a": "\a", "b": "\b", "f": "\f", "v": "\v"}
+
+
+class GDScriptSyntaxError(Exception):
+    """A tokenizer or parser error at a 1-based line / column."""
+
+    def __init__(self, message, line, col):
+        super().__init__(f"{line}:{col}: {message}")
+        self.message = message
+        self.line = line
+        self.col = col
+
+
+class Token:
+    """kind is ident / keyword / number / string / op / newline / eof."""
+    __slots__ = ("kind", "value", "line", "col", "start", "end", "indent", "prefix")
+
+    def __init__(self, kind, value, line, col, start, end, indent=0, prefix=""):
+        self.kind = kind
+        self.value = value
+        self.line = line
+        self.col = col
+        self.start = start
+        self.end = end
+        self.indent = indent
+        self.prefix = prefix
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, {self.line}:{self.col})"
+
+
+def tokenize(source):
+    """Tokenize GDScript source. Returns (tokens, first_line_indent)."""
+    tokens = []
+    n = len(source)
+    pos = 0
+    line = 1
+    line_start = 0
+    depth = 0
+    indent_char = None
+
+    def error(message, at=None):
+        at = pos if at is None else at
+        raise GDScriptSyntaxError(message, line, at - line_start + 1)
+
+    def next_content_indent(p, ln):
+        """Skip blank / comment-only lines from p (on line ln).
+
+        Returns (indent, pos, line, line_start) of the next content line.
+        """
+        nonlocal indent_char
+        ls = p
+        while True:
+            q = p
+            while q < n and source[q] in " \t":
+                q += 1
+            if q < n and source[q] == "\r":
+                q += 1
+            if q < n and source[q] == "#":
+                while q < n and source[q] != "\n":
+                    q += 1
+            if q >= n:
+                return 0, q, ln, ls
+            if source[q] == "\n":
+                p = q + 1
+                ln += 1
+                ls = p
+                continue
+            chars = source[p:q].rstrip("\r")
+            if depth == 0 and chars:
+                for c in chars:
+                    if indent_char is None:
+                        indent_char = c
+                    elif c != indent_char:
+                        used = "tab" if c == "\t" else "space"
+                        before = "space" if c == "\t" else "tab"
+                        raise GDScriptSyntaxError(
+                            f"Used {used} character for indentation instead of "
+                            f"{before} as used before in the file.", ln, 1)
+            return len(chars), p, ln, ls
+
+    first_indent, pos, line, line_start = next_content_indent(0, 1)
+    pos = line_start + first_indent
+
+    while pos < n:
+        c = source[pos]
+        if c in " \t\r":
+            pos += 1
+            continue
+        if c == "#":
+            while pos < n and source[pos] != "\n":
+                pos += 1
+            continue
+        if c == "\n":
+            indent, p, ln, ls = next_content_indent(pos + 1, line + 1)
+            if tokens and tokens[-1].kind != "newline":
+                tokens.append(Token("newline", "\n", line, pos - line_start + 1,
+                                    pos, pos + 1, indent))
+            line, line_start = ln, ls
+            pos = ls + indent if p < n else n
+            continue
+        if c == "\\":
+            q = pos + 1
+            while q < n and source[q] in " \t\r":
+                q += 1
+            if q < n and source[q] == "\n":
+                pos = q + 1
+                line += 1
+                line_start = pos
+                continue
+            error("Unexpected '\\' (line continuation must end the line).")
+        col = pos - line_start + 1
+        start = pos
+        prefix = ""
+        if c in "&^r" and pos + 1 < n and source[pos + 1] in "'\"":
+            prefix = c
+            pos += 1
+            c = source[pos]
+        if c in "'\"":
+            quote = c * 3 if source.startswith(c * 3, pos) else c
+            pos += len(quote)
+            chunks = []
+            start_line = line
+            while True:
+                if pos >= n:
+                    raise GDScriptSyntaxError("Unterminated string.", start_line, col)
+                ch = source[pos]
+                if source.startswith(quote, pos):
+                    pos += len(quote)
+                    break
+                if ch == "\n":
+                    if len(quote) == 1:
+                        raise GDScriptSyntaxError("Unterminated string.", start_line, col)
+                    line += 1
+                    line_start = pos + 1
+                if ch == "\\" and prefix != "r" and pos + 1 < n:
+                    esc = source[pos + 1]
+                    if esc == "u" or esc == "U":
+                        width = 4 if esc == "u" else 6
+                        digits = source[pos + 2:pos + 2 + width]
+                        if not re.fullmatch(r"[0-9a-fA-F]{%d}" % width, digits):
+                            error("Invalid unicode escape sequence.")
+                        chunks.append(chr(int(digits, 16)))
+                        pos += 2 + width
+                        continue
+                    if esc == "\n":
+                        line += 1
+                        line_start = pos + 2
+                        pos += 2
+                        continue
+                    if esc not in _ESCAPES:
+                        error(f"Invalid escape in string: '\\{esc}'.")
+                    chunks.append(_ESCAPES[esc])
+                    pos += 2
+                    continue
+                chunks.append(ch)
+                pos += 1
+            tokens.append(Token("string", "".join(chunks), start_line, col, start, pos,
+                                prefix=prefix))
+            continue
+        if c.isdigit() or (c == "." and pos + 1 < n and source[pos + 1].isdigit()):
+            m = _NUMBER_RE.match(source, pos)
+            text = m.group()
+            pos = m.end()
+            if pos < n and (source[pos].isalnum() or source[pos] == "_"):
+                error("Invalid numeric notation.", start)
+            digits = text.replace("_", "")
+            try:
+                if digits[:2] in ("0x", "0X"):
+                    value = int(digits, 16)
+                elif digits[:2] in ("0b", "0B"):
+                    value = int(digits, 2)
+                elif any(ch in digits for ch in ".eE"):
+                    value = float(digits)
+                else:
+                    value = int(digits)
+            except ValueError:
+                error("Invalid numeric notation.", start)
+            tokens.append(Token("number", value, line, col, start, pos))
+            continue
+        m = _IDENT_RE.match(source, pos)
+        if m:
+            word = m.group()
+            pos = m.end()
+            kind = "keyword" if word in KEYWORDS else "ident"
+            tokens.append(Token(kind, word, line, col, start, pos))
+            continue
+        for op in OPERATORS:
+            if source.startswith(op, pos):
+                break
+        else:
+            error(f"Invalid character '{c}'.")
+        pos += len(op)
+        if op in OPEN_BRACKETS:
+            depth += 1
+        elif op in CLOSE_BRACKETS:
+            depth = max(0, depth - 1)
+        tokens.append(Token("op", op, line, col, start, pos))
+
+    if tokens and tokens[-1].kind != "newline":
+        tokens.append(Token("newline", "\n", line, pos - line_start + 1, pos, pos, 0))
+    tokens.append(Token("eof", "", line, pos - line_start + 1, pos, pos, 0))
+    return tokens, first_indent
+
+
+# === Tree ===
+
+class Node:
+    """Syntax tree node: kind, position and kind-specific fields.
+
+    Fields hold child Nodes, lists / tuples of Nodes, or plain values;
+    iter_nodes() walks all of them generically.
+    """
+
+    def __init__(self, kind, line, col, **fields):
+        self.kind = kind
+        self.line = line
+        self.col = col
+        self.__dict__.update(fields)
+
+    def children(self):
+        for key, value in self.__dict__.items():
+            if key in ("kind", "line", "col"):
+                continue
+            yield from _child_nodes(value)
+
+    def __repr__(self):
+        fields = {k: v for k, v in self.__dict__.items() if k not in ("kind", "line", "col")}
+        return f"Node({self.kind}@{self.line}, {fields})"
+
+
+def _child_nodes(value):
+    if isinstance(value, Node):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _child_nodes(item)
+
+
+def iter_nodes(node):
+    """Depth-first walk over node and every descendant."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(current.children())))
+
+
+# === Parser ===
+
+class Parser:
+    """Recursive-descent parser over tokenize() output.
+
+    self.depth counts open brackets; while it is positive NEWLINE tokens are
+    skipped, except while a multi-line lambda body resets it to zero.
+    self.line_indent is the indentation of the current physical line.
+    """
+
+    def __init__(self, source):
+        self.tokens, self.line_indent = tokenize(source)
+        self.i = 0
+        self.depth = 0
+        self.prev = None
+
+    # --- token helpers ---
+
+    def peek(self, offset=0):
+        if self.depth > 0:
+            while self.tokens[self.i].kind == "newline":
+                self.line_indent = self.tokens[self.i].indent
+                self.i += 1
+        if offset == 0:
+            return self.tokens[self.i]
+        j = self.i
+        for _ in range(offset):
+            j += 1
+            while self.depth > 0 and self.tokens[j].kind == "newline":
+                j += 1
+        return self.tokens[min(j, len(self.tokens) - 1)]
+
+    def advance(self):
+        tok = self.peek()
+        if tok.kind == "eof":
+            return tok
+        self.i += 1
+        if tok.kind == "op":
+            if tok.value in OPEN_BRACKETS:
+                self.depth += 1
+            elif tok.value in CLOSE_BRACKETS:
+                self.depth -= 1
+        elif tok.kind == "newline":
+            self.line_indent = tok.indent
+        self.prev = tok
+        return tok
+
+    def check(self, value, kind=None):
+        tok = self.peek()
+        if kind is not None and tok.kind != kind:
+            return False
+        return tok.value == value and tok.kind in ("op", "keyword", "ident")
+
+    def accept(self, value):
+        if self.check(value):
+            return self.advance()
+        return None
+
+    def expect(self, value, what=None):
+        if self.check(value):
+            return self.advance()
+        self.fail(f'Expected "{value}"' + (f" {what}" if what else "") + ".")
+
+    def expect_name(self, what):
+        tok = self.peek()
+        if tok.kind == "ident":
+            return self.advance()
+        self.fail(f"Expected {what}.")
+
+    def fail(self, message, tok=None):
+        tok = tok or self.peek()
+        found = {"newline": "end of line", "eof": "end of file"}.get(tok.kind, f'"{tok.value}"')
+        raise GDScriptSyntaxError(f"{message} (found {found})", tok.line, tok.col)
+
+    # --- blocks ---
+
+    def parse_script(self):
+        if self.line_indent != 0:
+            self.fail("Unexpected indent.")
+        body = self.members(0)
+        return Node("script", 1, 1, body=body)
+
+    def members(self, indent):
+        """Class body at the given indentation, until a dedent or EOF."""
+        body = []
+        while self.peek().kind != "eof":
+            if self.line_indent > indent:
+                self.fail("Unexpected indent.")
+            if self.line_indent < indent:
+                break
+            body.append(self.member())
+            self.end_statement()
+        return body
+
+    def end_statement(self):
+        tok = self.peek()
+        if tok.kind == "newline":
+            self.advance()
+        elif self.check(";"):
+            self.advance()
+            if self.peek().kind == "newline":
+                self.advance()
+        elif tok.kind == "eof" or (self.prev is not None and self.prev.kind == "newline"):
+            return
+        else:
+            self.fail("Expected end of statement")
+
+    def block(self, statement_fn, loose=False):
+        """Body after ':' — an indented suite or simple statements on the same line.
+
+        loose: the block is a lambda body inside brackets, so the closing
+        bracket's line may sit at any indentation.
+        """
+        parent_indent = self.line_indent
+        if self.peek().kind != "newline":
+            body = [statement_fn()]
+            while self.check(";") and self.peek(1).kind not in ("newline", "eof"):
+                self.advance()
+                body.append(statement_fn())
+            self.end_statement()
+            return body
+        self.advance()
+        indent = self.line_indent
+        if indent <= parent_indent or self.peek().kind == "eof":
+            self.fail("Expected indented block after ':'")
+        body = []
+        while self.peek().kind != "eof":
+            if self.line_indent > indent:
+                self.fail("Unexpected indent.")
+            if self.line_indent < indent:
+                if not loose and self.line_indent > parent_indent:
+                    self.fail("Unindent doesn't match the previous indentation level.")
+                break
+            body.append(statement_fn())
+            self.end_statement()
+        return body
+
+    # --- class members ---
+
+    def annotations(self):
+        result = []
+        while self.check("@"):
+            at = self.advance()
+            name = self.peek()
+            if name.kind not in ("ident", "keyword") or name.start != at.end:
+                self.fail("Expected annotation name after '@'.")
+            self.advance()
+            args = self.call_args() if self.check("(") and self.peek().start == name.end else []
+            result.append(Node("annotation", at.line, at.col, name=name.value, args=args))
+            if self.peek().kind == "newline" and self.depth == 0:
+                self.advance()
+                if self.peek().kind == "eof":
+                    break
+        return result
+
+    def member(self):
+        annotations = self.annotations()
+        tok = self.peek()
+        if tok.kind == "eof":
+            return Node("annotations", annotations[0].line, annotations[0].col,
+                        annotations=annotations)
+        static = False
+        if self.check("static"):
+            self.advance()
+            static = True
+            if not (self.check("func") or self.check("var")):
+                self.fail('Expected "func" or "var" after "static".')
+        v = tok.value if tok.kind in ("keyword", "ident") else None
+        if self.check("func"):
+            node = self.function(static)
+        elif self.check("var"):
+            node = self.var_decl(member=True, static=static)
+        elif v == "const":
+            node = self.const_decl()
+        elif v == "signal":
+            node = self.signal_decl()
+        elif v == "enum":
+            node = self.enum_decl()
+        elif v == "extends":
+            self.advance()
+            node = self.extends_target(tok)
+        elif v == "class_name":
+            self.advance()
+            name = self.expect_name("class name after class_name")
+            extends = None
+            if self.check("extends"):
+                ext = self.advance()
+                extends = self.extends_target(ext)
+            node = Node("class_name", tok.line, tok.col, name=name.value, extends=extends)
+        elif v == "class":
+            node = self.class_decl()
+        elif v == "pass":
+            self.advance()
+            node = Node("pass", tok.line, tok.col)
+        elif tok.kind == "newline":
+            self.fail("Expected class member after annotation")
+        else:
+            self.fail("Unexpected token in class body")
+        node.annotations = annotations
+        return node
+
+    def extends_target(self, tok):
+        nxt = self.peek()
+        if nxt.kind == "string":
+            self.advance()
+            path = nxt.value
+            names = []
+            while self.accept("."):
+                names.append(self.expect_name("class name").value)
+            return Node("extends", tok.line, tok.col, path=path, name=".".join(names) or None,
+                        path_line=nxt.line, path_col=nxt.col)
+        name = self.expect_name("class name or path after extends")
+        parts = [name.value]
+        while self.accept("."):
+            parts.append(self.expect_name("class name").value)
+        return Node("extends", tok.line, tok.col, path=None, name=".".join(parts),
+                    path_line=name.line, path_col=name.col)
+
+    def class_decl(self):
+        tok = self.advance()
+        name = self.expect_name("class name after class")
+        extends = None
+        if self.check("extends"):
+            ext = self.advance()
+            extends = self.extends_target(ext)
+        self.expect(":", "after class declaration")
+        parent_indent = self.line_indent
+        if self.peek().kind != "newline":
+            self.fail("Expected indented block after class declaration")
+        self.advance()
+        indent = self.line_indent
+        if indent <= parent_indent:
+            self.fail("Expected indented block after class declaration")
+        body = self.members(indent)
+        if self.line_indent > parent_indent and self.peek().kind != "eof":
+            self.fail("Unindent doesn't match the previous indentation level.")
+        return Node("class", tok.line, tok.col, name=name.value, extends=extends, body=body)
+
+    def signal_decl(self):
+        tok = self.advance()
+        name = self.expect_name("signal name")
+        params = self.params() if self.check("(") else []
+        return Node("signal", tok.line, tok.col, name=name.value, params=params)
+
+    def enum_decl(self):
+        tok = self.advance()
+        name = None
+        if self.peek().kind == "ident":
+            name = self.advance().value
+        self.expect("{", "after enum")
+        values = []
+        while not self.check("}"):
+            item = self.expect_name("enum value name")
+            value = None
+            if self.accept("="):
+                value = self.expression()
+            values.append(Node("enum_value", item.line, item.col, name=item.value, value=value))
+            if not self.accept(","):
+                break
+        self.expect("}", "to close enum")
+        return Node("enum", tok.line, tok.col, name=name, values=values)
+
+    def const_decl(self):
+        tok = self.advance()
+        name = self.expect_name("constant name")
+        type_ = None
+        if self.accept(":="):
+            pass
+        elif self.accept(":"):
+            if not self.check("="):
+                type_ = self.type_spec()
+            self.expect("=", "for constant value")
+        else:
+            self.expect("=", "for constant value")
+        value = self.expression()
+        return Node("const", tok.line, tok.col, name=name.value, type=type_, value=value)
+
+    def var_decl(self, member=False, static=False):
+        tok = self.advance()
+        name = self.expect_name("variable name")
+        type_ = None
+        value = None
+        inferred = False
+        if self.accept(":="):
+            inferred = True
+            value = self.expression()
+        else:
+            if self.check(":") and not (member and self._accessor_follows()):
+                self.advance()
+                if self.check("="):
+                    inferred = True
+                else:
+                    type_ = self.type_spec()
+            if self.accept("="):
+                value = self.expression()
+        setter = getter = None
+        if member and self.check(":"):
+            self.advance()
+            setter, getter = self.accessors()
+        return Node("var", tok.line, tok.col, name=name.value, type=type_, value=value,
+                    inferred=inferred, static=static, member=member,
+                    setter=setter, getter=getter)
+
+    def _accessor_follows(self):
+        # "var x:" directly followed by a set/get block or inline set/get.
+        nxt = self.tokens[self.i + 1]
+        if nxt.kind == "newline":
+            return True
+        return (nxt.kind == "ident" and nxt.value in ("set", "get")
+                and self.tokens[self.i + 2].value in ("(", ":", "="))
+
+    def accessors(self):
+        setter = getter = None
+        inline = self.peek().kind != "newline"
+        if inline:
+            items = []
+            while True:
+                items.append(self.accessor())
+                if not self.accept(","):
+                    break
+        else:
+            items = self.block(self.accessor)
+        for kind, node in items:
+            if kind == "set":
+                if setter is not None:
+                    self.fail("Setter already defined")
+                setter = node
+            else:
+                if getter is not None:
+                    self.fail("Getter already defined")
+                getter = node
+        return setter, getter
+
+    def accessor(self):
+        tok = self.peek()
+        if tok.kind != "ident" or tok.value not in ("set", "get"):
+            self.fail('Expected "set" or "get"')
+        self.advance()
+        if self.accept("="):
+            fn = self.expect_name(f"{tok.value}ter function name")
+            return tok.value, Node("accessor", tok.line, tok.col, function=fn.value,
+                                   params=[], body=None)
+        params = []
+        if tok.value == "set":
+            self.expect("(", "after set")
+            param = self.expect_name("setter parameter")
+            ptype = self.type_spec() if self.accept(":") else None
+            params.append(Node("param", param.line, param.col, name=param.value, type=ptype,
+                               default=None))
+            self.expect(")", "after setter parameter")
+        elif self.accept("("):
+            self.expect(")", "after get(")
+        self.expect(":", f"after {tok.value}")
+        body = self.block(self.statement)
+        return tok.value, Node("accessor", tok.line, tok.col, function=None,
+                               params=params, body=body)
+
+    def params(self):
+        self.expect("(")
+        params = []
+        while not self.check(")"):
+            rest = bool(self.accept("..."))
+            name = self.expect_name("parameter name")
+            ptype = default = None
+            if self.accept(":="):
+                default = self.expression()
+            else:
+                if self.accept(":"):
+                    ptype = self.type_spec()
+                if self.accept("="):
+                    default = self.expression()
+            params.append(Node("param", name.line, name.col, name=name.value, type=ptype,
+                               default=default, rest=rest))
+            if not self.accept(","):
+                break
+        self.expect(")", "after parameters")
+        return params
+
+    def function(self, static=False, lambda_=False):
+        tok = self.advance()
+        name = None
+        if self.peek().kind == "ident":
+            name = self.advance().value
+        elif not lambda_:
+            self.fail("Expected function name after func")
+        params = self.params()
+        ret = None
+        if self.accept("->"):
+            ret = self.type_spec()
+        self.expect(":", "after function declaration")
+        if lambda_:
+            saved = self.depth
+            self.depth = 0
+            if self.peek().kind == "newline":
+                body = self.block(self.statement, loose=saved > 0)
+            else:
+                body = [self.statement()]
+            self.depth = saved
+        else:
+            body = self.block(self.statement)
+        return Node("lambda" if lambda_ else "func", tok.line, tok.col, name=name,
+                    params=params, return_type=ret, body=body, static=static)
+
+    def type_spec(self):
+        tok = self.peek()
+        if tok.kind == "ident" or (tok.kind == "keyword" and tok.value in ("void", "null")):
+            self.advance()
+        else:
+            self.fail("Expected type")
+        parts = [tok.value]
+        while self.check(".") and self.peek(1).kind == "ident":
+            self.advance()
+            parts.append(self.advance().value)
+        params = []
+        if self.check("[") and self.peek().start == self.prev.end:
+            self.advance()
+            params.append(self.type_spec())
+            while self.accept(","):
+                params.append(self.type_spec())
+            self.expect("]", "to close type parameters")
+        return Node("type", tok.line, tok.col, name=".".join(parts), params=params)
+
+    # --- statements ---
+
+    def statement(self):
+        annotations = self.annotations()
+        tok = self.peek()
+        v = tok.value if tok.kind in ("keyword", "ident") else None
+        if v == "var" and tok.kind == "keyword":
+            node = self.var_decl()
+        elif v == "const" and tok.kind == "keyword":
+            node = self.const_decl()
+        elif tok.kind == "keyword" and v in ("pass", "break", "continue", "breakpoint"):
+            self.advance()
+            node = Node(v, tok.line, tok.col)
+        elif tok.kind == "keyword" and v == "return":
+            self.advance()
+            value = None
+            if self.peek().kind not in ("newline", "eof") and not self.check(";") \
+                    and not (self.depth > 0 and self.peek().value in (")", "]", "}", ",")):
+                value = self.expression()
+            node = Node("return", tok.line, tok.col, value=value)
+        elif tok.kind == "keyword" and v == "if":
+            node = self.if_statement()
+        elif tok.kind == "keyword" and v == "while":
+            self.advance()
+            cond = self.expression()
+            self.expect(":", "after while condition")
+            node = Node("while", tok.line, tok.col, cond=cond, body=self.block(self.statement))
+        elif tok.kind == "keyword" and v == "for":
+            self.advance()
+            var = self.expect_name("loop variable name")
+            vtype = self.type_spec() if self.accept(":") else None
+            self.expect("in", "after loop variable")
+            iterable = self.expression()
+            self.expect(":", "after for")
+            node = Node("for", tok.line, tok.col, var=var.value, type=vtype, iterable=iterable,
+                        body=self.block(self.statement))
+        elif tok.kind == "keyword" and v == "match":
+            node = self.match_statement()
+        elif tok.kind == "keyword" and v in ("func", "class", "signal", "enum", "static",
+                                             "extends", "class_name"):
+            if v == "func" and self.peek(1).value == "(":
+                node = self.expression_statement()
+            else:
+                self.fail(f'"{v}" is not allowed inside a function body')
+        elif tok.kind in ("newline", "eof"):
+            self.fail("Expected statement")
+        else:
+            node = self.expression_statement()
+        node.annotations = annotations
+        return node
+
+    def expression_statement(self):
+        tok = self.peek()
+        expr = self.expression()
+        nxt = self.peek()
+        if nxt.kind == "op" and nxt.value in ASSIGN_OPS:
+            self.advance()
+            if expr.kind not in ("ident", "attr", "subscript"):
+                self.fail("Assignment target must be a variable, attribute or subscript", tok)
+            value = self.expression()
+            return Node("assign", tok.line, tok.col, target=expr, op=nxt.value, value=value)
+        return Node("expr", tok.line, tok.col, expr=expr)
+
+    def if_statement(self):
+        own_indent = self.line_indent
+        tok = self.advance()
+        branches = []
+        cond = self.expression()
+        self.expect(":", "after if condition")
+        branches.append((cond, self.block(self.statement)))
+        else_body = None
+        while self.line_indent == own_indent and self.prev.kind == "newline":
+            if self.check("elif"):
+                self.advance()
+                cond = self.expression()
+                self.expect(":", "after elif condition")
+                branches.append((cond, self.block(self.statement)))
+            elif self.check("else"):
+                self.advance()
+                self.expect(":", "after else")
+                else_body = self.block(self.statement)
+                break
+            else:
+                break
+        return Node("if", tok.line, tok.col, branches=branches, else_body=else_body)
+
+    def match_statement(self):
+        tok = self.advance()
+        subject = self.expression()
+        self.expect(":", "after match subject")
+        parent_indent = self.line_indent
+        if self.peek().kind != "newline":
+            self.fail("Expected newline after match")
+        self.advance()
+        indent = self.line_indent
+        if indent <= parent_indent:
+            self.fail("Expected indented block of match branches")
+        branches = []
+        while self.peek().kind != "eof":
+            if self.line_indent > indent:
+                self.fail("Unexpected indent.")
+            if self.line_indent < indent:
+                if self.line_indent > parent_indent:
+                    self.fail("Unindent doesn't match the previous indentation level.")
+                break
+            annotations = self.annotations()
+            btok = self.peek()
+            patterns = [self.pattern()]
+            while self.accept(","):
+                patterns.append(self.pattern())
+            guard = None
+            if self.peek().kind == "ident" and self.peek().value == "when":
+                self.advance()
+                guard = self.expression()
+            self.expect(":", "after match pattern")
+            body = self.block(self.statement)
+            branches.append(Node("branch", btok.line, btok.col, patterns=patterns, guard=guard,
+                                 body=body, annotations=annotations))
+        return Node("match", tok.line, tok.col, subject=subject, branches=branches)
+
+    def pattern(self):
+        tok = self.peek()
+        if self.check("var"):
+            self.advance()
+            name = self.expect_name("binding name")
+            return Node("bind_pattern", tok.line, tok.col, name=name.value)
+        if self.check(".."):
+            self.advance()
+            return Node("rest_pattern", tok.line, tok.col)
+        if self.check("["):
+            self.advance()
+            items = []
+            while not self.check("]"):
+                items.append(self.pattern())
+                if not self.accept(","):
+                    break
+            self.expect("]", "to close array pattern")
+            return Node("array_pattern", tok.line, tok.col, items=items)
+        if self.check("{"):
+            self.advance()
+            items = []
+            while not self.check("}"):
+                if self.check(".."):
+                    items.append((self.pattern(), None))
+                else:
+                    key = self.expression()
+                    value = self.pattern() if self.accept(":") else None
+                    items.append((key, value))
+                if not self.accept(","):
+                    break
+            self.expect("}", "to close dictionary pattern")
+            return Node("dict_pattern", tok.line, tok.col, items=items)
+        return Node("expr_pattern", tok.line, tok.col, expr=self.binary(0))
+
+    # --- expressions ---
+
+    def expression(self):
+        expr = self.ternary()
+        while self.check("as"):
+            tok = self.advance()
+            expr = Node("as", tok.line, tok.col, expr=expr, type=self.type_spec())
+        return expr
+
+    def ternary(self):
+        expr = self.binary(0)
+        if self.check("if", "keyword"):
+            tok = self.advance()
+            cond = self.binary(0)
+            self.expect("else", "in ternary expression")
+            other = self.ternary()
+            return Node("ternary", tok.line, tok.col, true_expr=expr, cond=cond, false_expr=other)
+        return expr
+
+    # Binary levels, lowest first; "not" sits between "and" and "in".
+    LEVELS = (
+        ("or", "||"),
+        ("and", "&&"),
+        None,                       # unary not / !
+        ("in",),                    # plus "not in"
+        tuple(COMPARE_OPS),
+        ("|",),
+        ("^",),
+        ("&",),
+        ("<<", ">>"),
+        ("+", "-"),
+        ("*", "/", "%"),
+    )
+
+    def binary(self, level):
+        if level == len(self.LEVELS):
+            return self.unary()
+        ops = self.LEVELS[level]
+        if ops is None:
+            if self.check("not") or self.check("!"):
+                tok = self.advance()
+                operand = self.binary(level)
+                return Node("unary", tok.line, tok.col, op="not", operand=operand)
+            return self.binary(level + 1)
+        left = self.binary(level + 1)
+        while True:
+            tok = self.peek()
+            op = None
+            if tok.kind in ("op", "keyword") and tok.value in ops:
+                op = tok.value
+                self.advance()
+            elif ops == ("in",) and self.check("not") and self.peek(1).value == "in":
+                self.advance()
+                self.advance()
+                op = "not in"
+            if op is None:
+                return left
+            right = self.binary(level + 1)
+            left = Node("binary", tok.line, tok.col, op=op, left=left, right=right)
+
+    def unary(self):
+        tok = self.peek()
+        if tok.kind == "op" and tok.value in ("-", "+"):
+            self.advance()
+            return Node("unary", tok.line, tok.col, op=tok.value, operand=self.unary())
+        if tok.kind == "op" and tok.value == "~":
+            self.advance()
+            return Node("unary", tok.line, tok.col, op="~", operand=self.unary())
+        return self.power()
+
+    def power(self):
+        left = self.is_expr()
+        while self.check("**"):
+            tok = self.advance()
+            right = self.unary() if self.peek().value in ("-", "+", "~") else self.is_expr()
+            left = Node("binary", tok.line, tok.col, op="**", left=left, right=right)
+        return left
+
+    def is_expr(self):
+        expr = self.await_expr()
+        while self.check("is"):
+            tok = self.advance()
+            negated = bool(self.accept("not"))
+            expr = Node("is", tok.line, tok.col, expr=expr, type=self.type_spec(),
+                        negated=negated)
+        return expr
+
+    def await_expr(self):
+        if self.check("await"):
+            tok = self.advance()
+            return Node("await", tok.line, tok.col, expr=self.await_expr())
+        return self.postfix(self.primary())
+
+    def postfix(self, expr):
+        while True:
+            tok = self.peek()
+            if tok.kind != "op":
+                return expr
+            if tok.value == ".":
+                self.advance()
+                name = self.peek()
+                if name.kind not in ("ident", "keyword"):
+                    self.fail("Expected identifier after '.'")
+                self.advance()
+                expr = Node("attr", name.line, name.col, base=expr, name=name.value)
+            elif tok.value == "(":
+                args = self.call_args()
+                expr = Node("call", tok.line, tok.col, callee=expr, args=args)
+            elif tok.value == "[":
+                self.advance()
+                index = self.expression()
+                self.expect("]", "to close subscript")
+                expr = Node("subscript", tok.line, tok.col, base=expr, index=index)
+            else:
+                return expr
+
+    def call_args(self):
+        self.expect("(")
+        args = []
+        while not self.check(")"):
+            args.append(self.expression())
+            if not self.accept(","):
+                break
+        self.expect(")", "to close call arguments")
+        return args
+
+    def primary(self):
+        tok = self.peek()
+        kind, value = tok.kind, tok.value
+        if kind == "number":
+            self.advance()
+            return Node("literal", tok.line, tok.col, value=value)
+        if kind == "string":
+            self.advance()
+            if tok.prefix == "^":
+                return Node("node_path", tok.line, tok.col, path=value, unique=False,
+                            literal=True)
+            return Node("literal", tok.line, tok.col, value=value,
+                        string_name=tok.prefix == "&")
+        if kind == "ident":
+            self.advance()
+            return Node("ident", tok.line, tok.col, name=value)
+        if kind == "keyword":
+            if value in CONSTANT_KEYWORDS:
+                self.advance()
+                return Node("literal", tok.line, tok.col, value=CONSTANT_KEYWORDS[value],
+                            keyword=value)
+            if value == "self":
+                self.advance()
+                return Node("self", tok.line, tok.col)
+            if value == "super":
+                self.advance()
+                if not (self.check(".") or self.check("(")):
+                    self.fail('Expected "." or "(" after super')
+                return Node("super", tok.line, tok.col)
+            if value == "preload":
+                self.advance()
+                args = self.call_args()
+                if len(args) != 1:
+                    self.fail("preload() takes exactly one argument", tok)
+                return Node("preload", tok.line, tok.col, path=args[0])
+            if value == "func":
+                return self.function(lambda_=True)
+            self.fail("Expected expression")
+        if kind == "op":
+            if value == "(":
+                self.advance()
+                expr = self.expression()
+                self.expect(")", "to close parenthesis")
+                return expr
+            if value == "[":
+                self.advance()
+                items = []
+                while not self.check("]"):
+                    items.append(self.expression())
+                    if not self.accept(","):
+                        break
+                self.expect("]", "to close array")
+                return Node("array", tok.line, tok.col, items=items)
+            if value == "{":
+                return self.dictionary()
+            if value in ("$", "%"):
+                return self.node_path()
+        self.fail("Expected expression")
+
+    def dictionary(self):
+        tok = self.advance()
+        pairs = []
+        while not self.check("}"):
+            if self.peek().kind == "ident" and self.peek(1).value == "=":
+                key_tok = self.advance()
+                self.advance()
+                key = Node("literal", key_tok.line, key_tok.col, value=key_tok.value)
+            else:
+                key = self.expression()
+                self.expect(":", "after dictionary key")
+            pairs.append((key, self.expression()))
+            if not self.accept(","):
+                break
+        self.expect("}", "to close dictionary")
+        return Node("dict", tok.line, tok.col, pairs=pairs)
+
+    def node_path(self):
+        tok = self.advance()
+        unique = tok.value == "%"
+        nxt = self.peek()
+        if nxt.start != tok.end:
+            self.fail(f"Expected node path after '{tok.value}'")
+        if nxt.kind == "string":
+            self.advance()
+            return Node("node_path", tok.line, tok.col, path=nxt.value, unique=unique,
+                        literal=False)
+        parts = []
+        end = tok.end
+        while True:
+            part = self.peek()
+            if part.start != end:
+                break
+            if part.kind in ("ident", "keyword", "number") or part.value in ("..", "."):
+                self.advance()
+                parts.append(str(part.value))
+                end = part.end
+            elif part.value == "%" and end == tok.end:
+                self.advance()
+                parts.append("%")
+                end = part.end
+                continue
+            else:
+                break
+            slash = self.peek()
+            if slash.value == "/" and slash.kind == "op" and slash.start == end:
+                self.advance()
+                parts.append("/")
+                end = slash.end
+            else:
+                break
+        if not parts or parts[-1] == "/":
+            self.fail(f"Expected node path after '{tok.value}'")
+        return Node("node_path", tok.line, tok.col, path="".join(parts), unique=unique,
+                    literal=False)
+
+
+def parse(source):
+    """Parse GDScript source into a "script" Node. Raises GDScriptSyntaxError."""
+    return Parser(source).parse_script()
+
+
+# === Summary ===
+
+# Identifiers checked against the global scope: PascalCase with at least one
+# lowercase letter (class names, autoloads, enum types). CONSTANT_CASE names
+# may be inherited engine constants and snake_case names inherited members.
+_GLOBAL_NAME_RE = re.compile(r"[A-Z][A-Za-z0-9_]*[a-z][A-Za-z0-9_]*\Z")
+_DECLARING = ("var", "const", "func", "signal", "enum", "enum_value", "class", "param",
+              "bind_pattern", "lambda")
+
+
+def _string_literal(node):
+    if node is not None and node.kind == "literal" and isinstance(node.value, str) \
+            and not getattr(node, "keyword", None):
+        return node.value
+    return None
+
+
+def _load_path(node):
+    """(path, kind) of a literal load("...") / ResourceLoader.load*("...") /
+    change_scene_to_file("...") (also via .call_deferred) call, else None."""
+    callee = node.callee
+    if callee.kind == "ident" and callee.name == "load":
+        kind = "load"
+    elif callee.kind == "attr" and (callee.name == "change_scene_to_file" or (
+            callee.name in ("call", "call_deferred") and callee.base.kind == "attr"
+            and callee.base.name == "change_scene_to_file")):
+        kind = "scene"
+    elif (callee.kind == "attr" and callee.base.kind == "ident"
+          and callee.base.name == "ResourceLoader"
+          and callee.name in ("load", "load_threaded_request")):
+        kind = "load"
+    else:
+        return None
+    path = _string_literal(node.args[0]) if node.args else None
+    return (path, kind) if path is not None else None
+
+
+def summarize(source):
+    """Parse source and reduce it to the JSON-friendly facts the checker needs.
+
+    Keys: error (None or {line, col, message}), class_name, extends (None or
+    {name, path, line, col}), members (top-level names, incl. anonymous enum
+    values), declared (every name declared anywhere), inner_extends, types /
+    names ([value, line, col] references), paths ([path, line, col, kind]
+    with kind preload / load / extends / scene) and problems (semantic
+    errors found while walking, e.g. a non-constant preload).
+    """
+    info = {"error": None, "class_name": None, "extends": None, "members": [],
+            "declared": [], "inner_extends": [], "types": [], "names": [],
+            "paths": [], "problems": []}
+    try:
+        tree = parse(source)
+    except GDScriptSyntaxError as e:
+        info["error"] = {"line": e.line, "col": e.col, "message": e.message}
+        return info
+
+    def extends_info(node):
+        return {"name": node.name, "path": node.path, "line": node.path_line,
+                "col": node.path_col}
+
+    members = set()
+    for node in tree.body:
+        if node.kind == "class_name":
+            info["class_name"] = node.name
+            info["class_name_line"] = node.line
+            if node.extends is not None:
+                info["extends"] = extends_info(node.extends)
+        elif node.kind == "extends":
+            info["extends"] = extends_info(node)
+        elif node.kind == "enum" and node.name is None:
+            members.update(v.name for v in node.values)
+        elif node.kind in _DECLARING and getattr(node, "name", None):
+            members.add(node.name)
+
+    declared = set()
+    for node in iter_nodes(tree):
+        kind = node.kind
+        if kind in _DECLARING and getattr(node, "name", None):
+            declared.add(node.name)
+        elif kind == "for":
+            declared.add(node.var)
+        elif kind == "type":
+            info["types"].append([node.name.split(".")[0], node.line, node.col])
+        elif kind == "ident":
+            if _GLOBAL_NAME_RE.match(node.name):
+                info["names"].append([node.name, node.line, node.col])
+        elif kind == "extends" or kind == "class_name":
+            ext = node if kind == "extends" else node.extends
+            if ext is None:
+                continue
+            if ext.path is not None:
+                info["paths"].append([ext.path, ext.path_line, ext.path_col, "extends"])
+            elif ext.name:
+                info["types"].append([ext.name.split(".")[0], ext.path_line, ext.path_col])
+        elif kind == "class" and node.extends is not None:
+            info["inner_extends"].append(extends_info(node.extends))
+        elif kind == "preload":
+            path = _string_literal(node.path)
+            if path is None:
+                info["problems"].append([node.line, node.col,
+                                         "preload() argument must be a constant string."])
+            else:
+                info["paths"].append([path, node.path.line, node.path.col, "preload"])
+        elif kind == "call":
+            found = _load_path(node)
+            if found is not None:
+                info["paths"].append([found[0], node.args[0].line, node.args[0].col, found[1]])
+    info["members"] = sorted(members)
+    info["declared"] = sorted(declared)
+    return info
+
+
+# === Global scope names ===
+
+# Variant types and @GlobalScope enums usable as type names / identifiers.
+BUILTIN_TYPES = frozenset("""
+    Variant bool int float String StringName NodePath Vector2 Vector2i Rect2 Rect2i
+    Vector3 Vector3i Vector4 Vector4i Transform2D Transform3D Plane Quaternion AABB
+    Basis Projection Color RID Object Callable Signal Dictionary Array
+    PackedByteArray PackedInt32Array PackedInt64Array PackedFloat32Array
+    PackedFloat64Array PackedStringArray PackedVector2Array PackedVector3Array
+    PackedVector4Array PackedColorArray
+    Error Key KeyModifierMask KeyLocation MouseButton MouseButtonMask JoyButton
+    JoyAxis MIDIMessage Side Corner Orientation ClockDirection HorizontalAlignment
+    VerticalAlignment InlineAlignment EulerOrder PropertyHint PropertyUsageFlags
+    MethodFlags VariantType VariantOperator GDScript void null
+""".split())
+
+# Engine classes and singletons (Godot 4.x ClassDB, core + 2D + 3D + UI +
+# editor API). GDExtension classes are read from gdextension/src by the checker.
+ENGINE_CLASSES = frozenset("""
+    Object RefCounted Resource Node Node2D Node3D CanvasItem CanvasLayer Control
+    Viewport SubViewport Window Popup PopupMenu PopupPanel AcceptDialog
+    ConfirmationDialog FileDialog SceneTree MainLoop SceneTreeTimer Tween
+    Tweener PropertyTweener IntervalTweener CallbackTweener MethodTweener
+    SubtweenTweener Timer HTTPRequest HTTPClient ResourcePreloader
+    InstancePlaceholder MultiplayerAPI MultiplayerPeer MultiplayerSpawner
+    MultiplayerSynchronizer ENetMultiplayerPeer ENetConnection SceneMultiplayer
+    WebSocketPeer WebSocketMultiplayerPeer WebRTCPeerConnection PacketPeer
+    PacketPeerUDP PacketPeerStream StreamPeer StreamPeerTCP StreamPeerTLS
+    StreamPeerBuffer TCPServer UDPServer TLSOptions Crypto CryptoKey X509Certificate
+    HashingContext AESContext HMACContext Thread Mutex Semaphore
+    Engine OS Time Input InputMap ProjectSettings ResourceLoader ResourceSaver
+    ResourceUID ClassDB DisplayServer RenderingServer PhysicsServer2D
+    PhysicsServer3D PhysicsServer2DManager PhysicsServer3DManager
+    NavigationServer2D NavigationServer3D NavigationMeshGenerator AudioServer
+    TranslationServer Performance IP Marshalls Geometry2D Geometry3D
+    EngineDebugger TextServerManager TextServer TextServerAdvanced
+    TextServerFallback ThemeDB XRServer CameraServer GDExtensionManager
+    JavaClassWrapper JavaScriptBridge NativeMenu WorkerThreadPool EditorInterface
+    RenderingDevice RDShaderFile RDShaderSPIRV RDShaderSource RDUniform
+    RDTextureFormat RDTextureView RDSamplerState RDPipelineRasterizationState
+    RDPipelineMultisampleState RDPipelineDepthStencilState RDPipelineColorBlendState
+    RDPipelineColorBlendStateAttachment RDVertexAttribute RDAttachmentFormat
+    RDFramebufferPass RDPipelineSpecializationConstant RDShaderSpecializationConstant
+    JSON JSONRPC XMLParser RegEx RegExMatch ConfigFile DirAccess FileAccess
+    PCKPacker ZIPReader ZIPPacker Expression RandomNumberGenerator Image
+    ImageTexture CompressedTexture2D Texture Texture2D Texture3D TextureLayered
+    Texture2DArray Cubemap CubemapArray ImageTexture3D ImageTextureLayered
+    AtlasTexture GradientTexture1D GradientTexture2D NoiseTexture2D NoiseTexture3D
+    CurveTexture CurveXYZTexture CanvasTexture ViewportTexture PlaceholderTexture2D
+    AnimatedTexture CameraTexture Texture2DRD Texture3DRD TextureCubemapRD
+    Noise FastNoiseLite Gradient Curve Curve2D Curve3D Font FontFile FontVariation
+    SystemFont Theme StyleBox StyleBoxFlat StyleBoxLine StyleBoxTexture StyleBoxEmpty
+    Shader ShaderMaterial ShaderInclude VisualShader Material BaseMaterial3D
+    StandardMaterial3D ORMMaterial3D CanvasItemMaterial ParticleProcessMaterial
+    FogMaterial PanoramaSkyMaterial ProceduralSkyMaterial PhysicalSkyMaterial
+    Mesh ArrayMesh ImmediateMesh PrimitiveMesh BoxMesh CapsuleMesh CylinderMesh
+    PlaneMesh QuadMesh PrismMesh SphereMesh TorusMesh TextMesh TubeTrailMesh
+    RibbonTrailMesh PointMesh MeshLibrary MultiMesh SurfaceTool MeshDataTool
+    ArrayOccluderMesh Occluder3D ArrayOccluder3D BoxOccluder3D SphereOccluder3D
+    QuadOccluder3D PolygonOccluder3D OccluderInstance3D
+    PackedScene SceneState Script GDScriptNativeClass Animation AnimationLibrary
+    AnimationPlayer AnimationTree AnimationMixer AnimationNode AnimationNodeStateMachine
+    AnimationNodeStateMachinePlayback AnimationNodeBlendTree AnimationNodeAnimation
+    AnimationNodeBlendSpace1D AnimationNodeBlendSpace2D AudioStream AudioStreamPlayer
+    AudioStreamPlayer2D AudioStreamPlayer3D AudioStreamWAV AudioStreamMP3
+    AudioStreamOggVorbis AudioStreamGenerator AudioStreamGeneratorPlayback
+    AudioStreamPlayback AudioStreamRandomizer AudioStreamPolyphonic
+    AudioStreamPlaybackPolyphonic AudioListener2D AudioListener3D AudioEffect
+    AudioEffectReverb AudioEffectLowPassFilter AudioEffectHighPassFilter
+    AudioEffectEQ AudioEffectCompressor AudioEffectLimiter AudioEffectAmplify
+    AudioEffectDelay AudioEffectDistortion AudioEffectChorus AudioEffectFilter
+    AudioEffectSpectrumAnalyzer AudioEffectSpectrumAnalyzerInstance AudioEffectRecord
+    AudioEffectCapture AudioBusLayout
+    Camera2D Camera3D Sprite2D Sprite3D AnimatedSprite2D AnimatedSprite3D
+    SpriteFrames SpriteBase3D Label3D Decal GPUParticles2D GPUParticles3D
+    CPUParticles2D CPUParticles3D GPUParticlesCollision3D GPUParticlesCollisionBox3D
+    GPUParticlesCollisionSphere3D GPUParticlesCollisionHeightField3D
+    GPUParticlesAttractor3D Light2D Light3D DirectionalLight3D OmniLight3D SpotLight3D
+    PointLight2D DirectionalLight2D LightOccluder2D OccluderPolygon2D
+    WorldEnvironment Environment CameraAttributes CameraAttributesPractical
+    CameraAttributesPhysical Sky World2D World3D ReflectionProbe VoxelGI VoxelGIData
+    LightmapGI LightmapGIData FogVolume VisualInstance3D GeometryInstance3D
+    MeshInstance3D MeshInstance2D MultiMeshInstance3D MultiMeshInstance2D
+    CSGShape3D CSGBox3D CSGSphere3D CSGCylinder3D CSGMesh3D CSGPolygon3D
+    CSGTorus3D CSGCombiner3D Marker2D Marker3D Path2D Path3D PathFollow2D
+    PathFollow3D RemoteTransform2D RemoteTransform3D VisibleOnScreenNotifier2D
+    VisibleOnScreenNotifier3D VisibleOnScreenEnabler2D VisibleOnScreenEnabler3D
+    Skeleton2D Skeleton3D Bone2D BoneAttachment3D Skin SkinReference
+    SkeletonIK3D SkeletonModifier3D SkeletonProfile SkeletonProfileHumanoid
+    PhysicalBone3D PhysicalBoneSimulator3D SoftBody3D LookAtModifier3D
+    CollisionObject2D CollisionObject3D PhysicsBody2D PhysicsBody3D
+    StaticBody2D StaticBody3D AnimatableBody2D AnimatableBody3D RigidBody2D
+    RigidBody3D CharacterBody2D CharacterBody3D VehicleBody3D VehicleWheel3D
+    Area2D Area3D RayCast2D RayCast3D ShapeCast2D ShapeCast3D CollisionShape2D
+    CollisionShape3D CollisionPolygon2D CollisionPolygon3D Shape2D Shape3D
+    BoxShape3D SphereShape3D CapsuleShape3D CylinderShape3D ConvexPolygonShape3D
+    ConcavePolygonShape3D HeightMapShape3D WorldBoundaryShape3D SeparationRayShape3D
+    RectangleShape2D CircleShape2D CapsuleShape2D SegmentShape2D
+    ConvexPolygonShape2D ConcavePolygonShape2D WorldBoundaryShape2D
+    SeparationRayShape2D PhysicsMaterial PhysicsDirectSpaceState2D
+    PhysicsDirectSpaceState3D PhysicsDirectBodyState2D PhysicsDirectBodyState3D
+    PhysicsRayQueryParameters2D PhysicsRayQueryParameters3D
+    PhysicsShapeQueryParameters2D PhysicsShapeQueryParameters3D
+    PhysicsPointQueryParameters2D PhysicsPointQueryParameters3D
+    PhysicsTestMotionParameters3D PhysicsTestMotionResult3D KinematicCollision2D
+    KinematicCollision3D Joint3D HingeJoint3D PinJoint3D SliderJoint3D
+    ConeTwistJoint3D Generic6DOFJoint3D Joint2D PinJoint2D GrooveJoint2D
+    DampedSpringJoint2D SpringArm3D
+    NavigationAgent2D NavigationAgent3D NavigationRegion2D NavigationRegion3D
+    NavigationMesh NavigationPolygon NavigationLink2D NavigationLink3D
+    NavigationObstacle2D NavigationObstacle3D NavigationPathQueryParameters3D
+    NavigationPathQueryResult3D NavigationMeshSourceGeometryData3D GridMap
+    TileMap TileMapLayer TileSet TileData Polygon2D Line2D Parallax2D
+    ParallaxBackground ParallaxLayer BackBufferCopy CanvasModulate CanvasGroup
+    Container BoxContainer HBoxContainer VBoxContainer GridContainer FlowContainer
+    HFlowContainer VFlowContainer MarginContainer CenterContainer PanelContainer
+    ScrollContainer SplitContainer HSplitContainer VSplitContainer TabContainer
+    AspectRatioContainer SubViewportContainer FoldableContainer Panel Label
+    RichTextLabel Button BaseButton CheckBox CheckButton LinkButton MenuButton
+    OptionButton TextureButton ColorPickerButton ButtonGroup ColorPicker
+    ColorRect TextureRect NinePatchRect LineEdit TextEdit CodeEdit Tree TreeItem
+    ItemList Range ProgressBar TextureProgressBar Slider HSlider VSlider ScrollBar
+    HScrollBar VScrollBar SpinBox Separator HSeparator VSeparator ReferenceRect
+    TabBar MenuBar GraphEdit GraphNode GraphElement VideoStreamPlayer VideoStream
+    Shortcut InputEvent InputEventKey InputEventMouse InputEventMouseButton
+    InputEventMouseMotion InputEventJoypadButton InputEventJoypadMotion
+    InputEventAction InputEventScreenTouch InputEventScreenDrag InputEventWithModifiers
+    InputEventFromWindow InputEventGesture InputEventMagnifyGesture
+    InputEventPanGesture InputEventMIDI InputEventShortcut
+    Translation OptimizedTranslation WeakRef JavaScriptObject
+    EditorPlugin EditorScript EditorSettings EditorFileSystem EditorFileSystemDirectory
+    EditorInspector EditorInspectorPlugin EditorProperty EditorImportPlugin
+    EditorExportPlugin EditorExportPlatform EditorDebuggerPlugin EditorDebuggerSession
+    EditorSelection EditorUndoRedoManager EditorResourcePreview EditorNode3DGizmo
+    EditorNode3DGizmoPlugin EditorResourcePicker EditorScenePostImport
+    EditorSceneFormatImporter EditorTranslationParserPlugin EditorPaths
+    EditorCommandPalette EditorToaster EditorSpinSlider EditorFileDialog
+    ScriptEditor ScriptEditorBase FileSystemDock UndoRedo
+    XRInterface XROrigin3D XRCamera3D XRController3D XRNode3D XRPositionalTracker
+    OpenXRInterface Node3DGizmo ResourceFormatLoader ResourceFormatSaver
+    ResourceImporter PhysicsServer3DRenderingServerHandler
+    RenderingDevice RenderSceneBuffers RenderSceneBuffersRD RenderData
+    CompositorEffect Compositor Logger
+""".split())
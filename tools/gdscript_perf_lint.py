@@ -0,0 +1,403 @@
+"""
+Static hot-path performance linter for GDScript.
+
+Finds every function reachable from a per-frame callback (_process,
+_physics_process, _integrate_forces) or a signal handler (functions passed to
+connect(), incl. Callable(self, "name") and the string forms) and flags
+patterns that are cheap to write and expensive to run every frame:
+
+    rng-new            RandomNumberGenerator.new() (keep one, reseed it)
+    debug-log-format   DebugManager.log_*() / log_tagged() whose message is
+                       built with %, +, str() or format() outside a
+                       `if DebugManager.LOG_*` style guard - the string is
+                       formatted even when the category is off
+    alloc-in-loop      Array / Dictionary literals, Array() / Dictionary(),
+                       .duplicate() and Class.new() inside loops
+    string-key         String keys built with % / str() + "_" inside loops
+    node-lookup        get_node / $Path / %Unique / find_child /
+                       get_nodes_in_group on a hot path
+    load               load() / ResourceLoader.load() on a hot path
+    print              print / prints / printt / print_debug on a hot path
+
+Calls are followed within a script (bare and self. calls), into autoloads
+(DebugManager.x()), class_name scripts and preloaded script constants.
+Calls made inside a loop put everything they reach in loop context. Lambda
+bodies are not followed. Severity = rule weight + 1 inside a loop:
+3+ error, 2 warning, 1 info.
+
+Per-file analysis is cached by content hash in tools/.cache/ and cache misses
+are analysed in parallel; reachability is recomputed on every run.
+
+Usage:
+    python tools/gdscript_perf_lint.py                          # text report
+    python tools/gdscript_perf_lint.py --json perf_report.json  # machine-readable report
+    python tools/gdscript_perf_lint.py --fail-on warning        # exit 1 on warnings too
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import gdscript_check as gc
+import gdscript_parser as gp
+import tracing
+
+PROJECT_ROOT = gc.PROJECT_ROOT
+CACHE_PATH = PROJECT_ROOT / "tools" / ".cache" / "gdscript_perf_lint.json"
+CACHE_VERSION = 1
+
+FRAME_CALLBACKS = ("_process", "_physics_process", "_integrate_forces")
+SEVERITIES = ("info", "warning", "error")
+RULE_WEIGHT = {"rng-new": 2, "load": 2, "debug-log-format": 1, "alloc-in-loop": 1,
+               "string-key": 1, "node-lookup": 1, "print": 1}
+NODE_LOOKUPS = frozenset(("get_node", "get_node_or_null", "find_child", "find_children",
+                          "get_nodes_in_group", "find_node"))
+PRINTS = frozenset(("print", "prints", "printt", "printraw", "print_debug", "print_rich"))
+COPIES = frozenset(("duplicate", "duplicate_deep"))
+CONTAINER_TYPES = frozenset(("Array", "Dictionary"))
+
+
+# === Per-file analysis ===
+
+def _walk_expr(node):
+    """Nodes of an expression, not descending into lambda bodies."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        if current.kind != "lambda":
+            stack.extend(current.children())
+
+
+def _is_string(node):
+    return gp._string_literal(node) is not None
+
+
+def _builds_string(expr):
+    """True if expr formats / concatenates a string at run time."""
+    for node in _walk_expr(expr):
+        if node.kind == "binary" and node.op == "%" and _is_string(node.left):
+            return True
+        if node.kind == "binary" and node.op == "+" and (_is_string(node.left)
+                                                         or _is_string(node.right)):
+            return True
+        if node.kind == "call":
+            callee = node.callee
+            if callee.kind == "ident" and callee.name == "str":
+                return True
+            if callee.kind == "attr" and callee.name in ("format", "num", "num_int64"):
+                return True
+    return False
+
+
+def _is_debug_guard(cond):
+    """Condition tests a debug switch (DebugManager.LOG_*, is_tag_active, debug_* flags)."""
+    for node in _walk_expr(cond):
+        name = getattr(node, "name", None)
+        if node.kind in ("ident", "attr") and isinstance(name, str):
+            lowered = name.lower()
+            if name == "DebugManager" or "debug" in lowered or name.startswith("LOG") \
+                    or name == "is_tag_active":
+                return True
+    return False
+
+
+def _is_log_call(callee):
+    return (callee.kind == "attr" and callee.base.kind == "ident"
+            and callee.base.name == "DebugManager"
+            and (callee.name.startswith("log_") or callee.name == "log_tagged"))
+
+
+class FunctionScan:
+    """Pattern hits and outgoing calls of one function body."""
+
+    def __init__(self):
+        self.calls = []         # [receiver, name, in_loop]
+        self.hits = []          # [rule, line, col, in_loop, message]
+        self.handlers = []      # local function names connected to signals
+
+    def hit(self, rule, node, in_loop, message):
+        self.hits.append([rule, node.line, node.col, in_loop, message])
+
+    def block(self, statements, in_loop, guarded):
+        for stmt in statements:
+            kind = stmt.kind
+            if kind == "if":
+                for cond, body in stmt.branches:
+                    self.expr(cond, in_loop, guarded)
+                    self.block(body, in_loop, guarded or _is_debug_guard(cond))
+                if stmt.else_body:
+                    self.block(stmt.else_body, in_loop, guarded)
+                # `if not DebugManager.LOG_X: return` guards the rest of the block.
+                cond, body = stmt.branches[0]
+                if len(stmt.branches) == 1 and not stmt.else_body and cond.kind == "unary" \
+                        and cond.op == "not" and _is_debug_guard(cond.operand) \
+                        and body and body[-1].kind == "return":
+                    guarded = True
+            elif kind == "for":
+                self.expr(stmt.iterable, in_loop, guarded)
+                self.block(stmt.body, True, guarded)
+            elif kind == "while":
+                self.expr(stmt.cond, True, guarded)
+                self.block(stmt.body, True, guarded)
+            elif kind == "match":
+                self.expr(stmt.subject, in_loop, guarded)
+                for branch in stmt.branches:
+                    if branch.guard is not None:
+                        self.expr(branch.guard, in_loop, guarded)
+                    self.block(branch.body, in_loop, guarded)
+            else:
+                for child in stmt.children():
+                    if child.kind != "annotation":
+                        self.expr(child, in_loop, guarded)
+
+    def expr(self, root, in_loop, guarded):
+        reported = set()
+        for node in _walk_expr(root):
+            kind = node.kind
+            if kind == "call":
+                self.call(node, in_loop, guarded)
+            elif kind in ("array", "dict") and in_loop and id(node) not in reported:
+                self.hit("alloc-in-loop", node, in_loop,
+                         f"{'Array' if kind == 'array' else 'Dictionary'} literal allocated "
+                         f"every iteration")
+                reported.update(id(n) for n in _walk_expr(node))
+            elif kind == "node_path":
+                self.hit("node-lookup", node, in_loop,
+                         f"{'%' if node.unique else '$'}{node.path} looks the node up on every "
+                         f"call; cache it in an @onready var")
+            elif kind == "binary" and in_loop and id(node) not in reported and (
+                    (node.op == "%" and _is_string(node.left))
+                    or (node.op == "+" and (_is_string(node.left) or _is_string(node.right))
+                        and _builds_string(node))):
+                self.hit("string-key", node, in_loop,
+                         "String built with % / + inside a loop; use integer or Vector keys")
+                reported.update(id(n) for n in _walk_expr(node))
+
+    def call(self, node, in_loop, guarded):
+        callee = node.callee
+        args = node.args
+        if callee.kind == "ident":
+            receiver, name = "self", callee.name
+        elif callee.kind == "attr":
+            base = callee.base
+            receiver = {"self": "self", "ident": getattr(base, "name", "")}.get(base.kind, "")
+            name = callee.name
+        else:
+            return
+        if receiver:
+            self.calls.append([receiver, name, in_loop])
+
+        if name == "new" and receiver == "RandomNumberGenerator":
+            self.hit("rng-new", callee, in_loop,
+                     "RandomNumberGenerator.new() per call; keep one generator and reseed it")
+        elif name == "new" and in_loop:
+            self.hit("alloc-in-loop", callee, in_loop, f"{receiver or 'object'}.new() inside a loop")
+        elif in_loop and ((callee.kind == "ident" and name in CONTAINER_TYPES)
+                          or (callee.kind == "attr" and name in COPIES)):
+            self.hit("alloc-in-loop", callee, in_loop, f"{name}() allocates every iteration")
+        elif _is_log_call(callee) and not guarded and any(_builds_string(a) for a in args):
+            self.hit("debug-log-format", callee, in_loop,
+                     f"DebugManager.{name}() message is formatted even when logging is off; "
+                     f"guard it with if DebugManager.LOG_*")
+        elif callee.kind == "ident" and name in PRINTS:
+            self.hit("print", callee, in_loop, f"{name}() on a hot path")
+        elif name in NODE_LOOKUPS:
+            self.hit("node-lookup", callee, in_loop, f"{name}() on a hot path; cache the result")
+        elif (callee.kind == "ident" and name == "load") or (
+                receiver == "ResourceLoader" and name == "load"):
+            self.hit("load", callee, in_loop, "load() on a hot path; preload or cache the resource")
+
+        if name == "connect" and args:
+            handler = args[1] if len(args) > 1 and _is_string(args[0]) else args[0]
+            self.handler(handler)
+
+    def handler(self, node):
+        if node.kind == "ident":
+            self.handlers.append(node.name)
+        elif node.kind == "attr" and node.base.kind == "self":
+            self.handlers.append(node.name)
+        elif node.kind == "call" and node.callee.kind == "ident" \
+                and node.callee.name == "Callable" and len(node.args) > 1 \
+                and node.args[0].kind == "self" and _is_string(node.args[1]):
+            self.handlers.append(gp._string_literal(node.args[1]))
+
+
+def _class_functions(body, container, out, preloads, info):
+    for node in body:
+        if node.kind == "func":
+            scan = FunctionScan()
+            scan.block(node.body, False, False)
+            key = f"{container}.{node.name}" if container else node.name
+            out[key] = {"line": node.line, "calls": scan.calls, "hits": scan.hits}
+            info["handlers"].update(f"{container}.{h}" if container else h for h in scan.handlers)
+        elif node.kind == "class":
+            _class_functions(node.body, f"{container}.{node.name}" if container else node.name,
+                             out, preloads, info)
+        elif node.kind == "const" and not container and node.value.kind == "preload":
+            path = gp._string_literal(node.value.path)
+            if path and path.endswith(".gd"):
+                preloads[node.name] = path
+        elif node.kind == "class_name":
+            info["class_name"] = node.name
+
+
+def analyze_bytes(raw):
+    """Worker entry point: raw script bytes -> per-function calls and hits."""
+    info = {"error": None, "class_name": None, "preloads": {}, "functions": {},
+            "handlers": set()}
+    try:
+        tree = gp.parse(raw.decode("utf-8-sig"))
+    except (gp.GDScriptSyntaxError, UnicodeDecodeError) as e:
+        info["error"] = str(e)
+    else:
+        _class_functions(tree.body, "", info["functions"], info["preloads"], info)
+    info["handlers"] = sorted(info["handlers"])
+    return info
+
+
+# === Reachability ===
+
+@tracing.traced("walk")
+def hot_functions(files, autoloads, root):
+    """
+    BFS from frame callbacks and signal handlers over the resolved call graph.
+    Returns {(res, func): {"root": ..., "loop": bool}}; loop context wins over
+    non-loop context for functions reached both ways.
+    """
+    class_files = {info["class_name"]: res for res, info in files.items() if info["class_name"]}
+    autoload_files = {name: gc.to_res(gc.resolve_res(path, "res://project.godot", root), root)
+                      for name, path in autoloads.items() if path.startswith("res://")}
+
+    def target_file(res, receiver):
+        if receiver == "self":
+            return res
+        if receiver in autoload_files:
+            return autoload_files[receiver]
+        if receiver in class_files:
+            return class_files[receiver]
+        path = files[res]["preloads"].get(receiver)
+        if path is not None:
+            resolved = gc.resolve_res(path, res, root)
+            return gc.to_res(resolved, root) if resolved is not None else None
+        return None
+
+    queue = deque()
+    reached = {}
+    for res, info in sorted(files.items()):
+        for func in info["functions"]:
+            short = func.rsplit(".", 1)[-1]
+            if short in FRAME_CALLBACKS:
+                queue.append((res, func, False, f"{res}:{func}"))
+            elif func in info["handlers"]:
+                queue.append((res, func, False, f"{res}:{func} (signal handler)"))
+    while queue:
+        res, func, loop, root_name = queue.popleft()
+        state = reached.get((res, func))
+        if state is not None and (state["loop"] or not loop):
+            continue
+        reached[(res, func)] = {"root": root_name, "loop": loop}
+        container = func.rsplit(".", 1)[0] + "." if "." in func else ""
+        for receiver, name, in_loop in files[res]["functions"][func]["calls"]:
+            target = target_file(res, receiver)
+            if target is None or target not in files:
+                continue
+            key = container + name if target == res else name
+            if key in files[target]["functions"]:
+                queue.append((target, key, loop or in_loop, root_name))
+    return reached
+
+
+@tracing.traced("match")
+def findings(files, reached):
+    result = []
+    for (res, func), state in sorted(reached.items()):
+        for rule, line, col, in_loop, message in files[res]["functions"][func]["hits"]:
+            loop = in_loop or state["loop"]
+            score = RULE_WEIGHT[rule] + (1 if loop else 0)
+            severity = SEVERITIES[min(score, 3) - 1]
+            result.append({"file": res, "line": line, "col": col, "rule": rule,
+                           "severity": severity, "function": func, "in_loop": loop,
+                           "root": state["root"], "message": message})
+    result.sort(key=lambda f: (-SEVERITIES.index(f["severity"]), f["file"], f["line"]))
+    return result
+
+
+# === Cache ===
+
+@tracing.traced("read")
+def load_files(root, jobs, cache_path=CACHE_PATH, force=False):
+    stamp = f"{CACHE_VERSION}-{gc.parser_stamp()}-{gc.content_hash(Path(__file__).read_bytes())}"
+    cache = {} if force else gc.load_cache(cache_path, stamp)
+    hashes = {}
+    missing = {}
+    for path in gc.script_files(root):
+        raw = path.read_bytes()
+        digest = gc.content_hash(raw)
+        hashes[gc.to_res(path, root)] = digest
+        if digest not in cache and digest not in missing:
+            missing[digest] = raw
+    results = gc.summarize_all(list(missing.values()), jobs, worker=analyze_bytes)
+    entries = {d: cache[d] for d in set(hashes.values()) if d in cache}
+    entries.update(zip(missing, results))
+    if missing or len(entries) != len(cache):
+        gc.save_cache(cache_path, stamp, entries)
+    return {res: entries[d] for res, d in hashes.items()}, len(missing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lint GDScript hot paths for per-frame costs.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--json", type=Path, help="write the machine-readable report here ('-' for stdout)")
+    parser.add_argument("--fail-on", choices=SEVERITIES + ("never",), default="error",
+                        help="exit 1 if a finding has this severity or worse (default: error)")
+    parser.add_argument("--min-severity", choices=SEVERITIES, default="info",
+                        help="hide findings below this severity in the text report")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="ignore the analysis cache")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    jobs = args.jobs or os.cpu_count() or 1
+    files, parsed = load_files(root, jobs, args.cache, args.force)
+    reached = hot_functions(files, gc.project_autoloads(root), root)
+    found = findings(files, reached)
+    elapsed = time.perf_counter() - start
+
+    counts = {s: sum(1 for f in found if f["severity"] == s) for s in SEVERITIES}
+    errors = sorted(res for res, info in files.items() if info["error"])
+    report = {"files": len(files), "hot_functions": len(reached), "counts": counts,
+              "unparsed": errors, "findings": found}
+    if args.json is not None:
+        text = json.dumps(report, indent=1)
+        if str(args.json) == "-":
+            print(text)
+        else:
+            args.json.write_text(text + "\n", encoding="utf-8")
+
+    if str(args.json) != "-":
+        shown = SEVERITIES.index(args.min_severity)
+        for f in found:
+            if SEVERITIES.index(f["severity"]) >= shown:
+                loop = " [loop]" if f["in_loop"] else ""
+                print(f"[PERF_LINT] {f['severity']:<7} {f['file']}:{f['line']}:{f['col']} "
+                      f"{f['rule']}{loop} in {f['function']}(): {f['message']}  <- {f['root']}")
+        for res in errors:
+            print(f"[PERF_LINT] Not analysed (syntax error): {res}")
+        print(f"[PERF_LINT] {len(files)} scripts ({parsed} analysed, {len(files) - parsed} cached), "
+              f"{len(reached)} hot functions, {counts['error']} errors, {counts['warning']} warnings, "
+              f"{counts['info']} info in {elapsed * 1000:.0f} ms")
+
+    if args.fail_on == "never":
+        return 0
+    threshold = SEVERITIES.index(args.fail_on)
+    return 1 if any(SEVERITIES.index(f["severity"]) >= threshold for f in found) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+CPU reference of Godot's String hash() and RandomNumberGenerator.
+
+GDScript seeds per-feature generators with `rng.seed = hash(key) + offset`
+(prefab_spawner.gd, vegetation_manager.gd). Reproducing those decisions
+offline needs the same arithmetic:
+
+    hash(String)              String::hash(), djb2 over UTF-32 code points (uint32)
+    RandomNumberGenerator     RandomPCG: pcg32 with the default 64-bit increment
+    .seed = s                 pcg32_srandom_r(s, PCG_DEFAULT_INC_64)
+    .randi()                  one pcg32 draw
+    .randf()                  RandomPCG::randf(): exponent from one draw, mantissa from a second
+    .randf_range(a, b)        a + randf() * (b - a)
+
+Everything is vectorized: one RandomNumberGenerator object holds a whole
+array of independent generators, one per seed.
+"""
+import numpy as np
+
+PCG_MULTIPLIER = np.uint64(6364136223846793005)
+PCG_DEFAULT_INC_64 = np.uint64(1442695040888963407)
+
+
+def string_hash(strings):
+    """Godot String::hash() of every string (ASCII / Latin-1), as a uint32 array."""
+    encoded = np.asarray(strings, dtype=np.bytes_)
+    width = max(encoded.dtype.itemsize, 1)
+    chars = encoded.view(np.uint8).reshape(encoded.size, width).astype(np.uint32)
+    h = np.full(encoded.size, 5381, dtype=np.uint32)
+    for column in range(width):
+        c = chars[:, column]
+        # Shorter strings are NUL padded; djb2 stops at the terminator
+        h = np.where(c != 0, (h << np.uint32(5)) + h + c, h)
+    return h.reshape(encoded.shape)
+
+
+def cell_key_hash(cx, cz):
+    """hash("%d_%d" % [cx, cz]) for integer arrays."""
+    cx, cz = np.broadcast_arrays(np.asarray(cx, dtype=np.int64), np.asarray(cz, dtype=np.int64))
+    keys = np.char.add(np.char.add(cx.astype(np.bytes_), b"_"), cz.astype(np.bytes_))
+    return string_hash(keys)
+
+
+def _count_leading_zeros(values):
+    values = values.astype(np.uint32)
+    zeros = np.zeros(values.shape, dtype=np.int32)
+    for shift in (16, 8, 4, 2, 1):
+        empty = values < (np.uint32(1) << np.uint32(32 - shift))
+        zeros = np.where(empty, zeros + shift, zeros)
+        values = np.where(empty, values << np.uint32(shift), values)
+    return np.where(values == 0, zeros + 1, zeros)
+
+
+class RandomNumberGenerator:
+    """Array of Godot RandomNumberGenerator instances, seeded like `rng.seed = seeds`."""
+
+    def __init__(self, seeds):
+        seeds = np.asarray(seeds)
+        # Negative GDScript ints wrap to uint64 on assignment
+        self.state = np.zeros(seeds.shape, dtype=np.uint64)
+        self.inc = np.full(seeds.shape, (PCG_DEFAULT_INC_64 << np.uint64(1)) | np.uint64(1), dtype=np.uint64)
+        self._next()
+        self.state = self.state + seeds.astype(np.int64).astype(np.uint64)
+        self._next()
+
+    def _next(self, mask=None):
+        old = self.state
+        advanced = old * PCG_MULTIPLIER + self.inc
+        self.state = advanced if mask is None else np.where(mask, advanced, old)
+        xorshifted = (((old >> np.uint64(18)) ^ old) >> np.uint64(27)).astype(np.uint32)
+        rot = (old >> np.uint64(59)).astype(np.uint32)
+        return (xorshifted >> rot) | (xorshifted << ((np.uint32(32) - rot) & np.uint32(31)))
+
+    def randi(self):
+        return self._next()
+
+    def randf(self):
+        """Uniform float32 in [0, 1]. A zero first draw returns 0 without a second draw."""
+        proto_exp_offset = self._next()
+        nonzero = proto_exp_offset != 0
+        mantissa = self._next(nonzero) | np.uint32(0x80000001)
+        value = np.ldexp(mantissa.astype(np.float32), -32 - _count_leading_zeros(proto_exp_offset))
+        return np.where(nonzero, value, np.float32(0.0)).astype(np.float32)
+
+    def randf_range(self, low, high):
+        low, high = np.float32(low), np.float32(high)
+        return (low + self.randf() * (high - low)).astype(np.float32)
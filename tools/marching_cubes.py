@@ -0,0 +1,181 @@
+"""
+CPU reference of marching_cubes.glsl.
+
+Vectorized NumPy marching cubes that writes the same interleaved vertex
+stream the GPU shader produces and MeshBuilder.build_mesh_native /
+build_collision_shape consume:
+
+    [pos.x, pos.y, pos.z, norm.x, norm.y, norm.z, col.r, col.g, col.b] * 3 per triangle
+
+The lookup tables are parsed straight from marching_cubes_lookup_table.glslinc
+so the CPU and GPU paths can never drift apart.
+"""
+import re
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LOOKUP_TABLE_PATH = PROJECT_ROOT / "world_marching_cubes" / "marching_cubes_lookup_table.glslinc"
+
+ISO_LEVEL = 0.0
+VERTEX_STRIDE = 9  # floats per vertex (pos + normal + color)
+
+# Cube corner offsets (x, y, z) in the shader's corner order
+CORNERS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1),
+    (0, 1, 0), (1, 1, 0), (1, 1, 1), (0, 1, 1),
+], dtype=np.int64)
+
+# Corner pairs for the 12 cube edges
+EDGES = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 0),
+    (4, 5), (5, 6), (6, 7), (7, 4),
+    (0, 4), (1, 5), (2, 6), (3, 7),
+], dtype=np.int64)
+
+_tables = None
+
+
+def load_tables(path=LOOKUP_TABLE_PATH):
+    """Parse edgeTable[256] and triTable[4096] out of the GLSL include."""
+    global _tables
+    if _tables is not None and path == LOOKUP_TABLE_PATH:
+        return _tables
+
+    text = Path(path).read_text(encoding="utf-8")
+    parsed = {}
+    for name in ("edgeTable", "triTable"):
+        match = re.search(rf"{name}\[\d+\]\s*=\s*int\[\]\((.*?)\);", text, re.S)
+        if not match:
+            raise ValueError(f"{name} not found in {path}")
+        body = re.sub(r"//[^\n]*", "", match.group(1))
+        parsed[name] = np.array([int(tok, 0) for tok in body.replace("\n", " ").split(",") if tok.strip()],
+                                dtype=np.int64)
+
+    edge_table = parsed["edgeTable"]
+    tri_table = parsed["triTable"].reshape(256, 16)
+    if edge_table.size != 256:
+        raise ValueError(f"edgeTable has {edge_table.size} entries, expected 256")
+
+    tables = (edge_table, tri_table, (tri_table != -1).sum(axis=1) // 3)
+    if path == LOOKUP_TABLE_PATH:
+        _tables = tables
+    return tables
+
+
+def material_to_color(mat_ids):
+    """Material ID -> vertex color (R = id / 255, G = 1 marks valid, B unused)."""
+    mat_ids = np.asarray(mat_ids)
+    colors = np.zeros(mat_ids.shape + (3,), dtype=np.float32)
+    colors[..., 0] = mat_ids.astype(np.float32) / np.float32(255.0)
+    colors[..., 1] = 1.0
+    return colors
+
+
+def grid_normals(density, points, spacing=1.0):
+    """Normals at vertex positions via central differences on the nearest grid point (get_normal)."""
+    dims = np.array(density.shape[::-1])  # (nx, ny, nz)
+    lattice = np.floor(points / np.float32(spacing) + np.float32(0.5)).astype(np.int64)
+    lattice = np.clip(lattice, 0, dims - 1)
+
+    def sample(offset):
+        idx = np.clip(lattice + offset, 0, dims - 1)
+        return density[idx[:, 2], idx[:, 1], idx[:, 0]]
+
+    n = np.stack([
+        sample((1, 0, 0)) - sample((-1, 0, 0)),
+        sample((0, 1, 0)) - sample((0, -1, 0)),
+        sample((0, 0, 1)) - sample((0, 0, -1)),
+    ], axis=1).astype(np.float32)
+    length = np.linalg.norm(n, axis=1, keepdims=True)
+    return np.divide(n, length, out=np.zeros_like(n), where=length > 0)
+
+
+def polygonize(density, cell_materials=None, spacing=1.0, cells=None):
+    """
+    Run marching cubes over a density grid indexed [z, y, x].
+
+    density:        (nz, ny, nx) float grid; negative = solid.
+    cell_materials: optional (cz, cy, cx) material ID per cell (defaults to 0).
+    spacing:        world units between grid points.
+    cells:          (cx, cy, cz) number of cells to polygonize along each axis;
+                    defaults to every cell of the grid.
+
+    Returns an (n_vertices, 9) float32 array in the GPU vertex layout.
+    """
+    edge_table, tri_table, tri_counts = load_tables()
+    density = np.asarray(density, dtype=np.float32)
+    nz, ny, nx = density.shape
+    cx, cy, cz = cells if cells is not None else (nx - 1, ny - 1, nz - 1)
+
+    # Cube index per cell from the 8 corner densities
+    corner_vals = np.stack([
+        density[oz:oz + cz, oy:oy + cy, ox:ox + cx] for ox, oy, oz in CORNERS
+    ], axis=-1)
+    cube_index = ((corner_vals < ISO_LEVEL) << np.arange(8)).sum(axis=-1)
+
+    active = np.nonzero(tri_counts[cube_index] > 0)
+    if active[0].size == 0:
+        return np.zeros((0, VERTEX_STRIDE), dtype=np.float32)
+
+    cell_z, cell_y, cell_x = active
+    cases = cube_index[active]
+    vals = corner_vals[active]  # (n_cells, 8)
+    base = np.stack([cell_x, cell_y, cell_z], axis=1)
+
+    # Interpolated vertex on every edge of every active cell (unused edges are ignored later)
+    p1 = (base[:, None, :] + CORNERS[EDGES[:, 0]][None]).astype(np.float32)
+    p2 = (base[:, None, :] + CORNERS[EDGES[:, 1]][None]).astype(np.float32)
+    v1 = vals[:, EDGES[:, 0]]
+    v2 = vals[:, EDGES[:, 1]]
+    denom = v2 - v1
+    safe = np.where(np.abs(denom) < 0.00001, np.float32(1.0), denom)
+    t = ((ISO_LEVEL - v1) / safe)[..., None]
+    edge_verts = p1 + t * (p2 - p1)
+    edge_verts = np.where((np.abs(ISO_LEVEL - v2) < 0.00001)[..., None], p2, edge_verts)
+    edge_verts = np.where((np.abs(ISO_LEVEL - v1) < 0.00001)[..., None] | (np.abs(denom) < 0.00001)[..., None],
+                          p1, edge_verts)
+    edge_verts *= np.float32(spacing)
+
+    # Expand triangles: repeat each cell once per triangle, then pick edges from triTable
+    counts = tri_counts[cases]
+    tri_cell = np.repeat(np.arange(cases.size), counts)
+    first = np.cumsum(counts) - counts
+    tri_slot = np.arange(tri_cell.size) - np.repeat(first, counts)
+    edges = tri_table[cases[tri_cell][:, None], tri_slot[:, None] * 3 + np.arange(3)]  # (n_tris, 3)
+
+    # Shader writes vertices in 1, 3, 2 order for winding
+    edges = edges[:, [0, 2, 1]]
+    positions = edge_verts[tri_cell[:, None], edges]  # (n_tris, 3, 3)
+    positions = positions.reshape(-1, 3)
+
+    if cell_materials is None:
+        mats = np.zeros(tri_cell.size, dtype=np.uint32)
+    else:
+        mats = np.asarray(cell_materials)[cell_z, cell_y, cell_x][tri_cell]
+
+    out = np.empty((positions.shape[0], VERTEX_STRIDE), dtype=np.float32)
+    out[:, 0:3] = positions
+    out[:, 3:6] = grid_normals(density, positions, spacing)
+    out[:, 6:9] = np.repeat(material_to_color(mats), 3, axis=0)
+    return out
+
+
+def chunk_cell_materials(materials, cells=None):
+    """Per-cell material using the shader's cube-center sample (round(pos + 0.5))."""
+    nz, ny, nx = materials.shape
+    cx, cy, cz = cells if cells is not None else (nx - 1, ny - 1, nz - 1)
+    return materials[1:cz + 1, 1:cy + 1, 1:cx + 1]
+
+
+def polygonize_chunk(density, materials=None):
+    """
+    Exact CPU equivalent of one marching_cubes.glsl dispatch on a 33^3 chunk.
+
+    The shader skips ids >= CHUNK_SIZE - 1, so only cells 0..30 are meshed
+    and the surface spans exactly one CHUNK_STRIDE.
+    """
+    cells = (31, 31, 31)
+    cell_mats = chunk_cell_materials(materials, cells) if materials is not None else None
+    return polygonize(density, cell_mats, 1.0, cells)
@@ -0,0 +1,326 @@
+"""
+glTF / GLB mesh budget inspector.
+
+Reads every .glb / .gltf in the project without decoding vertex data: the
+GLB binary chunk and external .bin buffers are memory-mapped, triangle and
+vertex counts come from accessor metadata (count, primitive mode), animation
+lengths from the sampler input accessor's max, and embedded image sizes from
+the PNG / JPEG header at the start of their bufferView.
+
+Per model:
+    triangles / vertices    per primitive, summed per mesh; "drawn" counts
+                            every node instance of a mesh
+    materials, skins        material count, joints of the largest skin
+    morph targets, animations (count and longest clip in seconds)
+    textures                embedded or external (uri) images with sizes
+
+Models are parsed in a process pool and checked against a budget file
+(tools/model_budget.json): "default" limits plus "overrides" matched by
+fnmatch glob on the res-relative path, last match wins. Exit code 1 when a
+model is over budget.
+
+Usage:
+    python tools/model_inspect.py
+    python tools/model_inspect.py --sort bones --top 10
+    python tools/model_inspect.py --meshes --json models.json --csv models.csv
+"""
+import argparse
+import csv
+import fnmatch
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote
+
+import asset_dedup as ad
+import texture_budget as tb
+import tracing
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = PROJECT_ROOT / "tools" / "model_budget.json"
+MODEL_EXTS = frozenset(("glb", "gltf"))
+GLB_BIN = 0x004E4942
+
+TRIANGLES, TRIANGLE_STRIP, TRIANGLE_FAN = 4, 5, 6
+SORT_KEYS = ("drawn_triangles", "triangles", "vertices", "materials", "bones", "morph_targets",
+             "animations", "textures", "bytes", "path")
+BUDGET_KEYS = ("drawn_triangles", "vertices", "materials", "bones", "texture_size")
+
+
+# === Reader ===
+
+class GltfDocument:
+    """glTF JSON plus lazily memory-mapped buffers (GLB BIN chunk or external .bin files)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._files = []
+        self._maps = {}
+        self._glb_bin = None
+        if self.path.suffix.lower() == ".glb":
+            with open(self.path, "rb") as f:
+                magic, version, length = struct.unpack("<III", f.read(12))
+                if magic != ad.GLB_MAGIC:
+                    raise ValueError("not a GLB file")
+                json_len, kind = struct.unpack("<II", f.read(8))
+                if kind != ad.GLB_JSON:
+                    raise ValueError("GLB does not start with a JSON chunk")
+                self.json = json.loads(f.read(json_len))
+                head = f.read(8)
+                if len(head) == 8:
+                    bin_len, kind = struct.unpack("<II", head)
+                    if kind == GLB_BIN:
+                        self._glb_bin = (20 + json_len + 8, bin_len)
+        else:
+            self.json = json.loads(self.path.read_bytes())
+
+    def close(self):
+        for view in self._maps.values():
+            view.release()
+        for mapped in self._files:
+            mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _map(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._files.append(mapped)
+        return memoryview(mapped)
+
+    def buffer(self, index):
+        """memoryview of buffer index, or None (data: uri, missing file)."""
+        if index in self._maps:
+            return self._maps[index]
+        entry = self.json.get("buffers", [])[index]
+        view = None
+        uri = entry.get("uri")
+        if uri is None and self._glb_bin is not None:
+            whole = self._map(self.path)
+            start, length = self._glb_bin
+            view = whole[start:start + length]
+        elif uri and not uri.startswith("data:"):
+            target = self.path.parent / unquote(uri)
+            if target.is_file():
+                view = self._map(target)
+        self._maps[index] = view
+        return view
+
+    def buffer_view(self, index):
+        entry = self.json["bufferViews"][index]
+        data = self.buffer(entry["buffer"])
+        if data is None:
+            return None
+        start = entry.get("byteOffset", 0)
+        return data[start:start + entry["byteLength"]]
+
+    def accessor(self, index):
+        return self.json.get("accessors", [])[index]
+
+
+def primitive_triangles(doc, prim):
+    mode = prim.get("mode", TRIANGLES)
+    if "indices" in prim:
+        count = doc.accessor(prim["indices"])["count"]
+    elif "POSITION" in prim.get("attributes", {}):
+        count = doc.accessor(prim["attributes"]["POSITION"])["count"]
+    else:
+        return 0
+    if mode == TRIANGLES:
+        return count // 3
+    if mode in (TRIANGLE_STRIP, TRIANGLE_FAN):
+        return max(0, count - 2)
+    return 0
+
+
+def image_info(doc, image):
+    """(source, width, height) of a glTF image; sizes from the header bytes only."""
+    uri = image.get("uri")
+    if "bufferView" in image:
+        data = doc.buffer_view(image["bufferView"])
+        mime = image.get("mimeType", "")
+        reader = {"image/png": tb.read_png_header, "image/jpeg": tb.read_jpeg_header}.get(mime)
+        info = reader(io.BytesIO(bytes(data[:65536]))) if data is not None and reader else None
+        source = "embedded"
+    elif uri and uri.startswith("data:"):
+        info, source = None, "data uri"
+    elif uri:
+        target = doc.path.parent / unquote(uri)
+        source = uri if target.is_file() else f"{uri} (missing)"
+        ext = ad.extension(target.name)
+        info = tb.read_header(target) if target.is_file() and ext in tb.HEADER_READERS else None
+    else:
+        info, source = None, "?"
+    return source, (info.width if info else 0), (info.height if info else 0)
+
+
+@tracing.traced("read")
+def inspect(path, rel=None):
+    """Budget-relevant counts of one model (dict, JSON-serializable)."""
+    rel = rel or str(path)
+    with GltfDocument(path) as doc:
+        gltf = doc.json
+        meshes = []
+        for index, mesh in enumerate(gltf.get("meshes", [])):
+            triangles = vertices = targets = 0
+            for prim in mesh.get("primitives", []):
+                triangles += primitive_triangles(doc, prim)
+                position = prim.get("attributes", {}).get("POSITION")
+                if position is not None:
+                    vertices += doc.accessor(position)["count"]
+                targets = max(targets, len(prim.get("targets", [])))
+            meshes.append({"name": mesh.get("name", f"mesh_{index}"),
+                           "primitives": len(mesh.get("primitives", [])),
+                           "triangles": triangles, "vertices": vertices, "morph_targets": targets,
+                           "instances": 0})
+        for node in gltf.get("nodes", []):
+            if "mesh" in node:
+                meshes[node["mesh"]]["instances"] += 1
+
+        clip = 0.0
+        for anim in gltf.get("animations", []):
+            for sampler in anim.get("samplers", []):
+                upper = doc.accessor(sampler["input"]).get("max")
+                if upper:
+                    clip = max(clip, upper[0])
+        textures = []
+        for image in gltf.get("images", []):
+            source, width, height = image_info(doc, image)
+            textures.append({"name": image.get("name", ""), "source": source,
+                             "width": width, "height": height})
+        skins = gltf.get("skins", [])
+        return {
+            "path": rel, "bytes": Path(path).stat().st_size,
+            "meshes": meshes,
+            "triangles": sum(m["triangles"] for m in meshes),
+            "drawn_triangles": sum(m["triangles"] * max(1, m["instances"]) for m in meshes),
+            "vertices": sum(m["vertices"] for m in meshes),
+            "materials": len(gltf.get("materials", [])),
+            "skins": len(skins),
+            "bones": max((len(s.get("joints", [])) for s in skins), default=0),
+            "morph_targets": max((m["morph_targets"] for m in meshes), default=0),
+            "animations": len(gltf.get("animations", [])),
+            "longest_clip": round(clip, 3),
+            "textures": len(textures),
+            "texture_size": max((max(t["width"], t["height"]) for t in textures), default=0),
+            "images": textures,
+        }
+
+
+def _inspect_job(job):
+    path, rel = job
+    try:
+        return inspect(path, rel)
+    except (ValueError, KeyError, IndexError, struct.error, json.JSONDecodeError) as e:
+        return {"path": rel, "error": f"{type(e).__name__}: {e}"}
+
+
+@tracing.traced("inspect")
+def inspect_all(root, rels, jobs):
+    work = [(str(Path(root) / rel), rel) for rel in rels]
+    if jobs == 1 or len(work) < 4:
+        return [_inspect_job(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_inspect_job, work, chunksize=2))
+
+
+# === Budget ===
+
+def load_budget(path):
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return data.get("default", {}), data.get("overrides", [])
+
+
+def budget_for(rel, default, overrides):
+    limits = dict(default)
+    for entry in overrides:
+        if fnmatch.fnmatch(rel, entry["glob"]):
+            limits.update({k: v for k, v in entry.items() if k != "glob"})
+    return limits
+
+
+def check_budget(report, default, overrides):
+    limits = budget_for(report["path"], default, overrides)
+    return [f"{key} {report[key]} > {limits[key]}" for key in BUDGET_KEYS
+            if limits.get(key) is not None and report[key] > limits[key]]
+
+
+@tracing.traced("write")
+def write_csv(path, reports):
+    columns = ["path"] + [k for k in SORT_KEYS if k != "path"] + ["skins", "longest_clip", "over"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for r in reports:
+            writer.writerow([r["path"]] + [r[k] for k in columns[1:-1]] + ["; ".join(r["over"])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Triangle / vertex / material / bone budget report for glTF models.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH, help="budget JSON file")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="drawn_triangles")
+    parser.add_argument("--top", type=int, default=0, help="only list the first N models (0: all)")
+    parser.add_argument("--meshes", action="store_true", help="list meshes and images per model")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--csv", type=Path, help="write the model table as CSV")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    jobs = args.jobs or os.cpu_count() or 1
+    rels = [rel for rel in ad.project_files(root) if ad.extension(rel) in MODEL_EXTS]
+    results = inspect_all(root, rels, jobs)
+    default, overrides = load_budget(args.budget)
+    errors = [r for r in results if "error" in r]
+    reports = [r for r in results if "error" not in r]
+    for r in reports:
+        r["over"] = check_budget(r, default, overrides)
+    descending = args.sort != "path"
+    reports.sort(key=lambda r: (r[args.sort], r["path"]) if not descending else (-r[args.sort], r["path"]))
+    elapsed = time.perf_counter() - start
+
+    shown = reports[:args.top] if args.top else reports
+    print(f"[MODELS] {'drawn tris':>10} {'verts':>8} {'mat':>3} {'bones':>5} {'morph':>5} "
+          f"{'anims':>5} {'tex':>3} {'max px':>6} {'size':>9}  model")
+    for r in shown:
+        flag = "  OVER: " + ", ".join(r["over"]) if r["over"] else ""
+        print(f"[MODELS] {r['drawn_triangles']:10d} {r['vertices']:8d} {r['materials']:3d} {r['bones']:5d} "
+              f"{r['morph_targets']:5d} {r['animations']:5d} {r['textures']:3d} {r['texture_size']:6d} "
+              f"{tb.sd.human_bytes(r['bytes']):>9}  {r['path']}{flag}")
+        if args.meshes:
+            for m in sorted(r["meshes"], key=lambda m: -m["triangles"]):
+                print(f"[MODELS]     mesh {m['triangles']:8d} tris {m['vertices']:8d} verts "
+                      f"x{m['instances']} {m['primitives']} surfaces  {m['name']}")
+            for t in r["images"]:
+                size = f"{t['width']}x{t['height']}" if t["width"] else "?"
+                print(f"[MODELS]     image {size} {t['source']}  {t['name']}")
+    for r in errors:
+        print(f"[MODELS] ERROR {r['path']}: {r['error']}")
+    over = [r for r in reports if r["over"]]
+    print(f"[MODELS] {len(reports)} models, {sum(r['drawn_triangles'] for r in reports)} drawn triangles, "
+          f"{len(over)} over budget, {len(errors)} unreadable, parsed in {elapsed * 1000:.0f} ms")
+
+    if args.json:
+        payload = {"models": reports, "errors": errors, "budget": {"default": default, "overrides": overrides}}
+        args.json.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+    if args.csv:
+        write_csv(args.csv, reports)
+    return 1 if over or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,514 @@
+"""
+Prefab compiler: v2 text layers -> packed binary arrays, with a build cache.
+
+prefab_spawner.load_prefab_from_file parses the v2 JSON layers
+("[1] [2:3] . ---" tokens) every time a user prefab is loaded. This tool
+parses them once offline, with the same rules as _parse_token /
+_parse_layers / _parse_compact_objects, validates them against
+world_prefabs/PREFAB_FORMAT_RULES.md and writes a compact .pfb file:
+
+    header     magic "PFAB", version, size xyz, object count, block count, name
+    4 variants one per spawn rotation 0-3:
+                 min offset xyz + dims xyz
+                 dense uint8 block types   [y][z][x]
+                 dense uint8 block metas   [y][z][x]  (stairs / ramps pre-rotated)
+                 sparse object table: id, combined rotation, placement offset, fractional_y
+
+Variants bake _rotate_offset and the directional meta rotation, and object
+placement offsets bake the corner / grid-correction / auto-centering math in
+spawn_user_prefab, so spawning a rotated prefab is a straight array walk.
+
+Compiled files are keyed by a content hash of the source JSON (plus the
+compiler version); unchanged prefabs are not recompiled.
+
+Usage:
+    python tools/prefab_compiler.py                     # compile world_prefabs/*.json
+    python tools/prefab_compiler.py --check             # validate only
+    python tools/prefab_compiler.py --user-dir ~/.local/share/godot/app_userdata/<project>/world_prefabs
+"""
+import argparse
+import hashlib
+import json
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import tracing
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PREFAB_DIR = PROJECT_ROOT / "world_prefabs"
+OUT_DIR = PREFAB_DIR / "compiled"
+REGISTRY_PATH = PROJECT_ROOT / "world_building_system" / "object_registry.gd"
+
+COMPILER_VERSION = 1
+INDEX_NAME = "index.json"
+
+PFB_MAGIC = b"PFAB"
+# magic, version, size xyz, object count, block count
+PFB_HEADER = struct.Struct("<4sH3HHI")
+# min offset xyz, dims xyz
+VARIANT_HEADER = struct.Struct("<3h3H")
+OBJECT_DTYPE = np.dtype([
+    ("object_id", "u1"), ("rotation", "u1"), ("pad", "u2"),
+    ("offset", "<f4", 3), ("fractional_y", "<f4"),
+])
+
+# BuildingChunk.voxel_bytes: 0 = air, 1-127 = blocks, 128+ reserved for object markers
+MAX_BLOCK_ID = 127
+BLOCK_STAIRS = 4
+BLOCK_RAMP = 2
+
+TOKEN_RE = re.compile(r"^\[(-?\d+)(?::(-?\d+))?\]$")
+
+
+class PrefabError(ValueError):
+    pass
+
+
+# === Object registry ===
+
+def load_object_sizes(path=REGISTRY_PATH):
+    """ObjectRegistry.OBJECTS id -> (x, y, z) size, read from object_registry.gd."""
+    text = Path(path).read_text(encoding="utf-8")
+    sizes = {}
+    for match in re.finditer(r"^\t(\d+):\s*\{(.*?)^\t\}", text, re.MULTILINE | re.DOTALL):
+        size = re.search(r"\"size\":\s*Vector3i\((\d+),\s*(\d+),\s*(\d+)\)", match.group(2))
+        if size:
+            sizes[int(match.group(1))] = tuple(int(v) for v in size.groups())
+    return sizes
+
+
+# === Parsing (mirrors prefab_spawner.gd) ===
+
+def parse_token(token):
+    """(type, meta) for a block token, None for air. Raises on tokens the runtime would drop."""
+    if token in (".", ""):
+        return None
+    match = TOKEN_RE.match(token)
+    if not match:
+        raise PrefabError(f"bad token {token!r}")
+    return int(match.group(1)), int(match.group(2) or 0)
+
+
+def parse_layers(layers, errors):
+    """Returns ({(x, y, z): (type, meta)}, rows per Y level, tokens per row)."""
+    blocks = {}
+    rows_per_level = [0]
+    row_widths = []
+    y = z = 0
+    for row_index, layer_str in enumerate(layers):
+        line = str(layer_str).strip()
+        if line == "---":
+            y += 1
+            z = 0
+            rows_per_level.append(0)
+            continue
+        tokens = line.split()
+        for x, token in enumerate(tokens):
+            try:
+                parsed = parse_token(token)
+            except PrefabError as exc:
+                errors.append(f"layers[{row_index}] x={x}: {exc}")
+                continue
+            if parsed is not None:
+                blocks[(x, y, z)] = parsed
+        row_widths.append(len(tokens))
+        rows_per_level[-1] += 1
+        z += 1
+    return blocks, rows_per_level, row_widths
+
+
+def parse_objects(compact, errors):
+    """[id, x, y, z, rot, frac_y] entries -> list of dicts (entries with < 5 values are skipped)."""
+    result = []
+    for index, obj in enumerate(compact):
+        if not isinstance(obj, list) or len(obj) < 5:
+            errors.append(f"objects[{index}]: expected [id, x, y, z, rot, y_offset], got {obj!r}")
+            continue
+        result.append({
+            "object_id": obj[0],
+            "offset": (float(obj[1]), float(obj[2]), float(obj[3])),
+            "rotation": obj[4],
+            "fractional_y": float(obj[5]) if len(obj) > 5 else 0.0,
+        })
+    return result
+
+
+def _is_int(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and float(value).is_integer()
+
+
+@tracing.traced("validate")
+def validate(data, object_sizes):
+    """
+    Parse and check a v2 prefab against PREFAB_FORMAT_RULES.md.
+
+    Returns (prefab, errors). prefab is None when the file cannot be used at all.
+    """
+    errors = []
+    if data.get("version", 1) < 2 or "layers" not in data:
+        return None, [f"old format (v{data.get('version', 1)}), migrate it to v2 layers first"]
+    if not isinstance(data.get("name"), str) or not data["name"]:
+        errors.append("missing name")
+
+    size = data.get("size")
+    if not (isinstance(size, list) and len(size) == 3 and all(_is_int(v) and v > 0 for v in size)):
+        return None, errors + [f"size must be three positive integers, got {size!r}"]
+    sx, sy, sz = (int(v) for v in size)
+
+    blocks, rows_per_level, row_widths = parse_layers(data["layers"], errors)
+    if len(rows_per_level) != sy:
+        errors.append(f"{len(rows_per_level)} Y levels in layers, size says {sy}")
+    for level, rows in enumerate(rows_per_level):
+        if rows != sz:
+            errors.append(f"Y level {level} has {rows} rows, size says {sz}")
+    bad_widths = sorted({w for w in row_widths if w != sx})
+    if bad_widths:
+        errors.append(f"rows with {bad_widths} tokens, size says {sx}")
+
+    for (x, y, z), (block_type, meta) in blocks.items():
+        if not 1 <= block_type <= MAX_BLOCK_ID:
+            errors.append(f"block ({x},{y},{z}): type {block_type} outside 1-{MAX_BLOCK_ID}")
+        if not 0 <= meta <= 3:
+            errors.append(f"block ({x},{y},{z}): rotation {meta} outside 0-3")
+
+    objects = parse_objects(data.get("objects", []), errors)
+    for index, obj in enumerate(objects):
+        where = f"objects[{index}]"
+        object_id, rotation = obj["object_id"], obj["rotation"]
+        if not _is_int(object_id) or int(object_id) not in object_sizes:
+            errors.append(f"{where}: unknown object id {object_id!r}")
+            continue
+        if not _is_int(rotation) or not 0 <= rotation <= 3:
+            errors.append(f"{where}: rotation {rotation!r} outside 0-3")
+            continue
+        obj["object_id"], obj["rotation"] = int(object_id), int(rotation)
+        ox, oy, oz = object_sizes[obj["object_id"]]
+        if obj["rotation"] in (1, 3):
+            ox, oz = oz, ox
+        x, y, z = obj["offset"]
+        if x < 0 or y < 0 or z < 0 or x + ox > sx or y + oy > sy or z + oz > sz:
+            errors.append(f"{where}: object {obj['object_id']} ({ox}x{oy}x{oz}) at {obj['offset']} "
+                          f"outside size {sx}x{sy}x{sz}")
+
+    prefab = {"name": data.get("name", ""), "size": (sx, sy, sz), "blocks": blocks, "objects": objects}
+    return prefab, errors
+
+
+# === Rotation (mirrors spawn_user_prefab) ===
+
+def rotate_offsets(x, y, z, rotation):
+    """_rotate_offset / _rotate_vector3_offset on arrays."""
+    if rotation == 1:
+        return -z, y, x
+    if rotation == 2:
+        return -x, y, -z
+    if rotation == 3:
+        return z, y, -x
+    return x, y, z
+
+
+GRID_CORRECTION = {0: (0.0, 0.0, 0.0), 1: (1.0, 0.0, 0.0), 2: (1.0, 0.0, 1.0), 3: (0.0, 0.0, 1.0)}
+
+
+def rotate_metas(types, metas, rotation):
+    """Stairs (4) and ramps (2) with meta 1-3 turn with the prefab."""
+    directional = (types == BLOCK_STAIRS) | ((types == BLOCK_RAMP) & (metas >= 1) & (metas <= 3))
+    return np.where(directional, (metas + rotation) % 4, metas).astype(np.uint8)
+
+
+def object_placement(obj, rotation, object_sizes):
+    """obj_pos - spawn_pos and combined rotation, as computed in spawn_user_prefab."""
+    size = np.array(object_sizes[obj["object_id"]], dtype=np.float64)
+    local_rot = obj["rotation"]
+    corner = np.array(rotate_offsets(*obj["offset"], rotation), dtype=np.float64) + GRID_CORRECTION[rotation]
+
+    local_size = size[[2, 1, 0]] if local_rot in (1, 3) else size
+    half = np.array(rotate_offsets(*(local_size * 0.5), rotation), dtype=np.float64)
+    half[1] = 0.0
+
+    combined = (local_rot + rotation) % 4
+    chunk_half = np.array([size[0] * 0.5, 0.0, size[2] * 0.5])
+    if combined in (1, 3):
+        chunk_half = chunk_half[[2, 1, 0]]
+    return corner + half - chunk_half, combined
+
+
+@tracing.traced("variants")
+def build_variants(prefab, object_sizes):
+    """Dense [y][z][x] type/meta arrays and placed object tables for rotations 0-3."""
+    coords = np.array(sorted(prefab["blocks"]), dtype=np.int32).reshape(-1, 3)
+    values = np.array([prefab["blocks"][tuple(c)] for c in coords], dtype=np.int32).reshape(-1, 2)
+    variants = []
+    for rotation in range(4):
+        rx, ry, rz = rotate_offsets(coords[:, 0], coords[:, 1], coords[:, 2], rotation)
+        sx, sy, sz = prefab["size"]
+        # Bounds of the rotated full box (not just occupied cells) keep dims stable per rotation
+        corners = [rotate_offsets(cx, 0, cz, rotation) for cx in (0, sx - 1) for cz in (0, sz - 1)]
+        min_offset = (min(c[0] for c in corners), 0, min(c[2] for c in corners))
+        dims = (max(c[0] for c in corners) - min_offset[0] + 1, sy, max(c[2] for c in corners) - min_offset[2] + 1)
+
+        types = np.zeros((dims[1], dims[2], dims[0]), dtype=np.uint8)
+        metas = np.zeros_like(types)
+        if coords.shape[0]:
+            iy, iz, ix = ry - min_offset[1], rz - min_offset[2], rx - min_offset[0]
+            types[iy, iz, ix] = values[:, 0]
+            metas[iy, iz, ix] = rotate_metas(values[:, 0], values[:, 1], rotation)
+
+        table = np.zeros(len(prefab["objects"]), dtype=OBJECT_DTYPE)
+        for i, obj in enumerate(prefab["objects"]):
+            offset, combined = object_placement(obj, rotation, object_sizes)
+            table[i] = (obj["object_id"], combined, 0, offset, obj["fractional_y"])
+        variants.append({"min_offset": min_offset, "dims": dims, "types": types, "metas": metas, "objects": table})
+    return variants
+
+
+# === Binary format ===
+
+@tracing.traced("encode")
+def encode(prefab, variants):
+    name = prefab["name"].encode("utf-8")
+    parts = [
+        PFB_HEADER.pack(PFB_MAGIC, COMPILER_VERSION, *prefab["size"], len(prefab["objects"]), len(prefab["blocks"])),
+        struct.pack("<H", len(name)), name,
+    ]
+    for variant in variants:
+        parts.append(VARIANT_HEADER.pack(*variant["min_offset"], *variant["dims"]))
+        parts.append(variant["types"].tobytes())
+        parts.append(variant["metas"].tobytes())
+        parts.append(variant["objects"].tobytes())
+    return b"".join(parts)
+
+
+def decode(raw):
+    """Inverse of encode: {name, size, block_count, variants: [{min_offset, dims, types, metas, objects}]}."""
+    magic, version, sx, sy, sz, object_count, block_count = PFB_HEADER.unpack_from(raw)
+    if magic != PFB_MAGIC or version != COMPILER_VERSION:
+        raise PrefabError(f"not a v{COMPILER_VERSION} compiled prefab")
+    pos = PFB_HEADER.size
+    (name_len,) = struct.unpack_from("<H", raw, pos)
+    pos += 2
+    name = raw[pos:pos + name_len].decode("utf-8")
+    pos += name_len
+
+    variants = []
+    for _ in range(4):
+        values = VARIANT_HEADER.unpack_from(raw, pos)
+        pos += VARIANT_HEADER.size
+        min_offset, dims = values[:3], values[3:]
+        cells = dims[0] * dims[1] * dims[2]
+        shape = (dims[1], dims[2], dims[0])
+        types = np.frombuffer(raw, dtype=np.uint8, count=cells, offset=pos).reshape(shape)
+        metas = np.frombuffer(raw, dtype=np.uint8, count=cells, offset=pos + cells).reshape(shape)
+        pos += cells * 2
+        objects = np.frombuffer(raw, dtype=OBJECT_DTYPE, count=object_count, offset=pos)
+        pos += object_count * OBJECT_DTYPE.itemsize
+        variants.append({"min_offset": min_offset, "dims": dims, "types": types, "metas": metas, "objects": objects})
+    return {"name": name, "size": (sx, sy, sz), "block_count": block_count, "variants": variants}
+
+
+def variant_blocks(variant):
+    """(offsets (n, 3), types, metas) of the solid cells of a decoded variant, spawn-relative."""
+    iy, iz, ix = np.nonzero(variant["types"])
+    offsets = np.stack([ix, iy, iz], axis=1) + np.array(variant["min_offset"])
+    return offsets, variant["types"][iy, iz, ix], variant["metas"][iy, iz, ix]
+
+
+# === Build cache ===
+
+def content_hash(raw):
+    return hashlib.blake2b(raw + f"pfb{COMPILER_VERSION}".encode(), digest_size=16).hexdigest()
+
+
+def load_index(out_dir):
+    path = Path(out_dir) / INDEX_NAME
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data.get("prefabs", {}) if data.get("version") == COMPILER_VERSION else {}
+
+
+def discard(out_dir, index, name):
+    """Forget name in the index and delete its .pfb, so a now-invalid prefab leaves no stale output."""
+    index.pop(name, None)
+    (Path(out_dir) / f"{name}.pfb").unlink(missing_ok=True)
+
+
+def save_index(out_dir, index):
+    payload = {"version": COMPILER_VERSION, "prefabs": index}
+    (Path(out_dir) / INDEX_NAME).write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+
+@tracing.traced("compile")
+def compile_library(sources, out_dir, object_sizes, force=False, check_only=False):
+    """
+    Validate and compile every source. Returns (results, index).
+
+    Each result: {name, source, status ("compiled" / "cached" / "invalid" / "checked"), errors, ...}
+    """
+    out_dir = Path(out_dir)
+    index = {} if force else load_index(out_dir)
+    results = []
+    for source in sources:
+        raw = source.read_bytes()
+        name = source.stem
+        digest = content_hash(raw)
+        entry = index.get(name)
+        target = out_dir / f"{name}.pfb"
+        if not check_only and entry and entry["hash"] == digest and target.exists():
+            results.append({"name": name, "source": source, "status": "cached", "errors": [], "output": target})
+            continue
+
+        try:
+            prefab, errors = validate(json.loads(raw), object_sizes)
+        except json.JSONDecodeError as exc:
+            prefab, errors = None, [f"invalid JSON: {exc}"]
+        if prefab is None or errors:
+            results.append({"name": name, "source": source, "status": "invalid", "errors": errors})
+            if not check_only:
+                discard(out_dir, index, name)
+            continue
+        if check_only:
+            results.append({"name": name, "source": source, "status": "checked", "errors": []})
+            continue
+
+        encoded = encode(prefab, build_variants(prefab, object_sizes))
+        out_dir.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(encoded)
+        index[name] = {"hash": digest, "source": source.as_posix(), "bytes": len(encoded),
+                       "source_bytes": len(raw), "blocks": len(prefab["blocks"])}
+        results.append({"name": name, "source": source, "status": "compiled", "errors": [], "output": target})
+
+    if not check_only:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        save_index(out_dir, index)
+    return results, index
+
+
+# === Benchmark ===
+
+def runtime_parse(raw):
+    """What load_prefab_from_file does per load: JSON parse + layer/object parsing into dicts."""
+    data = json.loads(raw)
+    blocks = [{"offset": offset, "type": t, "meta": m}
+              for offset, (t, m) in parse_layers(data["layers"], [])[0].items()]
+    objects = parse_objects(data.get("objects", []), [])
+    return blocks, objects
+
+
+def compiled_load(raw, rotation=0):
+    variant = decode(raw)["variants"][rotation]
+    return variant_blocks(variant), variant["objects"]
+
+
+def _best_time(fn, arg, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def verify_roundtrip(source, compiled_path, object_sizes):
+    """Compiled rotation variants must reproduce the runtime's block placement exactly."""
+    prefab, _ = validate(json.loads(source.read_bytes()), object_sizes)
+    decoded = decode(compiled_path.read_bytes())
+    for rotation, variant in enumerate(decoded["variants"]):
+        expected = set()
+        for (x, y, z), (block_type, meta) in prefab["blocks"].items():
+            rx, ry, rz = rotate_offsets(x, y, z, rotation)
+            if block_type == BLOCK_STAIRS or (block_type == BLOCK_RAMP and 1 <= meta <= 3):
+                meta = (meta + rotation) % 4
+            expected.add((rx, ry, rz, block_type, meta))
+        offsets, types, metas = variant_blocks(variant)
+        actual = {(*map(int, o), int(t), int(m)) for o, t, m in zip(offsets, types, metas)}
+        if actual != expected:
+            return False
+    return True
+
+
+def benchmark(results, repeats):
+    rows = []
+    for r in results:
+        if r["status"] not in ("compiled", "cached"):
+            continue
+        source_raw = r["source"].read_bytes()
+        compiled_raw = r["output"].read_bytes()
+        rows.append({
+            "name": r["name"],
+            "source_bytes": len(source_raw),
+            "compiled_bytes": len(compiled_raw),
+            "parse_s": _best_time(runtime_parse, source_raw, repeats),
+            "load_s": _best_time(compiled_load, compiled_raw, repeats),
+        })
+    return rows
+
+
+def print_report(results, rows):
+    for r in results:
+        label = f"[PREFAB_COMPILER] {r['status']:9s} {r['name']}"
+        print(label)
+        for error in r["errors"]:
+            print(f"[PREFAB_COMPILER]     {error}")
+    if not rows:
+        return
+    print(f"{'prefab':>28} {'json':>9} {'pfb':>8} {'parse ms':>9} {'load ms':>8} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['name']:>28} {row['source_bytes']:>9} {row['compiled_bytes']:>8} {row['parse_s'] * 1000:>9.3f} "
+              f"{row['load_s'] * 1000:>8.3f} {row['parse_s'] / max(row['load_s'], 1e-12):>7.1f}x")
+    parse = sum(r["parse_s"] for r in rows)
+    load = sum(r["load_s"] for r in rows)
+    src = sum(r["source_bytes"] for r in rows)
+    out = sum(r["compiled_bytes"] for r in rows)
+    print(f"[PREFAB_COMPILER] Library: {len(rows)} prefabs, {src} -> {out} bytes ({out / max(src, 1):.1%}, "
+          f"all 4 rotations included)")
+    print(f"[PREFAB_COMPILER] Parse time: {parse * 1000:.3f} ms -> {load * 1000:.3f} ms "
+          f"({parse / max(load, 1e-12):.1f}x faster, {(parse - load) * 1000:.3f} ms saved per full library load)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and compile v2 prefabs into packed binary arrays.")
+    parser.add_argument("--prefab-dir", type=Path, default=PREFAB_DIR)
+    parser.add_argument("--user-dir", type=Path, help="also compile user://world_prefabs (after res://, same precedence)")
+    parser.add_argument("--out", type=Path, default=OUT_DIR)
+    parser.add_argument("--force", action="store_true", help="ignore the build cache")
+    parser.add_argument("--check", action="store_true", help="validate only, write nothing")
+    parser.add_argument("--repeats", type=int, default=20, help="benchmark repetitions (0 = skip)")
+    args = parser.parse_args()
+
+    # Same precedence as get_available_prefabs: res:// names shadow user:// names
+    sources = {}
+    for directory in (args.prefab_dir, args.user_dir):
+        if directory and directory.is_dir():
+            for path in sorted(directory.glob("*.json")):
+                sources.setdefault(path.stem, path)
+
+    object_sizes = load_object_sizes()
+    start = time.perf_counter()
+    results, index = compile_library(list(sources.values()), args.out, object_sizes, args.force, args.check)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r["status"] == "invalid"]
+    for r in results:
+        if r["status"] == "compiled" and not verify_roundtrip(r["source"], r["output"], object_sizes):
+            r["status"] = "invalid"
+            r["errors"].append("compiled variants do not match the runtime block placement")
+            failed.append(r)
+            discard(args.out, index, r["name"])
+            save_index(args.out, index)
+
+    rows = benchmark(results, args.repeats) if args.repeats and not args.check else []
+    print_report(results, rows)
+    counts = {s: sum(1 for r in results if r["status"] == s) for s in ("compiled", "cached", "checked", "invalid")}
+    print(f"[PREFAB_COMPILER] {len(results)} prefabs in {elapsed * 1000:.1f} ms: "
+          + ", ".join(f"{count} {status}" for status, count in counts.items() if count))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
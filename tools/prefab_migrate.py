@@ -0,0 +1,497 @@
+"""
+Batch migration and dedup of the deprecated prefab library.
+
+world_prefabs/old_deprecated holds several near-identical old-format (v1
+"blocks" list) houses, each thousands of lines, that load_prefab_from_file
+refuses to load. This tool parses every prefab under the given directories in
+a process pool, converts v1 files to the v2 layers format, and groups them:
+
+    exact duplicates  same voxel + object content in any of the 4 rotations
+                      (canonical blake2b hash)
+    near duplicates   best Jaccard similarity of (x, y, z, type, meta) cells
+                      over the 4 rotations >= --threshold
+
+One v2 file is written per exact-duplicate group (or per near-duplicate
+cluster with --merge-near), skipping anything already in world_prefabs/, plus
+a catalog.json describing which source went where (copy the prefab files,
+not the catalog, into world_prefabs/). Every written file is
+re-validated with prefab_compiler.validate.
+
+v1 files may contain /* */ and // comments and trailing commas, which Godot's
+JSON parser rejects; they are stripped before parsing.
+
+Usage:
+    python tools/prefab_migrate.py                          # old_deprecated -> world_prefabs/migrated
+    python tools/prefab_migrate.py --threshold 0.85 --merge-near
+    python tools/prefab_migrate.py --dry-run
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import prefab_compiler as pc
+import tracing
+
+SOURCE_DIR = pc.PREFAB_DIR / "old_deprecated"
+OUT_DIR = pc.PREFAB_DIR / "migrated"
+CATALOG_NAME = "catalog.json"
+CATALOG_VERSION = 1
+
+NEAR_THRESHOLD = 0.9
+
+# Strings are matched first so "res://..." is never treated as a comment
+_JSON_CLEANUP_RE = re.compile(r'"(?:\\.|[^"\\])*"|/\*.*?\*/|//[^\n]*|,(?=\s*[}\]])', re.DOTALL)
+
+
+def load_lenient_json(text):
+    """json.loads that tolerates comments and trailing commas (hand-edited v1 files)."""
+    return json.loads(_JSON_CLEANUP_RE.sub(lambda m: m.group(0) if m.group(0).startswith('"') else "", text))
+
+
+# === v1 -> v2 conversion ===
+
+def _scene_ids(object_scenes):
+    return {scene: object_id for object_id, scene in object_scenes.items()}
+
+
+def convert_v1(data, object_scenes, warnings):
+    """
+    v1 {size, blocks: [{type, meta, offset}], objects: [{object_id, offset, rotation, fractional_y}]}
+    -> v2 dict. origin / submerge are dropped (spawn_user_prefab takes submerge as an argument).
+    """
+    blocks = {}
+    for block in data.get("blocks", []):
+        offset = tuple(int(v) for v in block["offset"])
+        if offset in blocks:
+            warnings.append(f"duplicate block at {offset}, last one wins")
+        blocks[offset] = (int(block.get("type", 1)), int(block.get("meta", 0)))
+
+    scene_ids = _scene_ids(object_scenes)
+    objects = []
+    for obj in data.get("objects", []):
+        object_id = obj.get("object_id")
+        if object_id is None:
+            object_id = scene_ids.get(obj.get("scene", ""))
+            if object_id is None:
+                warnings.append(f"object with scene {obj.get('scene')!r} has no registry id, dropped")
+                continue
+        x, y, z = (float(v) for v in obj["offset"])
+        objects.append([int(object_id), x, y, z, int(obj.get("rotation", 0)), float(obj.get("fractional_y", 0.0))])
+
+    # v2 layers cannot hold negative offsets: shift everything into the positive octant
+    points = [offset for offset in blocks] + [tuple(int(np.floor(v)) for v in obj[1:4]) for obj in objects]
+    shift = np.minimum(np.min(points, axis=0), 0) if points else np.zeros(3, dtype=int)
+    if shift.any():
+        warnings.append(f"negative offsets, shifted by {tuple(-shift)}")
+        blocks = {tuple(np.subtract(k, shift)): v for k, v in blocks.items()}
+        for obj in objects:
+            obj[1:4] = [obj[1] - shift[0], obj[2] - shift[1], obj[3] - shift[2]]
+
+    # Declared size is kept unless the content sticks out of it
+    extent = np.max(np.array(list(blocks) or [(0, 0, 0)]), axis=0) + 1
+    declared = np.array(data.get("size", [1, 1, 1]), dtype=int)
+    size = np.maximum(declared, extent)
+    if (size != declared).any():
+        warnings.append(f"declared size {declared.tolist()} too small, using {size.tolist()}")
+    return {"name": data.get("name", ""), "version": 2, "size": [int(v) for v in size],
+            "layers": to_layers(blocks, size), "objects": objects}
+
+
+def to_layers(blocks, size):
+    """Inverse of prefab_spawner._parse_layers: one string per Z row, "---" between Y levels."""
+    sx, sy, sz = (int(v) for v in size)
+    layers = []
+    for y in range(sy):
+        if y:
+            layers.append("---")
+        for z in range(sz):
+            tokens = []
+            for x in range(sx):
+                cell = blocks.get((x, y, z))
+                if cell is None:
+                    tokens.append(".")
+                elif cell[1]:
+                    tokens.append(f"[{cell[0]}:{cell[1]}]")
+                else:
+                    tokens.append(f"[{cell[0]}]")
+            layers.append(" ".join(tokens))
+    return layers
+
+
+# === Content hashing ===
+
+def cell_array(blocks):
+    """(n, 5) int32 array of x, y, z, type, meta."""
+    if not blocks:
+        return np.zeros((0, 5), dtype=np.int32)
+    return np.array([(*k, *v) for k, v in blocks.items()], dtype=np.int32)
+
+
+def rotated_cells(cells, rotation):
+    """Cells after a spawn rotation (offset + directional meta), normalized to a zero min corner, sorted."""
+    if cells.shape[0] == 0:
+        return cells
+    x, y, z = pc.rotate_offsets(cells[:, 0], cells[:, 1], cells[:, 2], rotation)
+    out = np.stack([x, y, z, cells[:, 3], pc.rotate_metas(cells[:, 3], cells[:, 4], rotation)], axis=1)
+    out[:, :3] -= out[:, :3].min(axis=0)
+    return out[np.lexsort(out.T[::-1])].astype(np.int32)
+
+
+def canonical_hash(cells, objects):
+    """Rotation-invariant content hash: smallest digest over the 4 rotations."""
+    digests = []
+    for rotation in range(4):
+        h = hashlib.blake2b(rotated_cells(cells, rotation).tobytes(), digest_size=16)
+        # Objects follow the block rotation; their placement is relative to the rotated block set
+        if cells.shape[0]:
+            x, y, z = pc.rotate_offsets(cells[:, 0], cells[:, 1], cells[:, 2], rotation)
+            origin = np.array([x.min(), y.min(), z.min()], dtype=np.float64)
+        else:
+            origin = np.zeros(3)
+        rows = []
+        for object_id, ox, oy, oz, rot, frac in objects:
+            px, py, pz = pc.rotate_offsets(ox, oy, oz, rotation)
+            rows.append((object_id, (rot + rotation) % 4, round(px - origin[0], 3), round(py - origin[1], 3),
+                         round(pz - origin[2], 3), round(frac, 3)))
+        h.update(json.dumps(sorted(rows)).encode())
+        digests.append(h.hexdigest())
+    return min(digests)
+
+
+def _voxel_keys(cells):
+    """Pack normalized x, y, z, type, meta into one int64 per cell for set operations."""
+    c = cells.astype(np.int64)
+    return np.sort((c[:, 0] << 40) | (c[:, 1] << 30) | (c[:, 2] << 20) | (c[:, 3] << 8) | c[:, 4])
+
+
+def similarity(cells_a, cells_b):
+    """Best Jaccard similarity of the two cell sets over the 4 rotations of b."""
+    if cells_a.shape[0] == 0 and cells_b.shape[0] == 0:
+        return 1.0
+    keys_a = _voxel_keys(rotated_cells(cells_a, 0))
+    best = 0.0
+    for rotation in range(4):
+        keys_b = _voxel_keys(rotated_cells(cells_b, rotation))
+        common = np.intersect1d(keys_a, keys_b, assume_unique=True).size
+        best = max(best, common / (keys_a.size + keys_b.size - common))
+    return best
+
+
+# === Worker ===
+
+def _display_path(path):
+    path = Path(path).resolve()
+    return path.relative_to(pc.PROJECT_ROOT).as_posix() if path.is_relative_to(pc.PROJECT_ROOT) else path.as_posix()
+
+
+@tracing.traced("convert")
+def migrate_file(task):
+    """Parse + convert one prefab. Runs in worker processes."""
+    path, object_sizes, object_scenes = task
+    path = Path(path)
+    record = {"source": _display_path(path), "stem": path.stem, "bytes": path.stat().st_size,
+              "errors": [], "warnings": []}
+    try:
+        data = load_lenient_json(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        record["errors"].append(f"unreadable JSON: {exc}")
+        return record
+
+    record["version"] = data.get("version", 1)
+    if record["version"] >= 2 and "layers" in data:
+        v2 = data
+    elif "blocks" in data:
+        try:
+            v2 = convert_v1(data, object_scenes, record["warnings"])
+        except (KeyError, TypeError, ValueError) as exc:
+            record["errors"].append(f"cannot convert v1 prefab: {exc}")
+            return record
+    else:
+        record["errors"].append("neither v2 layers nor v1 blocks")
+        return record
+
+    if not v2.get("name"):
+        v2["name"] = path.stem
+    prefab, errors = pc.validate(v2, object_sizes)
+    if prefab is None:
+        record["errors"].extend(errors)
+        return record
+    # Content problems are reported but do not block migration (the runtime is lenient too)
+    record["warnings"].extend(errors)
+
+    cells = cell_array(prefab["blocks"])
+    objects = [[o["object_id"], *o["offset"], o["rotation"], o["fractional_y"]] for o in prefab["objects"]]
+    record.update({
+        "name": v2["name"],
+        "v2": v2,
+        "cells": cells,
+        "blocks": int(cells.shape[0]),
+        "hash": canonical_hash(cells, objects),
+    })
+    return record
+
+
+# === Grouping ===
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def _representative(records):
+    """Prefer v2 sources, then names without copy/bad markers, then the shortest path."""
+    def rank(r):
+        stem = r["stem"].lower()
+        marked = any(tag in stem for tag in ("copy", "bad"))
+        return (r["version"] < 2, marked, len(r["warnings"]), len(r["source"]), r["source"])
+    return min(records, key=rank)
+
+
+@tracing.traced("match")
+def near_pairs(records, threshold, others=None):
+    """
+    (i, j, similarity) for record pairs above the threshold.
+
+    Pairs are taken within `records`, or between `records` (i) and `others` (j) when given.
+    """
+    pairs = []
+    for i, a in enumerate(records):
+        candidates = enumerate(others) if others is not None else ((j, records[j]) for j in range(i + 1, len(records)))
+        for j, b in candidates:
+            if a["hash"] == b["hash"]:
+                continue
+            # Jaccard can't exceed the block-count ratio; skip hopeless pairs cheaply
+            small, large = sorted((a["blocks"], b["blocks"]))
+            if large and small / large < threshold:
+                continue
+            score = similarity(a["cells"], b["cells"])
+            if score >= threshold:
+                pairs.append((i, j, score))
+    return pairs
+
+
+@tracing.traced("catalog")
+def build_catalog(records, library, threshold, merge_near):
+    """
+    Group parsed records into output prefabs. Returns (groups, pairs).
+
+    Near-duplicate pairs are computed between distinct contents only (one
+    record per hash), so exact copies don't repeat every pair.
+    """
+    uf = _UnionFind(len(records))
+    first_by_hash = {}
+    for i, record in enumerate(records):
+        uf.union(i, first_by_hash.setdefault(record["hash"], i))
+    unique = sorted(first_by_hash.values())
+    pairs = [(unique[i], unique[j], score) for i, j, score in near_pairs([records[k] for k in unique], threshold)]
+    if merge_near:
+        for i, j, _ in pairs:
+            uf.union(i, j)
+
+    clusters = {}
+    for i in range(len(records)):
+        clusters.setdefault(uf.find(i), []).append(records[i])
+
+    library_by_hash = {r["hash"]: r for r in library}
+    groups = []
+    for members in clusters.values():
+        rep = _representative(members)
+        in_library = library_by_hash.get(rep["hash"])
+        near_library = None
+        if in_library is None:
+            matches = near_pairs([rep], threshold, library)
+            if matches:
+                _, j, score = max(matches, key=lambda m: m[2])
+                near_library = {"prefab": library[j]["stem"] + ".json", "similarity": round(score, 4)}
+        groups.append({
+            "representative": rep,
+            "members": members,
+            "in_library": in_library["stem"] + ".json" if in_library else None,
+            "near_library": near_library,
+            # A near match to a shipped prefab only replaces it when near-duplicates are merged
+            "written": in_library is None and not (merge_near and near_library),
+        })
+    groups.sort(key=lambda g: g["representative"]["source"])
+    return groups, pairs
+
+
+def _output_names(groups):
+    """Unique file stems; v2 prefab names come from the name field like the runtime expects."""
+    used = {}
+    for group in groups:
+        base = re.sub(r"[^A-Za-z0-9_]+", "_", group["representative"]["name"]).strip("_") or "prefab"
+        count = used.get(base, 0)
+        used[base] = count + 1
+        group["output"] = base if count == 0 else f"{base}_{count + 1}"
+
+
+@tracing.traced("write")
+def write_outputs(groups, pairs, records, out_dir, threshold, dry_run=False):
+    out_dir = Path(out_dir)
+    _output_names(groups)
+    written = []
+    for group in groups:
+        rep = group["representative"]
+        if not group["written"]:
+            continue
+        # Same layout Godot's JSON.stringify(data, "\t") gives the existing v2 files
+        text = json.dumps(rep["v2"], indent="\t") + "\n"
+        group["output_bytes"] = len(text.encode("utf-8"))
+        if not dry_run:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            target = out_dir / f"{group['output']}.json"
+            target.write_text(text, encoding="utf-8")
+            written.append(target)
+
+    catalog = {
+        "version": CATALOG_VERSION,
+        "threshold": threshold,
+        "prefabs": [{
+            "output": f"{g['output']}.json" if g["written"] else None,
+            "in_library": g["in_library"],
+            "near_library": g["near_library"],
+            "hash": g["representative"]["hash"],
+            "blocks": g["representative"]["blocks"],
+            "representative": g["representative"]["source"],
+            "sources": [{"source": m["source"], "hash": m["hash"], "exact": m["hash"] == g["representative"]["hash"],
+                         "warnings": m["warnings"]} for m in g["members"]],
+        } for g in groups],
+        "near_duplicates": [{"a": records[i]["source"], "b": records[j]["source"], "similarity": round(s, 4)}
+                            for i, j, s in pairs],
+    }
+    if not dry_run:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / CATALOG_NAME).write_text(json.dumps(catalog, indent=1) + "\n", encoding="utf-8")
+    return written, catalog
+
+
+def library_records(object_sizes, object_scenes, prefab_dir=pc.PREFAB_DIR):
+    """Parsed records for the prefabs already loadable from world_prefabs/."""
+    records = [migrate_file((path, object_sizes, object_scenes)) for path in sorted(Path(prefab_dir).glob("*.json"))]
+    return [r for r in records if not r["errors"]]
+
+
+def load_object_scenes(path=pc.REGISTRY_PATH):
+    """ObjectRegistry.OBJECTS id -> scene path (to map v1 scene-only objects)."""
+    text = Path(path).read_text(encoding="utf-8")
+    scenes = {}
+    for match in re.finditer(r"^\t(\d+):\s*\{(.*?)^\t\}", text, re.MULTILINE | re.DOTALL):
+        scene = re.search(r"\"scene\":\s*\"([^\"]+)\"", match.group(2))
+        if scene:
+            scenes[int(match.group(1))] = scene.group(1)
+    return scenes
+
+
+@tracing.traced("verify")
+def verify_outputs(written, records_by_output, object_sizes):
+    """Written files must validate and hold exactly the representative's cells."""
+    failures = []
+    for path in written:
+        prefab, errors = pc.validate(json.loads(path.read_text(encoding="utf-8")), object_sizes)
+        if prefab is None:
+            failures.append(f"{path.name}: {errors}")
+            continue
+        expected = records_by_output[path.stem]["cells"]
+        if not np.array_equal(_voxel_keys(cell_array(prefab["blocks"])), _voxel_keys(expected)):
+            failures.append(f"{path.name}: voxel content changed during migration")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate old-format prefabs to v2 and deduplicate them.")
+    parser.add_argument("sources", nargs="*", type=Path, default=[SOURCE_DIR], help="files or directories")
+    parser.add_argument("--out", type=Path, default=OUT_DIR)
+    parser.add_argument("--threshold", type=float, default=NEAR_THRESHOLD, help="near-duplicate Jaccard similarity")
+    parser.add_argument("--merge-near", action="store_true", help="write one prefab per near-duplicate cluster")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--dry-run", action="store_true", help="report only, write nothing")
+    args = parser.parse_args()
+
+    paths = []
+    for source in args.sources:
+        paths.extend(sorted(source.rglob("*.json")) if source.is_dir() else [source])
+    if not paths:
+        print("[PREFAB_MIGRATE] No prefab files found")
+        return 1
+
+    object_sizes = pc.load_object_sizes()
+    object_scenes = load_object_scenes()
+    tasks = [(p, object_sizes, object_scenes) for p in paths]
+
+    start = time.perf_counter()
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs == 1:
+        results = [migrate_file(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(migrate_file, tasks))
+    parse_seconds = time.perf_counter() - start
+
+    failed = [r for r in results if r["errors"]]
+    records = [r for r in results if not r["errors"]]
+    groups, pairs = build_catalog(records, library_records(object_sizes, object_scenes), args.threshold, args.merge_near)
+    written, _ = write_outputs(groups, pairs, records, args.out, args.threshold, args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    print(f"[PREFAB_MIGRATE] Parsed {len(results)} files in {parse_seconds * 1000:.1f} ms ({jobs} workers)")
+    for r in failed:
+        print(f"[PREFAB_MIGRATE] FAILED {r['source']}")
+        for error in r["errors"]:
+            print(f"[PREFAB_MIGRATE]     {error}")
+    for group in groups:
+        rep = group["representative"]
+        if group["in_library"]:
+            target = f"already in world_prefabs as {group['in_library']}"
+        elif not group["written"]:
+            target = f"merged into world_prefabs/{group['near_library']['prefab']}"
+        else:
+            target = f"-> {group['output']}.json"
+        if group["near_library"]:
+            target += f" (near {group['near_library']['prefab']}: {group['near_library']['similarity']:.3f})"
+        print(f"[PREFAB_MIGRATE] {rep['blocks']:5d} blocks {target}")
+        for member in group["members"]:
+            kind = "keep " if member is rep else ("exact" if member["hash"] == rep["hash"] else "near ")
+            print(f"[PREFAB_MIGRATE]     {kind} {member['source']} (v{member['version']}, {member['bytes']} bytes)")
+            for warning in member["warnings"]:
+                print(f"[PREFAB_MIGRATE]         warning: {warning}")
+    for i, j, score in pairs:
+        print(f"[PREFAB_MIGRATE] near duplicate {score:.3f}: {records[i]['source']} ~ {records[j]['source']}")
+
+    source_bytes = sum(r["bytes"] for r in results)
+    outputs = [g for g in groups if g["written"]]
+    out_bytes = sum(g["output_bytes"] for g in outputs)
+    new_label = "planned new" if args.dry_run else "new"
+    print(f"[PREFAB_MIGRATE] {len(results)} files ({source_bytes} bytes) -> {len(outputs)} {new_label} v2 prefabs "
+          f"({out_bytes} bytes), {sum(1 for g in groups if not g['written'])} already in world_prefabs, "
+          f"{len(failed)} unreadable, {elapsed * 1000:.1f} ms total")
+
+    if written:
+        failures = verify_outputs(written, {g["output"]: g["representative"] for g in groups if g["written"]},
+                                  object_sizes)
+        for failure in failures:
+            print(f"[PREFAB_MIGRATE] VERIFY FAILED {failure}")
+        if failures:
+            return 1
+        print(f"[PREFAB_MIGRATE] Catalog written to {args.out / CATALOG_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Project root discovery and shared settings for the tools CLI (cli.py).
+
+The project root is the nearest folder at or above the working directory
+that holds project.godot (falling back to this checkout), unless --root or
+TOOLS_PROJECT_ROOT names one.
+
+Settings live in one JSON file, tools/tools.json (or the file named by
+--config / TOOLS_CONFIG). Every key can be overridden from the environment as
+TOOLS_<KEY>, converted to the type of the value in the file:
+
+    TOOLS_GODOT_BIN=/opt/godot/godot            string
+    TOOLS_CHECK_TIMEOUT=45                      int
+    TOOLS_SKIP_DIRS=.git,.godot,addons          list (comma separated)
+
+Stdlib only, so loading it costs nothing next to the commands themselves.
+"""
+import json
+import os
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).resolve().parent / "tools.json"
+ENV_PREFIX = "TOOLS_"
+ENV_CONFIG = "TOOLS_CONFIG"
+ENV_ROOT = "TOOLS_PROJECT_ROOT"
+PROJECT_FILE = "project.godot"
+
+
+class ConfigError(Exception):
+    """Missing project root, unreadable config or a bad override."""
+
+
+def find_root(start=None):
+    """Nearest directory at or above start (default: cwd, then this file) with project.godot."""
+    candidates = [Path(start)] if start else [Path.cwd(), Path(__file__).resolve().parent]
+    for candidate in candidates:
+        candidate = candidate.resolve()
+        for folder in (candidate, *candidate.parents):
+            if (folder / PROJECT_FILE).is_file():
+                return folder
+        if start:
+            break
+    raise ConfigError(f"no {PROJECT_FILE} at or above {candidates[0]}")
+
+
+def _coerce(key, raw, default):
+    """Environment string -> the type of the file's value for key."""
+    try:
+        if isinstance(default, bool):
+            if raw.lower() not in ("1", "0", "true", "false", "yes", "no"):
+                raise ValueError(raw)
+            return raw.lower() in ("1", "true", "yes")
+        if isinstance(default, int):
+            return int(raw)
+        if isinstance(default, float):
+            return float(raw)
+    except ValueError:
+        raise ConfigError(f"{ENV_PREFIX}{key.upper()}={raw!r}: expected {type(default).__name__}") from None
+    if isinstance(default, list):
+        return [item.strip() for item in raw.split(",") if item.strip()]
+    return raw
+
+
+class Config:
+    """Resolved settings plus where each one came from."""
+
+    def __init__(self, root, path, settings, sources):
+        self.root = root
+        self.path = path
+        self.settings = settings
+        self.sources = sources
+
+    def __getitem__(self, key):
+        return self.settings[key]
+
+    def resolve(self, path):
+        """res:// or project-relative path -> absolute filesystem Path."""
+        text = str(path)
+        if text.startswith("res://"):
+            return self.root / text[len("res://"):]
+        path = Path(text)
+        return path if path.is_absolute() else Path.cwd() / path
+
+    def to_res(self, path):
+        return "res://" + Path(path).resolve().relative_to(self.root).as_posix()
+
+    def text_files(self, extensions=None):
+        """Sorted project files with the given extensions, skipping skip_dirs and .gdignore folders."""
+        extensions = {e.lower() if e.startswith(".") else "." + e.lower()
+                      for e in (extensions or self.settings["text_extensions"])}
+        skip = set(self.settings["skip_dirs"])
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in skip
+                           and not os.path.exists(os.path.join(dirpath, d, ".gdignore"))]
+            for name in filenames:
+                if os.path.splitext(name)[1].lower() in extensions:
+                    found.append(Path(dirpath) / name)
+        found.sort()
+        return found
+
+
+def load(root=None, path=None, environ=None):
+    """Config for root (auto-discovered) from path (default tools/tools.json) plus TOOLS_* overrides."""
+    environ = os.environ if environ is None else environ
+    root = find_root(root or environ.get(ENV_ROOT) or None)
+    path = Path(path or environ.get(ENV_CONFIG) or CONFIG_PATH)
+    try:
+        settings = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"cannot read {path}: {e}") from None
+    sources = dict.fromkeys(settings, str(path))
+    for key, default in settings.items():
+        name = ENV_PREFIX + key.upper()
+        if name in environ:
+            settings[key] = _coerce(key, environ[name], default)
+            sources[key] = name
+    return Config(root, path, settings, sources)
@@ -0,0 +1,454 @@
+"""
+Explicit road graph for a region: procedural grid plus player-placed roads.
+
+Roads are described twice at runtime. gen_density.glsl's get_road_info
+derives them per voxel from a grid (intersections every road_spacing units,
+heights from road_cell_height, stepped), and road_manager.gd keeps
+player-placed road_segments as point lists that it rasterizes into a
+2048^2 mask and tests point by point in is_on_road. This tool turns both
+into one graph:
+
+    nodes   intersections / polyline points: position xyz (road height in y),
+            raw height (grid height before stepping)
+    edges   node pair, full width, kind (procedural / road / trail), source segment id
+
+Player polylines are merged in: points within --snap of an existing node
+reuse it, points that land on an edge split it (T-junctions), the rest
+become new nodes.
+
+A uniform grid over the region lists, per cell, every edge that comes
+within `reach` of the cell, so the batch queries only test a few
+candidates per point:
+
+    distance_to_road(x, z)   centerline distance to the nearest edge (1000 when beyond reach,
+                             the shader's no-road value)
+    road_height(x, z)        height of the nearest edge's centerline at the projected point;
+                             procedural edges interpolate the raw heights and apply the
+                             shader's stepping, so on the centerline it matches get_road_info
+    on_road(x, z)            distance < width / 2 of that edge (road_manager.is_on_road)
+
+Off the centerline get_road_info blends all four corners of the grid cell;
+the graph keeps the nearest centerline height instead, which is what
+placement code wants ("the road next to me").
+
+File layout (little-endian):
+
+    header   magic "RGRF", version, node / edge count, road spacing, index origin xz,
+             index dims xz, cell size, reach, index item count
+    nodes    NODE_DTYPE[node count]
+    edges    EDGE_DTYPE[edge count]
+    offsets  uint32[nx * nz + 1], candidate edges of cell i are items[offsets[i]:offsets[i + 1]]
+    items    int32[item count]
+
+Usage:
+    python tools/road_graph.py --radius 32 --out road_graph.bin
+    python tools/road_graph.py --radius 32 --segments road_segments.json --snap 2
+"""
+import argparse
+import json
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import terrain_reference as tr
+import tracing
+
+KIND_PROCEDURAL, KIND_ROAD, KIND_TRAIL = 0, 1, 2
+KIND_NAMES = ("procedural", "road", "trail")
+NO_ROAD_DISTANCE = 1000.0  # get_road_info with roads disabled
+DEFAULT_SNAP = 1.0
+DEFAULT_CELL_SIZE = 32.0
+
+GRAPH_MAGIC = b"RGRF"
+GRAPH_VERSION = 1
+# magic, version, node count, edge count, road spacing, index origin xz, index dims xz, cell size, reach, item count
+GRAPH_HEADER = struct.Struct("<4sI2If2f2I2fI")
+NODE_DTYPE = np.dtype([("position", "<f4", 3), ("raw_height", "<f4")])
+EDGE_DTYPE = np.dtype([
+    ("a", "<i4"), ("b", "<i4"), ("width", "<f4"), ("kind", "u1"), ("pad", "u1", 3), ("segment_id", "<i4"),
+])
+
+_VECTOR3 = re.compile(r"Vector3\(([^)]*)\)")
+
+
+# === Graph construction ===
+
+@tracing.traced("build")
+def procedural_graph(world_min, world_max, params=tr.DEFAULT_PARAMS):
+    """Nodes / edges of the procedural grid covering world_min..world_max ((x, z))."""
+    sp = params.road_spacing
+    if sp <= 0:
+        return np.zeros(0, dtype=NODE_DTYPE), np.zeros(0, dtype=EDGE_DTYPE)
+    cx0, cz0 = (int(np.floor(v / sp)) for v in world_min)
+    cx1, cz1 = (int(np.ceil(v / sp)) for v in world_max)
+    cz, cx = np.mgrid[cz0:cz1 + 1, cx0:cx1 + 1]
+    nz, nx = cx.shape
+
+    nodes = np.zeros(cx.size, dtype=NODE_DTYPE)
+    raw = tr.road_cell_height(cx, cz, sp).ravel()
+    nodes["raw_height"] = raw
+    # Intersections are Vector2(cell * spacing) in float32
+    nodes["position"] = np.stack([(cx * np.float32(sp)).ravel(), tr.road_step_height(raw),
+                                  (cz * np.float32(sp)).ravel()], axis=1)
+
+    ids = np.arange(cx.size).reshape(nz, nx)
+    pairs = np.concatenate([np.stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()], axis=1),
+                            np.stack([ids[:-1, :].ravel(), ids[1:, :].ravel()], axis=1)])
+    edges = np.zeros(len(pairs), dtype=EDGE_DTYPE)
+    edges["a"], edges["b"] = pairs[:, 0], pairs[:, 1]
+    edges["width"] = params.road_width
+    edges["kind"] = KIND_PROCEDURAL
+    edges["segment_id"] = -1
+    return nodes, edges
+
+
+def _parse_point(point):
+    if isinstance(point, str):
+        match = _VECTOR3.search(point)
+        if not match:
+            raise ValueError(f"not a Vector3: {point!r}")
+        point = match.group(1).split(",")
+    if len(point) != 3:
+        raise ValueError(f"road point needs 3 components: {point!r}")
+    return tuple(float(v) for v in point)
+
+
+@tracing.traced("read")
+def load_segments(path):
+    """
+    road_manager.road_segments dumped as JSON: {id: {points, width, is_trail}}
+    (or a list of such entries, or {"road_segments": ...}). Points are
+    [x, y, z] lists or var_to_str "Vector3(x, y, z)" strings.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    data = data.get("road_segments", data) if isinstance(data, dict) else data
+    items = data.items() if isinstance(data, dict) else enumerate(data)
+    segments = []
+    for segment_id, segment in items:
+        points = [_parse_point(p) for p in segment["points"]]
+        if len(points) < 2:
+            continue
+        is_trail = bool(segment.get("is_trail", False))
+        segments.append({"id": int(segment_id), "points": points, "is_trail": is_trail,
+                         "width": float(segment.get("width", 3.0 if is_trail else 10.0))})
+    return segments
+
+
+class _GraphBuilder:
+    """Growable node / edge lists used while merging player segments."""
+
+    def __init__(self, nodes, edges):
+        self.nodes = list(nodes.tolist())
+        self.edges = list(edges.tolist())
+
+    def _positions(self):
+        return np.array([n[0] for n in self.nodes], dtype=np.float64).reshape(-1, 3)
+
+    def node_for(self, point, snap):
+        positions = self._positions()
+        if len(positions):
+            dist = np.hypot(positions[:, 0] - point[0], positions[:, 2] - point[2])
+            nearest = int(np.argmin(dist))
+            if dist[nearest] <= snap:
+                return nearest
+        edge, t, dist = self._nearest_edge(point, positions)
+        if edge is not None and dist <= snap:
+            return self._split(edge, t)
+        self.nodes.append((point, point[1]))
+        return len(self.nodes) - 1
+
+    def _nearest_edge(self, point, positions):
+        if not self.edges:
+            return None, 0.0, np.inf
+        pairs = np.array([(e[0], e[1]) for e in self.edges])
+        a, b = positions[pairs[:, 0]], positions[pairs[:, 1]]
+        dist, t = _segment_distance(point[0], point[2], a[:, 0], a[:, 2], b[:, 0], b[:, 2])
+        edge = int(np.argmin(dist))
+        return edge, float(t[edge]), float(dist[edge])
+
+    def _split(self, edge, t):
+        a, b, width, kind, pad, segment_id = self.edges[edge]
+        pa, pb = np.array(self.nodes[a][0]), np.array(self.nodes[b][0])
+        raw = np.float32(self.nodes[a][1]) * np.float32(1.0 - t) + np.float32(self.nodes[b][1]) * np.float32(t)
+        position = pa + (pb - pa) * t
+        if kind == KIND_PROCEDURAL:
+            position[1] = tr.road_step_height(raw)
+        else:
+            raw = position[1]
+        self.nodes.append((tuple(position.tolist()), float(raw)))
+        middle = len(self.nodes) - 1
+        self.edges[edge] = (a, middle, width, kind, pad, segment_id)
+        self.edges.append((middle, b, width, kind, pad, segment_id))
+        return middle
+
+    def add_segment(self, segment, snap):
+        kind = KIND_TRAIL if segment["is_trail"] else KIND_ROAD
+        ids = [self.node_for(p, snap) for p in segment["points"]]
+        for a, b in zip(ids, ids[1:]):
+            if a != b:
+                self.edges.append((a, b, segment["width"], kind, (0, 0, 0), segment["id"]))
+
+    def arrays(self):
+        return np.array(self.nodes, dtype=NODE_DTYPE), np.array(self.edges, dtype=EDGE_DTYPE)
+
+
+@tracing.traced("merge")
+def merge_segments(nodes, edges, segments, snap=DEFAULT_SNAP):
+    builder = _GraphBuilder(nodes, edges)
+    for segment in segments:
+        builder.add_segment(segment, snap)
+    return builder.arrays()
+
+
+# === Queries ===
+
+def _segment_distance(px, pz, ax, az, bx, bz):
+    """Distance from points to segments in the xz plane and the clamped projection t (_point_to_segment_distance)."""
+    abx, abz = bx - ax, bz - az
+    length_sq = abx * abx + abz * abz
+    degenerate = length_sq < 0.001
+    t = np.clip(((px - ax) * abx + (pz - az) * abz) / np.where(degenerate, 1.0, length_sq), 0.0, 1.0)
+    t = np.where(degenerate, 0.0, t)
+    return np.hypot(px - (ax + abx * t), pz - (az + abz * t)), t
+
+
+class RoadGraph:
+    """Nodes, edges and the uniform-grid edge index."""
+
+    def __init__(self, nodes, edges, road_spacing, index):
+        self.nodes = nodes
+        self.edges = edges
+        self.road_spacing = road_spacing
+        # index: origin (x, z), dims (nx, nz), cell size, reach, offsets, items
+        self.index = index
+
+    @classmethod
+    def build(cls, nodes, edges, road_spacing, world_min, world_max, cell_size=DEFAULT_CELL_SIZE, reach=None):
+        if reach is None:
+            reach = max(road_spacing / 2.0, cell_size)
+        origin = (float(world_min[0]), float(world_min[1]))
+        dims = (max(int(np.ceil((world_max[0] - world_min[0]) / cell_size)), 1),
+                max(int(np.ceil((world_max[1] - world_min[1]) / cell_size)), 1))
+
+        pos = nodes["position"].astype(np.float64)
+        a, b = pos[edges["a"]], pos[edges["b"]]
+        lo_x = np.floor((np.minimum(a[:, 0], b[:, 0]) - reach - origin[0]) / cell_size).astype(np.int64)
+        hi_x = np.floor((np.maximum(a[:, 0], b[:, 0]) + reach - origin[0]) / cell_size).astype(np.int64)
+        lo_z = np.floor((np.minimum(a[:, 2], b[:, 2]) - reach - origin[1]) / cell_size).astype(np.int64)
+        hi_z = np.floor((np.maximum(a[:, 2], b[:, 2]) + reach - origin[1]) / cell_size).astype(np.int64)
+        lo_x, lo_z = np.clip(lo_x, 0, dims[0] - 1), np.clip(lo_z, 0, dims[1] - 1)
+        hi_x, hi_z = np.clip(hi_x, 0, dims[0] - 1), np.clip(hi_z, 0, dims[1] - 1)
+
+        # Expand every edge over its cell rectangle
+        span_x, span_z = hi_x - lo_x + 1, hi_z - lo_z + 1
+        per_edge = span_x * span_z
+        edge_of = np.repeat(np.arange(len(edges)), per_edge)
+        k = np.arange(per_edge.sum()) - np.repeat(np.cumsum(per_edge) - per_edge, per_edge)
+        cell_x = lo_x[edge_of] + k % span_x[edge_of]
+        cell_z = lo_z[edge_of] + k // span_x[edge_of]
+        cell = cell_z * dims[0] + cell_x
+
+        order = np.argsort(cell, kind="stable")
+        offsets = np.zeros(dims[0] * dims[1] + 1, dtype=np.uint32)
+        np.cumsum(np.bincount(cell, minlength=dims[0] * dims[1]), out=offsets[1:])
+        index = (origin, dims, float(cell_size), float(reach), offsets, edge_of[order].astype(np.int32))
+        return cls(nodes, edges, road_spacing, index)
+
+    def nearest(self, x, z):
+        """(distance, edge, t) of the nearest edge per point; edge -1 and distance 1000 when none within reach."""
+        x = np.asarray(x, dtype=np.float64).ravel()
+        z = np.asarray(z, dtype=np.float64).ravel()
+        (ox, oz), (nx, nz), cell_size, reach, offsets, items = self.index
+        cx = np.floor((x - ox) / cell_size).astype(np.int64)
+        cz = np.floor((z - oz) / cell_size).astype(np.int64)
+        inside = (cx >= 0) & (cx < nx) & (cz >= 0) & (cz < nz)
+        cell = np.where(inside, cz * nx + cx, 0)
+        starts = offsets[cell].astype(np.int64)
+        counts = np.where(inside, offsets[cell + 1].astype(np.int64) - starts, 0)
+
+        query = np.repeat(np.arange(x.size), counts)
+        slot = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        candidate = items[slot]
+        pos = self.nodes["position"].astype(np.float64)
+        a, b = pos[self.edges["a"][candidate]], pos[self.edges["b"][candidate]]
+        dist, t = _segment_distance(x[query], z[query], a[:, 0], a[:, 2], b[:, 0], b[:, 2])
+
+        best_dist = np.full(x.size, np.inf)
+        np.minimum.at(best_dist, query, dist)
+        # First candidate reaching the minimum (stable, so ties go to the lowest slot)
+        hit = np.flatnonzero(dist == best_dist[query])
+        first_query, first = np.unique(query[hit], return_index=True)
+        best_edge = np.full(x.size, -1, dtype=np.int64)
+        best_t = np.zeros(x.size)
+        best_edge[first_query] = candidate[hit[first]]
+        best_t[first_query] = t[hit[first]]
+
+        missing = best_dist > reach
+        best_edge[missing] = -1
+        return np.where(missing, NO_ROAD_DISTANCE, best_dist), best_edge, best_t
+
+    def road_info(self, x, z):
+        """(distance, centerline height) per point in one pass; height is NaN when no road within reach."""
+        dist, edge, t = self.nearest(x, z)
+        return dist, self._edge_height(edge, t)
+
+    def distance_to_road(self, x, z):
+        return self.nearest(x, z)[0]
+
+    def road_height(self, x, z):
+        return self.road_info(x, z)[1]
+
+    def _edge_height(self, edge, t):
+        found = edge >= 0
+        e = self.edges[np.where(found, edge, 0)] if len(self.edges) else np.zeros(edge.size, dtype=EDGE_DTYPE)
+        na, nb = self.nodes[e["a"]], self.nodes[e["b"]]
+        tf = t.astype(np.float32)
+        raw = tr.mix(na["raw_height"], nb["raw_height"], tf)
+        linear = tr.mix(na["position"][:, 1], nb["position"][:, 1], tf)
+        height = np.where(e["kind"] == KIND_PROCEDURAL, tr.road_step_height(raw), linear)
+        return np.where(found, height, np.nan)
+
+    def on_road(self, x, z):
+        dist, edge, _ = self.nearest(x, z)
+        width = self.edges["width"][np.maximum(edge, 0)] if len(self.edges) else np.zeros(edge.size)
+        return (edge >= 0) & (dist < width / 2.0)
+
+    def to_bytes(self):
+        (ox, oz), (nx, nz), cell_size, reach, offsets, items = self.index
+        header = GRAPH_HEADER.pack(GRAPH_MAGIC, GRAPH_VERSION, len(self.nodes), len(self.edges), self.road_spacing,
+                                   ox, oz, nx, nz, cell_size, reach, len(items))
+        return header + b"".join(a.tobytes() for a in (self.nodes, self.edges, offsets.astype("<u4"),
+                                                           items.astype("<i4")))
+
+    @classmethod
+    def from_bytes(cls, raw):
+        magic, version, node_count, edge_count, spacing, ox, oz, nx, nz, cell_size, reach, item_count = \
+            GRAPH_HEADER.unpack_from(raw)
+        if magic != GRAPH_MAGIC or version != GRAPH_VERSION:
+            raise ValueError(f"not a v{GRAPH_VERSION} road graph")
+        offset = GRAPH_HEADER.size
+        arrays = []
+        for dtype, count in ((NODE_DTYPE, node_count), (EDGE_DTYPE, edge_count),
+                             (np.dtype("<u4"), nx * nz + 1), (np.dtype("<i4"), item_count)):
+            arrays.append(np.frombuffer(raw, dtype=dtype, count=count, offset=offset))
+            offset += dtype.itemsize * count
+        nodes, edges, offsets, items = arrays
+        return cls(nodes, edges, spacing, ((ox, oz), (nx, nz), cell_size, reach, offsets, items))
+
+
+# === Checks and benchmarks ===
+
+def brute_force_distance(graph, x, z):
+    """Distance to every edge, as road_manager.is_on_road walks them."""
+    pos = graph.nodes["position"].astype(np.float64)
+    a, b = pos[graph.edges["a"]], pos[graph.edges["b"]]
+    dist, _ = _segment_distance(np.asarray(x, dtype=np.float64)[:, None], np.asarray(z, dtype=np.float64)[:, None],
+                                a[None, :, 0], a[None, :, 2], b[None, :, 0], b[None, :, 2])
+    best = dist.min(axis=1)
+    return np.where(best > graph.index[3], NO_ROAD_DISTANCE, best)
+
+
+@tracing.traced("verify")
+def verify(graph, world_min, world_max, params, samples=2000, seed=0, procedural_only=True):
+    """Problems found comparing the index against brute force (and the shader, for a pure grid)."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(world_min[0], world_max[0], samples)
+    z = rng.uniform(world_min[1], world_max[1], samples)
+    problems = []
+    if not np.array_equal(graph.distance_to_road(x, z), brute_force_distance(graph, x, z)):
+        problems.append("indexed distance differs from brute force")
+
+    if procedural_only and params.road_spacing > 0:
+        shader_dist, _ = tr.road_info(x, z, params.road_spacing)
+        if not np.allclose(graph.distance_to_road(x, z), shader_dist, atol=1e-3):
+            problems.append("distance differs from get_road_info")
+        # Points on the centerlines: heights must follow get_road_info
+        sp = params.road_spacing
+        line_x = np.round(x / sp) * sp
+        on_line = np.concatenate([np.stack([line_x, z], axis=1), np.stack([x, np.round(z / sp) * sp], axis=1)])
+        on_line = on_line[(on_line[:, 0] >= world_min[0]) & (on_line[:, 0] < world_max[0])
+                          & (on_line[:, 1] >= world_min[1]) & (on_line[:, 1] < world_max[1])]
+        _, shader_height = tr.road_info(on_line[:, 0], on_line[:, 1], sp)
+        graph_height = graph.road_height(on_line[:, 0], on_line[:, 1])
+        if not np.allclose(graph_height, shader_height, atol=1e-3):
+            worst = float(np.nanmax(np.abs(graph_height - shader_height)))
+            problems.append(f"centerline height differs from get_road_info by up to {worst:.4f}")
+    return problems
+
+
+@tracing.traced("benchmark")
+def benchmark(graph, world_min, world_max, params, queries=200000, brute_queries=2000, seed=1):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(world_min[0], world_max[0], queries)
+    z = rng.uniform(world_min[1], world_max[1], queries)
+    results = {"queries": queries, "brute_queries": brute_queries}
+
+    start = time.perf_counter()
+    graph.road_info(x, z)
+    results["graph_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tr.road_info(x, z, params.road_spacing)
+    results["shader_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(brute_queries):
+        brute_force_distance(graph, x[i:i + 1], z[i:i + 1])
+    results["brute_s"] = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a road graph with a spatial index for a region.")
+    parser.add_argument("--radius", type=int, default=32, help="chunk radius around the center")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("X", "Z"))
+    parser.add_argument("--road-spacing", type=float, default=tr.DEFAULT_PARAMS.road_spacing)
+    parser.add_argument("--road-width", type=float, default=tr.DEFAULT_PARAMS.road_width)
+    parser.add_argument("--segments", type=Path, help="road_manager.road_segments as JSON")
+    parser.add_argument("--snap", type=float, default=DEFAULT_SNAP, help="merge distance for player road points")
+    parser.add_argument("--cell-size", type=float, default=DEFAULT_CELL_SIZE, help="index cell size")
+    parser.add_argument("--queries", type=int, default=200000, help="random queries to time")
+    parser.add_argument("--out", type=Path, help="write the graph here")
+    args = parser.parse_args()
+
+    params = tr.GeneratorParams(road_spacing=args.road_spacing, road_width=args.road_width)
+    cx, cz = args.center
+    world_min = ((cx - args.radius) * tr.CHUNK_STRIDE, (cz - args.radius) * tr.CHUNK_STRIDE)
+    world_max = ((cx + args.radius + 1) * tr.CHUNK_STRIDE, (cz + args.radius + 1) * tr.CHUNK_STRIDE)
+
+    start = time.perf_counter()
+    nodes, edges = procedural_graph(world_min, world_max, params)
+    segments = load_segments(args.segments) if args.segments else []
+    if segments:
+        nodes, edges = merge_segments(nodes, edges, segments, args.snap)
+    graph = RoadGraph.build(nodes, edges, params.road_spacing, world_min, world_max, args.cell_size)
+    elapsed = time.perf_counter() - start
+    kinds = ", ".join(f"{np.count_nonzero(edges['kind'] == k)} {name}" for k, name in enumerate(KIND_NAMES))
+    items = graph.index[5]
+    print(f"[ROAD_GRAPH] {len(nodes)} nodes, {len(edges)} edges ({kinds}) in {elapsed * 1000:.1f} ms")
+    print(f"[ROAD_GRAPH]   index {graph.index[1][0]}x{graph.index[1][1]} cells of {args.cell_size:g} m, "
+          f"reach {graph.index[3]:g} m, {len(items) / max(len(graph.index[4]) - 1, 1):.1f} edges per cell")
+
+    loaded = RoadGraph.from_bytes(graph.to_bytes())
+    problems = verify(loaded, world_min, world_max, params, procedural_only=not segments)
+    print(f"[ROAD_GRAPH] Verification: {'OK' if not problems else '; '.join(problems)}")
+
+    bench = benchmark(loaded, world_min, world_max, params, args.queries)
+    rate = bench["queries"] / max(bench["graph_s"], 1e-9)
+    brute_rate = bench["brute_queries"] / max(bench["brute_s"], 1e-9)
+    print(f"[ROAD_GRAPH] {bench['queries']} distance + height queries: {bench['graph_s'] * 1000:.1f} ms "
+          f"({rate:,.0f}/s); all-segments scan {brute_rate:,.0f}/s ({rate / max(brute_rate, 1e-9):.0f}x); "
+          f"get_road_info (grid only) {bench['shader_s'] * 1000:.1f} ms")
+
+    if args.out:
+        args.out.write_bytes(graph.to_bytes())
+        print(f"[ROAD_GRAPH] Graph written to {args.out}")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""
+Batch settlement planner for road-intersection prefab spawning.
+
+prefab_spawner._check_and_spawn_buildings runs for every generated surface
+chunk: for the 9 road cells around it, it seeds a RandomNumberGenerator
+with hash("cx_cz") + seed_offset, rolls the 30% spawn chance and the road
+side, rejects forested spots (16 forest_noise samples) and takes the max of
+4 get_terrain_height calls. This tool applies the same rules to every road
+cell of a region in one vectorized pass, using the Godot hash / PCG /
+FastNoiseLite ports, and writes a site table indexed by chunk:
+
+    header     magic "STBL", version, chunk origin xz, chunk dims xz, site count,
+               road spacing, world seed
+    offsets    uint32[nx * nz + 1], sites of chunk (x, z) are
+               sites[offsets[i]:offsets[i + 1]] with i = (z - oz) * nx + (x - ox)
+    sites      cell xz (int32), spawn position xyz (float32), road side (int8)
+
+A site belongs to the chunk that contains its spawn position, so the
+lookup for a chunk is two array reads.
+
+Heights assume the terrain under the site is generated. At runtime a site is
+evaluated when any chunk within one road cell loads, and if the chunks under
+it are not loaded yet get_terrain_height returns -1000 and the spawner falls
+back to Y=15; the planner gives the height the rule intends.
+
+Usage:
+    python tools/settlement_planner.py --radius 64 --out settlement_sites.bin
+    python tools/settlement_planner.py --radius 64 --bench-radius 12
+"""
+import argparse
+import math
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import godot_random
+import terrain_reference as tr
+from fast_noise_lite import FastNoiseLite
+import tracing
+
+# prefab_spawner.gd @export defaults
+SPAWN_DISTANCE_FROM_ROAD = 15.0
+SEED_OFFSET = 42
+SPAWN_CHANCE = 0.3
+FOREST_FREQUENCY = 0.05
+FOREST_THRESHOLD = 0.4
+FOREST_OFFSETS = (-2, 0, 2, 4)  # range(-2, 5, 2)
+FOOTPRINT_OFFSETS = ((0, 0), (3, 0), (0, 3), (3, 3))
+FALLBACK_HEIGHT = 15.0
+PREFAB_NAME = "small_house"
+DEFAULT_WORLD_SEED = 12345  # chunk_manager.gd world_seed
+
+TABLE_MAGIC = b"STBL"
+TABLE_VERSION = 1
+# magic, version, chunk origin xz, chunk dims xz, site count, road spacing, world seed
+TABLE_HEADER = struct.Struct("<4sI2i2IIfq")
+SITE_DTYPE = np.dtype([
+    ("cell_x", "<i4"), ("cell_z", "<i4"),
+    ("position", "<f4", 3), ("side", "i1"), ("pad", "u1", 3),
+])
+
+
+# === Rules (vectorized over road cells) ===
+
+def cell_range(chunk_min, chunk_max, spacing):
+    """Road cells visited by _check_and_spawn_buildings for chunks chunk_min..chunk_max on one axis."""
+    first = int(np.floor(chunk_min * tr.CHUNK_STRIDE / spacing)) - 1
+    last = int(np.floor(chunk_max * tr.CHUNK_STRIDE / spacing)) + 1
+    return first, last
+
+
+def is_forested(spawn_x, spawn_z, forest_noise):
+    """_is_forested_area: any of 16 samples around the footprint >= 0.4."""
+    offsets = np.array(FOREST_OFFSETS, dtype=np.float64)
+    sx = spawn_x[:, None, None] + offsets[None, :, None]
+    sz = spawn_z[:, None, None] + offsets[None, None, :]
+    noise = forest_noise.get_noise_2d(sx, sz).astype(np.float64)
+    return (noise >= FOREST_THRESHOLD).any(axis=(1, 2))
+
+
+def footprint_height(spawn_x, spawn_z, params):
+    """Max of the 4 footprint get_terrain_height samples, 15 when below zero."""
+    heights = np.stack([tr.get_terrain_height(spawn_x + dx, spawn_z + dz, params)
+                        for dx, dz in FOOTPRINT_OFFSETS]).astype(np.float64)
+    top = heights.max(axis=0)
+    return np.where(top < 0.0, FALLBACK_HEIGHT, top)
+
+
+def evaluate_cells(cell_x, cell_z, world_seed, params=tr.DEFAULT_PARAMS):
+    """Apply the spawn rules to arrays of road cells. Returns a SITE_DTYPE array of accepted sites."""
+    cell_x = np.asarray(cell_x, dtype=np.int64).ravel()
+    cell_z = np.asarray(cell_z, dtype=np.int64).ravel()
+    spacing = params.road_spacing
+
+    rng = godot_random.RandomNumberGenerator(godot_random.cell_key_hash(cell_x, cell_z).astype(np.int64) + SEED_OFFSET)
+    # GDScript compares the float32 draw as a 64-bit float
+    roll = rng.randf().astype(np.float64)
+    side_roll = rng.randf().astype(np.float64)
+    keep = roll <= SPAWN_CHANCE
+    cell_x, cell_z, side_roll = cell_x[keep], cell_z[keep], side_roll[keep]
+
+    side = np.where(side_roll > 0.5, 1, -1).astype(np.int8)
+    # intersection is a Vector2 (float32), the offset math is 64-bit
+    spawn_x = (cell_x * spacing).astype(np.float32).astype(np.float64) + SPAWN_DISTANCE_FROM_ROAD * side
+    spawn_z = (cell_z * spacing).astype(np.float32).astype(np.float64) + SPAWN_DISTANCE_FROM_ROAD
+
+    open_ground = ~is_forested(spawn_x, spawn_z, FastNoiseLite(world_seed, FOREST_FREQUENCY))
+    cell_x, cell_z, side = cell_x[open_ground], cell_z[open_ground], side[open_ground]
+    spawn_x, spawn_z = spawn_x[open_ground], spawn_z[open_ground]
+
+    sites = np.zeros(cell_x.size, dtype=SITE_DTYPE)
+    sites["cell_x"], sites["cell_z"], sites["side"] = cell_x, cell_z, side
+    sites["position"] = np.stack([spawn_x, footprint_height(spawn_x, spawn_z, params), spawn_z], axis=1)
+    return sites
+
+
+@tracing.traced("plan")
+def plan_region(chunk_min, chunk_max, world_seed, params=tr.DEFAULT_PARAMS):
+    """All sites the spawner would place for surface chunks chunk_min..chunk_max ((x, z) inclusive)."""
+    if params.road_spacing <= 0:
+        return np.zeros(0, dtype=SITE_DTYPE)
+    x0, x1 = cell_range(chunk_min[0], chunk_max[0], params.road_spacing)
+    z0, z1 = cell_range(chunk_min[1], chunk_max[1], params.road_spacing)
+    cz, cx = np.mgrid[z0:z1 + 1, x0:x1 + 1]
+    return evaluate_cells(cx, cz, world_seed, params)
+
+
+# === Site table ===
+
+def site_chunks(sites):
+    """(chunk_x, chunk_z) containing each site's spawn position."""
+    pos = sites["position"].astype(np.float64)
+    return (np.floor(pos[:, 0] / tr.CHUNK_STRIDE).astype(np.int64),
+            np.floor(pos[:, 2] / tr.CHUNK_STRIDE).astype(np.int64))
+
+
+class SiteTable:
+    """Sites sorted by chunk with a dense per-chunk offset grid (O(1) lookup)."""
+
+    def __init__(self, origin, dims, offsets, sites, road_spacing, world_seed):
+        self.origin = origin
+        self.dims = dims
+        self.offsets = offsets
+        self.sites = sites
+        self.road_spacing = road_spacing
+        self.world_seed = world_seed
+
+    @classmethod
+    def build(cls, sites, road_spacing, world_seed):
+        chunk_x, chunk_z = site_chunks(sites)
+        if sites.size:
+            origin = (int(chunk_x.min()), int(chunk_z.min()))
+            dims = (int(chunk_x.max()) - origin[0] + 1, int(chunk_z.max()) - origin[1] + 1)
+        else:
+            origin, dims = (0, 0), (0, 0)
+        slot = (chunk_z - origin[1]) * dims[0] + (chunk_x - origin[0])
+        order = np.argsort(slot, kind="stable")
+        counts = np.bincount(slot, minlength=dims[0] * dims[1])
+        offsets = np.zeros(dims[0] * dims[1] + 1, dtype=np.uint32)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(origin, dims, offsets, sites[order], road_spacing, world_seed)
+
+    def sites_in_chunk(self, chunk_x, chunk_z):
+        ix, iz = chunk_x - self.origin[0], chunk_z - self.origin[1]
+        if not (0 <= ix < self.dims[0] and 0 <= iz < self.dims[1]):
+            return self.sites[:0]
+        slot = iz * self.dims[0] + ix
+        return self.sites[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def to_bytes(self):
+        header = TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, *self.origin, *self.dims, self.sites.size,
+                                   self.road_spacing, self.world_seed)
+        return header + self.offsets.astype("<u4").tobytes() + self.sites.tobytes()
+
+    @classmethod
+    def from_bytes(cls, raw):
+        magic, version, ox, oz, nx, nz, count, spacing, seed = TABLE_HEADER.unpack_from(raw)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"not a v{TABLE_VERSION} settlement site table")
+        offsets = np.frombuffer(raw, dtype="<u4", count=nx * nz + 1, offset=TABLE_HEADER.size)
+        sites = np.frombuffer(raw, dtype=SITE_DTYPE, count=count, offset=TABLE_HEADER.size + offsets.nbytes)
+        return cls((ox, oz), (nx, nz), offsets, sites, spacing, seed)
+
+
+# === Per-chunk reference (runtime order) ===
+
+_MASK32 = 0xFFFFFFFF
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _string_hash(text):
+    """String::hash() (djb2) of one string, as in hash(key)."""
+    h = 5381
+    for ch in text:
+        h = (h * 33 + ord(ch)) & _MASK32
+    return h
+
+
+class _ScalarRNG:
+    """One RandomNumberGenerator in plain ints (RandomPCG), independent of the vectorized port."""
+
+    def __init__(self, seed):
+        self.inc = ((int(godot_random.PCG_DEFAULT_INC_64) << 1) | 1) & _MASK64
+        self.state = 0
+        self._next()
+        self.state = (self.state + seed) & _MASK64
+        self._next()
+
+    def _next(self):
+        old = self.state
+        self.state = (old * int(godot_random.PCG_MULTIPLIER) + self.inc) & _MASK64
+        xorshifted = (((old >> 18) ^ old) >> 27) & _MASK32
+        rot = old >> 59
+        return ((xorshifted >> rot) | (xorshifted << ((32 - rot) & 31))) & _MASK32
+
+    def randf(self):
+        proto_exp_offset = self._next()
+        if proto_exp_offset == 0:
+            return 0.0
+        mantissa = self._next() | 0x80000001
+        leading_zeros = 32 - proto_exp_offset.bit_length()
+        return float(np.float32(math.ldexp(float(np.float32(mantissa)), -32 - leading_zeros)))
+
+
+def _terrain_height(x, z, params):
+    return float(tr.get_terrain_height(x, z, params))
+
+
+@tracing.traced("plan per chunk")
+def plan_per_chunk(chunk_min, chunk_max, world_seed, params=tr.DEFAULT_PARAMS):
+    """
+    _on_chunk_generated for every chunk in turn, ported line by line: one road
+    cell at a time with the string-keyed spawned_positions dictionary, a
+    scalar RNG per cell, up to 16 single forest_noise samples (stopping at the
+    first forested one) and 4 single get_terrain_height calls. Used as the
+    baseline for both the sites and the timing of the batched planner.
+    """
+    spacing = params.road_spacing
+    forest_noise = FastNoiseLite(world_seed, FOREST_FREQUENCY)
+    spawned_positions = {}
+    sites = []
+    for chunk_z in range(chunk_min[1], chunk_max[1] + 1):
+        for chunk_x in range(chunk_min[0], chunk_max[0] + 1):
+            cell_x = math.floor(chunk_x * tr.CHUNK_STRIDE / spacing)
+            cell_z = math.floor(chunk_z * tr.CHUNK_STRIDE / spacing)
+            for dx in range(-1, 2):
+                for dz in range(-1, 2):
+                    cx, cz = int(cell_x + dx), int(cell_z + dz)
+                    intersection_x = float(np.float32(cx * spacing))
+                    intersection_z = float(np.float32(cz * spacing))
+                    key = "%d_%d" % (cx, cz)
+                    if key in spawned_positions:
+                        continue
+                    spawned_positions[key] = True
+
+                    rng = _ScalarRNG(_string_hash(key) + SEED_OFFSET)
+                    if rng.randf() > SPAWN_CHANCE:
+                        continue
+                    side = 1 if rng.randf() > 0.5 else -1
+                    spawn_x = intersection_x + SPAWN_DISTANCE_FROM_ROAD * side
+                    spawn_z = intersection_z + SPAWN_DISTANCE_FROM_ROAD
+
+                    forested = False
+                    for fx in FOREST_OFFSETS:
+                        for fz in FOREST_OFFSETS:
+                            if float(forest_noise.get_noise_2d(spawn_x + fx, spawn_z + fz)) >= FOREST_THRESHOLD:
+                                forested = True
+                                break
+                        if forested:
+                            break
+                    if forested:
+                        continue
+
+                    h1 = _terrain_height(spawn_x, spawn_z, params)
+                    h2 = _terrain_height(spawn_x + 3, spawn_z, params)
+                    h3 = _terrain_height(spawn_x, spawn_z + 3, params)
+                    h4 = _terrain_height(spawn_x + 3, spawn_z + 3, params)
+                    terrain_y = max(max(h1, h2), max(h3, h4))
+                    if terrain_y < 0:
+                        terrain_y = FALLBACK_HEIGHT
+                    sites.append((cx, cz, (spawn_x, terrain_y, spawn_z), side, (0, 0, 0)))
+    return np.array(sites, dtype=SITE_DTYPE)
+
+
+def _sorted_sites(sites):
+    return np.sort(sites, order=["cell_z", "cell_x"])
+
+
+@tracing.traced("benchmark")
+def benchmark(chunk_min, chunk_max, world_seed, params=tr.DEFAULT_PARAMS):
+    start = time.perf_counter()
+    batch = plan_region(chunk_min, chunk_max, world_seed, params)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = plan_per_chunk(chunk_min, chunk_max, world_seed, params)
+    reference_s = time.perf_counter() - start
+
+    same = np.array_equal(_sorted_sites(batch).tobytes(), _sorted_sites(reference).tobytes())
+    return batch_s, reference_s, batch.size, same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan road-intersection building sites for a region.")
+    parser.add_argument("--radius", type=int, default=32, help="chunk radius around the center")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("X", "Z"))
+    parser.add_argument("--seed", type=int, default=DEFAULT_WORLD_SEED, help="world_seed")
+    parser.add_argument("--road-spacing", type=float, default=tr.DEFAULT_PARAMS.road_spacing)
+    parser.add_argument("--out", type=Path, help="write the site table here")
+    parser.add_argument("--bench-radius", type=int, default=8,
+                        help="radius for the per-chunk comparison (0 = skip)")
+    parser.add_argument("--queries", type=int, default=100000, help="random chunk lookups to time")
+    args = parser.parse_args()
+
+    params = tr.GeneratorParams(road_spacing=args.road_spacing)
+    cx, cz = args.center
+    chunk_min, chunk_max = (cx - args.radius, cz - args.radius), (cx + args.radius, cz + args.radius)
+
+    start = time.perf_counter()
+    sites = plan_region(chunk_min, chunk_max, args.seed, params)
+    table = SiteTable.build(sites, params.road_spacing, args.seed)
+    elapsed = time.perf_counter() - start
+    chunks = (args.radius * 2 + 1) ** 2
+    print(f"[SETTLEMENT] Planned {sites.size} sites for {chunks} chunks in {elapsed * 1000:.1f} ms")
+    if sites.size:
+        heights = sites["position"][:, 1]
+        print(f"[SETTLEMENT]   site height {heights.min():.2f} .. {heights.max():.2f}, "
+              f"{np.count_nonzero(sites['side'] > 0)} east / {np.count_nonzero(sites['side'] < 0)} west of the road")
+
+    raw = table.to_bytes()
+    loaded = SiteTable.from_bytes(raw)
+    rng = np.random.default_rng(0)
+    qx = rng.integers(chunk_min[0], chunk_max[0] + 1, args.queries)
+    qz = rng.integers(chunk_min[1], chunk_max[1] + 1, args.queries)
+    start = time.perf_counter()
+    found = sum(loaded.sites_in_chunk(int(x), int(z)).size for x, z in zip(qx, qz))
+    query_s = time.perf_counter() - start
+    print(f"[SETTLEMENT] Site table: {len(raw)} bytes, {args.queries} chunk lookups in {query_s * 1000:.1f} ms "
+          f"({query_s / max(args.queries, 1) * 1e6:.2f} us each, {found} sites returned)")
+
+    ok = True
+    if args.bench_radius:
+        r = args.bench_radius
+        batch_s, reference_s, count, same = benchmark((cx - r, cz - r), (cx + r, cz + r), args.seed, params)
+        bench_chunks = (r * 2 + 1) ** 2
+        print(f"[SETTLEMENT] Scalar per-chunk port vs batch ({bench_chunks} chunks, {count} sites): "
+              f"{reference_s * 1000:.1f} ms -> {batch_s * 1000:.1f} ms ({reference_s / max(batch_s, 1e-9):.1f}x), "
+              f"{'identical' if same else 'MISMATCH'}")
+        ok = same
+
+    if args.out:
+        args.out.write_bytes(raw)
+        print(f"[SETTLEMENT] Site table written to {args.out}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
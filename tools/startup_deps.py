@@ -0,0 +1,286 @@
+"""
+Startup cost analyzer: what each autoload and the main scene drags in before
+the first frame.
+
+Every autoload in project.godot and the main scene are loaded before the
+first frame, together with everything they reference eagerly:
+
+    .gd               preload("..."), extends "...", and global class_name
+                      scripts it mentions (the compiler loads those)
+    .tscn / .tres     [ext_resource path="..."] entries
+    .gdshader(inc)    #include "..."
+
+For each root the tool computes that transitive closure, weights it by
+on-disk bytes (source assets; the imported copies under .godot/ scale with
+them) and asset type, and reports:
+
+    ranked roots      closure size, bytes per asset type, bytes exclusive to
+                      the root (what making it lazy would save)
+    heavy assets      the largest files in each closure with the chain that
+                      pulls them in (DebugManager -> a.gd -> b.tscn -> c.glb)
+    shared            resources pulled in by several autoloads
+
+load("...") and change_scene_to_file("...") literals are lazy and only
+followed with --include-load. Scenes the main scene switches to are listed
+separately under "after startup", with the bytes they add on top of the
+startup set; they count neither towards the startup total nor against an
+autoload's exclusive bytes.
+
+Usage:
+    python tools/startup_deps.py
+    python tools/startup_deps.py --top 10 --include-load
+    python tools/startup_deps.py --json startup_report.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import gdscript_check as gc
+import tracing
+
+PROJECT_ROOT = gc.PROJECT_ROOT
+
+ASSET_TYPES = {
+    "texture": ("png", "jpg", "jpeg", "webp", "svg", "tga", "bmp", "exr", "hdr", "ktx", "dds"),
+    "model": ("glb", "gltf", "fbx", "obj", "blend", "dae"),
+    "audio": ("wav", "ogg", "mp3"),
+    "scene": ("tscn", "scn"),
+    "resource": ("tres", "res"),
+    "script": ("gd", "cs"),
+    "shader": ("gdshader", "gdshaderinc", "glsl", "glslinc"),
+    "font": ("ttf", "otf", "woff", "woff2", "fnt"),
+}
+_TYPE_BY_EXT = {ext: kind for kind, exts in ASSET_TYPES.items() for ext in exts}
+
+_EXT_RESOURCE_RE = re.compile(r"^\[ext_resource\b([^\]]*)\]", re.M)
+_ATTR_RE = re.compile(r'(\w+)="([^"]*)"')
+_INCLUDE_RE = re.compile(r'^\s*#include\s+"([^"]+)"', re.M)
+_MAIN_SCENE_RE = re.compile(r'^run/main_scene\s*=\s*"([^"]+)"', re.M)
+
+
+def asset_type(res):
+    return _TYPE_BY_EXT.get(res.rsplit(".", 1)[-1].lower(), "other")
+
+
+def human_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+# === Dependency graph ===
+
+class DependencyGraph:
+    """Eager / lazy edges between res:// paths, read on demand and memoized."""
+
+    def __init__(self, root, summaries, include_load=False):
+        self.root = Path(root)
+        self.summaries = summaries
+        self.include_load = include_load
+        self.class_names = {info["class_name"]: res for res, info in summaries.items()
+                            if info["class_name"]}
+        self._edges = {}
+        self.scene_changes = {}
+
+    def file(self, res):
+        return self.root / res[len("res://"):]
+
+    def size(self, res):
+        path = self.file(res)
+        return path.stat().st_size if path.is_file() else 0
+
+    def _resolve(self, path, owner):
+        target = gc.resolve_res(path, owner, self.root)
+        if target is None:
+            return None
+        return "res://" + os.path.normpath(target.relative_to(self.root)).replace(os.sep, "/")
+
+    def edges(self, res):
+        """Sorted dependency res paths of one file."""
+        if res in self._edges:
+            return self._edges[res]
+        deps = set()
+        ext = res.rsplit(".", 1)[-1].lower()
+        if ext == "gd":
+            info = self.summaries.get(res)
+            if info is not None and not info["error"]:
+                for path, _, _, kind in info["paths"]:
+                    if kind == "scene":
+                        target = self._resolve(path, res)
+                        if target:
+                            self.scene_changes.setdefault(res, set()).add(target)
+                    if kind in ("preload", "extends") or (self.include_load and kind in ("load", "scene")):
+                        deps.add(self._resolve(path, res))
+                declared = set(info["declared"])
+                for name, _, _ in info["types"] + info["names"]:
+                    target = self.class_names.get(name)
+                    if target and name not in declared:
+                        deps.add(target)
+        elif ext in ("tscn", "tres", "scn", "res") and self.file(res).is_file():
+            text = self.file(res).read_text(encoding="utf-8", errors="replace")
+            for m in _EXT_RESOURCE_RE.finditer(text):
+                attrs = dict(_ATTR_RE.findall(m.group(1)))
+                if "path" in attrs:
+                    deps.add(self._resolve(attrs["path"], res))
+        elif ext in ("gdshader", "gdshaderinc") and self.file(res).is_file():
+            text = self.file(res).read_text(encoding="utf-8", errors="replace")
+            deps.update(self._resolve(p, res) for p in _INCLUDE_RE.findall(text))
+        deps.discard(None)
+        deps.discard(res)
+        self._edges[res] = sorted(deps)
+        return self._edges[res]
+
+    @tracing.traced("walk")
+    def closure(self, start):
+        """BFS from start: {res: parent res (None for start)}."""
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            res = queue.popleft()
+            for dep in self.edges(res):
+                if dep not in parents:
+                    parents[dep] = res
+                    queue.append(dep)
+        return parents
+
+
+def chain(parents, res):
+    path = [res]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    return list(reversed(path))
+
+
+# === Report ===
+
+@tracing.traced("analyze")
+def analyze(root, summaries, include_load=False, top=5):
+    root = Path(root)
+    graph = DependencyGraph(root, summaries, include_load)
+    roots = []
+    for name, path in gc.project_autoloads(root).items():
+        roots.append({"name": name, "kind": "autoload", "start": graph._resolve(path, "res://project.godot")})
+    project = (root / "project.godot").read_text(encoding="utf-8")
+    main = _MAIN_SCENE_RE.search(project)
+    if main:
+        roots.append({"name": "main scene", "kind": "main_scene", "start": main.group(1)})
+
+    closures = {}
+    for entry in roots:
+        closures[entry["name"]] = graph.closure(entry["start"])
+    if main:
+        seen = set(r["start"] for r in roots)
+        for res in sorted(closures["main scene"]):
+            for target in sorted(graph.scene_changes.get(res, ())):
+                if target not in seen:
+                    seen.add(target)
+                    name = f"{target.rsplit('/', 1)[-1]} (scene change)"
+                    roots.append({"name": name, "kind": "scene_change", "start": target})
+                    closures[name] = graph.closure(target)
+
+    startup = [entry for entry in roots if entry["kind"] != "scene_change"]
+    owners = {}
+    for entry in startup:
+        for res in closures[entry["name"]]:
+            owners.setdefault(res, []).append(entry["name"])
+
+    def root_report(entry, owned):
+        """Sizes of one root's closure; owned(res) decides which bytes count as its own."""
+        parents = closures[entry["name"]]
+        by_type = {}
+        total = own = 0
+        missing = []
+        for res in parents:
+            size = graph.size(res)
+            if not graph.file(res).is_file():
+                missing.append(res)
+            total += size
+            by_type[asset_type(res)] = by_type.get(asset_type(res), 0) + size
+            if owned(res):
+                own += size
+        heavy = sorted(parents, key=lambda r: (-graph.size(r), r))[:top]
+        return {
+            "name": entry["name"], "kind": entry["kind"], "start": entry["start"],
+            "files": len(parents), "bytes": total, "exclusive_bytes": own,
+            "bytes_by_type": dict(sorted(by_type.items(), key=lambda kv: -kv[1])),
+            "heavy": [{"res": r, "bytes": graph.size(r), "type": asset_type(r),
+                       "chain": chain(parents, r)} for r in heavy if graph.size(r)],
+            "missing": sorted(missing),
+        }
+
+    report_roots = [root_report(entry, lambda res: len(owners[res]) == 1) for entry in startup]
+    report_roots.sort(key=lambda r: (-r["bytes"], r["name"]))
+    # Scenes switched to after the first frame: their own bytes are those not already loaded at startup
+    after_startup = [root_report(entry, lambda res: res not in owners)
+                     for entry in roots if entry["kind"] == "scene_change"]
+    after_startup.sort(key=lambda r: (-r["bytes"], r["name"]))
+
+    autoload_names = {r["name"] for r in roots if r["kind"] == "autoload"}
+    shared = []
+    for res, names in owners.items():
+        autoload_owners = [n for n in names if n in autoload_names]
+        if len(autoload_owners) > 1:
+            shared.append({"res": res, "bytes": graph.size(res), "type": asset_type(res),
+                           "roots": sorted(names)})
+    shared.sort(key=lambda s: (-s["bytes"], s["res"]))
+    union = set(owners)
+    return {"roots": report_roots, "after_startup": after_startup, "shared": shared, "total_files": len(union),
+            "total_bytes": sum(graph.size(r) for r in union), "include_load": include_load}
+
+
+def print_root(r, own_label):
+    types = ", ".join(f"{t} {human_bytes(b)}" for t, b in r["bytes_by_type"].items() if b)
+    print(f"[STARTUP] {r['name']:<32} {r['files']:4d} files {human_bytes(r['bytes']):>9}  "
+          f"{own_label} {human_bytes(r['exclusive_bytes']):>9}  ({types})")
+    for item in r["heavy"]:
+        via = " -> ".join(p.rsplit("/", 1)[-1] for p in item["chain"][:-1])
+        print(f"[STARTUP]     {human_bytes(item['bytes']):>9} {item['type']:<8} {item['res']}"
+              + (f"  via {via}" if via else ""))
+    for res in r["missing"]:
+        print(f"[STARTUP]     MISSING {res}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank autoloads / main scene by startup dependency weight.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--top", type=int, default=5, help="heavy assets listed per root")
+    parser.add_argument("--include-load", action="store_true",
+                        help="also follow load() / change_scene_to_file() literals")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    jobs = args.jobs or os.cpu_count() or 1
+    summaries, _ = gc.load_summaries(gc.script_files(root), root, jobs)
+    report = analyze(root, summaries, args.include_load, args.top)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=1) + "\n", encoding="utf-8")
+    mode = "preload + load" if args.include_load else "preload / ext_resource"
+    print(f"[STARTUP] {len(report['roots'])} roots, {report['total_files']} files, "
+          f"{human_bytes(report['total_bytes'])} loaded before the first frame ({mode}), "
+          f"analysed in {elapsed * 1000:.0f} ms")
+    for r in report["roots"]:
+        print_root(r, "exclusive")
+    if report["after_startup"]:
+        print("[STARTUP] After startup (scene changes, not in the total above; 'new' = not loaded at startup):")
+        for r in report["after_startup"]:
+            print_root(r, "new")
+    if report["shared"]:
+        print("[STARTUP] Shared by several autoloads:")
+        for s in report["shared"]:
+            print(f"[STARTUP]     {human_bytes(s['bytes']):>9} {s['res']}  ({', '.join(s['roots'])})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Golden-fingerprint regression check for terrain generation.
+
+Player saves store terrain edits (stored_modifications) that are replayed on
+top of regenerated density, so any unintended change to gen_density.glsl
+(noise, roads, biome fbm) silently corrupts existing worlds. This tool
+fingerprints the CPU reference of the generator over a fixed grid of
+generator configurations and chunk coordinates and diffs the result against
+the committed golden file.
+
+Each chunk fingerprint holds, for density, material and surface height:
+  - a hash of the quantized values (density 1/256, height 1/64, raw IDs)
+  - summary statistics, so a failing hash shows how far things moved
+
+The golden file also stores the SHA-256 of gen_density.glsl and
+gen_water_density.glsl: the fingerprints only cover the CPU port, so a shader
+edit that was not ported to terrain_reference.py fails the check too.
+
+NOTE: world_seed is not a gen_density.glsl input yet (only vegetation,
+prefabs and entities use it), so the config grid varies generator
+parameters instead. Add a seed field to the configs once the shader takes one.
+
+When a terrain change is intentional, port it to terrain_reference.py and
+re-run with --update to refresh the golden file in the same commit.
+
+Usage:
+    python tools/terrain_fingerprint.py            # check, exit 1 on difference
+    python tools/terrain_fingerprint.py --update   # rewrite the golden file
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import terrain_reference as tr
+import tracing
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden" / "terrain_fingerprints.json"
+GOLDEN_VERSION = 2
+SHADER_DIR = Path(__file__).resolve().parent.parent / "world_marching_cubes"
+SHADER_SOURCES = ("gen_density.glsl", "gen_water_density.glsl")
+
+DENSITY_QUANT = 256.0
+HEIGHT_QUANT = 64.0
+STAT_TOLERANCE = 1e-4
+
+# Named generator configurations (chunk_manager.gd exports)
+CONFIGS = {
+    "default": tr.GeneratorParams(),
+    "no_roads": tr.GeneratorParams(road_spacing=0.0),
+    "hilly": tr.GeneratorParams(noise_freq=0.05, terrain_height=24.0, road_spacing=64.0, road_width=6.0),
+}
+
+# XZ chunk columns: spawn area, road intersections and far-away chunks (float precision)
+CHUNK_COLUMNS = [
+    (0, 0), (1, 0), (0, 1), (-1, -1), (3, 3), (-4, 2),
+    (6, -6), (13, 9), (-25, 17), (64, -48), (-200, 150), (1000, 1000),
+]
+CHUNK_LAYERS = (-1, 0, 1)
+
+
+def _digest(array):
+    return hashlib.blake2b(np.ascontiguousarray(array).tobytes(), digest_size=8).hexdigest()
+
+
+def _stats(values):
+    if values.size == 0:
+        return {"min": 0.0, "max": 0.0, "mean": 0.0}
+    return {"min": round(float(values.min()), 5), "max": round(float(values.max()), 5),
+            "mean": round(float(values.mean()), 5)}
+
+
+def fingerprint_chunk(task):
+    """Fingerprint one (config name, coord) pair. Runs in worker processes."""
+    config_name, coord = task
+    params = CONFIGS[config_name]
+    density = tr.chunk_density(coord, params)
+    materials = tr.chunk_materials(coord, params)
+    heights = tr.surface_heights(density, coord[1] * tr.CHUNK_STRIDE)
+    has_surface = heights > -1000.0
+
+    mat_ids, mat_counts = np.unique(materials, return_counts=True)
+    return {
+        "config": config_name,
+        "coord": list(coord),
+        "density": {
+            "hash": _digest(np.rint(density * DENSITY_QUANT).astype("<i4")),
+            "solid": int(np.count_nonzero(density < 0.0)),
+            **_stats(density),
+        },
+        "material": {
+            "hash": _digest(materials.astype(np.uint8)),
+            "histogram": {str(int(i)): int(c) for i, c in zip(mat_ids, mat_counts)},
+        },
+        "surface": {
+            "hash": _digest(np.rint(heights * HEIGHT_QUANT).astype("<i4")),
+            "columns": int(np.count_nonzero(has_surface)),
+            **_stats(heights[has_surface]),
+        },
+    }
+
+
+def shader_hashes(shader_dir=SHADER_DIR):
+    """{file name: SHA-256} of the generator shaders (line endings normalized)."""
+    return {name: hashlib.sha256((Path(shader_dir) / name).read_bytes().replace(b"\r\n", b"\n")).hexdigest()
+            for name in SHADER_SOURCES}
+
+
+def tasks():
+    return [(name, (x, y, z)) for name in CONFIGS for x, z in CHUNK_COLUMNS for y in CHUNK_LAYERS]
+
+
+@tracing.traced("fingerprint")
+def compute_all(jobs=None):
+    work = tasks()
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        return [fingerprint_chunk(t) for t in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(fingerprint_chunk, work, chunksize=max(1, len(work) // (jobs * 4))))
+
+
+def _key(record):
+    return f"{record['config']}:{','.join(str(c) for c in record['coord'])}"
+
+
+def diff_shaders(golden, current):
+    """Shaders whose source no longer matches the hash the golden file was written against."""
+    return [f"{name}: shader changed: port it to terrain_reference.py and re-run with --update"
+            for name in sorted(current) if golden.get(name) != current[name]]
+
+
+@tracing.traced("match")
+def diff(golden, current):
+    """List of human readable differences between two fingerprint sets."""
+    problems = []
+    golden_by_key = {_key(r): r for r in golden}
+    current_by_key = {_key(r): r for r in current}
+
+    for key in sorted(golden_by_key.keys() - current_by_key.keys()):
+        problems.append(f"{key}: missing from current run")
+    for key in sorted(current_by_key.keys() - golden_by_key.keys()):
+        problems.append(f"{key}: not in golden file (run --update)")
+
+    for key in sorted(golden_by_key.keys() & current_by_key.keys()):
+        old, new = golden_by_key[key], current_by_key[key]
+        for part in ("density", "material", "surface"):
+            if old[part]["hash"] == new[part]["hash"]:
+                continue
+            changes = []
+            for field, old_value in old[part].items():
+                if field == "hash":
+                    continue
+                new_value = new[part].get(field)
+                if isinstance(old_value, float) and isinstance(new_value, float):
+                    if abs(old_value - new_value) > STAT_TOLERANCE:
+                        changes.append(f"{field} {old_value} -> {new_value}")
+                elif old_value != new_value:
+                    changes.append(f"{field} {old_value} -> {new_value}")
+            problems.append(f"{key}: {part} changed" + (f" ({'; '.join(changes)})" if changes else " (hash only)"))
+    return problems
+
+
+@tracing.traced("read")
+def load_golden(path=GOLDEN_PATH):
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != GOLDEN_VERSION:
+        raise ValueError(f"{path}: golden version {data.get('version')} != {GOLDEN_VERSION} (run --update)")
+    return data["chunks"], data["shaders"]
+
+
+@tracing.traced("write")
+def write_golden(records, shaders, path=GOLDEN_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": GOLDEN_VERSION,
+        "quantization": {"density": DENSITY_QUANT, "height": HEIGHT_QUANT},
+        "configs": {name: vars(params) for name, params in CONFIGS.items()},
+        "shaders": shaders,
+        "chunks": records,
+    }
+    path.write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check terrain generation against golden fingerprints.")
+    parser.add_argument("--update", action="store_true", help="rewrite the golden file")
+    parser.add_argument("--golden", type=Path, default=GOLDEN_PATH)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = compute_all(args.jobs)
+    elapsed = time.perf_counter() - start
+    print(f"[TERRAIN_FINGERPRINT] Fingerprinted {len(records)} chunks in {elapsed:.2f}s")
+
+    shaders = shader_hashes()
+    if args.update:
+        write_golden(records, shaders, args.golden)
+        print(f"[TERRAIN_FINGERPRINT] Golden file written: {args.golden}")
+        return 0
+
+    if not args.golden.exists():
+        print(f"[TERRAIN_FINGERPRINT] No golden file at {args.golden} (run with --update)")
+        return 1
+
+    golden_records, golden_shaders = load_golden(args.golden)
+    problems = diff_shaders(golden_shaders, shaders) + diff(golden_records, records)
+    if problems:
+        print(f"[TERRAIN_FINGERPRINT] FAILED: {len(problems)} differences")
+        for line in problems:
+            print(f"   {line}")
+        print("[TERRAIN_FINGERPRINT] Existing saves replay stored_modifications onto this terrain.")
+        print("[TERRAIN_FINGERPRINT] If the change is intentional, re-run with --update and commit the golden file.")
+        return 1
+
+    print("[TERRAIN_FINGERPRINT] OK: terrain matches golden fingerprints")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Offline LOD mesh generation for distant terrain chunks.
+
+Downsamples a chunk's 33^3 density grid (GPU layout, generated terrain
+only: terrain_reference has no player modification buffer, so edits are not
+reflected) to 2x / 4x / 8x coarser lattices and runs marching cubes on the
+result. The coarse lattice always spans exactly one CHUNK_STRIDE, so chunk
+borders line up between neighbours of any LOD; the remaining cracks where
+two different LODs meet are hidden with skirts (border edges extruded down).
+
+Output is the same interleaved 9-float vertex stream MeshBuilder consumes,
+so a LOD mesh can go straight into build_mesh_native().
+
+Usage:
+    python tools/terrain_lod.py                     # 5x5 chunk benchmark around origin
+    python tools/terrain_lod.py --radius 3 --y 0 --out lod_meshes
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+import marching_cubes as mc
+import terrain_reference as tr
+import tracing
+
+LOD_STRIDES = (1, 2, 4, 8)
+SKIRT_EPSILON = 1e-4
+
+
+def lod_cells(stride):
+    """Number of cells per axis for a LOD stride (31 at full resolution)."""
+    return -(-tr.CHUNK_STRIDE // stride)
+
+
+def resample_grid(grid, cells):
+    """Trilinearly resample a 33^3 [z, y, x] grid onto (cells + 1)^3 points spanning 0..CHUNK_STRIDE."""
+    coords = np.linspace(0.0, float(tr.CHUNK_STRIDE), cells + 1, dtype=np.float32)
+    i0 = np.minimum(np.floor(coords).astype(np.int64), grid.shape[0] - 2)
+    t = (coords - i0).astype(np.float32)
+
+    # Separable: interpolate along x, then y, then z
+    g = grid[:, :, i0] * (1 - t) + grid[:, :, i0 + 1] * t
+    g = g[:, i0, :] * (1 - t)[None, :, None] + g[:, i0 + 1, :] * t[None, :, None]
+    g = g[i0, :, :] * (1 - t)[:, None, None] + g[i0 + 1, :, :] * t[:, None, None]
+    return g.astype(np.float32)
+
+
+def lod_cell_materials(materials, cells):
+    """Material per coarse cell, sampled from the full-res grid at the cell center."""
+    spacing = tr.CHUNK_STRIDE / cells
+    centers = np.floor((np.arange(cells) + 0.5) * spacing + 0.5).astype(np.int64)
+    centers = np.clip(centers, 0, materials.shape[0] - 1)
+    return materials[np.ix_(centers, centers, centers)]
+
+
+def build_skirts(vertices, depth, extent=float(tr.CHUNK_STRIDE)):
+    """
+    Extrude mesh edges lying on the chunk border planes straight down by `depth`.
+
+    Skirt quads reuse the edge's normal and color and are wound to face the
+    same way as the triangle they hang from.
+    """
+    tris = vertices.reshape(-1, 3, mc.VERTEX_STRIDE)
+    if tris.shape[0] == 0:
+        return np.zeros((0, mc.VERTEX_STRIDE), dtype=np.float32)
+
+    skirts = []
+    for a, b in ((0, 1), (1, 2), (2, 0)):
+        va, vb = tris[:, a], tris[:, b]
+        on_border = np.zeros(tris.shape[0], dtype=bool)
+        for axis in (0, 2):  # Only X/Z borders; Y neighbours are stacked chunks
+            for plane in (0.0, extent):
+                on_border |= ((np.abs(va[:, axis] - plane) < SKIRT_EPSILON)
+                              & (np.abs(vb[:, axis] - plane) < SKIRT_EPSILON))
+        if not np.any(on_border):
+            continue
+
+        top_a, top_b = va[on_border], vb[on_border]
+        low_a, low_b = top_a.copy(), top_b.copy()
+        low_a[:, 1] -= depth
+        low_b[:, 1] -= depth
+        # Edge runs a->b in the triangle, so the quad runs b->a to face the same way
+        quad = np.stack([top_b, top_a, low_a, top_b, low_a, low_b], axis=1)
+        skirts.append(quad.reshape(-1, mc.VERTEX_STRIDE))
+
+    if not skirts:
+        return np.zeros((0, mc.VERTEX_STRIDE), dtype=np.float32)
+    return np.concatenate(skirts)
+
+
+@tracing.traced("lod mesh")
+def build_lod_mesh(density, materials, stride, skirts=True):
+    """
+    Build the mesh for one chunk at a LOD stride.
+
+    Stride 1 is the exact marching_cubes.glsl result (no skirts); coarser
+    strides resample the density and optionally add skirts one coarse cell deep.
+    """
+    if stride == 1:
+        return mc.polygonize_chunk(density, materials)
+
+    cells = lod_cells(stride)
+    spacing = tr.CHUNK_STRIDE / cells
+    coarse = resample_grid(density, cells)
+    cell_mats = lod_cell_materials(materials, cells) if materials is not None else None
+    verts = mc.polygonize(coarse, cell_mats, spacing)
+    if skirts and verts.shape[0]:
+        verts = np.concatenate([verts, build_skirts(verts, spacing)])
+    return verts
+
+
+@tracing.traced("benchmark")
+def benchmark(coords, params=tr.DEFAULT_PARAMS, strides=LOD_STRIDES, out_dir=None):
+    """Mesh every chunk at every LOD and collect triangle counts and build times."""
+    stats = {s: {"triangles": 0, "seconds": 0.0, "chunks": 0} for s in strides}
+
+    for coord in coords:
+        density = tr.chunk_density(coord, params)
+        materials = tr.chunk_materials(coord, params)
+        for stride in strides:
+            start = time.perf_counter()
+            verts = build_lod_mesh(density, materials, stride)
+            stats[stride]["seconds"] += time.perf_counter() - start
+            stats[stride]["triangles"] += verts.shape[0] // 3
+            stats[stride]["chunks"] += 1
+
+            if out_dir is not None and verts.shape[0]:
+                name = f"chunk_{coord[0]}_{coord[1]}_{coord[2]}_lod{stride}.f32"
+                (out_dir / name).write_bytes(verts.astype("<f4").tobytes())
+
+    return stats
+
+
+def print_report(stats):
+    base = stats.get(1, {}).get("triangles", 0)
+    print(f"{'LOD':>5} {'cells':>6} {'triangles':>10} {'tris/chunk':>11} {'vs 1x':>7} "
+          f"{'bytes/chunk':>12} {'ms/chunk':>9}")
+    for stride, s in stats.items():
+        chunks = max(s["chunks"], 1)
+        tris = s["triangles"]
+        ratio = f"{tris / base:.1%}" if base else "-"
+        bytes_per_chunk = tris * 3 * mc.VERTEX_STRIDE * 4 / chunks
+        print(f"{str(stride) + 'x':>5} {lod_cells(stride):>6} {tris:>10} {tris / chunks:>11.0f} {ratio:>7} "
+              f"{bytes_per_chunk:>12.0f} {s['seconds'] * 1000 / chunks:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and benchmark LOD terrain meshes.")
+    parser.add_argument("--radius", type=int, default=2, help="chunk radius around the center (default 2 = 5x5)")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("X", "Z"))
+    parser.add_argument("--y", type=int, default=0, help="chunk Y layer")
+    parser.add_argument("--out", type=Path, help="write each LOD mesh as raw little-endian float32")
+    args = parser.parse_args()
+
+    coords = [(args.center[0] + x, args.y, args.center[1] + z)
+              for x in range(-args.radius, args.radius + 1)
+              for z in range(-args.radius, args.radius + 1)]
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+
+    print(f"[LOD] Meshing {len(coords)} chunks at strides {', '.join(f'{s}x' for s in LOD_STRIDES)}...")
+    stats = benchmark(coords, out_dir=args.out)
+    print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+CPU reference of the terrain generator (gen_density.glsl).
+
+NumPy port of the density and material compute shader so tools can reason
+about the world without a GPU or the engine. Every function is vectorized
+over arbitrary arrays of world positions and evaluated in float32 to stay
+as close as possible to the shader arithmetic.
+
+The water pass (gen_water_density.glsl) is mirrored by water_density_at().
+
+Grids returned by chunk_density()/chunk_materials() are indexed [z, y, x],
+so .ravel() gives the same flat order as the GPU buffer:
+    index = x + y * 33 + z * 33 * 33
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# Mirrors world_marching_cubes/chunk_manager.gd
+CHUNK_SIZE = 32
+CHUNK_STRIDE = CHUNK_SIZE - 1  # Chunks overlap by 1 unit
+DENSITY_GRID_SIZE = 33  # 0..32
+MIN_Y_LAYER = -20
+MAX_Y_LAYER = 40
+
+
+@dataclass(frozen=True)
+class GeneratorParams:
+    """Push constants fed to gen_density.glsl (chunk_manager.gd @export defaults)."""
+    noise_freq: float = 0.1
+    terrain_height: float = 10.0
+    road_spacing: float = 100.0  # 0 = procedural roads disabled
+    road_width: float = 8.0
+    water_level: float = 13.0  # Pushed as terrain_height to gen_water_density.glsl
+
+
+DEFAULT_PARAMS = GeneratorParams()
+
+
+def _f32(a):
+    return np.asarray(a, dtype=np.float32)
+
+
+def fract(x):
+    return x - np.floor(x)
+
+
+def mix(a, b, t):
+    return a * (np.float32(1.0) - t) + b * t
+
+
+def smoothstep(edge0, edge1, x):
+    t = np.clip((x - np.float32(edge0)) / np.float32(edge1 - edge0), 0.0, 1.0)
+    return t * t * (np.float32(3.0) - np.float32(2.0) * t)
+
+
+def glsl_mod(x, y):
+    return x - np.float32(y) * np.floor(x / np.float32(y))
+
+
+# === Noise Functions ===
+
+def hash3(px, py, pz):
+    px = fract(px * np.float32(0.3183099) + np.float32(0.1)) * np.float32(17.0)
+    py = fract(py * np.float32(0.3183099) + np.float32(0.1)) * np.float32(17.0)
+    pz = fract(pz * np.float32(0.3183099) + np.float32(0.1)) * np.float32(17.0)
+    return fract(px * py * pz * (px + py + pz))
+
+
+def noise3(x, y, z):
+    """Value noise, 0..1 (noise() in the shaders)."""
+    x, y, z = _f32(x), _f32(y), _f32(z)
+    ix, iy, iz = np.floor(x), np.floor(y), np.floor(z)
+    fx, fy, fz = x - ix, y - iy, z - iz
+    fx = fx * fx * (np.float32(3.0) - np.float32(2.0) * fx)
+    fy = fy * fy * (np.float32(3.0) - np.float32(2.0) * fy)
+    fz = fz * fz * (np.float32(3.0) - np.float32(2.0) * fz)
+    one = np.float32(1.0)
+    return mix(mix(mix(hash3(ix, iy, iz), hash3(ix + one, iy, iz), fx),
+                   mix(hash3(ix, iy + one, iz), hash3(ix + one, iy + one, iz), fx), fy),
+               mix(mix(hash3(ix, iy, iz + one), hash3(ix + one, iy, iz + one), fx),
+                   mix(hash3(ix, iy + one, iz + one), hash3(ix + one, iy + one, iz + one), fx), fy), fz)
+
+
+def _hash2d(px, py):
+    qx = px * np.float32(127.1) + py * np.float32(311.7)
+    qy = px * np.float32(269.5) + py * np.float32(183.3)
+    return (np.float32(-1.0) + np.float32(2.0) * fract(np.sin(qx) * np.float32(43758.5453123)),
+            np.float32(-1.0) + np.float32(2.0) * fract(np.sin(qy) * np.float32(43758.5453123)))
+
+
+def noise2d(px, py):
+    """2D simplex noise for biomes (matches terrain.gdshader)."""
+    px, py = _f32(px), _f32(py)
+    k1 = np.float32(0.366025404)
+    k2 = np.float32(0.211324865)
+
+    s = (px + py) * k1
+    ix, iy = np.floor(px + s), np.floor(py + s)
+    t = (ix + iy) * k2
+    ax, ay = px - ix + t, py - iy + t
+    m = (ax >= ay).astype(np.float32)  # step(a.y, a.x)
+    ox, oy = m, np.float32(1.0) - m
+    bx, by = ax - ox + k2, ay - oy + k2
+    cx = ax - np.float32(1.0) + np.float32(2.0) * k2
+    cy = ay - np.float32(1.0) + np.float32(2.0) * k2
+
+    ha = np.maximum(np.float32(0.5) - (ax * ax + ay * ay), 0.0)
+    hb = np.maximum(np.float32(0.5) - (bx * bx + by * by), 0.0)
+    hc = np.maximum(np.float32(0.5) - (cx * cx + cy * cy), 0.0)
+
+    gax, gay = _hash2d(ix, iy)
+    gbx, gby = _hash2d(ix + ox, iy + oy)
+    gcx, gcy = _hash2d(ix + np.float32(1.0), iy + np.float32(1.0))
+
+    n = (ha ** 4 * (ax * gax + ay * gay)
+         + hb ** 4 * (bx * gbx + by * gby)
+         + hc ** 4 * (cx * gcx + cy * gcy))
+    return n * np.float32(70.0)
+
+
+def fbm2(px, py):
+    """Fractal Brownian Motion for biome shapes (3 octaves of noise2d)."""
+    px, py = _f32(px), _f32(py)
+    f = np.zeros(np.broadcast(px, py).shape, dtype=np.float32)
+    w = np.float32(0.5)
+    for _ in range(3):
+        f = f + w * noise2d(px, py)
+        px, py = px * np.float32(2.0), py * np.float32(2.0)
+        w = w * np.float32(0.5)
+    return f
+
+
+def fbm3(x, y, z):
+    """3D Fractal Brownian Motion for underground variation."""
+    x, y, z = _f32(x), _f32(y), _f32(z)
+    f = np.zeros(np.broadcast(x, y, z).shape, dtype=np.float32)
+    w = np.float32(0.5)
+    for _ in range(3):
+        f = f + w * noise3(x, y, z)
+        x, y, z = x * np.float32(2.0), y * np.float32(2.0), z * np.float32(2.0)
+        w = w * np.float32(0.5)
+    return f
+
+
+# === Procedural Road Network ===
+
+def road_info(wx, wz, spacing):
+    """Distance to the nearest road and the road's target height (get_road_info)."""
+    wx, wz = _f32(wx), _f32(wz)
+    shape = np.broadcast(wx, wz).shape
+    if spacing <= 0.0:
+        return np.full(shape, 1000.0, dtype=np.float32), np.zeros(shape, dtype=np.float32)
+
+    sp = np.float32(spacing)
+    cell_x = np.floor(wx / sp)
+    cell_z = np.floor(wz / sp)
+    local_x = glsl_mod(wx, sp)
+    local_z = glsl_mod(wz, sp)
+
+    dist_x = np.minimum(local_x, sp - local_x)
+    dist_z = np.minimum(local_z, sp - local_z)
+    min_dist = np.minimum(dist_x, dist_z)
+
+    interpolated = mix(
+        mix(road_cell_height(cell_x, cell_z, sp), road_cell_height(cell_x + 1, cell_z, sp), local_x / sp),
+        mix(road_cell_height(cell_x, cell_z + 1, sp), road_cell_height(cell_x + 1, cell_z + 1, sp), local_x / sp),
+        local_z / sp)
+
+    return np.broadcast_to(min_dist, shape), np.broadcast_to(road_step_height(interpolated), shape)
+
+
+def road_step_height(interpolated):
+    """Stepped road: flat at integer levels, short smoothstep ramp in between."""
+    interpolated = _f32(interpolated)
+    base_level = np.floor(interpolated)
+    frac = interpolated - base_level
+    flat_size = np.float32(0.45)
+    ramp_t = smoothstep(0.0, 1.0, (frac - flat_size) / (np.float32(1.0) - np.float32(2.0) * flat_size))
+    road_height = np.where(frac < flat_size, base_level,
+                           np.where(frac > np.float32(1.0) - flat_size, base_level + np.float32(1.0),
+                                    base_level + ramp_t))
+    return road_height.astype(np.float32)
+
+
+def road_cell_height(cell_x, cell_z, spacing):
+    """Road height at a grid intersection (gentle 0.008 noise, +-3 around Y=12)."""
+    sp = np.float32(spacing)
+    return (noise3(_f32(cell_x) * sp * np.float32(0.008), np.float32(0.0), _f32(cell_z) * sp * np.float32(0.008))
+            * np.float32(3.0) + np.float32(12.0))
+
+
+# === Density / Material ===
+
+def terrain_height_at(wx, wz, params=DEFAULT_PARAMS):
+    """Unmodified hill height (base + noise), ignoring roads."""
+    wx, wz = _f32(wx), _f32(wz)
+    th = np.float32(params.terrain_height)
+    freq = np.float32(params.noise_freq)
+    return th + noise3(wx * freq, np.float32(0.0), wz * freq) * th
+
+
+def density_at(wx, wy, wz, params=DEFAULT_PARAMS):
+    """Signed density (negative = solid) at world positions (get_density)."""
+    wx, wy, wz = _f32(wx), _f32(wy), _f32(wz)
+    density = wy - terrain_height_at(wx, wz, params)
+
+    road_dist, road_height = road_info(wx, wz, params.road_spacing)
+    width = np.float32(params.road_width)
+    blend = smoothstep(width, width * np.float32(0.5), road_dist)
+    on_road = road_dist < width
+    return np.where(on_road, mix(density, wy - road_height, blend), density).astype(np.float32)
+
+
+def material_at(wx, wy, wz, params=DEFAULT_PARAMS):
+    """Material IDs (uint) at world positions, including the road-aware surface depth."""
+    wx, wy, wz = _f32(wx), _f32(wy), _f32(wz)
+    shape = np.broadcast(wx, wy, wz).shape
+    width = np.float32(params.road_width)
+
+    terrain_height = terrain_height_at(wx, wz, params)
+    road_dist, road_height = road_info(wx, wz, params.road_spacing)
+    blend = smoothstep(width * np.float32(2.0), width * np.float32(0.5), road_dist)
+    effective_height = np.where(road_dist < width * np.float32(2.0),
+                                mix(terrain_height, road_height, blend), terrain_height)
+    depth = effective_height - wy
+
+    # Later rules are applied first so earlier (higher priority) rules overwrite them
+    biome = fbm2(wx * np.float32(0.002), wz * np.float32(0.002))
+    mat = np.zeros(shape, dtype=np.uint32)  # Grass
+    mat = np.where(biome > 0.2, 4, mat)  # Gravel
+    mat = np.where(biome > 0.6, 5, mat)  # Snow
+    mat = np.where(biome < -0.2, 3, mat)  # Sand
+
+    deep = depth > 10.0
+    if np.any(deep):
+        stone = np.where(fbm3(wx * np.float32(0.02), wy * np.float32(0.02), wz * np.float32(0.02)) > 0.25, 9, 1)
+        ore = (noise3(wx * np.float32(0.15), wy * np.float32(0.15), wz * np.float32(0.15)) > 0.75) & (depth > 8.0)
+        mat = np.where(deep, np.where(ore, 2, stone), mat)
+
+    on_road = (road_dist < width * np.float32(0.5)) & (np.abs(wy - road_height) < 2.0)
+    return np.where(on_road, 6, mat).astype(np.uint32)
+
+
+# === Water ===
+
+def water_surface_height(wx, wz, params=DEFAULT_PARAMS):
+    """
+    Water surface height per column (gen_water_density.glsl effective_height).
+
+    Low-frequency noise splits the world into wet and dry regions; dry
+    regions keep their water 20 units lower, i.e. underground.
+    """
+    wx, wz = _f32(wx), _f32(wz)
+    freq = np.float32(params.noise_freq) * np.float32(0.1)
+    mask_val = noise3(wx * freq, np.float32(0.0), wz * freq) * np.float32(2.0) - np.float32(1.0)
+    water_mask = smoothstep(-0.3, 0.3, mask_val)
+    return np.float32(params.water_level) - (np.float32(1.0) - water_mask) * np.float32(20.0)
+
+
+def water_density_at(wx, wy, wz, params=DEFAULT_PARAMS):
+    """Signed water density (negative = water, positive = air)."""
+    return (_f32(wy) - water_surface_height(wx, wz, params)).astype(np.float32)
+
+
+def chunk_origin(coord):
+    """World position of a chunk's density grid origin (coord * CHUNK_STRIDE)."""
+    return tuple(float(c * CHUNK_STRIDE) for c in coord)
+
+
+def chunk_world_grid(coord, size=DENSITY_GRID_SIZE):
+    """World-space sample positions for a chunk, each shaped (size, size, size) as [z, y, x]."""
+    ox, oy, oz = chunk_origin(coord)
+    axis = np.arange(size, dtype=np.float32)
+    wz, wy, wx = np.meshgrid(axis + np.float32(oz), axis + np.float32(oy), axis + np.float32(ox), indexing="ij")
+    return wx, wy, wz
+
+
+def chunk_density(coord, params=DEFAULT_PARAMS):
+    """33x33x33 density grid for a chunk, same layout as the GPU density buffer."""
+    return density_at(*chunk_world_grid(coord), params)
+
+
+def chunk_materials(coord, params=DEFAULT_PARAMS):
+    """33x33x33 material grid for a chunk, same layout as the GPU material buffer."""
+    return material_at(*chunk_world_grid(coord), params)
+
+
+def surface_heights(density, base_y=0.0):
+    """
+    World surface height for every (z, x) column of a chunk grid (get_chunk_surface_height).
+
+    Scans each column top-down for the first solid sample and interpolates
+    against the sample above it. Columns without solid return -1000.0.
+    """
+    size_y = density.shape[1]
+    solid = density < 0.0
+    has_solid = solid.any(axis=1)
+    top = size_y - 1 - np.argmax(solid[:, ::-1, :], axis=1)  # highest solid iy per column
+
+    d = np.take_along_axis(density, top[:, None, :], axis=1)[:, 0, :]
+    above = np.take_along_axis(density, np.minimum(top + 1, size_y - 1)[:, None, :], axis=1)[:, 0, :]
+    t = above / np.where(above - d == 0.0, np.float32(1.0), above - d)
+    local = np.where(top < size_y - 1, (top + 1).astype(np.float32) - t, top.astype(np.float32))
+    return np.where(has_solid, np.float32(base_y) + local, np.float32(-1000.0)).astype(np.float32)
+
+
+def column_surface_heights(wx, wz, base_y=0.0, params=DEFAULT_PARAMS):
+    """
+    surface_heights() for individual grid columns of one chunk layer, without the full grid.
+
+    Density is y minus a column height, so only the few samples around that
+    height decide the result; they are evaluated exactly like the full grid
+    would evaluate them, so the output is bit-identical to surface_heights().
+    """
+    wx, wz = np.broadcast_arrays(_f32(wx), _f32(wz))
+    base = np.float32(base_y)
+    top_iy = DENSITY_GRID_SIZE - 1
+    height = base + np.float32(16.0) - density_at(wx, base + np.float32(16.0), wz, params)
+    k = np.ceil(height.astype(np.float64) - float(base)).astype(np.int64) - 1  # highest solid sample, +-1
+
+    window = np.clip(k[..., None] + np.arange(-2, 4), 0, top_iy)
+    d = density_at(wx[..., None], base + window.astype(np.float32), wz[..., None], params)
+    solid = d < 0.0
+    # Monotonic in y: the window must start solid (or at iy 0) and end in air (or at the top sample)
+    if np.any(solid[..., -1] & (window[..., -1] < top_iy)) or np.any(~solid[..., 0] & (window[..., 0] > 0)):
+        raise ArithmeticError("column_surface_heights: surface outside the sample window")
+
+    has_solid = solid.any(axis=-1)
+    last = solid.shape[-1] - 1 - np.argmax(solid[..., ::-1], axis=-1)
+    top = np.take_along_axis(window, last[..., None], axis=-1)[..., 0]
+    d_top = np.take_along_axis(d, last[..., None], axis=-1)[..., 0]
+    d_above = np.take_along_axis(d, np.minimum(last + 1, solid.shape[-1] - 1)[..., None], axis=-1)[..., 0]
+    t = d_above / np.where(d_above - d_top == 0.0, np.float32(1.0), d_above - d_top)
+    local = np.where(top < top_iy, (top + 1).astype(np.float32) - t, top.astype(np.float32))
+    return np.where(has_solid, base + local, np.float32(-1000.0)).astype(np.float32)
+
+
+def get_terrain_height(wx, wz, params=DEFAULT_PARAMS):
+    """
+    Surface height at world (x, z) positions (chunk_manager.get_terrain_height).
+
+    Same lookup as the engine with every chunk layer loaded: nearest grid
+    column (round half away from zero), highest chunk layer with solid in that
+    column, top-down scan with interpolation. -1000.0 where nothing is solid.
+    """
+    wx, wz = np.broadcast_arrays(np.asarray(wx, dtype=np.float64), np.asarray(wz, dtype=np.float64))
+    shape = wx.shape
+    wx, wz = wx.ravel(), wz.ravel()
+    chunk_x = np.floor(wx / CHUNK_STRIDE)
+    chunk_z = np.floor(wz / CHUNK_STRIDE)
+    local_x = np.sign(wx - chunk_x * CHUNK_STRIDE) * np.floor(np.abs(wx - chunk_x * CHUNK_STRIDE) + 0.5)
+    local_z = np.sign(wz - chunk_z * CHUNK_STRIDE) * np.floor(np.abs(wz - chunk_z * CHUNK_STRIDE) + 0.5)
+    sx = (chunk_x * CHUNK_STRIDE + local_x).astype(np.float32)[:, None]
+    sz = (chunk_z * CHUNK_STRIDE + local_z).astype(np.float32)[:, None]
+
+    # Density is y minus a column height, so y = 0 locates the surface layer; scan one layer either side
+    estimate = -density_at(sx[:, 0], np.float32(0.0), sz[:, 0], params).astype(np.float64)
+    top_layer = np.clip(np.ceil(estimate / CHUNK_STRIDE), MIN_Y_LAYER, MAX_Y_LAYER).astype(np.int64)
+
+    heights = np.full(wx.shape, -1000.0, dtype=np.float32)
+    found = np.zeros(wx.shape, dtype=bool)
+    iy = np.arange(DENSITY_GRID_SIZE, dtype=np.float32)[None, :]
+    for step in range(3):
+        layer = top_layer - step
+        base_y = (layer * CHUNK_STRIDE).astype(np.float32)[:, None]
+        column = density_at(sx, base_y + iy, sz, params)
+        h = surface_heights(column[:, :, None], base_y)[:, 0]
+        use = ~found & (layer >= MIN_Y_LAYER) & (h > -1000.0)
+        heights[use] = h[use]
+        found |= use
+    return heights.reshape(shape)
+
+
+def chunk_water_density(coord, params=DEFAULT_PARAMS):
+    """33x33x33 water density grid for a chunk, same layout as the GPU buffer."""
+    return water_density_at(*chunk_world_grid(coord), params)
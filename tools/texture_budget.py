@@ -0,0 +1,530 @@
+"""
+Texture budget analyzer and downscale / recompress pipeline.
+
+Reads PNG / JPEG / WebP headers only (no decode) for every texture in the
+project, combines them with the .import settings Godot uses (compress/mode,
+high_quality, normal_map, mipmaps/generate, process/size_limit) and
+estimates GPU memory per texture:
+
+    VRAM compressed     1 byte/px (BPTC, DXT5, RGTC normal maps), 0.5 byte/px
+                        for opaque S3TC (DXT1)
+    lossless / lossy /  RGBA8 4, RG8 2, R8 1 byte/px
+    uncompressed
+    mipmaps             x 4/3
+
+Per scene it sums the textures each .tscn pulls in (ext_resource /
+preload closure from startup_deps.py, plus glTF image uris and the textures
+Godot extracts next to a .glb on import) and flags textures and scenes over
+budget, with the process/size_limit that would bring a texture in budget.
+
+--write-variants DIR decodes flagged PNGs (numpy; JPEG / WebP need a decoder
+and only get the size_limit suggestion), halves them with an alpha-weighted
+box filter until they fit, re-encodes them with per-row adaptive filtering
+and Z_FILTERED deflate (--zlib-level, 9 is ~3% smaller and ~9x slower than
+6), and writes them under DIR mirroring their res:// paths. Textures Godot
+re-extracts from a model on import only get the size_limit suggestion.
+Encoding runs in a process pool; results are cached in
+tools/.cache/texture_variants/ by source content hash, target size and level.
+
+Usage:
+    python tools/texture_budget.py
+    python tools/texture_budget.py --max-size 1024 --max-vram-mb 2 --scene-budget-mb 64
+    python tools/texture_budget.py --write-variants /tmp/textures --json textures.json
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import asset_dedup as ad
+import gdscript_check as gc
+import startup_deps as sd
+import tracing
+
+PROJECT_ROOT = gc.PROJECT_ROOT
+VARIANT_CACHE = PROJECT_ROOT / "tools" / ".cache" / "texture_variants"
+TEXTURE_EXTS = frozenset(("png", "jpg", "jpeg", "webp"))
+MODEL_EXTS = frozenset(("gltf", "glb"))
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+COMPRESS_MODES = {0: "lossless", 1: "lossy", 2: "vram", 3: "uncompressed", 4: "basis"}
+_PARAM_RE = re.compile(r"^([\w/]+)=(.*)$", re.M)
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+# === Headers ===
+
+class TextureInfo:
+    """Header facts of one image file."""
+
+    def __init__(self, fmt, width, height, channels, bit_depth, alpha, interlaced=False, palette=False):
+        self.fmt = fmt
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.bit_depth = bit_depth
+        self.alpha = alpha
+        self.interlaced = interlaced
+        self.palette = palette
+
+
+def read_png_header(f):
+    if f.read(8) != PNG_SIGNATURE:
+        return None
+    length, kind = struct.unpack(">I4s", f.read(8))
+    if kind != b"IHDR":
+        return None
+    width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", f.read(13))
+    alpha = color in (4, 6)
+    f.read(4)
+    # tRNS comes before the first IDAT; stop there.
+    while not alpha:
+        head = f.read(8)
+        if len(head) < 8:
+            break
+        length, kind = struct.unpack(">I4s", head)
+        if kind in (b"IDAT", b"IEND"):
+            break
+        alpha = kind == b"tRNS"
+        f.seek(length + 4, 1)
+    channels = PNG_CHANNELS.get(color, 4)
+    return TextureInfo("png", width, height, channels, depth, alpha, interlace == 1, color == 3)
+
+
+def read_jpeg_header(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker or marker[0] in (0xD8, 0x01) or 0xD0 <= marker[0] <= 0xD7:
+            continue
+        length = struct.unpack(">H", f.read(2))[0]
+        if marker[0] in _SOF_MARKERS:
+            depth, height, width, channels = struct.unpack(">BHHB", f.read(6))
+            return TextureInfo("jpg", width, height, channels, depth, False)
+        f.seek(length - 2, 1)
+
+
+def read_webp_header(f):
+    head = f.read(30)
+    if len(head) < 30 or head[:4] != b"RIFF" or head[8:12] != b"WEBP":
+        return None
+    chunk = head[12:16]
+    if chunk == b"VP8X":
+        width = 1 + int.from_bytes(head[24:27], "little")
+        height = 1 + int.from_bytes(head[27:30], "little")
+        return TextureInfo("webp", width, height, 4, 8, bool(head[20] & 0x10))
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        return TextureInfo("webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, 4, 8,
+                           bool(bits >> 28 & 1))
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", head[26:30])
+        return TextureInfo("webp", width & 0x3FFF, height & 0x3FFF, 3, 8, False)
+    return None
+
+
+HEADER_READERS = {"png": read_png_header, "jpg": read_jpeg_header, "jpeg": read_jpeg_header,
+                  "webp": read_webp_header}
+
+
+@tracing.traced("read")
+def read_header(path):
+    with open(path, "rb") as f:
+        return HEADER_READERS[ad.extension(str(path))](f)
+
+
+# === VRAM estimate ===
+
+def import_params(path):
+    """[params] of the .import next to path ({} if the file was never imported)."""
+    import_file = Path(str(path) + ".import")
+    if not import_file.is_file():
+        return {}
+    text = import_file.read_text(encoding="utf-8", errors="replace")
+    section = text.split("[params]", 1)[-1]
+    return dict(_PARAM_RE.findall(section))
+
+
+def bytes_per_pixel(info, params):
+    mode = int(params.get("compress/mode", 0))
+    if mode in (2, 4):
+        if params.get("compress/high_quality") == "true" or params.get("compress/normal_map") == "1":
+            return 1.0
+        return 1.0 if info.alpha else 0.5
+    if info.palette or info.channels >= 3:
+        return 4.0
+    return float(info.channels + (1 if info.alpha and info.channels == 1 else 0))
+
+
+def imported_size(width, height, size_limit):
+    if size_limit and max(width, height) > size_limit:
+        scale = size_limit / max(width, height)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+    return width, height
+
+
+def vram_bytes(info, params, size_limit=None):
+    limit = int(params.get("process/size_limit", 0)) if size_limit is None else size_limit
+    width, height = imported_size(info.width, info.height, limit)
+    total = width * height * bytes_per_pixel(info, params)
+    if params.get("mipmaps/generate", "false") == "true":
+        total *= 4 / 3
+    return int(total)
+
+
+def suggested_limit(info, params, max_size, max_vram):
+    """Longest side, halved from the current import size, that meets both max_size and max_vram."""
+    side = max(imported_size(info.width, info.height, int(params.get("process/size_limit", 0))))
+    while side > 1 and (side > max_size or vram_bytes(info, params, side) > max_vram):
+        side //= 2
+    return side
+
+
+# === Scene closure ===
+
+class TextureGraph(sd.DependencyGraph):
+    """startup_deps graph plus model -> texture edges (glTF uris, textures extracted on import)."""
+
+    def __init__(self, root, summaries, generated):
+        super().__init__(root, summaries)
+        self.generated = generated
+
+    def edges(self, res):
+        if res in self._edges:
+            return self._edges[res]
+        deps = list(super().edges(res))
+        ext = ad.extension(res)
+        if ext in MODEL_EXTS:
+            rel = res[len("res://"):]
+            path = self.file(res)
+            if path.is_file():
+                for uri in ad.gltf_uris(path.read_bytes(), ext):
+                    target = "res://" + os.path.normpath(os.path.join(os.path.dirname(rel),
+                                                                      ad.unquote(uri))).replace(os.sep, "/")
+                    deps.append(target)
+            stem = rel.rsplit(".", 1)[0] + "_"
+            deps.extend("res://" + g for g in self.generated if g.startswith(stem))
+        self._edges[res] = sorted(set(deps) - {res})
+        return self._edges[res]
+
+
+# === Decode / resize / encode ===
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+    return np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+
+def _unfilter(filters, data, bpp):
+    """Reconstruct filtered scanlines (rows x stride uint8)."""
+    height, stride = data.shape
+    if np.all(filters <= 2):
+        out = np.empty_like(data)
+        prev = np.zeros(stride, np.uint8)
+        for y in range(height):
+            row = data[y]
+            if filters[y] == 1:
+                row = np.cumsum(row.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+            elif filters[y] == 2:
+                row = row + prev
+            out[y] = row
+            prev = out[y]
+        return out
+    # Average / Paeth depend on the left pixel: walk anti-diagonals of pixel units,
+    # every unit on one diagonal only depends on the previous two.
+    units = stride // bpp
+    src = data.reshape(height, units, bpp).astype(np.int16)
+    recon = np.zeros((height + 1, units + 1, bpp), np.int16)
+    for d in range(height + units - 1):
+        y0 = max(0, d - units + 1)
+        ys = np.arange(y0, min(height, d + 1))
+        xs = d - ys
+        a = recon[ys + 1, xs]
+        b = recon[ys, xs + 1]
+        c = recon[ys, xs]
+        f = filters[ys][:, None]
+        pred = np.select([f == 1, f == 2, f == 3, f == 4],
+                         [a, b, (a + b) >> 1, _paeth(a, b, c)], 0)
+        recon[ys + 1, xs + 1] = (src[ys, xs] + pred) & 0xFF
+    return recon[1:, 1:].reshape(height, stride).astype(np.uint8)
+
+
+@tracing.traced("decode")
+def decode_png(raw):
+    """RGBA / RGB / LA / L uint8 array (height, width, channels) of a non-interlaced PNG."""
+    pos = 8
+    idat = []
+    palette = trns = None
+    while pos < len(raw):
+        length, kind = struct.unpack_from(">I4s", raw, pos)
+        body = raw[pos + 8:pos + 8 + length]
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = np.frombuffer(body, np.uint8).reshape(-1, 3)
+        elif kind == b"tRNS":
+            trns = body
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+        pos += 12 + length
+    if interlace:
+        raise ValueError("interlaced PNG")
+    channels = PNG_CHANNELS[color]
+    bits = channels * depth
+    stride = (width * bits + 7) // 8
+    data = np.frombuffer(zlib.decompress(b"".join(idat)), np.uint8).reshape(height, stride + 1)
+    rows = _unfilter(data[:, 0], data[:, 1:], max(1, bits // 8))
+    if depth < 8:
+        rows = np.unpackbits(rows, axis=1).reshape(height, -1, depth)
+        rows = (rows * (1 << np.arange(depth - 1, -1, -1, dtype=np.uint8))).sum(axis=2, dtype=np.uint8)
+        rows = rows[:, :width]
+        if color == 0:
+            rows = rows * (255 // ((1 << depth) - 1))
+    elif depth == 16:
+        rows = rows[:, 0::2]
+    pixels = rows.reshape(height, width, channels)
+    if color == 3:
+        index = pixels[..., 0]
+        rgb = palette[index]
+        if trns is None:
+            return rgb
+        alpha = np.full(len(palette), 255, np.uint8)
+        alpha[:len(trns)] = np.frombuffer(trns, np.uint8)
+        return np.dstack([rgb, alpha[index]])
+    return pixels
+
+
+def downscale(pixels, max_size):
+    """Halve with a 2x2 box filter (alpha-weighted colour) until the longest side fits."""
+    img = pixels.astype(np.float32)
+    has_alpha = img.shape[2] in (2, 4)
+    while max(img.shape[:2]) > max_size:
+        if img.shape[0] % 2 or img.shape[1] % 2:
+            img = np.pad(img, ((0, img.shape[0] % 2), (0, img.shape[1] % 2), (0, 0)), mode="edge")
+        blocks = img.reshape(img.shape[0] // 2, 2, img.shape[1] // 2, 2, img.shape[2])
+        if has_alpha:
+            alpha = blocks[..., -1:]
+            weight = alpha.sum(axis=(1, 3))
+            colour = (blocks[..., :-1] * alpha).sum(axis=(1, 3))
+            plain = blocks[..., :-1].mean(axis=(1, 3))
+            colour = np.where(weight > 0, colour / np.maximum(weight, 1e-6), plain)
+            img = np.concatenate([colour, weight / 4], axis=2)
+        else:
+            img = blocks.mean(axis=(1, 3))
+    return np.clip(np.rint(img), 0, 255).astype(np.uint8)
+
+
+@tracing.traced("encode")
+def encode_png(pixels, level=6):
+    """8-bit PNG with per-row minimum-sum-of-absolute-differences filter choice."""
+    height, width, channels = pixels.shape
+    rows = pixels.reshape(height, width * channels).astype(np.int16)
+    left = np.zeros_like(rows)
+    left[:, channels:] = rows[:, :-channels]
+    up = np.zeros_like(rows)
+    up[1:] = rows[:-1]
+    upleft = np.zeros_like(rows)
+    upleft[1:, channels:] = rows[:-1, :-channels]
+    candidates = np.stack([rows, rows - left, rows - up, rows - ((left + up) >> 1),
+                           rows - _paeth(left, up, upleft)]) & 0xFF
+    signed = np.where(candidates > 127, 256 - candidates, candidates)
+    choice = signed.sum(axis=2).argmin(axis=0)
+    filtered = candidates[choice, np.arange(height)].astype(np.uint8)
+    scanlines = np.hstack([choice.astype(np.uint8)[:, None], filtered])
+    color = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    deflate = zlib.compressobj(level, zlib.DEFLATED, 15, 9, zlib.Z_FILTERED)
+    idat = deflate.compress(scanlines.tobytes()) + deflate.flush()
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    return (PNG_SIGNATURE + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, 0))
+            + chunk(b"IDAT", idat) + chunk(b"IEND", b""))
+
+
+def build_variant(job):
+    """Worker: (source path, cache path, max size, level) -> (cache path, width, height, bytes, error)."""
+    source, cached, max_size, level = job
+    try:
+        pixels = downscale(decode_png(Path(source).read_bytes()), max_size)
+        data = encode_png(pixels, level)
+    except (ValueError, KeyError, zlib.error) as e:
+        return cached, 0, 0, 0, str(e)
+    tmp = cached + ".tmp"
+    Path(tmp).write_bytes(data)
+    os.replace(tmp, cached)
+    return cached, pixels.shape[1], pixels.shape[0], len(data), None
+
+
+@tracing.traced("write")
+def write_variants(root, textures, out_dir, jobs, level=6, cache_dir=VARIANT_CACHE):
+    """Copies of the flagged PNGs downscaled to their size_limit and recompressed. Returns per-texture results."""
+    root = Path(root)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    pngs = [t for t in textures if t["format"] == "png" and not t["generated"]]
+    hashes, _ = ad.hash_assets(root, [t["path"] for t in pngs], jobs)
+    todo = []
+    for t in pngs:
+        cached = cache_dir / f"{hashes[t['path']]}-{t['size_limit']}-z{level}.png"
+        t["cache"] = cached
+        if not cached.exists():
+            todo.append((str(root / t["path"]), str(cached), t["size_limit"], level))
+    if jobs == 1 or len(todo) < 2:
+        built = [build_variant(job) for job in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            built = list(pool.map(build_variant, todo))
+    errors = {cached: error for cached, _, _, _, error in built if error}
+    results = []
+    for t in pngs:
+        key = str(t["cache"])
+        if key in errors:
+            results.append({"path": t["path"], "error": errors[key]})
+            continue
+        target = Path(out_dir) / t["path"]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(t["cache"], target)
+        with open(target, "rb") as f:
+            info = read_png_header(f)
+        results.append({"path": t["path"], "width": info.width, "height": info.height,
+                        "bytes": target.stat().st_size, "source_bytes": t["bytes"],
+                        "cached": all(str(t["cache"]) != job[1] for job in todo)})
+    return results
+
+
+# === Report ===
+
+@tracing.traced("analyze")
+def analyze(root, max_size=2048, max_vram=4 << 20, scene_budget=128 << 20, jobs=1):
+    root = Path(root)
+    files = ad.project_files(root)
+    textures = {}
+    generated = []
+    for rel in files:
+        if ad.extension(rel) not in TEXTURE_EXTS:
+            continue
+        info = read_header(root / rel)
+        if info is None:
+            continue
+        params = import_params(root / rel)
+        is_generated = ad.is_generated(root, rel)
+        if is_generated:
+            generated.append(rel)
+        vram = vram_bytes(info, params)
+        over = []
+        if max(imported_size(info.width, info.height, int(params.get("process/size_limit", 0)))) > max_size:
+            over.append("size")
+        if vram > max_vram:
+            over.append("vram")
+        limit = suggested_limit(info, params, max_size, max_vram) if over else None
+        textures[rel] = {
+            "path": rel, "format": info.fmt, "width": info.width, "height": info.height,
+            "channels": info.channels, "bit_depth": info.bit_depth, "alpha": info.alpha,
+            "bytes": (root / rel).stat().st_size,
+            "import": COMPRESS_MODES.get(int(params.get("compress/mode", 0)), "?") if params else "not imported",
+            "mipmaps": params.get("mipmaps/generate") == "true", "generated": is_generated,
+            "vram": vram, "over": over, "size_limit": limit,
+            "vram_at_limit": vram_bytes(info, params, limit) if limit else None,
+        }
+
+    summaries, _ = gc.load_summaries(gc.script_files(root), root, jobs)
+    graph = TextureGraph(root, summaries, generated)
+    scenes = []
+    for rel in files:
+        if ad.extension(rel) != "tscn":
+            continue
+        used = sorted(res[len("res://"):] for res in graph.closure("res://" + rel)
+                      if res[len("res://"):] in textures)
+        vram = sum(textures[t]["vram"] for t in used)
+        scenes.append({"scene": rel, "textures": len(used), "vram": vram,
+                       "over": vram > scene_budget,
+                       "largest": sorted(used, key=lambda t: -textures[t]["vram"])[:3]})
+    scenes.sort(key=lambda s: (-s["vram"], s["scene"]))
+    ranked = sorted(textures.values(), key=lambda t: (-t["vram"], t["path"]))
+    return {"textures": ranked, "scenes": scenes,
+            "budget": {"max_size": max_size, "max_vram": max_vram, "scene_budget": scene_budget},
+            "total_vram": sum(t["vram"] for t in ranked), "total_bytes": sum(t["bytes"] for t in ranked)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Texture VRAM budget report and downscale pipeline.")
+    parser.add_argument("--root", type=Path, default=PROJECT_ROOT, help="Godot project root")
+    parser.add_argument("--max-size", type=int, default=2048, help="longest side budget in pixels")
+    parser.add_argument("--max-vram-mb", type=float, default=4.0, help="per-texture VRAM budget")
+    parser.add_argument("--scene-budget-mb", type=float, default=128.0, help="per-scene texture VRAM budget")
+    parser.add_argument("--top", type=int, default=10, help="textures / scenes listed")
+    parser.add_argument("--write-variants", type=Path, metavar="DIR",
+                        help="write downscaled, recompressed copies of flagged PNGs under DIR")
+    parser.add_argument("--zlib-level", type=int, default=6, help="deflate level for variants")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    root = args.root.resolve()
+    jobs = args.jobs or os.cpu_count() or 1
+    mb = 1 << 20
+    report = analyze(root, args.max_size, int(args.max_vram_mb * mb), int(args.scene_budget_mb * mb), jobs)
+    elapsed = time.perf_counter() - start
+    textures = report["textures"]
+    flagged = [t for t in textures if t["over"]]
+
+    print(f"[TEXTURES] {len(textures)} textures, {sd.human_bytes(report['total_bytes'])} on disk, "
+          f"~{sd.human_bytes(report['total_vram'])} VRAM if all loaded, analysed in {elapsed * 1000:.0f} ms")
+    for t in textures[:args.top]:
+        print(f"[TEXTURES] {sd.human_bytes(t['vram']):>9} {t['width']:5d}x{t['height']:<5d} "
+              f"{t['format']:<4} {t['import']:<12} {t['path']}")
+    for s in report["scenes"][:args.top]:
+        mark = "  OVER BUDGET" if s["over"] else ""
+        print(f"[TEXTURES] scene {sd.human_bytes(s['vram']):>9} {s['textures']:3d} textures  {s['scene']}{mark}")
+    if flagged:
+        saved = sum(t["vram"] - t["vram_at_limit"] for t in flagged)
+        print(f"[TEXTURES] {len(flagged)} textures over budget (max {args.max_size}px / "
+              f"{args.max_vram_mb:g} MB); process/size_limit would save ~{sd.human_bytes(saved)} VRAM:")
+        for t in flagged:
+            print(f"[TEXTURES]     {'+'.join(t['over']):<9} {t['width']}x{t['height']} -> size_limit="
+                  f"{t['size_limit']} ({sd.human_bytes(t['vram'])} -> {sd.human_bytes(t['vram_at_limit'])})  {t['path']}")
+
+    if args.write_variants:
+        start = time.perf_counter()
+        results = write_variants(root, flagged, args.write_variants, jobs, args.zlib_level)
+        for r in results:
+            if "error" in r:
+                print(f"[TEXTURES] variant skipped ({r['error']}): {r['path']}")
+                continue
+            print(f"[TEXTURES] variant {r['width']}x{r['height']} {sd.human_bytes(r['source_bytes'])} -> "
+                  f"{sd.human_bytes(r['bytes'])}{' (cached)' if r['cached'] else ''}  {r['path']}")
+        skipped = len(flagged) - len(results)
+        note = f", {skipped} non-PNG / re-extracted left to size_limit" if skipped else ""
+        print(f"[TEXTURES] {len(results)} variants in {args.write_variants} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms{note}")
+        report["variants"] = results
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=1) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
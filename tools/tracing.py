@@ -0,0 +1,288 @@
+"""
+Low-overhead tracing for the project's Python tooling.
+
+    with tracing.span("walk"):          time a phase (nests; per thread)
+        ...
+    @tracing.traced("parse")            time every call of a function
+    def parse(...): ...
+    tracing.count("files", 1)           accumulate a counter
+
+Tracing is off unless TOOLS_TRACE is set (or enable() is called), and then
+costs one attribute check per span / counter: span() hands back a shared
+no-op context manager and traced() calls straight through.
+
+    TOOLS_TRACE=1               text summary on stderr at exit (per span:
+                                calls, total, mean, max; counters)
+    TOOLS_TRACE=trace.json      summary plus a Chrome trace (chrome://tracing,
+                                https://ui.perfetto.dev) with complete ("X")
+                                events and counter ("C") events
+    TOOLS_TRACE_SAMPLE=N        keep 1 of every N trace events per span name
+                                (summary statistics still count every call);
+                                for spans inside hot loops
+
+Only the process that enabled tracing writes output; ProcessPoolExecutor
+workers are covered by the parent's span around the pool.
+
+Usage:
+    TOOLS_TRACE=/tmp/trace.json python tools/gdscript_check.py
+    python tools/tracing.py --self-test
+"""
+import argparse
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+ENV_TRACE = "TOOLS_TRACE"
+ENV_SAMPLE = "TOOLS_TRACE_SAMPLE"
+
+_clock = time.perf_counter_ns
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Tracer:
+    """Collected spans, counters and trace events of one process."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.sample_every = 1
+        self.pid = os.getpid()
+        self.origin = _clock()
+        self.lock = threading.Lock()
+        self.stats = {}         # name -> [calls, total ns, max ns]
+        self.counters = {}
+        self.events = []
+        self.seen = {}          # name -> calls, for sampling
+
+    def record(self, name, start, end, args):
+        duration = end - start
+        with self.lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+            calls = self.seen.get(name, 0)
+            self.seen[name] = calls + 1
+            if self.path and calls % self.sample_every == 0:
+                event = {"name": name, "ph": "X", "pid": self.pid, "tid": threading.get_ident(),
+                         "ts": (start - self.origin) / 1000, "dur": duration / 1000}
+                if args:
+                    event["args"] = args
+                self.events.append(event)
+
+    def count(self, name, value):
+        with self.lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            if self.path:
+                self.events.append({"name": name, "ph": "C", "pid": self.pid,
+                                    "ts": (_clock() - self.origin) / 1000, "args": {name: total}})
+
+
+_tracer = _Tracer()
+_atexit_registered = False
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        _tracer.record(self.name, self.start, _clock(), self.args)
+        return False
+
+    def set(self, **args):
+        """Attach values known only inside the span (sizes, counts) to its event."""
+        self.args = dict(self.args or {}, **args)
+
+
+def span(name, **args):
+    """Context manager timing a block."""
+    if not _tracer.enabled:
+        return _NOOP
+    return _Span(name, args or None)
+
+
+def traced(name=None):
+    """Decorator timing every call; name defaults to the function's qualified name."""
+    def wrap(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def call(*a, **k):
+            if not _tracer.enabled:
+                return fn(*a, **k)
+            start = _clock()
+            try:
+                return fn(*a, **k)
+            finally:
+                _tracer.record(label, start, _clock(), None)
+        return call
+    return wrap
+
+
+def count(name, value=1):
+    if _tracer.enabled:
+        _tracer.count(name, value)
+
+
+def enabled():
+    return _tracer.enabled
+
+
+def enable(path=None, sample_every=1):
+    """Turn tracing on for this process; path also writes a Chrome trace at exit."""
+    global _atexit_registered
+    if not _atexit_registered:
+        atexit.register(_finish)
+        _atexit_registered = True
+    _tracer.enabled = True
+    _tracer.path = path
+    _tracer.sample_every = max(1, int(sample_every))
+    _tracer.pid = os.getpid()
+
+
+def disable():
+    _tracer.enabled = False
+
+
+def reset():
+    global _tracer
+    _tracer = _Tracer()
+
+
+def chrome_trace():
+    meta = {"name": "process_name", "ph": "M", "pid": _tracer.pid,
+            "args": {"name": os.path.basename(sys.argv[0]) or "python"}}
+    return {"traceEvents": [meta] + list(_tracer.events), "displayTimeUnit": "ms"}
+
+
+def summary():
+    """Text table of spans by total time, then counters."""
+    lines = [f"[TRACE] {'span':<32} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+    for name, (calls, total, peak) in sorted(_tracer.stats.items(), key=lambda kv: -kv[1][1]):
+        lines.append(f"[TRACE] {name:<32} {calls:8d} {total / 1e6:10.2f} {total / calls / 1e6:9.3f} "
+                     f"{peak / 1e6:9.2f}")
+    for name, value in sorted(_tracer.counters.items()):
+        lines.append(f"[TRACE] counter {name:<24} {value}")
+    return "\n".join(lines)
+
+
+def _finish():
+    if not _tracer.enabled or os.getpid() != _tracer.pid:
+        return
+    if _tracer.stats or _tracer.counters:
+        print(summary(), file=sys.stderr)
+    if _tracer.path:
+        with open(_tracer.path, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(), f)
+        print(f"[TRACE] wrote {len(_tracer.events)} events to {_tracer.path}", file=sys.stderr)
+
+
+def _configure_from_env():
+    value = os.environ.get(ENV_TRACE, "")
+    if value and value != "0":
+        enable(None if value == "1" else value, os.environ.get(ENV_SAMPLE, 1))
+
+
+_configure_from_env()
+
+
+# === Self-test ===
+
+def self_test():
+    checks = []
+
+    def check(name, ok, detail=""):
+        checks.append(ok)
+        print(f"[TRACE] self-test {'PASS' if ok else 'FAIL'}: {name}{(' (' + detail + ')') if detail else ''}")
+
+    was_enabled = _tracer.enabled
+    disable()
+    n = 200_000
+
+    @traced("work")
+    def work():
+        return 1
+
+    start = time.perf_counter()
+    for _ in range(n):
+        with span("loop"):
+            pass
+    disabled_span = (time.perf_counter() - start) / n * 1e9
+    start = time.perf_counter()
+    for _ in range(n):
+        pass
+    baseline = (time.perf_counter() - start) / n * 1e9
+    check("disabled span is near free", disabled_span - baseline < 1000,
+          f"{disabled_span - baseline:.0f} ns/span over an empty loop")
+    check("disabled tracer records nothing", not _tracer.stats)
+
+    # Events stay in memory; reset() below drops them before anything is written.
+    enable("self-test.json", sample_every=10)
+    for i in range(25):
+        with span("outer", i=i):
+            with span("inner") as inner:
+                inner.set(items=i)
+            work()
+    count("files", 3)
+    count("files", 4)
+    stats = _tracer.stats
+    check("every call counted in the summary", stats["outer"][0] == 25 and stats["work"][0] == 25)
+    outer_events = [e for e in _tracer.events if e["name"] == "outer"]
+    check("trace events sampled 1 in 10", len(outer_events) == 3, f"{len(outer_events)} of 25")
+    nested = all(o["ts"] <= i["ts"] and i["ts"] + i["dur"] <= o["ts"] + o["dur"] + 1e-3
+                 for o, i in zip(outer_events, [e for e in _tracer.events if e["name"] == "inner"]))
+    check("nested spans lie inside their parent", nested)
+    check("counter accumulates", _tracer.counters["files"] == 7)
+    trace = json.loads(json.dumps(chrome_trace()))
+    phases = {e["ph"] for e in trace["traceEvents"]}
+    check("Chrome trace has X, C and M events", phases == {"X", "C", "M"})
+    check("summary lists spans and counters", "outer" in summary() and "counter files" in summary())
+    reset()
+    if was_enabled:
+        _configure_from_env()
+    return all(checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracing helpers for the Python tools.")
+    parser.add_argument("--self-test", action="store_true", help="check overhead, sampling and export")
+    args = parser.parse_args()
+    if args.self_test:
+        return 0 if self_test() else 1
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
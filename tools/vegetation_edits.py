@@ -0,0 +1,395 @@
+"""
+Integer-keyed spatial store for vegetation edits.
+
+vegetation_manager.gd keeps its edits in String-keyed Dictionaries and saves
+them wholesale through get_save_data():
+
+    chopped_trees   "%d_%d" % [int(x), int(z)] of the tree position
+    removed_grass   _position_hash(): "%d_%d" % [floor(x), floor(z)]
+    removed_rocks   same as removed_grass
+    placed_grass    [{world_pos: [x, y, z], scale, rotation}, ...]
+    placed_rocks    same as placed_grass
+
+(runtime-only collider keys come from _tree_key / _grass_key / _rock_key:
+"[g_|r_]cx_cz_index"). Vegetation positions sit on whole world cells, so
+every one of those strings is a chunk plus a small local payload. This
+store packs them into uint64 keys:
+
+    bits 63..40   chunk x + 2^23    (24 bits)
+    bits 39..16   chunk z + 2^23    (24 bits)
+    bits 15..0    payload: cell (local_z << 5 | local_x) or instance index
+
+The bias keeps keys of one chunk contiguous and sorted by (chunk x,
+chunk z), so each edit set is one sorted array: membership is a binary
+search, a chunk's edits are one searchsorted slice. Placed grass / rocks
+are records sorted by the key of their cell.
+
+File layout (little-endian):
+
+    header   magic "VEDT", version, key count per set, record count per placed list
+    sets     uint64[count] per set (chopped_trees, removed_grass, removed_rocks)
+    placed   PLACED_DTYPE[count] per list (placed_grass, placed_rocks)
+
+Usage:
+    python tools/vegetation_edits.py --save ~/.local/share/godot/app_userdata/<project>/saves/quicksave.json --out edits.bin
+    python tools/vegetation_edits.py --synthetic 50000
+"""
+import argparse
+import json
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import tracing
+
+CHUNK_STRIDE = 31  # chunk_manager.gd CHUNK_STRIDE
+CHUNK_BITS = 24
+CHUNK_BIAS = 1 << (CHUNK_BITS - 1)
+PAYLOAD_BITS = 16
+LOCAL_BITS = 5  # local cell 0..30 per axis
+MAX_INDEX = (1 << PAYLOAD_BITS) - 1
+
+SET_NAMES = ("chopped_trees", "removed_grass", "removed_rocks")
+PLACED_NAMES = ("placed_grass", "placed_rocks")
+
+STORE_MAGIC = b"VEDT"
+STORE_VERSION = 1
+# magic, version, key count per set, record count per placed list
+STORE_HEADER = struct.Struct("<4sI3I2I")
+PLACED_DTYPE = np.dtype([
+    ("key", "<u8"), ("position", "<f4", 3), ("scale", "<f4"), ("rotation", "<f4"),
+])
+
+
+# === Keys ===
+
+def _chunk_bits(chunk_x, chunk_z):
+    chunk_x = np.asarray(chunk_x, dtype=np.int64)
+    chunk_z = np.asarray(chunk_z, dtype=np.int64)
+    if np.any(np.abs(chunk_x) >= CHUNK_BIAS) or np.any(np.abs(chunk_z) >= CHUNK_BIAS):
+        raise ValueError(f"chunk coordinate outside +-{CHUNK_BIAS}")
+    return (((chunk_x + CHUNK_BIAS).astype(np.uint64) << np.uint64(PAYLOAD_BITS + CHUNK_BITS))
+            | ((chunk_z + CHUNK_BIAS).astype(np.uint64) << np.uint64(PAYLOAD_BITS)))
+
+
+def chunk_key_range(chunk_x, chunk_z):
+    """[first, last) key range of one chunk."""
+    first = _chunk_bits(chunk_x, chunk_z)
+    return first, first + np.uint64(1 << PAYLOAD_BITS)
+
+
+def pack_cells(cell_x, cell_z):
+    """Keys for whole world cells (the integers of a "%d_%d" position key)."""
+    cell_x = np.asarray(cell_x, dtype=np.int64)
+    cell_z = np.asarray(cell_z, dtype=np.int64)
+    chunk_x, local_x = np.divmod(cell_x, CHUNK_STRIDE)
+    chunk_z, local_z = np.divmod(cell_z, CHUNK_STRIDE)
+    return _chunk_bits(chunk_x, chunk_z) | ((local_z << LOCAL_BITS) | local_x).astype(np.uint64)
+
+
+def unpack_cells(keys):
+    chunk_x, chunk_z, payload = unpack(keys)
+    local_x = payload & ((1 << LOCAL_BITS) - 1)
+    local_z = payload >> LOCAL_BITS
+    return chunk_x * CHUNK_STRIDE + local_x, chunk_z * CHUNK_STRIDE + local_z
+
+
+def pack_instances(chunk_x, chunk_z, index):
+    """Keys replacing _tree_key / _grass_key / _rock_key (chunk plus instance index)."""
+    index = np.asarray(index, dtype=np.int64)
+    if np.any((index < 0) | (index > MAX_INDEX)):
+        raise ValueError(f"instance index outside 0..{MAX_INDEX}")
+    return _chunk_bits(chunk_x, chunk_z) | index.astype(np.uint64)
+
+
+def unpack(keys):
+    """(chunk x, chunk z, payload) of packed keys."""
+    keys = np.asarray(keys, dtype=np.uint64)
+    mask = np.uint64((1 << CHUNK_BITS) - 1)
+    chunk_x = ((keys >> np.uint64(PAYLOAD_BITS + CHUNK_BITS)) & mask).astype(np.int64) - CHUNK_BIAS
+    chunk_z = ((keys >> np.uint64(PAYLOAD_BITS)) & mask).astype(np.int64) - CHUNK_BIAS
+    payload = (keys & np.uint64(MAX_INDEX)).astype(np.int64)
+    return chunk_x, chunk_z, payload
+
+
+def parse_position_keys(strings):
+    """Cells of "%d_%d" position keys. Raises ValueError on anything else."""
+    cells = np.empty((len(strings), 2), dtype=np.int64)
+    for i, key in enumerate(strings):
+        x, sep, z = str(key).partition("_")
+        if not sep:
+            raise ValueError(f"not a position key: {key!r}")
+        cells[i] = int(x), int(z)
+    return cells[:, 0], cells[:, 1]
+
+
+def format_position_keys(keys):
+    cell_x, cell_z = unpack_cells(keys)
+    return [f"{x}_{z}" for x, z in zip(cell_x.tolist(), cell_z.tolist())]
+
+
+# === Store ===
+
+class EditStore:
+    """Sorted uint64 key sets plus chunk-sorted placed records."""
+
+    def __init__(self, sets=None, placed=None):
+        self.sets = {name: np.zeros(0, dtype=np.uint64) for name in SET_NAMES}
+        self.placed = {name: np.zeros(0, dtype=PLACED_DTYPE) for name in PLACED_NAMES}
+        for name, keys in (sets or {}).items():
+            self.sets[name] = np.unique(np.asarray(keys, dtype=np.uint64))
+        for name, records in (placed or {}).items():
+            self.placed[name] = np.sort(np.asarray(records, dtype=PLACED_DTYPE), order="key", kind="stable")
+
+    # Membership and per-chunk access
+
+    def contains(self, name, cell_x, cell_z):
+        """Vectorized membership of world cells in one edit set."""
+        keys = self.sets[name]
+        query = pack_cells(cell_x, cell_z)
+        slot = np.minimum(np.searchsorted(keys, query), max(keys.size - 1, 0))
+        return (keys[slot] == query) if keys.size else np.zeros(np.shape(query), dtype=bool)
+
+    def in_chunk(self, name, chunk_x, chunk_z):
+        """Keys (or placed records) of one chunk: a contiguous slice."""
+        first, last = chunk_key_range(chunk_x, chunk_z)
+        if name in self.sets:
+            keys = self.sets[name]
+            return keys[np.searchsorted(keys, first):np.searchsorted(keys, last)]
+        records = self.placed[name]
+        return records[np.searchsorted(records["key"], first):np.searchsorted(records["key"], last)]
+
+    # Edits
+
+    def add(self, name, cell_x, cell_z):
+        self.sets[name] = np.union1d(self.sets[name], pack_cells(np.atleast_1d(cell_x), np.atleast_1d(cell_z)))
+
+    def discard(self, name, cell_x, cell_z):
+        self.sets[name] = np.setdiff1d(self.sets[name], pack_cells(np.atleast_1d(cell_x), np.atleast_1d(cell_z)),
+                                       assume_unique=True)
+
+    def place(self, name, position, scale=1.0, rotation=0.0):
+        record = np.zeros(1, dtype=PLACED_DTYPE)
+        record["position"] = position
+        record["scale"], record["rotation"] = scale, rotation
+        record["key"] = pack_cells(np.floor(position[0]), np.floor(position[2]))
+        records = self.placed[name]
+        at = np.searchsorted(records["key"], record["key"][0], side="right")
+        self.placed[name] = np.insert(records, at, record)
+
+    # Save format conversion
+
+    @classmethod
+    def from_save_data(cls, data):
+        """Build from the dictionary vegetation_manager.get_save_data() returns."""
+        sets = {name: pack_cells(*parse_position_keys(data.get(name, []))) for name in SET_NAMES}
+        placed = {}
+        for name in PLACED_NAMES:
+            items = data.get(name, [])
+            records = np.zeros(len(items), dtype=PLACED_DTYPE)
+            if items:
+                records["position"] = [item["world_pos"] for item in items]
+                records["scale"] = [item.get("scale", 1.0) for item in items]
+                records["rotation"] = [item.get("rotation", 0.0) for item in items]
+                position = records["position"].astype(np.float64)
+                records["key"] = pack_cells(np.floor(position[:, 0]), np.floor(position[:, 2]))
+            placed[name] = records
+        return cls(sets, placed)
+
+    def to_save_data(self):
+        """Dictionary in the get_save_data() format (what load_save_data() accepts)."""
+        data = {name: format_position_keys(self.sets[name]) for name in SET_NAMES}
+        for name in PLACED_NAMES:
+            records = self.placed[name]
+            data[name] = [{"world_pos": position, "scale": scale, "rotation": rotation}
+                          for position, scale, rotation in zip(records["position"].tolist(),
+                                                                records["scale"].tolist(),
+                                                                records["rotation"].tolist())]
+        return data
+
+    # Binary format
+
+    def to_bytes(self):
+        header = STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION,
+                                   *(self.sets[name].size for name in SET_NAMES),
+                                   *(self.placed[name].size for name in PLACED_NAMES))
+        body = [self.sets[name].astype("<u8").tobytes() for name in SET_NAMES]
+        body += [self.placed[name].tobytes() for name in PLACED_NAMES]
+        return header + b"".join(body)
+
+    @classmethod
+    def from_bytes(cls, raw):
+        magic, version, *counts = STORE_HEADER.unpack_from(raw)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise ValueError(f"not a v{STORE_VERSION} vegetation edit store")
+        store = cls()
+        offset = STORE_HEADER.size
+        for name, count in zip(SET_NAMES, counts):
+            store.sets[name] = np.frombuffer(raw, dtype="<u8", count=count, offset=offset)
+            offset += count * 8
+        for name, count in zip(PLACED_NAMES, counts[len(SET_NAMES):]):
+            store.placed[name] = np.frombuffer(raw, dtype=PLACED_DTYPE, count=count, offset=offset)
+            offset += count * PLACED_DTYPE.itemsize
+        return store
+
+    def nbytes(self):
+        return sum(a.nbytes for a in self.sets.values()) + sum(a.nbytes for a in self.placed.values())
+
+
+# === Checks and benchmarks ===
+
+@tracing.traced("read")
+def load_vegetation_save(path):
+    """The vegetation section of a save_manager_v2 JSON file (or a bare get_save_data() dump)."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return data.get("vegetation", data)
+
+
+def synthetic_save_data(count, radius=64, seed=0):
+    """A long session's worth of edits: mostly removed grass, some chopped trees and rocks, a few placed."""
+    rng = np.random.default_rng(seed)
+    span = radius * CHUNK_STRIDE
+
+    def cells(n, step):
+        x = rng.integers(-span, span, n) // step * step
+        z = rng.integers(-span, span, n) // step * step
+        return sorted({f"{a}_{b}" for a, b in zip(x.tolist(), z.tolist())})
+
+    def placed(n):
+        pos = rng.uniform(-span, span, (n, 3))
+        pos[:, 1] = rng.uniform(0, 40, n)
+        return [{"world_pos": p, "scale": float(s), "rotation": float(r)}
+                for p, s, r in zip(pos.tolist(), rng.uniform(0.4, 0.6, n), rng.uniform(0, 6.283, n))]
+
+    return {
+        "removed_grass": cells(int(count * 0.7), 2),
+        "removed_rocks": cells(int(count * 0.1), 7),
+        "chopped_trees": cells(int(count * 0.2), 4),
+        "placed_grass": placed(count // 100),
+        "placed_rocks": placed(count // 200),
+    }
+
+
+def _float32_save(data):
+    """Save dict with placed values cast to float32, i.e. what the store can hold."""
+    out = {name: sorted(data.get(name, [])) for name in SET_NAMES}
+    for name in PLACED_NAMES:
+        out[name] = [([float(np.float32(v)) for v in item["world_pos"]],
+                      float(np.float32(item.get("scale", 1.0))), float(np.float32(item.get("rotation", 0.0))))
+                     for item in data.get(name, [])]
+        out[name].sort(key=lambda item: tuple(np.floor([item[0][0], item[0][2]])))
+    return out
+
+
+@tracing.traced("verify")
+def verify_roundtrip(data, store):
+    """Save dict -> store -> bytes -> store -> save dict loses nothing beyond float32."""
+    restored = EditStore.from_bytes(store.to_bytes()).to_save_data()
+    expected, actual = _float32_save(data), _float32_save(restored)
+    problems = [name for name in SET_NAMES if set(expected[name]) != set(actual[name])]
+    problems += [name for name in PLACED_NAMES
+                 if sorted(expected[name], key=repr) != sorted(actual[name], key=repr)]
+    cells = pack_cells([-1, 0, 30, 31, -31, -32], [5, -5, 1000, -1000, 0, 0])
+    if not np.array_equal(pack_cells(*unpack_cells(cells)), cells):
+        problems.append("cell keys")
+    instances = pack_instances(-3, 7, [0, 1, MAX_INDEX])
+    if not np.array_equal(pack_instances(*unpack(instances)), instances):
+        problems.append("instance keys")
+    return problems
+
+
+def _dict_nbytes(table):
+    """Rough CPython size of a {str: True} dictionary, as the runtime keeps it."""
+    return sys.getsizeof(table) + sum(sys.getsizeof(key) for key in table)
+
+
+@tracing.traced("benchmark")
+def benchmark(data, store, queries=100000, seed=1):
+    """Memory, lookup and save/restore costs of string dictionaries vs the packed store."""
+    dicts = {name: {key: True for key in data.get(name, [])} for name in SET_NAMES}
+    results = {
+        "dict_bytes": sum(_dict_nbytes(table) for table in dicts.values()),
+        "store_bytes": store.nbytes(),
+    }
+
+    keys = data.get("removed_grass", [])
+    rng = np.random.default_rng(seed)
+    cell_x, cell_z = parse_position_keys(keys) if keys else (np.zeros(1, np.int64), np.zeros(1, np.int64))
+    # Half hits, half misses (shifted by one cell)
+    pick = rng.integers(0, cell_x.size, queries)
+    qx = cell_x[pick] + (np.arange(queries) % 2)
+    qz = cell_z[pick]
+    qx_list, qz_list = qx.tolist(), qz.tolist()
+
+    start = time.perf_counter()
+    table = dicts["removed_grass"]
+    dict_hits = sum(1 for x, z in zip(qx_list, qz_list) if f"{x}_{z}" in table)
+    results["dict_lookup_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store_hits = int(np.count_nonzero(store.contains("removed_grass", qx, qz)))
+    results["store_lookup_s"] = time.perf_counter() - start
+    results["lookups_agree"] = dict_hits == store_hits
+    results["queries"] = queries
+
+    start = time.perf_counter()
+    text = json.dumps(data, indent="\t")
+    restored = json.loads(text)
+    {name: {key: True for key in restored[name]} for name in SET_NAMES}
+    results["json_roundtrip_s"] = time.perf_counter() - start
+    results["json_bytes"] = len(text.encode())
+
+    start = time.perf_counter()
+    raw = store.to_bytes()
+    EditStore.from_bytes(raw)
+    results["binary_roundtrip_s"] = time.perf_counter() - start
+    results["binary_bytes"] = len(raw)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert vegetation edits to the packed integer-keyed store.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--save", type=Path, help="save_manager_v2 JSON (or a get_save_data() dump)")
+    source.add_argument("--synthetic", type=int, default=50000, help="generate this many edit keys instead")
+    parser.add_argument("--out", type=Path, help="write the binary store here")
+    parser.add_argument("--queries", type=int, default=100000, help="membership lookups to time")
+    args = parser.parse_args()
+
+    if args.save:
+        data = load_vegetation_save(args.save)
+        label = str(args.save)
+    else:
+        data = synthetic_save_data(args.synthetic)
+        label = f"synthetic session ({args.synthetic} edits)"
+
+    start = time.perf_counter()
+    store = EditStore.from_save_data(data)
+    convert_s = time.perf_counter() - start
+    counts = ", ".join(f"{name} {store.sets[name].size}" for name in SET_NAMES)
+    counts += ", " + ", ".join(f"{name} {store.placed[name].size}" for name in PLACED_NAMES)
+    print(f"[VEG_EDITS] {label}: {counts} (converted in {convert_s * 1000:.1f} ms)")
+
+    problems = verify_roundtrip(data, store)
+    print(f"[VEG_EDITS] Round trip through the binary store: {'OK' if not problems else 'FAILED ' + ', '.join(problems)}")
+
+    bench = benchmark(data, store, args.queries)
+    print(f"[VEG_EDITS] Memory: {bench['dict_bytes'] / 1024:.1f} KB of string dictionaries -> "
+          f"{bench['store_bytes'] / 1024:.1f} KB packed ({bench['dict_bytes'] / max(bench['store_bytes'], 1):.1f}x)")
+    print(f"[VEG_EDITS] {bench['queries']} lookups: dict {bench['dict_lookup_s'] * 1000:.1f} ms, "
+          f"sorted keys {bench['store_lookup_s'] * 1000:.1f} ms, "
+          f"{'same answers' if bench['lookups_agree'] else 'DIFFERENT ANSWERS'}")
+    print(f"[VEG_EDITS] Save + restore: JSON {bench['json_bytes'] / 1024:.1f} KB in {bench['json_roundtrip_s'] * 1000:.1f} ms, "
+          f"binary {bench['binary_bytes'] / 1024:.1f} KB in {bench['binary_roundtrip_s'] * 1000:.2f} ms")
+
+    if args.out:
+        args.out.write_bytes(store.to_bytes())
+        print(f"[VEG_EDITS] Store written to {args.out}")
+    return 0 if not problems and bench["lookups_agree"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+"""
+Offline tree / grass / rock placement for regions of surface chunks.
+
+vegetation_manager._place_vegetation_for_chunk, _place_grass_for_chunk and
+_place_rocks_for_chunk walk a grid of each new surface chunk in GDScript,
+sample a FastNoiseLite, read the surface height, drop underwater spots and
+build one Transform3D per instance. This tool applies the same rules to a
+whole region in one vectorized pass and stores the result per chunk:
+
+    kind    grid step  noise (seed, frequency)    threshold  underwater rule
+    tree    4          world_seed,     0.05       0.4        terrain_y + 1 < water_level
+    grass   2 (1)      world_seed + 1, 0.08       0.3        water density at terrain_y + 0.5 < 0
+    rock    7          world_seed + 2, 0.06       0.35       water density at terrain_y + 0.5 < 0
+
+Instances come out in runtime order (x outer, z inner). Surface heights are
+the get_chunk_height_map scan of the chunk's density grid, evaluated only
+for the sampled columns (terrain_reference.column_surface_heights).
+
+The runtime draws scale and yaw from the global, unseeded randf(), so those
+two values differ on every visit. The precompute draws them from a
+per-chunk RandomNumberGenerator seeded with hash("cx_cz") + world_seed +
+kind offset (randf_range for the scale, then randf() * TAU for the yaw, per
+instance), which makes the output a pure function of (world_seed, chunk).
+Removed-grass / removed-rock entries and chunks with terrain modifications
+are save-game state and are left to the runtime to filter.
+
+File layout (little-endian, every section 16-byte aligned so it can be
+np.memmap'ed or read into PackedFloat32Array/PackedInt32Array directly):
+
+    header     magic "VEGP", version, chunk origin xz, chunk dims xz, world seed,
+               instance count per kind (tree, grass, rock)
+    per kind   offsets uint32[nx * nz + 1], instances of chunk (x, z) are
+               records[offsets[i]:offsets[i + 1]] with i = (z - oz) * nx + (x - ox)
+               records float32[count, 5]: chunk-local x, y, z, yaw (radians), scale
+
+multimesh_buffer() expands records into the 12-float TRANSFORM_3D layout of
+MultiMesh.buffer, given the mesh's base basis.
+
+Usage:
+    python tools/vegetation_precompute.py --radius 32 --out vegetation.bin
+    python tools/vegetation_precompute.py --radius 32 --jobs 8 --bench-radius 2
+"""
+import argparse
+import hashlib
+import math
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import godot_random
+import terrain_reference as tr
+from fast_noise_lite import FastNoiseLite
+import tracing
+
+DEFAULT_WORLD_SEED = 12345  # chunk_manager.gd world_seed
+NO_TERRAIN = -100.0
+
+# vegetation_manager.gd placement rules and @export defaults
+KINDS = {
+    "tree": {"step": 4, "seed_offset": 0, "frequency": 0.05, "threshold": 0.4,
+             "scale": 1.0, "scale_range": (0.8, 1.2), "water": "level"},
+    "grass": {"step": 2, "seed_offset": 1, "frequency": 0.08, "threshold": 0.3,
+              "scale": 0.5, "scale_range": (0.8, 1.2), "water": "density"},
+    "rock": {"step": 7, "seed_offset": 2, "frequency": 0.06, "threshold": 0.35,
+             "scale": 0.5, "scale_range": (0.6, 1.4), "water": "density"},
+}
+KIND_NAMES = tuple(KINDS)
+DENSE_GRASS_STEP = 1
+
+TABLE_MAGIC = b"VEGP"
+TABLE_VERSION = 1
+# magic, version, chunk origin xz, chunk dims xz, world seed, instance count per kind
+TABLE_HEADER = struct.Struct("<4sI2i2Iq3I")
+RECORD_FLOATS = 5  # x, y, z, yaw, scale
+SECTION_ALIGN = 16
+
+
+# === Placement rules (vectorized over chunks) ===
+
+def grid_offsets(step):
+    """Local (x, z) of the sampled cells, x outer / z inner like the GDScript loops."""
+    local = np.arange(0, tr.CHUNK_STRIDE, step)
+    lx, lz = np.meshgrid(local, local, indexing="ij")
+    return lx.ravel(), lz.ravel()
+
+
+def kind_step(kind, dense_grass=False):
+    return DENSE_GRASS_STEP if kind == "grass" and dense_grass else KINDS[kind]["step"]
+
+
+def is_underwater(kind, gx, terrain_y, gz, params):
+    """The per-kind underwater test, for float32 surface heights."""
+    if KINDS[kind]["water"] == "level":
+        return terrain_y.astype(np.float64) + 1.0 < params.water_level
+    # get_water_density(Vector3(gx, terrain_y + 0.5, gz)): nearest sample of the water grid
+    probe_y = (terrain_y.astype(np.float64) + 0.5).astype(np.float32)
+    chunk_y = np.floor(probe_y.astype(np.float64) / tr.CHUNK_STRIDE)
+    local_y = probe_y - (chunk_y * tr.CHUNK_STRIDE).astype(np.float32)
+    sample_y = chunk_y * tr.CHUNK_STRIDE + np.floor(local_y.astype(np.float64) + 0.5)
+    return tr.water_density_at(gx, sample_y, gz, params) < 0.0
+
+
+def place_kind(kind, chunk_x, chunk_z, world_seed, params=tr.DEFAULT_PARAMS, dense_grass=False):
+    """
+    Instances of one kind for arrays of surface chunks.
+
+    Returns (counts per chunk, float32 records[n, 5]) with the records grouped
+    by chunk in input order.
+    """
+    spec = KINDS[kind]
+    chunk_x = np.asarray(chunk_x, dtype=np.int64).ravel()
+    chunk_z = np.asarray(chunk_z, dtype=np.int64).ravel()
+    lx, lz = grid_offsets(kind_step(kind, dense_grass))
+    gx = chunk_x[:, None] * tr.CHUNK_STRIDE + lx[None, :]
+    gz = chunk_z[:, None] * tr.CHUNK_STRIDE + lz[None, :]
+
+    keep = np.ones(gx.shape, dtype=bool)
+    if not (kind == "grass" and dense_grass):
+        noise = FastNoiseLite(world_seed + spec["seed_offset"], spec["frequency"])
+        keep = noise.get_noise_2d(gx, gz).astype(np.float64) >= spec["threshold"]
+    chunk_index, point = np.nonzero(keep)
+    gx, gz = gx[chunk_index, point], gz[chunk_index, point]
+
+    terrain_y = tr.column_surface_heights(gx.astype(np.float32), gz.astype(np.float32), 0.0, params)
+    keep = terrain_y >= NO_TERRAIN
+    keep[keep] = ~is_underwater(kind, gx[keep], terrain_y[keep], gz[keep], params)
+    chunk_index, point, terrain_y = chunk_index[keep], point[keep], terrain_y[keep]
+
+    counts = np.bincount(chunk_index, minlength=chunk_x.size)
+    # Rank of each instance inside its chunk = which draw pair of the chunk's generator it gets
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(chunk_index.size) - starts[chunk_index]
+    seeds = godot_random.cell_key_hash(chunk_x, chunk_z).astype(np.int64) + world_seed + spec["seed_offset"]
+    rng = godot_random.RandomNumberGenerator(seeds)
+    rounds = int(counts.max()) if counts.size else 0
+    scale_draws = np.empty((rounds, chunk_x.size), dtype=np.float32)
+    yaw_draws = np.empty((rounds, chunk_x.size), dtype=np.float32)
+    # Generators are independent, so every chunk can draw in lockstep and ignore the surplus
+    for r in range(rounds):
+        scale_draws[r] = rng.randf_range(*spec["scale_range"])
+        yaw_draws[r] = rng.randf()
+
+    records = np.empty((chunk_index.size, RECORD_FLOATS), dtype=np.float32)
+    records[:, 0] = lx[point]
+    records[:, 1] = terrain_y
+    records[:, 2] = lz[point]
+    records[:, 3] = yaw_draws[rank, chunk_index].astype(np.float64) * math.tau
+    records[:, 4] = spec["scale"] * scale_draws[rank, chunk_index].astype(np.float64)
+    return counts, records
+
+
+def place_region(origin, dims, world_seed, params=tr.DEFAULT_PARAMS, dense_grass=False):
+    """{kind: (counts, records)} for chunks origin .. origin + dims - 1, z-major."""
+    iz, ix = np.mgrid[0:dims[1], 0:dims[0]]
+    chunk_x, chunk_z = (ix + origin[0]).ravel(), (iz + origin[1]).ravel()
+    return {kind: place_kind(kind, chunk_x, chunk_z, world_seed, params, dense_grass) for kind in KIND_NAMES}
+
+
+def _place_band(task):
+    origin, dims, world_seed, params, dense_grass = task
+    return place_region(origin, dims, world_seed, params, dense_grass)
+
+
+@tracing.traced("place")
+def precompute(origin, dims, world_seed, params=tr.DEFAULT_PARAMS, dense_grass=False, jobs=1, band_rows=4):
+    """place_region() split into bands of chunk rows, in parallel when jobs > 1."""
+    tasks = [((origin[0], origin[1] + z), (dims[0], min(band_rows, dims[1] - z)), world_seed, params, dense_grass)
+             for z in range(0, dims[1], band_rows)]
+    if jobs == 1:
+        bands = [_place_band(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            bands = list(pool.map(_place_band, tasks))
+    return VegetationTable.build(origin, dims, world_seed, {
+        kind: (np.concatenate([band[kind][0] for band in bands]),
+               np.concatenate([band[kind][1] for band in bands]))
+        for kind in KIND_NAMES
+    })
+
+
+# === Table ===
+
+def _aligned(size):
+    return -(-size // SECTION_ALIGN) * SECTION_ALIGN
+
+
+class VegetationTable:
+    """Per-kind instance records sorted by chunk with a dense per-chunk offset grid."""
+
+    def __init__(self, origin, dims, world_seed, offsets, records):
+        self.origin = origin
+        self.dims = dims
+        self.world_seed = world_seed
+        self.offsets = offsets
+        self.records = records
+
+    @classmethod
+    def build(cls, origin, dims, world_seed, placed):
+        offsets, records = {}, {}
+        for kind in KIND_NAMES:
+            counts, kind_records = placed[kind]
+            offsets[kind] = np.zeros(dims[0] * dims[1] + 1, dtype=np.uint32)
+            np.cumsum(counts, out=offsets[kind][1:])
+            records[kind] = np.ascontiguousarray(kind_records, dtype=np.float32)
+        return cls(tuple(origin), tuple(dims), world_seed, offsets, records)
+
+    def instances(self, kind, chunk_x, chunk_z):
+        ix, iz = chunk_x - self.origin[0], chunk_z - self.origin[1]
+        if not (0 <= ix < self.dims[0] and 0 <= iz < self.dims[1]):
+            return self.records[kind][:0]
+        slot = iz * self.dims[0] + ix
+        return self.records[kind][self.offsets[kind][slot]:self.offsets[kind][slot + 1]]
+
+    def to_bytes(self):
+        counts = [len(self.records[kind]) for kind in KIND_NAMES]
+        parts = [TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, *self.origin, *self.dims, self.world_seed, *counts)]
+        size = TABLE_HEADER.size
+        for kind in KIND_NAMES:
+            for array in (self.offsets[kind].astype("<u4"), self.records[kind].astype("<f4")):
+                padding = _aligned(size) - size
+                parts += [b"\0" * padding, array.tobytes()]
+                size += padding + array.nbytes
+        return b"".join(parts)
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a table file; record arrays stay on disk until touched."""
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, ox, oz, nx, nz, seed, *counts = TABLE_HEADER.unpack_from(raw)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path}: not a v{TABLE_VERSION} vegetation table")
+        offsets, records = {}, {}
+        position = TABLE_HEADER.size
+        for kind, count in zip(KIND_NAMES, counts):
+            position = _aligned(position)
+            offsets[kind] = raw[position:position + (nx * nz + 1) * 4].view("<u4")
+            position = _aligned(position + offsets[kind].nbytes)
+            records[kind] = raw[position:position + count * RECORD_FLOATS * 4].view("<f4").reshape(count, RECORD_FLOATS)
+            position += records[kind].nbytes
+        return cls((ox, oz), (nx, nz), seed, offsets, records)
+
+    def digest(self):
+        return hashlib.blake2b(self.to_bytes(), digest_size=16).hexdigest()
+
+
+def multimesh_buffer(records, base_basis=None):
+    """
+    float32[n * 12] in MultiMesh TRANSFORM_3D buffer layout for records.
+
+    Mirrors base.rotated(Vector3.UP, yaw).scaled(scale) with origin = position;
+    base_basis is the mesh's base transform basis (identity by default).
+    """
+    records = np.asarray(records, dtype=np.float32)
+    base = np.eye(3) if base_basis is None else np.asarray(base_basis, dtype=np.float64)
+    yaw = records[:, 3].astype(np.float64)
+    cos, sin = np.cos(yaw), np.sin(yaw)
+    rotation = np.zeros((len(records), 3, 3))
+    rotation[:, 0, 0], rotation[:, 0, 2] = cos, sin
+    rotation[:, 1, 1] = 1.0
+    rotation[:, 2, 0], rotation[:, 2, 2] = -sin, cos
+    basis = records[:, 4, None, None].astype(np.float64) * (rotation @ base)
+    rows = np.concatenate([basis, records[:, :3, None].astype(np.float64)], axis=2)
+    return rows.astype(np.float32).reshape(-1)
+
+
+# === Per-chunk reference (runtime order) ===
+
+def place_chunk_reference(kind, chunk_x, chunk_z, world_seed, params=tr.DEFAULT_PARAMS, dense_grass=False):
+    """
+    One chunk, one cell at a time like the GDScript loop, from the full
+    density and water grids. Independent of every shortcut place_kind takes.
+    """
+    spec = KINDS[kind]
+    step = kind_step(kind, dense_grass)
+    noise = FastNoiseLite(world_seed + spec["seed_offset"], spec["frequency"])
+    heights = tr.surface_heights(tr.chunk_density((chunk_x, 0, chunk_z), params))
+    water_grids = {}
+    rng = godot_random.RandomNumberGenerator(
+        godot_random.cell_key_hash([chunk_x], [chunk_z]).astype(np.int64) + world_seed + spec["seed_offset"])
+    records = []
+    for x in range(0, tr.CHUNK_STRIDE, step):
+        for z in range(0, tr.CHUNK_STRIDE, step):
+            gx, gz = chunk_x * tr.CHUNK_STRIDE + x, chunk_z * tr.CHUNK_STRIDE + z
+            if not (kind == "grass" and dense_grass) and float(noise.get_noise_2d(gx, gz)) < spec["threshold"]:
+                continue
+            terrain_y = heights[z, x]
+            if terrain_y < NO_TERRAIN:
+                continue
+            if spec["water"] == "level":
+                if float(terrain_y) + 1.0 < params.water_level:
+                    continue
+            else:
+                probe_y = np.float32(float(terrain_y) + 0.5)
+                chunk_y = math.floor(float(probe_y) / tr.CHUNK_STRIDE)
+                if chunk_y not in water_grids:
+                    water_grids[chunk_y] = tr.chunk_water_density((chunk_x, chunk_y, chunk_z), params)
+                iy = math.floor(float(probe_y - np.float32(chunk_y * tr.CHUNK_STRIDE)) + 0.5)
+                if water_grids[chunk_y][z, iy, x] < 0.0:
+                    continue
+            scale = spec["scale"] * float(rng.randf_range(*spec["scale_range"])[0])
+            yaw = float(rng.randf()[0]) * math.tau
+            records.append((x, terrain_y, z, yaw, scale))
+    return np.array(records, dtype=np.float32).reshape(-1, RECORD_FLOATS)
+
+
+@tracing.traced("verify")
+def verify_chunks(table, chunks, params=tr.DEFAULT_PARAMS, dense_grass=False):
+    """Chunks whose table records differ in any bit from the per-chunk reference."""
+    mismatches = []
+    for chunk_x, chunk_z in chunks:
+        for kind in KIND_NAMES:
+            expected = place_chunk_reference(kind, chunk_x, chunk_z, table.world_seed, params, dense_grass)
+            actual = table.instances(kind, chunk_x, chunk_z)
+            if expected.tobytes() != np.ascontiguousarray(actual).tobytes():
+                mismatches.append((kind, chunk_x, chunk_z))
+    return mismatches
+
+
+@tracing.traced("benchmark")
+def benchmark(origin, dims, world_seed, params=tr.DEFAULT_PARAMS, dense_grass=False):
+    """(batch seconds, reference seconds, instances) for the same chunks."""
+    start = time.perf_counter()
+    table = precompute(origin, dims, world_seed, params, dense_grass)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for z in range(origin[1], origin[1] + dims[1]):
+        for x in range(origin[0], origin[0] + dims[0]):
+            for kind in KIND_NAMES:
+                place_chunk_reference(kind, x, z, world_seed, params, dense_grass)
+    reference_s = time.perf_counter() - start
+    return batch_s, reference_s, sum(len(table.records[kind]) for kind in KIND_NAMES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute vegetation instances for a region of surface chunks.")
+    parser.add_argument("--radius", type=int, default=16, help="chunk radius around the center")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("X", "Z"))
+    parser.add_argument("--seed", type=int, default=DEFAULT_WORLD_SEED, help="world_seed")
+    parser.add_argument("--dense-grass", action="store_true", help="dense_grass_mode (grass on every cell)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", type=Path, help="write the table here")
+    parser.add_argument("--verify", type=int, default=8, help="random chunks to check against the per-chunk reference")
+    parser.add_argument("--bench-radius", type=int, default=1,
+                        help="radius for the per-chunk comparison (0 = skip)")
+    args = parser.parse_args()
+
+    params = tr.DEFAULT_PARAMS
+    cx, cz = args.center
+    origin = (cx - args.radius, cz - args.radius)
+    dims = (args.radius * 2 + 1, args.radius * 2 + 1)
+    chunks = dims[0] * dims[1]
+
+    start = time.perf_counter()
+    table = precompute(origin, dims, args.seed, params, args.dense_grass, jobs=args.jobs)
+    elapsed = time.perf_counter() - start
+    total = sum(len(table.records[kind]) for kind in KIND_NAMES)
+    print(f"[VEG_PRECOMPUTE] {chunks} chunks, {total} instances in {elapsed * 1000:.1f} ms "
+          f"({total / max(elapsed, 1e-9):,.0f} instances/s, {args.jobs} jobs)")
+    for kind in KIND_NAMES:
+        records = table.records[kind]
+        print(f"[VEG_PRECOMPUTE]   {kind:<5} {len(records):>8} ({len(records) / chunks:.1f} per chunk)")
+
+    ok = True
+    # Determinism: a serial run with a different band split must produce the same bytes
+    serial = precompute(origin, dims, args.seed, params, args.dense_grass, jobs=1, band_rows=dims[1])
+    same = serial.digest() == table.digest()
+    print(f"[VEG_PRECOMPUTE] Determinism ({args.jobs} jobs vs serial single band): "
+          f"{table.digest()} {'identical' if same else 'MISMATCH ' + serial.digest()}")
+    ok &= same
+
+    if args.verify:
+        rng = np.random.default_rng(0)
+        picks = [(int(x), int(z)) for x, z in zip(rng.integers(origin[0], origin[0] + dims[0], args.verify),
+                                                  rng.integers(origin[1], origin[1] + dims[1], args.verify))]
+        mismatches = verify_chunks(table, picks, params, args.dense_grass)
+        print(f"[VEG_PRECOMPUTE] Per-chunk reference on {len(picks)} chunks: "
+              f"{'bit-identical' if not mismatches else f'{len(mismatches)} MISMATCHES {mismatches[:4]}'}")
+        ok &= not mismatches
+
+    if args.bench_radius:
+        r = args.bench_radius
+        bench_dims = (r * 2 + 1, r * 2 + 1)
+        batch_s, reference_s, count = benchmark((cx - r, cz - r), bench_dims, args.seed, params, args.dense_grass)
+        print(f"[VEG_PRECOMPUTE] Per-chunk vs batch ({bench_dims[0] * bench_dims[1]} chunks, {count} instances): "
+              f"{count / max(reference_s, 1e-9):,.0f} -> {count / max(batch_s, 1e-9):,.0f} instances/s "
+              f"({reference_s / max(batch_s, 1e-9):.1f}x)")
+
+    if args.out:
+        raw = table.to_bytes()
+        args.out.write_bytes(raw)
+        loaded = VegetationTable.open(args.out)
+        ok &= loaded.digest() == table.digest()
+        print(f"[VEG_PRECOMPUTE] Table written to {args.out} ({len(raw)} bytes)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
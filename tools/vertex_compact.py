@@ -0,0 +1,238 @@
+"""
+Quantized compact vertex stream for terrain meshes.
+
+The marching cubes output is 9 float32 per vertex (36 bytes) and every
+triangle carries its own three vertices. This module packs each vertex into
+12 bytes and welds duplicated corners into an index buffer:
+
+    offset  type        field
+    0       uint16 x3   chunk-local position, fixed point over [POSITION_MIN, POSITION_MAX]
+    6       int16  x2   octahedral-encoded normal (snorm16)
+    10      uint8       material ID (vertex color R * 255)
+    11      uint8       flags (bit 0 = color G "valid material" marker)
+
+decode_stream() expands back to the interleaved float layout MeshBuilder
+expects, so the compact form can be swapped in on either side of the
+GPU readback without touching build_mesh_native / build_collision_shape.
+
+Usage:
+    python tools/vertex_compact.py --radius 2
+"""
+import argparse
+import time
+
+import numpy as np
+
+import marching_cubes as mc
+import terrain_lod
+import terrain_reference as tr
+import tracing
+
+# Covers a full chunk plus LOD skirts hanging below it
+POSITION_MIN = -8.0
+POSITION_MAX = 40.0
+POSITION_STEPS = 65535
+POSITION_SCALE = (POSITION_MAX - POSITION_MIN) / POSITION_STEPS
+
+NORMAL_STEPS = 32767
+FLAG_VALID = 1
+
+COMPACT_DTYPE = np.dtype([
+    ("pos", "<u2", 3),
+    ("oct", "<i2", 2),
+    ("mat", "u1"),
+    ("flags", "u1"),
+])
+assert COMPACT_DTYPE.itemsize == 12
+
+FLOAT_VERTEX_BYTES = mc.VERTEX_STRIDE * 4
+
+# Theoretical worst-case errors of the encoding
+MAX_POSITION_ERROR = POSITION_SCALE / 2
+# Octahedral snorm16 lands at a few thousandths of a degree; 0.01 leaves headroom
+MAX_NORMAL_ERROR_DEG = 0.01
+
+
+def oct_encode(normals):
+    """Unit normals (n, 3) -> octahedral coordinates (n, 2) in [-1, 1]."""
+    n = normals / np.maximum(np.abs(normals).sum(axis=1, keepdims=True), 1e-20)
+    x, y, z = n[:, 0], n[:, 1], n[:, 2]
+    sign_x = np.where(x >= 0.0, 1.0, -1.0)
+    sign_y = np.where(y >= 0.0, 1.0, -1.0)
+    folded_x = (1.0 - np.abs(y)) * sign_x
+    folded_y = (1.0 - np.abs(x)) * sign_y
+    return np.stack([np.where(z >= 0.0, x, folded_x), np.where(z >= 0.0, y, folded_y)], axis=1)
+
+
+def oct_decode(oct_coords):
+    """Octahedral coordinates (n, 2) -> unit normals (n, 3) float32."""
+    x, y = oct_coords[:, 0], oct_coords[:, 1]
+    z = 1.0 - np.abs(x) - np.abs(y)
+    t = np.maximum(-z, 0.0)
+    x = x - np.where(x >= 0.0, t, -t)
+    y = y - np.where(y >= 0.0, t, -t)
+    n = np.stack([x, y, z], axis=1)
+    length = np.linalg.norm(n, axis=1, keepdims=True)
+    return (n / np.maximum(length, 1e-20)).astype(np.float32)
+
+
+def encode_vertices(vertices):
+    """(n, 9) float32 GPU stream -> (n,) COMPACT_DTYPE array (one entry per input vertex)."""
+    vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, mc.VERTEX_STRIDE)
+    pos = vertices[:, 0:3].astype(np.float64)
+    if pos.size and (pos.min() < POSITION_MIN or pos.max() > POSITION_MAX):
+        raise ValueError(f"Vertex positions outside [{POSITION_MIN}, {POSITION_MAX}]: "
+                         f"{pos.min():.3f}..{pos.max():.3f}")
+
+    out = np.empty(vertices.shape[0], dtype=COMPACT_DTYPE)
+    out["pos"] = np.rint((pos - POSITION_MIN) / POSITION_SCALE)
+    out["oct"] = np.rint(np.clip(oct_encode(vertices[:, 3:6].astype(np.float64)), -1.0, 1.0) * NORMAL_STEPS)
+    out["mat"] = np.clip(np.rint(vertices[:, 6] * 255.0), 0, 255)
+    out["flags"] = np.where(vertices[:, 7] >= 0.5, FLAG_VALID, 0)
+    return out
+
+
+def decode_vertices(compact):
+    """(n,) COMPACT_DTYPE -> (n, 9) float32 GPU stream."""
+    out = np.empty((compact.shape[0], mc.VERTEX_STRIDE), dtype=np.float32)
+    out[:, 0:3] = compact["pos"] * POSITION_SCALE + POSITION_MIN
+    out[:, 3:6] = oct_decode(compact["oct"].astype(np.float32) / NORMAL_STEPS)
+    out[:, 6] = compact["mat"].astype(np.float32) / np.float32(255.0)
+    out[:, 7] = (compact["flags"] & FLAG_VALID).astype(np.float32)
+    out[:, 8] = 0.0
+    return out
+
+
+@tracing.traced("weld")
+def weld(compact):
+    """
+    Remove duplicated corners.
+
+    Returns (unique_vertices, indices); indices are uint16 when the vertex
+    count allows it, uint32 otherwise. Vertices only merge when every
+    quantized field matches, so material borders keep their own corners.
+    """
+    if compact.shape[0] == 0:
+        return compact, np.zeros(0, dtype=np.uint16)
+    keys = compact.view(np.dtype((np.void, COMPACT_DTYPE.itemsize)))
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    # Keep first-seen order so the index buffer stays cache friendly
+    order = np.argsort(first)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(order.size)
+    unique = compact[first[order]]
+    index_type = np.uint16 if unique.shape[0] <= 0xFFFF else np.uint32
+    return unique, remap[inverse.ravel()].astype(index_type)
+
+
+def encode_stream(vertices):
+    """GPU float stream -> (unique compact vertices, index buffer)."""
+    return weld(encode_vertices(vertices))
+
+
+def decode_stream(unique, indices):
+    """Compact indexed mesh -> non-indexed (n, 9) float32 stream for MeshBuilder."""
+    return decode_vertices(unique)[indices]
+
+
+def stream_bytes(unique, indices):
+    return unique.nbytes + indices.nbytes
+
+
+@tracing.traced("verify")
+def measure_error(vertices, decoded):
+    """Max position error (units), max normal error (degrees) and material mismatches."""
+    if vertices.shape[0] == 0:
+        return 0.0, 0.0, 0
+    pos_err = float(np.abs(vertices[:, 0:3] - decoded[:, 0:3]).max())
+    a = vertices[:, 3:6].astype(np.float64)
+    b = decoded[:, 3:6].astype(np.float64)
+    # atan2 stays accurate for tiny angles where arccos(dot) is dominated by rounding
+    angles = np.arctan2(np.linalg.norm(np.cross(a, b), axis=1), (a * b).sum(axis=1))
+    # Zero-length normals (flat density) cannot be encoded and decode to an arbitrary axis
+    valid = np.linalg.norm(a, axis=1) > 0.5
+    normal_err = float(np.degrees(angles[valid]).max()) if np.any(valid) else 0.0
+    mat_err = int(np.count_nonzero(np.rint(vertices[:, 6] * 255) != np.rint(decoded[:, 6] * 255)))
+    return pos_err, normal_err, mat_err
+
+
+@tracing.traced("benchmark")
+def benchmark(coords, params=tr.DEFAULT_PARAMS, strides=(1,)):
+    """Encode every chunk mesh, check error bounds and collect size/throughput numbers."""
+    totals = {"vertices": 0, "unique": 0, "float_bytes": 0, "compact_bytes": 0,
+              "encode_s": 0.0, "decode_s": 0.0, "pos_err": 0.0, "normal_err": 0.0, "mat_err": 0}
+
+    for coord in coords:
+        density = tr.chunk_density(coord, params)
+        materials = tr.chunk_materials(coord, params)
+        for stride in strides:
+            verts = terrain_lod.build_lod_mesh(density, materials, stride)
+            if verts.shape[0] == 0:
+                continue
+
+            start = time.perf_counter()
+            unique, indices = encode_stream(verts)
+            totals["encode_s"] += time.perf_counter() - start
+            start = time.perf_counter()
+            decoded = decode_stream(unique, indices)
+            totals["decode_s"] += time.perf_counter() - start
+
+            pos_err, normal_err, mat_err = measure_error(verts, decoded)
+            totals["pos_err"] = max(totals["pos_err"], pos_err)
+            totals["normal_err"] = max(totals["normal_err"], normal_err)
+            totals["mat_err"] += mat_err
+            totals["vertices"] += verts.shape[0]
+            totals["unique"] += unique.shape[0]
+            totals["float_bytes"] += verts.nbytes
+            totals["compact_bytes"] += stream_bytes(unique, indices)
+
+    return totals
+
+
+def print_report(totals, chunk_count):
+    from_mb = 1024 * 1024
+    print(f"[VERTEX_COMPACT] Chunks: {chunk_count}  vertices: {totals['vertices']}  "
+          f"after welding: {totals['unique']} ({totals['unique'] / max(totals['vertices'], 1):.1%})")
+    print(f"[VERTEX_COMPACT] Float stream:   {totals['float_bytes'] / from_mb:8.2f} MB "
+          f"({FLOAT_VERTEX_BYTES} B/vertex)")
+    print(f"[VERTEX_COMPACT] Compact stream: {totals['compact_bytes'] / from_mb:8.2f} MB "
+          f"({COMPACT_DTYPE.itemsize} B/vertex + indices), "
+          f"{totals['float_bytes'] / max(totals['compact_bytes'], 1):.1f}x smaller")
+
+    max_tris = tr.CHUNK_SIZE ** 3 * 5  # chunk_manager.gd MAX_TRIANGLES
+    print(f"[VERTEX_COMPACT] MAX_TRIANGLES readback buffer: "
+          f"{max_tris * 3 * FLOAT_VERTEX_BYTES / from_mb:.1f} MB float -> "
+          f"{max_tris * 3 * COMPACT_DTYPE.itemsize / from_mb:.1f} MB compact")
+
+    if totals["encode_s"] > 0:
+        print(f"[VERTEX_COMPACT] Encode+weld: {totals['float_bytes'] / from_mb / totals['encode_s']:8.1f} MB/s")
+    if totals["decode_s"] > 0:
+        print(f"[VERTEX_COMPACT] Decode:      {totals['float_bytes'] / from_mb / totals['decode_s']:8.1f} MB/s")
+
+    ok = (totals["pos_err"] <= MAX_POSITION_ERROR * 1.001
+          and totals["normal_err"] <= MAX_NORMAL_ERROR_DEG
+          and totals["mat_err"] == 0)
+    print(f"[VERTEX_COMPACT] Max position error: {totals['pos_err']:.6f} (bound {MAX_POSITION_ERROR:.6f})")
+    print(f"[VERTEX_COMPACT] Max normal error:   {totals['normal_err']:.4f} deg (bound {MAX_NORMAL_ERROR_DEG})")
+    print(f"[VERTEX_COMPACT] Material mismatches: {totals['mat_err']}")
+    print(f"[VERTEX_COMPACT] Error bounds: {'OK' if ok else 'EXCEEDED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compact terrain vertex stream.")
+    parser.add_argument("--radius", type=int, default=2, help="chunk radius around the origin")
+    parser.add_argument("--y", type=int, default=0, help="chunk Y layer")
+    parser.add_argument("--lod", action="store_true", help="also encode 2x/4x/8x LOD meshes (with skirts)")
+    args = parser.parse_args()
+
+    coords = [(x, args.y, z) for x in range(-args.radius, args.radius + 1)
+              for z in range(-args.radius, args.radius + 1)]
+    strides = terrain_lod.LOD_STRIDES if args.lod else (1,)
+    ok = print_report(benchmark(coords, strides=strides), len(coords))
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
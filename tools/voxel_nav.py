@@ -0,0 +1,786 @@
+"""
+Voxel navigation graph: walkable cells, per-chunk portal graphs and HPA* paths.
+
+Zombies (game/entities/zombie_base.gd) only steer straight at their target
+and hop when they hit a wall. This builds the navigation data
+PERFORMANCE_ANALYSIS.md calls VoxelNavGen from the same sources the game
+has: terrain density grids (33^3 per chunk, negative = solid) and
+BuildingChunk voxels (16^3, any non-zero block is solid).
+
+Cells are the 1-unit lattice of the density samples; a building voxel at
+world (x, y, z) fills cell (x, y, z). A cell is walkable when the cell below
+is solid and `clearance` cells starting at it are air (cells above the
+region count as air). Moves go to the 4 horizontal neighbours, up to
+`max_step` cells up as a step, up to `max_jump` cells up as a jump and up to
+`max_drop` cells down; climbing needs headroom above the start cell and
+dropping needs it above the landing cell. The defaults follow the zombie
+capsule (1.8 tall -> 2 cells) and its wall hop (velocity.y = 4 against
+gravity 20, repeated while touching the wall).
+
+    move cost   1 + 0.5 per cell up (+1 for a jump), 1 + 0.25 per cell down
+
+Every terrain chunk column (CHUNK_STRIDE x CHUNK_STRIDE cells, all y) is a
+cluster. Moves across a cluster border are grouped into entrances (crossings
+whose cells are mutually connected along the border on both sides), and each
+entrance gets a transition every ENTRANCE_SPACING crossings per direction.
+The transition cells are the cluster's portals; each portal keeps a forward
+and a reverse Dijkstra tree over its cluster, which give portal-to-portal
+edges and let a query attach its start / goal to the abstract graph with
+array lookups. Queries run A* over portals (plus a local A* when start and
+goal share a cluster), then refine by walking the trees.
+
+Terrain edits (modify, mirroring modify_density.glsl) and building changes
+(set_building_chunk) mark the clusters whose solid cells changed; rebuild()
+redoes only those clusters and their borders, and rebuilds neighbour trees
+only for portals that appeared.
+
+The tool builds a region from the CPU terrain reference plus stamped
+prefabs, checks the walkable rules cell by cell, compares HPA* against
+Dijkstra on the flat cell graph, checks that incremental rebuilds match a
+full build, and times path queries.
+
+Usage:
+    python tools/voxel_nav.py
+    python tools/voxel_nav.py --radius 4 --buildings 40 --queries 5000
+"""
+import argparse
+import heapq
+import math
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+import building_mesher as bm
+import prefab_compiler as pc
+import terrain_reference as tr
+import tracing
+
+CLUSTER = tr.CHUNK_STRIDE
+DEFAULT_Y_LAYERS = (-1, 0, 1)  # Terrain chunk layers covered by a region
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))  # (dx, dz)
+ENTRANCE_SPACING = 8
+MOVE_COST, CLIMB_COST, JUMP_COST, DROP_COST = 1.0, 0.5, 1.0, 0.25
+OPEN_AIR = 1 << 16  # Air run above the region top
+INF = math.inf
+SHAPE_SPHERE, SHAPE_BOX = 0, 1
+
+
+@dataclass(frozen=True)
+class AgentParams:
+    clearance: int = 2
+    max_step: int = 1
+    max_jump: int = 2
+    max_drop: int = 3
+
+
+DEFAULT_AGENT = AgentParams()
+
+
+def move_cost(dy, agent=DEFAULT_AGENT):
+    """Cost of one horizontal move with a height change of dy cells."""
+    if dy > agent.max_step:
+        return MOVE_COST + CLIMB_COST * dy + JUMP_COST
+    if dy > 0:
+        return MOVE_COST + CLIMB_COST * dy
+    return MOVE_COST - DROP_COST * dy
+
+
+# === Walkable cells and moves ===
+
+def air_runs(solid):
+    """Consecutive air cells from each cell upward ([z, y, x]; 0 for solid cells)."""
+    air = np.empty(solid.shape, dtype=np.int32)
+    run = np.full((solid.shape[0], solid.shape[2]), OPEN_AIR, dtype=np.int32)
+    for y in range(solid.shape[1] - 1, -1, -1):
+        run = np.where(solid[:, y, :], 0, run + 1)
+        air[:, y, :] = run
+    return air
+
+
+def walkable(solid, agent=DEFAULT_AGENT):
+    """(walk, air) for a [z, y, x] solid grid: solid below and `clearance` air cells."""
+    air = air_runs(solid)
+    walk = np.zeros(solid.shape, dtype=bool)
+    walk[:, 1:, :] = solid[:, :-1, :] & (air[:, 1:, :] >= agent.clearance)
+    return walk, air
+
+
+def _pair_slices(step, n):
+    """Source / destination slices of an axis shifted by step."""
+    if step >= 0:
+        return slice(0, n - step), slice(step, n)
+    return slice(-step, n), slice(0, n + step)
+
+
+def moves(walk, air, agent=DEFAULT_AGENT):
+    """Every move of a [z, y, x] block: source / destination (n, 3) zyx indices and costs."""
+    depth, height, width = walk.shape
+    sources, targets, costs = [], [], []
+    for dx, dz in DIRECTIONS:
+        for dy in range(-agent.max_drop, agent.max_jump + 1):
+            (sz, tz), (sy, ty), (sx, tx) = _pair_slices(dz, depth), _pair_slices(dy, height), _pair_slices(dx, width)
+            mask = walk[sz, sy, sx] & walk[tz, ty, tx]
+            if dy > 0:
+                mask &= air[sz, sy, sx] >= dy + agent.clearance
+            elif dy < 0:
+                mask &= air[tz, ty, tx] >= agent.clearance - dy
+            z, y, x = np.nonzero(mask)
+            source = np.stack([z + sz.start, y + sy.start, x + sx.start], axis=1)
+            sources.append(source)
+            targets.append(source + (dz, dy, dx))
+            costs.append(np.full(len(z), move_cost(dy, agent)))
+    return np.concatenate(sources), np.concatenate(targets), np.concatenate(costs)
+
+
+def _dijkstra(adjacency, source):
+    dist = [INF] * len(adjacency)
+    pred = [-1] * len(adjacency)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, cost in adjacency[u]:
+            nd = d + cost
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    return dist, pred
+
+
+def _astar(adjacency, xz, source, goal):
+    """A* over adjacency lists with a Manhattan xz heuristic: (cost, node path)."""
+    gx, gz = xz[goal]
+    dist = {source: 0.0}
+    pred = {source: -1}
+    heap = [(abs(xz[source][0] - gx) + abs(xz[source][1] - gz), 0.0, source)]
+    while heap:
+        _f, d, u = heapq.heappop(heap)
+        if u == goal:
+            path = [u]
+            while pred[path[-1]] >= 0:
+                path.append(pred[path[-1]])
+            return d, path[::-1]
+        if d > dist[u]:
+            continue
+        for v, cost in adjacency[u]:
+            nd = d + cost
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd + abs(xz[v][0] - gx) + abs(xz[v][1] - gz), nd, v))
+    return INF, None
+
+
+# === Navigation world ===
+
+class NavWorld:
+    """Solid cells of a square of terrain chunk columns and their HPA* graph."""
+
+    def __init__(self, cluster_min, clusters, y_layers=DEFAULT_Y_LAYERS, agent=DEFAULT_AGENT):
+        self.cluster_min = tuple(cluster_min)  # Chunk (x, z) of cluster (0, 0)
+        self.clusters = clusters
+        self.y_layers = tuple(y_layers)
+        self.agent = agent
+        self.origin = (cluster_min[0] * CLUSTER, y_layers[0] * CLUSTER, cluster_min[1] * CLUSTER)
+        side = clusters * CLUSTER
+        self.shape = (side, CLUSTER * len(y_layers) + 1, side)  # [z, y, x]
+        self.density = np.ones(self.shape, dtype=np.float32)
+        self.building = np.zeros(self.shape, dtype=bool)
+        self.solid = np.zeros(self.shape, dtype=bool)
+        self.walk = np.zeros(self.shape, dtype=bool)
+        self.air = np.zeros(self.shape, dtype=np.int32)
+        self.local = np.full(self.shape, -1, dtype=np.int32)  # Cluster-local index of walkable cells
+
+        self.nodes = {}  # cluster -> global cells of its walkable cells
+        self.xz = {}  # cluster -> [(x, z)] per local node
+        self.adjacency = {}  # cluster -> forward / reverse adjacency lists [(local, cost)]
+        self.crossings = {}  # cluster -> moves with one end outside (source, target, cost)
+        self.borders = {}  # (cluster, cluster) -> transitions [(source cell, target cell, cost)]
+        self.portals = {}  # cluster -> sorted portal cells
+        self.trees = {}  # portal -> (forward dist, forward pred, reverse dist, reverse pred)
+        self.links = {}  # portal -> [(portal, cost)]
+        self.dirty = {(i, j) for i in range(clusters) for j in range(clusters)}
+
+    # --- Cells ---
+
+    def cell(self, x, y, z):
+        """Global cell id of region indices (x, y, z)."""
+        return (z * self.shape[1] + y) * self.shape[2] + x
+
+    def coords(self, cell):
+        """Region indices (x, y, z) of a cell id."""
+        zy, x = divmod(cell, self.shape[2])
+        z, y = divmod(zy, self.shape[1])
+        return x, y, z
+
+    def cluster_of(self, cell):
+        x, _y, z = self.coords(cell)
+        return x // CLUSTER, z // CLUSTER
+
+    def world_position(self, cell):
+        """World (x, y, z) of a cell (y is the feet height)."""
+        x, y, z = self.coords(cell)
+        return x + self.origin[0], y + self.origin[1], z + self.origin[2]
+
+    def cell_at(self, wx, wy, wz):
+        """Walkable cell in the column under (wx, wz) closest to height wy, or -1."""
+        x, z = int(math.floor(wx)) - self.origin[0], int(math.floor(wz)) - self.origin[2]
+        if not (0 <= x < self.shape[2] and 0 <= z < self.shape[0]):
+            return -1
+        ys = np.flatnonzero(self.walk[z, :, x])
+        if len(ys) == 0:
+            return -1
+        y = int(ys[np.argmin(np.abs(ys + self.origin[1] - wy))])
+        return self.cell(x, y, z)
+
+    def walkable_cells(self):
+        return np.flatnonzero(self.walk.ravel())
+
+    def move_cost(self, a, b):
+        """Cost of the move a -> b by the walkable rules, or None."""
+        (ax, ay, az), (bx, by, bz) = self.coords(a), self.coords(b)
+        if not (self.walk.flat[a] and self.walk.flat[b]) or abs(ax - bx) + abs(az - bz) != 1:
+            return None
+        dy = by - ay
+        if dy > self.agent.max_jump or dy < -self.agent.max_drop:
+            return None
+        if dy > 0 and self.air.flat[a] < dy + self.agent.clearance:
+            return None
+        if dy < 0 and self.air.flat[b] < self.agent.clearance - dy:
+            return None
+        return move_cost(dy, self.agent)
+
+    # --- Sources ---
+
+    def _region_box(self, world_min, size):
+        """Region slices and source slices of a world-aligned [z, y, x] block, or None."""
+        region, source = [], []
+        for axis, (lo, n) in enumerate(zip(world_min, size)):
+            start = lo - self.origin[(2, 1, 0)[axis]]
+            a, b = max(start, 0), min(start + n, self.shape[axis])
+            if a >= b:
+                return None
+            region.append(slice(a, b))
+            source.append(slice(a - start, b - start))
+        return tuple(region), tuple(source)
+
+    def fresh_copy(self):
+        """A NavWorld with the same density and building voxels and no graph yet."""
+        world = NavWorld(self.cluster_min, self.clusters, self.y_layers, self.agent)
+        world.density[...] = self.density
+        world.building[...] = self.building
+        world._update_solid(slice(0, self.shape[0]), slice(0, self.shape[2]))
+        return world
+
+    def set_chunk_density(self, coord, density):
+        """Copy a chunk's 33^3 [z, y, x] density grid into the region."""
+        ox, oy, oz = (int(c) * CLUSTER for c in coord)
+        box = self._region_box((oz, oy, ox), density.shape)
+        if box is not None:
+            region, source = box
+            self.density[region] = density[source]
+            self._update_solid(region[0], region[2])
+
+    def set_building_chunk(self, coord, types):
+        """Replace the building voxels of a 16^3 [z, y, x] BuildingChunk."""
+        ox, oy, oz = (int(c) * bm.SIZE for c in coord)
+        box = self._region_box((oz, oy, ox), types.shape)
+        if box is not None:
+            region, source = box
+            self.building[region] = types[source] > 0
+            self._update_solid(region[0], region[2])
+
+    @tracing.traced("density")
+    def load_terrain(self, params=tr.DEFAULT_PARAMS):
+        """Fill the region from CPU reference density grids (tr.chunk_density)."""
+        cx0, cz0 = self.cluster_min
+        for i in range(self.clusters):
+            for j in range(self.clusters):
+                for cy in self.y_layers:
+                    coord = (cx0 + i, cy, cz0 + j)
+                    self.set_chunk_density(coord, tr.chunk_density(coord, params))
+
+    def modify(self, brush_pos, radius, value, shape=SHAPE_SPHERE):
+        """Apply a terrain brush to the density samples (modify_density.glsl sphere / box)."""
+        reach = int(math.ceil(radius)) + 1
+        center = [int(math.floor(c)) for c in brush_pos]
+        world_min = (center[2] - reach, center[1] - reach, center[0] - reach)
+        box = self._region_box(world_min, (2 * reach + 1,) * 3)
+        if box is None:
+            return
+        region, _source = box
+        wz, wy, wx = np.meshgrid(*(np.arange(s.start, s.stop, dtype=np.float32) + np.float32(o)
+                                   for s, o in zip(region, self.origin[::-1])), indexing="ij")
+        offset = [wx - np.float32(brush_pos[0]), wy - np.float32(brush_pos[1]), wz - np.float32(brush_pos[2])]
+        block = self.density[region]
+        if shape == SHAPE_BOX:
+            inside = np.maximum(np.abs(offset[0]), np.maximum(np.abs(offset[1]), np.abs(offset[2]))) <= radius
+            block[inside] = np.float32(value)
+        else:
+            dist = np.sqrt(offset[0] * offset[0] + offset[1] * offset[1] + offset[2] * offset[2])
+            weight = np.clip(np.float32(1.0) - dist / np.float32(radius), 0.0, 1.0)
+            block += np.where(dist < radius, np.float32(value) * weight, np.float32(0.0)).astype(np.float32)
+        self.density[region] = block
+        self._update_solid(region[0], region[2])
+
+    def _update_solid(self, zs, xs):
+        solid = (self.density[zs, :, xs] < 0.0) | self.building[zs, :, xs]
+        changed = (solid != self.solid[zs, :, xs]).any(axis=1)
+        self.solid[zs, :, xs] = solid
+        z, x = np.nonzero(changed)
+        self.dirty.update(zip(((x + xs.start) // CLUSTER).tolist(), ((z + zs.start) // CLUSTER).tolist()))
+
+    # --- Graph ---
+
+    def _neighbours(self, cluster):
+        i, j = cluster
+        for ni, nj in ((i + 1, j), (i - 1, j), (i, j + 1), (i, j - 1)):
+            if 0 <= ni < self.clusters and 0 <= nj < self.clusters:
+                yield ni, nj
+
+    def _build_cluster(self, cluster):
+        i, j = cluster
+        x0, z0 = i * CLUSTER, j * CLUSTER
+        sx0, sz0 = max(x0 - 1, 0), max(z0 - 1, 0)
+        sx1, sz1 = min(x0 + CLUSTER + 1, self.shape[2]), min(z0 + CLUSTER + 1, self.shape[0])
+        walk, air = walkable(self.solid[sz0:sz1, :, sx0:sx1], self.agent)
+        inner = (slice(z0 - sz0, z0 - sz0 + CLUSTER), slice(None), slice(x0 - sx0, x0 - sx0 + CLUSTER))
+        box = (slice(z0, z0 + CLUSTER), slice(None), slice(x0, x0 + CLUSTER))
+        self.walk[box] = walk[inner]
+        self.air[box] = air[inner]
+
+        z, y, x = np.nonzero(self.walk[box])
+        nodes = self.cell(x + x0, y, z + z0)
+        self.local[box] = -1
+        self.local.ravel()[nodes] = np.arange(len(nodes), dtype=np.int32)
+        self.nodes[cluster] = nodes
+        self.xz[cluster] = list(zip((x + x0).tolist(), (z + z0).tolist()))
+
+        source, target, cost = moves(walk, air, self.agent)
+        source += (sz0, 0, sx0)
+        target += (sz0, 0, sx0)
+        src_in = (source[:, 0] // CLUSTER == j) & (source[:, 2] // CLUSTER == i)
+        dst_in = (target[:, 0] // CLUSTER == j) & (target[:, 2] // CLUSTER == i)
+        src_cells = self.cell(source[:, 2], source[:, 1], source[:, 0])
+        dst_cells = self.cell(target[:, 2], target[:, 1], target[:, 0])
+
+        forward = [[] for _ in range(len(nodes))]
+        reverse = [[] for _ in range(len(nodes))]
+        intra = src_in & dst_in
+        a = self.local.ravel()[src_cells[intra]].tolist()
+        b = self.local.ravel()[dst_cells[intra]].tolist()
+        for s, t, c in zip(a, b, cost[intra].tolist()):
+            forward[s].append((t, c))
+            reverse[t].append((s, c))
+        self.adjacency[cluster] = (forward, reverse)
+        cross = src_in != dst_in
+        self.crossings[cluster] = (src_cells[cross].tolist(), dst_cells[cross].tolist(), cost[cross].tolist())
+
+    def _connected(self, a, b):
+        return self.move_cost(a, b) is not None and self.move_cost(b, a) is not None
+
+    def _border_transitions(self, cluster, other):
+        """
+        Transitions across the border of a freshly built cluster and a
+        neighbour. Crossings are keyed (cell in the lower cluster, cell in the
+        higher one) whichever side is rebuilt, so both sides pick the same ones.
+        """
+        low = min(cluster, other)
+        pairs = {}  # (low cell, high cell) -> [cost low -> high, cost high -> low]
+        for s, t, c in zip(*self.crossings[cluster]):
+            source_cluster, target_cluster = self.cluster_of(s), self.cluster_of(t)
+            if {source_cluster, target_cluster} != {cluster, other}:
+                continue
+            if source_cluster == low:
+                pairs.setdefault((s, t), [INF, INF])[0] = c
+            else:
+                pairs.setdefault((t, s), [INF, INF])[1] = c
+        along = 0 if cluster[1] != other[1] else 2  # Border between z neighbours runs along x
+        keys = sorted(pairs, key=lambda k: (self.coords(k[0])[along], self.coords(k[0])[1], self.coords(k[1])[1]))
+        by_along = {}
+        for index, (a, _b) in enumerate(keys):
+            by_along.setdefault(self.coords(a)[along], []).append(index)
+
+        parent = list(range(len(keys)))
+        def find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+        for index, (a, b) in enumerate(keys):
+            for other_index in by_along.get(self.coords(a)[along] + 1, ()):
+                a2, b2 = keys[other_index]
+                if self._connected(a, a2) and self._connected(b, b2):
+                    parent[find(other_index)] = find(index)
+
+        entrances = {}
+        for index in range(len(keys)):
+            entrances.setdefault(find(index), []).append(index)
+        transitions = []
+        for members in entrances.values():
+            for direction in (0, 1):
+                usable = [keys[m] for m in members if pairs[keys[m]][direction] < INF]
+                if not usable:
+                    continue
+                picks = ([len(usable) // 2] if len(usable) <= ENTRANCE_SPACING
+                         else range(ENTRANCE_SPACING // 2, len(usable), ENTRANCE_SPACING))
+                for p in picks:
+                    a, b = usable[p]
+                    cost = pairs[(a, b)][direction]
+                    transitions.append((a, b, cost) if direction == 0 else (b, a, cost))
+        return transitions
+
+    def _trees(self, cluster, portal):
+        forward, reverse = self.adjacency[cluster]
+        local = int(self.local.flat[portal])
+        return _dijkstra(forward, local) + _dijkstra(reverse, local)
+
+    @tracing.traced("rebuild")
+    def rebuild(self):
+        """Rebuild dirty clusters and their borders: {clusters, trees, seconds}."""
+        start = time.perf_counter()
+        dirty = sorted(self.dirty)
+        self.dirty = set()
+        for cluster in dirty:
+            self._build_cluster(cluster)
+        touched = set(dirty)
+        for cluster in dirty:
+            for other in self._neighbours(cluster):
+                key = (min(cluster, other), max(cluster, other))
+                if other not in dirty or other > cluster:  # Dirty pairs are done once
+                    self.borders[key] = self._border_transitions(cluster, other)
+                touched.add(other)
+
+        trees = 0
+        for cluster in touched:
+            inter = {}
+            for other in self._neighbours(cluster):
+                for s, t, c in self.borders.get((min(cluster, other), max(cluster, other)), ()):
+                    if self.cluster_of(s) == cluster:
+                        inter.setdefault(s, []).append((t, c))
+                    else:
+                        inter.setdefault(t, [])
+            portals = sorted(inter)
+            old = self.portals.get(cluster, [])
+            keep = set() if cluster in dirty else set(old) & set(portals)
+            for portal in old:
+                if portal not in keep:
+                    self.trees.pop(portal, None)
+                    self.links.pop(portal, None)
+            for portal in portals:
+                if portal not in keep:
+                    self.trees[portal] = self._trees(cluster, portal)
+                    trees += 1
+            self.portals[cluster] = portals
+            for portal in portals:
+                forward = self.trees[portal][0]
+                intra = [(q, forward[self.local.flat[q]]) for q in portals
+                         if q != portal and forward[self.local.flat[q]] < INF]
+                self.links[portal] = intra + inter[portal]
+        return {"clusters": len(dirty), "trees": trees, "seconds": time.perf_counter() - start}
+
+    # --- Queries ---
+
+    def _heuristic(self, cell, gx, gz):
+        x, _y, z = self.coords(cell)
+        return abs(x - gx) + abs(z - gz)
+
+    @tracing.traced("path")
+    def find_path(self, start, goal, refine=True):
+        """
+        HPA* path between two walkable cells: (cost, cells). With refine=False
+        the cells are only start, the portals passed and goal. (INF, None)
+        when there is no path.
+        """
+        if self.dirty:
+            self.rebuild()
+        if start < 0 or goal < 0 or not (self.walk.flat[start] and self.walk.flat[goal]):
+            return INF, None
+        if start == goal:
+            return 0.0, [start]
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        start_local, goal_local = int(self.local.flat[start]), int(self.local.flat[goal])
+        best_cost, best = INF, None
+        if start_cluster == goal_cluster:
+            xz = self.xz[start_cluster]
+            best_cost, local_path = _astar(self.adjacency[start_cluster][0], xz, start_local, goal_local)
+            if local_path is not None:
+                best = self.nodes[start_cluster][local_path].tolist()
+
+        goal_cost = {}
+        for q in self.portals.get(goal_cluster, ()):
+            d = self.trees[q][0][goal_local]
+            if d < INF:
+                goal_cost[q] = d
+        gx, _gy, gz = self.coords(goal)
+        dist, parent, heap = {}, {}, []
+        if goal_cost:
+            for p in self.portals.get(start_cluster, ()):
+                d = self.trees[p][2][start_local]
+                if d < INF:
+                    dist[p], parent[p] = d, start
+                    heapq.heappush(heap, (d + self._heuristic(p, gx, gz), d, p))
+        while heap:
+            f, d, u = heapq.heappop(heap)
+            if f >= best_cost:
+                break
+            if u == goal:
+                best_cost, best = d, [goal]
+                while best[-1] != start:
+                    best.append(parent[best[-1]])
+                best.reverse()
+                if refine:
+                    best = self._refine(best)
+                break
+            if d > dist[u]:
+                continue
+            if u in goal_cost and d + goal_cost[u] < dist.get(goal, INF):
+                dist[goal], parent[goal] = d + goal_cost[u], u
+                heapq.heappush(heap, (dist[goal], dist[goal], goal))
+            for v, cost in self.links[u]:
+                nd = d + cost
+                if nd < dist.get(v, INF):
+                    dist[v], parent[v] = nd, u
+                    heapq.heappush(heap, (nd + self._heuristic(v, gx, gz), nd, v))
+        return best_cost, best
+
+    def _tree_walk(self, cluster, pred, source, target):
+        """Cells from source to target following a Dijkstra predecessor list."""
+        nodes = self.nodes[cluster]
+        u, end = int(self.local.flat[source]), int(self.local.flat[target])
+        walk = [u]
+        while u != end:
+            u = pred[u]
+            walk.append(u)
+        return nodes[walk].tolist()
+
+    def _refine(self, abstract):
+        """Expand start, portals..., goal into every cell on the way."""
+        path = [abstract[0]]
+        for index, (a, b) in enumerate(zip(abstract, abstract[1:])):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(b)
+            elif index == 0:
+                path += self._tree_walk(cluster, self.trees[b][3], a, b)[1:]  # Reverse tree: pred points toward b
+            else:
+                path += self._tree_walk(cluster, self.trees[a][1], b, a)[::-1][1:]
+        return path
+
+    def portal_count(self):
+        return sum(len(p) for p in self.portals.values())
+
+
+# === Reference / checks ===
+
+def flat_graph(world):
+    """Adjacency lists over every walkable cell, from one pass over the whole region."""
+    walk, air = walkable(world.solid, world.agent)
+    cells = np.flatnonzero(walk.ravel())
+    index = np.full(walk.size, -1, dtype=np.int64)
+    index[cells] = np.arange(len(cells))
+    source, target, cost = moves(walk, air, world.agent)
+    adjacency = [[] for _ in range(len(cells))]
+    a = index[world.cell(source[:, 2], source[:, 1], source[:, 0])].tolist()
+    b = index[world.cell(target[:, 2], target[:, 1], target[:, 0])].tolist()
+    for s, t, c in zip(a, b, cost.tolist()):
+        adjacency[s].append((t, c))
+    xz = [(world.coords(int(c))[0], world.coords(int(c))[2]) for c in cells]
+    return cells, index, adjacency, xz
+
+
+def flat_path_cost(graph, start, goal):
+    cells, index, adjacency, xz = graph
+    cost, _path = _astar(adjacency, xz, int(index[start]), int(index[goal]))
+    return cost
+
+
+def check_walkable(world, samples=4000, seed=0):
+    """Cell-by-cell check of walk / air against the rules, on random columns."""
+    rng = np.random.default_rng(seed)
+    agent = world.agent
+    problems = []
+    for _ in range(samples):
+        z, x = (int(v) for v in rng.integers(0, world.shape[0], 2))
+        column = world.solid[z, :, x]
+        for y in range(world.shape[1]):
+            clear = all(y + k >= len(column) or not column[y + k] for k in range(agent.clearance))
+            expected = y > 0 and bool(column[y - 1]) and clear
+            if bool(world.walk[z, y, x]) != expected:
+                problems.append(f"walk mismatch at ({x}, {y}, {z})")
+                return problems
+    return problems
+
+
+def sample_pairs(world, count, seed=0):
+    rng = np.random.default_rng(seed)
+    cells = world.walkable_cells()
+    return [(int(a), int(b)) for a, b in rng.choice(cells, (count, 2))]
+
+
+@tracing.traced("verify")
+def verify(world, pairs):
+    """HPA* vs flat A* on pairs: problems, cost ratios."""
+    graph = flat_graph(world)
+    problems, ratios = [], []
+    for start, goal in pairs:
+        exact = flat_path_cost(graph, start, goal)
+        cost, path = world.find_path(start, goal)
+        if (exact < INF) != (cost < INF):
+            problems.append(f"reachability differs for {world.world_position(start)} -> {world.world_position(goal)}")
+            continue
+        if exact == INF:
+            continue
+        if cost < exact:
+            problems.append(f"HPA* cost {cost} below optimum {exact}")
+        steps = [world.move_cost(a, b) for a, b in zip(path, path[1:])]
+        if path[0] != start or path[-1] != goal or any(s is None for s in steps):
+            problems.append(f"invalid path {world.world_position(start)} -> {world.world_position(goal)}")
+        elif sum(steps) != cost:
+            problems.append(f"path cost {sum(steps)} != reported {cost}")
+        ratios.append(cost / exact if exact > 0 else 1.0)
+    return problems, ratios
+
+
+def graph_signature(world):
+    """Portals and links, for comparing an incremental rebuild with a full one."""
+    return {p: sorted(links) for p, links in world.links.items()}
+
+
+# === Test data ===
+
+def stamp_buildings(world, variants, count, seed=0):
+    """
+    Place prefab variants on the terrain surface and feed them to the world
+    as BuildingChunks (16^3 [z, y, x], keyed by chunk coord). Returns the
+    number of prefabs placed and chunks written.
+    """
+    rng = np.random.default_rng(seed)
+    top = world.shape[1] - 1 - np.argmax(world.solid[:, ::-1, :], axis=1)  # [z, x] highest solid y
+    voxels = {}
+    placed = 0
+    for _ in range(count):
+        _name, types, _metas = variants[rng.integers(len(variants))]
+        dy, dz, dx = types.shape
+        if dz >= world.shape[0] or dx >= world.shape[2]:
+            continue
+        z0 = int(rng.integers(0, world.shape[0] - dz))
+        x0 = int(rng.integers(0, world.shape[2] - dx))
+        y0 = int(top[z0:z0 + dz, x0:x0 + dx].min()) + 1
+        if y0 + dy >= world.shape[1]:
+            continue
+        y, z, x = np.nonzero(types)
+        wx, wy, wz = x + x0 + world.origin[0], y + y0 + world.origin[1], z + z0 + world.origin[2]
+        for key, lx, ly, lz, block in zip(zip(wx // bm.SIZE, wy // bm.SIZE, wz // bm.SIZE),
+                                          wx % bm.SIZE, wy % bm.SIZE, wz % bm.SIZE, types[y, z, x]):
+            chunk = voxels.setdefault(tuple(int(k) for k in key), np.zeros((bm.SIZE,) * 3, dtype=np.uint8))
+            chunk[lz, ly, lx] = block
+        placed += 1
+    for coord, chunk in voxels.items():
+        world.set_building_chunk(coord, chunk)
+    return placed, len(voxels)
+
+
+@tracing.traced("build")
+def build_world(cluster_min, clusters, params, variants, buildings, seed):
+    world = NavWorld(cluster_min, clusters)
+    world.load_terrain(params)
+    stamped = stamp_buildings(world, variants, buildings, seed) if variants and buildings else (0, 0)
+    return world, stamped
+
+
+def random_edits(world, count, seed=0):
+    """Dig pits and place pillars at random walkable cells (box brushes like terrain_api.gd)."""
+    rng = np.random.default_rng(seed)
+    cells = world.walkable_cells()
+    for index, cell in enumerate(rng.choice(cells, count)):
+        x, y, z = world.world_position(int(cell))
+        if index % 2:
+            world.modify((x, y + 1, z), 1.5, -0.5, SHAPE_BOX)
+        else:
+            world.modify((x, y - 1, z), 2.5, 0.5, SHAPE_BOX)
+
+
+@tracing.traced("benchmark")
+def benchmark(world, pairs, reference_pairs):
+    start = time.perf_counter()
+    for a, b in pairs:
+        world.find_path(a, b, refine=False)
+    abstract_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for a, b in pairs:
+        world.find_path(a, b)
+    refined_s = time.perf_counter() - start
+    graph = flat_graph(world)
+    start = time.perf_counter()
+    for a, b in reference_pairs:
+        flat_path_cost(graph, a, b)
+    flat_s = time.perf_counter() - start
+    return {
+        "abstract_qps": len(pairs) / max(abstract_s, 1e-9),
+        "refined_qps": len(pairs) / max(refined_s, 1e-9),
+        "flat_qps": len(reference_pairs) / max(flat_s, 1e-9),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a voxel navigation graph and benchmark HPA* path queries.")
+    parser.add_argument("--radius", type=int, default=3, help="chunk columns around the origin per side")
+    parser.add_argument("--buildings", type=int, default=24, help="prefabs to stamp onto the terrain")
+    parser.add_argument("--prefab-dir", type=Path, default=pc.PREFAB_DIR)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--reference", type=int, default=40, help="pairs checked against flat A*")
+    parser.add_argument("--edits", type=int, default=8, help="terrain edits for the incremental rebuild check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    params = tr.DEFAULT_PARAMS
+    cluster_min = (-args.radius, -args.radius)
+    clusters = 2 * args.radius
+    variants = bm.load_prefab_variants(args.prefab_dir)
+    start = time.perf_counter()
+    world, (placed, chunks) = build_world(cluster_min, clusters, params, variants, args.buildings, args.seed)
+    load_s = time.perf_counter() - start
+    full = world.rebuild()
+    depth, height, width = world.shape
+    print(f"[VOXEL_NAV] Region {clusters}x{clusters} chunks ({width}x{height}x{depth} cells), "
+          f"{placed} prefabs in {chunks} BuildingChunks: {len(world.walkable_cells())} walkable cells, "
+          f"{world.portal_count()} portals")
+    print(f"[VOXEL_NAV] Load {load_s:.2f} s, graph build {full['seconds']:.2f} s ({full['trees']} portal trees)")
+
+    problems = check_walkable(world, seed=args.seed)
+    pairs = sample_pairs(world, args.reference, args.seed)
+    path_problems, ratios = verify(world, pairs)
+    problems += path_problems
+
+    random_edits(world, args.edits, args.seed)
+    dirty = len(world.dirty)
+    edit = world.rebuild()
+    scratch = world.fresh_copy()
+    scratch.rebuild()
+    if graph_signature(scratch) != graph_signature(world):
+        problems.append("incremental rebuild differs from a full build")
+    edit_problems, edit_ratios = verify(world, sample_pairs(world, args.reference // 2, args.seed + 1))
+    problems += edit_problems
+    ratios += edit_ratios
+    ratio = f"cost ratio mean {np.mean(ratios):.3f}, max {np.max(ratios):.3f}" if ratios else "no reachable pairs"
+    print(f"[VOXEL_NAV] Check walkable rules, HPA* vs flat A* ({len(ratios)} paths, {ratio}), "
+          f"incremental vs full rebuild: {'OK' if not problems else '; '.join(problems[:4])}")
+    print(f"[VOXEL_NAV] {args.edits} edits -> {dirty} dirty chunks rebuilt in {edit['seconds'] * 1000:.0f} ms "
+          f"({edit['trees']} portal trees) vs {full['seconds'] * 1000:.0f} ms full build")
+
+    bench = benchmark(world, sample_pairs(world, args.queries, args.seed + 2),
+                      sample_pairs(world, max(args.reference // 4, 1), args.seed + 3))
+    print(f"[VOXEL_NAV] Queries/s: {bench['abstract_qps']:,.0f} HPA* abstract, {bench['refined_qps']:,.0f} refined, "
+          f"{bench['flat_qps']:,.0f} flat A*")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
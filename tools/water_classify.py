@@ -0,0 +1,227 @@
+"""
+Bulk water-chunk classification (CPU reference of gen_water_density.glsl).
+
+Every chunk currently pays for a water density dispatch, a water meshing
+dispatch and a readback in _complete_chunk_readback, even when there is no
+water surface inside it. Water density is linear in Y, so a whole column of
+chunks can be classified from one 33x33 evaluation of the water surface
+height:
+
+    AIR      every sample >= 0   -> no mesh, density is trivially positive
+    WATER    every sample <  0   -> no mesh, chunk is fully submerged
+    SURFACE  mixed signs         -> needs the water meshing pass
+
+Classes are written as a 2-bit-per-chunk bitmap (4 chunks per byte).
+Chunks with player water edits (layer 1 in a save's terrain_modifications)
+are always forced to SURFACE.
+
+Usage:
+    python tools/water_classify.py --radius 64 --y-min -2 --y-max 2
+    python tools/water_classify.py --save quicksave.json --out water_classes.bin
+"""
+import argparse
+import json
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+import terrain_reference as tr
+import tracing
+
+AIR = 0
+WATER = 1
+SURFACE = 2
+CLASS_NAMES = {AIR: "air", WATER: "water", SURFACE: "surface"}
+
+BITMAP_MAGIC = b"WCLS"
+BITMAP_VERSION = 1
+# magic, version, origin xyz, size xyz
+BITMAP_HEADER = struct.Struct("<4sI3i3I")
+
+# Only the meshed part of the grid matters for deciding whether a mesh exists,
+# but the CPU mirror (get_water_density) reads the full 33^3 grid, so classify on that.
+SAMPLES = tr.DENSITY_GRID_SIZE
+
+
+def column_height_range(x_coords, z_coords, params=tr.DEFAULT_PARAMS):
+    """
+    Min/max water surface height for every (x, z) chunk column.
+
+    Returns two float32 arrays shaped (len(z_coords), len(x_coords)).
+    """
+    x_coords = np.asarray(x_coords)
+    z_coords = np.asarray(z_coords)
+    local = np.arange(SAMPLES, dtype=np.float32)
+    # World sample positions: (chunks, 33) per axis, broadcast to (nz, 33, nx, 33)
+    wx = (x_coords[:, None] * tr.CHUNK_STRIDE).astype(np.float32) + local[None, :]
+    wz = (z_coords[:, None] * tr.CHUNK_STRIDE).astype(np.float32) + local[None, :]
+    heights = tr.water_surface_height(wx[None, None, :, :], wz[:, :, None, None], params)
+    return heights.min(axis=(1, 3)), heights.max(axis=(1, 3))
+
+
+@tracing.traced("classify")
+def classify_region(origin, size, params=tr.DEFAULT_PARAMS):
+    """
+    Classify a box of chunks.
+
+    origin: (x, y, z) of the first chunk, size: (nx, ny, nz).
+    Returns a uint8 array shaped (nz, ny, nx) of AIR / WATER / SURFACE.
+    """
+    ox, oy, oz = origin
+    nx, ny, nz = size
+    h_min, h_max = column_height_range(np.arange(ox, ox + nx), np.arange(oz, oz + nz), params)
+
+    # Density = y - height (float32, same as the shader). Lowest/highest grid sample per layer.
+    y_base = (np.arange(oy, oy + ny) * tr.CHUNK_STRIDE).astype(np.float32)
+    y_low = y_base[None, :, None]
+    y_high = y_base[None, :, None] + np.float32(SAMPLES - 1)
+    min_density = y_low - h_max[:, None, :]
+    max_density = y_high - h_min[:, None, :]
+
+    classes = np.full((nz, ny, nx), SURFACE, dtype=np.uint8)
+    classes[min_density >= 0.0] = AIR
+    classes[max_density < 0.0] = WATER
+    return classes
+
+
+def force_modified(classes, origin, coords):
+    """Mark chunks with water-layer edits as SURFACE (edits can create any shape)."""
+    ox, oy, oz = origin
+    nz, ny, nx = classes.shape
+    for x, y, z in coords:
+        ix, iy, iz = x - ox, y - oy, z - oz
+        if 0 <= ix < nx and 0 <= iy < ny and 0 <= iz < nz:
+            classes[iz, iy, ix] = SURFACE
+
+
+@tracing.traced("read")
+def water_modified_chunks(save_path):
+    """Chunk coords with layer 1 (water) modifications in a save file."""
+    data = json.loads(Path(save_path).read_text(encoding="utf-8"))
+    coords = []
+    for key, mods in data.get("terrain_modifications", {}).items():
+        parts = key.split(",")
+        if len(parts) != 3:
+            continue
+        if any(int(mod.get("layer", 0)) == 1 for mod in mods):
+            coords.append(tuple(int(p) for p in parts))
+    return coords
+
+
+# === Bitmap ===
+
+def pack_bitmap(classes):
+    """2 bits per chunk, x-fastest order, 4 chunks per byte (low bits first)."""
+    flat = classes.ravel()
+    padded = np.zeros(-(-flat.size // 4) * 4, dtype=np.uint8)
+    padded[:flat.size] = flat
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)).astype(np.uint8)
+
+
+def unpack_bitmap(packed, size):
+    nx, ny, nz = size
+    flat = np.stack([(packed >> shift) & 0b11 for shift in (0, 2, 4, 6)], axis=1).ravel()
+    return flat[:nx * ny * nz].reshape(nz, ny, nx)
+
+
+@tracing.traced("write")
+def write_bitmap(path, origin, classes):
+    nz, ny, nx = classes.shape
+    header = BITMAP_HEADER.pack(BITMAP_MAGIC, BITMAP_VERSION, *origin, nx, ny, nz)
+    Path(path).write_bytes(header + pack_bitmap(classes).tobytes())
+
+
+@tracing.traced("read")
+def read_bitmap(path):
+    """Returns (origin, classes)."""
+    raw = Path(path).read_bytes()
+    magic, version, ox, oy, oz, nx, ny, nz = BITMAP_HEADER.unpack_from(raw)
+    if magic != BITMAP_MAGIC or version != BITMAP_VERSION:
+        raise ValueError(f"{path} is not a v{BITMAP_VERSION} water class bitmap")
+    packed = np.frombuffer(raw, dtype=np.uint8, offset=BITMAP_HEADER.size)
+    return (ox, oy, oz), unpack_bitmap(packed, (nx, ny, nz))
+
+
+def chunk_class(origin, classes, coord):
+    """Class of a single chunk, SURFACE when outside the bitmap (safe default)."""
+    ix, iy, iz = (c - o for c, o in zip(coord, origin))
+    nz, ny, nx = classes.shape
+    if 0 <= ix < nx and 0 <= iy < ny and 0 <= iz < nz:
+        return int(classes[iz, iy, ix])
+    return SURFACE
+
+
+# === Verification ===
+
+@tracing.traced("verify")
+def verify_against_grid(origin, classes, samples=64, params=tr.DEFAULT_PARAMS, seed=0):
+    """Check random chunks against a full 33^3 water density evaluation."""
+    rng = np.random.default_rng(seed)
+    nz, ny, nx = classes.shape
+    mismatches = 0
+    for _ in range(samples):
+        ix, iy, iz = rng.integers(nx), rng.integers(ny), rng.integers(nz)
+        coord = (origin[0] + ix, origin[1] + iy, origin[2] + iz)
+        grid = tr.chunk_water_density(coord, params)
+        if np.all(grid >= 0.0):
+            expected = AIR
+        elif np.all(grid < 0.0):
+            expected = WATER
+        else:
+            expected = SURFACE
+        if expected != classes[iz, iy, ix]:
+            mismatches += 1
+            print(f"[WATER_CLASSIFY] MISMATCH at {coord}: bitmap={CLASS_NAMES[classes[iz, iy, ix]]} "
+                  f"grid={CLASS_NAMES[expected]}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify chunks as air / water / water surface.")
+    parser.add_argument("--radius", type=int, default=32, help="chunk radius around the center")
+    parser.add_argument("--center", type=int, nargs=2, default=(0, 0), metavar=("X", "Z"))
+    parser.add_argument("--y-min", type=int, default=-2)
+    parser.add_argument("--y-max", type=int, default=2)
+    parser.add_argument("--save", type=Path, help="save file whose water edits force SURFACE")
+    parser.add_argument("--out", type=Path, help="write the 2-bit class bitmap here")
+    parser.add_argument("--verify", type=int, default=32, metavar="N",
+                        help="cross-check N random chunks against full grids (0 = off)")
+    args = parser.parse_args()
+
+    side = args.radius * 2 + 1
+    origin = (args.center[0] - args.radius, args.y_min, args.center[1] - args.radius)
+    size = (side, args.y_max - args.y_min + 1, side)
+
+    start = time.perf_counter()
+    classes = classify_region(origin, size)
+    elapsed = time.perf_counter() - start
+    if args.save:
+        force_modified(classes, origin, water_modified_chunks(args.save))
+
+    total = classes.size
+    counts = {name: int(np.count_nonzero(classes == cls)) for cls, name in CLASS_NAMES.items()}
+    skippable = counts["air"] + counts["water"]
+    print(f"[WATER_CLASSIFY] Classified {total} chunks ({size[0]}x{size[1]}x{size[2]}) in {elapsed * 1000:.1f} ms "
+          f"({total / max(elapsed, 1e-9):,.0f} chunks/s)")
+    for name, count in counts.items():
+        print(f"[WATER_CLASSIFY]   {name:8s} {count:8d}  {count / total:6.1%}")
+    print(f"[WATER_CLASSIFY] Water meshing passes skippable: {skippable}/{total} ({skippable / total:.1%})")
+
+    for iy in range(size[1]):
+        layer = classes[:, iy, :]
+        print(f"[WATER_CLASSIFY]   y={origin[1] + iy:3d}: surface {np.count_nonzero(layer == SURFACE):6d}")
+
+    if args.verify:
+        mismatches = verify_against_grid(origin, classes, args.verify)
+        print(f"[WATER_CLASSIFY] Verified {args.verify} random chunks against full grids: {mismatches} mismatches")
+
+    if args.out:
+        write_bitmap(args.out, origin, classes)
+        print(f"[WATER_CLASSIFY] Bitmap written to {args.out} ({args.out.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()